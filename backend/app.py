@@ -4,8 +4,8 @@ Streamlit 메인 애플리케이션
 """
 import streamlit as st
 import asyncio
+import hashlib
 import json
-import boto3
 from app.services.bedrock_service import BedrockService
 from app.services.pdf_service import PDFService
 from app.services.crawler_service import CrawlerService
@@ -35,8 +35,18 @@ with st.sidebar:
     
     st.markdown("---")
     
+    # 사용자 이름 (면접 기록 저장/조회 기준)
+    st.text_input(
+        "👤 사용자 이름",
+        value=st.session_state.get('user_id', "guest"),
+        help="면접 기록을 이 이름으로 저장하고 불러옵니다",
+        key='user_id'
+    )
+    
+    st.markdown("---")
+    
     # 일반 사용자용 메뉴 (기본)
-    user_pages = ["🏠 홈", "❓ 질문 생성"]
+    user_pages = ["🏠 홈", "❓ 질문 생성", "📜 면접 기록"]
     
     # 개발자용 메뉴
     if developer_mode:
@@ -227,6 +237,14 @@ elif page == "💬 간단한 채팅":
     if "messages" not in st.session_state:
         st.session_state.messages = []
     
+    # 프롬프트에 넣을 대화 메모리 (오래된 대화는 백그라운드에서 요약)
+    if "chat_memory" not in st.session_state:
+        from app.services.conversation_memory import SummarizingMemory, bedrock_summarizer
+        from app.services.bedrock_client import create_bedrock_runtime
+        st.session_state.chat_memory = SummarizingMemory(
+            summarizer=bedrock_summarizer(create_bedrock_runtime())
+        )
+    
     # 채팅 히스토리 표시
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
@@ -248,15 +266,12 @@ elif page == "💬 간단한 채팅":
         """간단한 스트리밍 응답 생성 (Rate Limiting & Retry 포함)"""
         import time
         from app.services.rate_limiter import rate_limiter
+        from app.services.metrics import StreamTimer, record_retry
+        
+        from app.services.bedrock_client import create_bedrock_runtime
         
         # Bedrock 클라이언트 초기화
-        session_kwargs = {"region_name": settings.aws_region}
-        if settings.aws_access_key_id and settings.aws_secret_access_key:
-            session_kwargs.update({
-                "aws_access_key_id": settings.aws_access_key_id,
-                "aws_secret_access_key": settings.aws_secret_access_key
-            })
-        bedrock_runtime_local = boto3.client("bedrock-runtime", **session_kwargs)
+        bedrock_runtime_local = create_bedrock_runtime()
         
         # Retry 설정
         max_retries = 5
@@ -270,30 +285,20 @@ elif page == "💬 간단한 채팅":
                 loop_rate.run_until_complete(rate_limiter.wait_if_needed(key="bedrock_simple_chat"))
                 loop_rate.close()
                 
-                # 메시지 히스토리 구성 (최근 6개)
-                history = []
-                recent_messages = st.session_state.messages[-6:]
-                for msg in recent_messages:
-                    if msg["role"] in ["user", "assistant"]:
-                        content = msg["content"][:500] if len(msg["content"]) > 500 else msg["content"]
-                        history.append({
-                            "role": msg["role"],
-                            "content": [{"type": "text", "text": content}]
-                        })
-                
-                # 현재 사용자 메시지 추가
-                history.append({
-                    "role": "user",
-                    "content": [{"type": "text", "text": user_prompt}]
-                })
-                
-                body = json.dumps({
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": 1500,
-                    "messages": history,
-                })
+                # 메시지 히스토리 구성 (이전 대화 요약 + 최근 대화, 토큰 예산 안에서)
+                from app.services.prompt_builder import PromptAssembler
+                chat_memory = st.session_state.chat_memory
+                prompt_assembler = PromptAssembler()
+                assembled_prompt = prompt_assembler.assemble(
+                    system_prompt="",
+                    question=user_prompt,
+                    history=chat_memory.history(),
+                    summary=chat_memory.summary
+                )
+                body = prompt_assembler.to_bedrock_body(assembled_prompt, max_tokens=1500)
                 
                 # 스트리밍 응답
+                timer = StreamTimer()
                 response = bedrock_runtime_local.invoke_model_with_response_stream(
                     modelId=settings.bedrock_model_id,
                     body=body,
@@ -307,7 +312,9 @@ elif page == "💬 간단한 채팅":
                             chunk_json = json.loads(chunk.get("bytes").decode())
                             text = chunk_handler_simple(chunk_json)
                             if text:
+                                timer.token()
                                 yield text
+                timer.finish()
                 return
                                 
             except Exception as e:
@@ -316,7 +323,8 @@ elif page == "💬 간단한 채팅":
                 
                 if "ThrottlingException" in error_str or "Too many requests" in error_str or "throttl" in error_str.lower():
                     if attempt < max_retries - 1:
-                        delay = base_delay * (2 ** attempt)
+                        delay = base_delay * (2 ** attempt) * settings.bedrock_retry_delay_scale
+                        record_retry("simple_chat", delay)
                         # 개발자 모드일 때만 재시도 메시지 표시
                         if developer_mode_debug:
                             yield f"\n\n⏳ {delay}초 대기 후 재시도합니다...\n\n"
@@ -350,6 +358,10 @@ elif page == "💬 간단한 채팅":
         
         # 보조 응답 세션 상태에 추가
         st.session_state.messages.append({"role": "assistant", "content": model_output})
+        
+        # 대화 메모리에 추가 (필요하면 오래된 대화 요약이 백그라운드에서 시작됨)
+        st.session_state.chat_memory.add_user_message(prompt)
+        st.session_state.chat_memory.add_ai_message(model_output)
 
 elif page == "📄 PDF 업로드":
     st.header("📄 PDF 업로드 및 텍스트 추출")
@@ -379,23 +391,28 @@ elif page == "📄 PDF 업로드":
                     # 파일 읽기
                     file_content = uploaded_file.read()
                     
-                    # PDFService를 사용하여 텍스트 추출
+                    # PDFService를 사용하여 텍스트 추출 (같은 파일은 캐시에서 바로 반환)
                     pdf_service = PDFService()
                     loop = asyncio.new_event_loop()
                     asyncio.set_event_loop(loop)
-                    extracted_text = loop.run_until_complete(
-                        pdf_service.extract_text(file_content, uploaded_file.name)
+                    analysis = loop.run_until_complete(
+                        pdf_service.analyze_pdf(file_content, uploaded_file.name)
                     )
                     loop.close()
+                    extracted_text = analysis["text"]
                     
                     # 세션 상태에 저장
                     st.session_state.pdf_text = extracted_text
                     st.session_state.pdf_filename = uploaded_file.name
+                    st.session_state.pdf_cache_key = analysis["cache_key"]
                     
-                    st.success("✅ 텍스트 추출 완료!")
+                    if analysis["cached"]:
+                        st.success("✅ 텍스트 추출 완료! (이전에 분석한 파일이라 캐시에서 불러왔습니다)")
+                    else:
+                        st.success("✅ 텍스트 추출 완료!")
                     
                     # 요약 정보 표시
-                    summary = pdf_service.get_summary(extracted_text)
+                    summary = analysis["summary"]
                     
                     st.subheader("📊 문서 요약")
                     col1, col2, col3 = st.columns(3)
@@ -551,15 +568,28 @@ elif page == "🕷️ 웹 크롤링":
                                     
                                     loop = asyncio.new_event_loop()
                                     asyncio.set_event_loop(loop)
-                                    doc_id = loop.run_until_complete(
-                                        rag_service.add_document(
+                                    # 이미 저장한 URL이면 바뀐 청크만 임베딩하고 사라진 청크는 삭제
+                                    update = loop.run_until_complete(
+                                        rag_service.update_document(
                                             content,
                                             {"source": "crawler", "url": url}
                                         )
                                     )
                                     loop.close()
                                     
-                                    st.success(f"📚 RAG에 자동 저장 완료! (문서 ID: {doc_id[:8]}...)")
+                                    # 작업 큐/수집 파이프라인과 같이 출처 카탈로그에 등록 (최신성 확인 대상)
+                                    from app.services.source_catalog import track_crawled_document
+                                    track_crawled_document(
+                                        url,
+                                        content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(),
+                                        doc_id=update["doc_id"],
+                                        changed=update["added"] + update["removed"] > 0
+                                    )
+                                    
+                                    st.success(
+                                        f"📚 RAG에 자동 저장 완료! (문서 ID: {update['doc_id'][:8]}..., "
+                                        f"추가 {update['added']} · 삭제 {update['removed']} · 유지 {update['unchanged']} 청크)"
+                                    )
                                 except Exception as rag_error:
                                     st.warning(f"⚠️ RAG 저장 실패: {str(rag_error)} (크롤링 데이터는 세션에 저장되었습니다)")
                         
@@ -617,104 +647,129 @@ elif page == "🕷️ 웹 크롤링":
                 )
                 
                 if st.button("🕷️ 일괄 크롤링 시작", type="primary", use_container_width=True):
-                    # 진행 상황 표시
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
-                    
-                    results = []
-                    crawler_service = CrawlerService()
-                    rag_added_count = 0
-                    
-                    # RAG 서비스 초기화 (자동 저장용)
-                    rag_service = None
-                    if auto_rag_multi:
-                        try:
-                            from app.services.rag_service import RAGService
-                            rag_service = RAGService()
-                        except:
-                            pass
-                    
-                    for idx, url in enumerate(urls):
-                        status_text.text(f"크롤링 중: {url} ({idx + 1}/{len(urls)})")
-                        progress_bar.progress((idx + 1) / len(urls))
-                        
-                        try:
-                            content = crawler_service.crawl_url(url)
-                            results.append({
-                                "url": url,
-                                "status": "success",
-                                "content": content,
-                                "length": len(content)
-                            })
-                            
-                            # 자동 RAG 저장
-                            if auto_rag_multi and rag_service and content and len(content.strip()) > 0:
-                                try:
-                                    loop_rag = asyncio.new_event_loop()
-                                    asyncio.set_event_loop(loop_rag)
-                                    loop_rag.run_until_complete(
-                                        rag_service.add_document(
-                                            content,
-                                            {"source": "crawler", "url": url}
-                                        )
-                                    )
-                                    loop_rag.close()
-                                    rag_added_count += 1
-                                except Exception as rag_err:
-                                    pass  # RAG 저장 실패는 무시하고 계속
-                            
-                        except Exception as e:
-                            results.append({
-                                "url": url,
-                                "status": "error",
-                                "error": str(e)
-                            })
-                    
-                    progress_bar.empty()
-                    status_text.empty()
-                    
-                    # 결과 요약
-                    success_count = sum(1 for r in results if r["status"] == "success")
-                    error_count = len(results) - success_count
+                    # 크롤링/RAG 저장은 작업 큐에서 백그라운드로 처리 (페이지를 벗어나도 계속 진행)
+                    # 같은 요청이 아직 진행 중이면 같은 묶음 ID로 다시 등록 → 작업이 중복 생성되지 않음
+                    import uuid
+                    crawl_request = {"urls": urls, "auto_rag": auto_rag_multi}
+                    batch_id = None
+                    if st.session_state.get("crawl_request") == crawl_request and not st.session_state.get("crawl_batch_done", True):
+                        batch_id = st.session_state.crawl_batch_id
+                    batch_id = batch_id or str(uuid.uuid4())
                     
-                    col1, col2, col3 = st.columns(3)
+                    try:
+                        from app.services.api_client import get_api_client
+                        api_client = get_api_client()
+                        if api_client:
+                            api_client.ingest_urls(urls, auto_rag=auto_rag_multi, batch_id=batch_id)
+                        else:
+                            from app.services.ingest_jobs import enqueue_urls
+                            enqueue_urls(urls, auto_rag=auto_rag_multi, batch_id=batch_id)
+                        st.session_state.crawl_request = crawl_request
+                        st.session_state.crawl_batch_id = batch_id
+                        st.session_state.crawl_batch_done = False
+                    except Exception as e:
+                        st.error(f"❌ 작업 등록 실패: {str(e)}")
+        
+        # 일괄 크롤링 진행 상황 (작업 큐에서 조회)
+        if st.session_state.get("crawl_batch_id"):
+            import time
+            from app.services.api_client import get_api_client
+            
+            batch_id = st.session_state.crawl_batch_id
+            api_client = get_api_client()
+            try:
+                if api_client:
+                    batch = api_client.get_batch(batch_id)
+                else:
+                    from app.services.ingest_jobs import get_ingest_queue
+                    batch = get_ingest_queue().batch_status(batch_id)
+            except Exception as e:
+                batch = None
+                st.error(f"❌ 작업 상태 조회 실패: {str(e)}")
+            
+            if batch and batch["jobs"]:
+                st.subheader("📊 일괄 크롤링 진행 상황")
+                counts = batch["counts"]
+                st.progress(
+                    batch["progress"],
+                    text=f"완료 {counts['succeeded']} · 실패 {counts['failed']} · 진행 중 {counts['running']} · 대기 {counts['queued']}"
+                )
+                
+                crawl_counts = batch["by_kind"].get("crawl", {})
+                embed_counts = batch["by_kind"].get("embed", {})
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.success(f"✅ 크롤링 성공: {crawl_counts.get('succeeded', 0)}개")
+                with col2:
+                    if crawl_counts.get("failed", 0) > 0:
+                        st.error(f"❌ 크롤링 실패: {crawl_counts['failed']}개")
+                with col3:
+                    if embed_counts:
+                        st.success(f"📚 RAG 저장: {embed_counts.get('succeeded', 0)}/{sum(embed_counts.values())}개")
+                
+                status_icons = {"queued": "⏳", "running": "🔄", "succeeded": "✅", "failed": "❌"}
+                crawl_jobs = [job for job in batch["jobs"] if job["kind"] == "crawl"]
+                for idx, job in enumerate(crawl_jobs):
+                    url = job.get("payload", {}).get("url") or (job.get("result") or {}).get("url", "")
+                    with st.expander(f"{status_icons.get(job['status'], '')} {url or job['message']}", expanded=False):
+                        if job["status"] == "succeeded" and job.get("result"):
+                            st.metric("텍스트 길이", f"{job['result']['length']:,}자")
+                            st.text_area(
+                                "내용 (미리보기)",
+                                job["result"].get("preview", ""),
+                                height=200,
+                                key=f"content_{batch_id}_{idx}",
+                                label_visibility="collapsed"
+                            )
+                        else:
+                            if job["message"]:
+                                st.caption(job["message"])
+                            st.caption(f"시도: {job['attempts']}/{job['max_attempts']}")
+                            if job.get("error"):
+                                st.error(f"오류: {job['error']}")
+                
+                failed_embeds = [job for job in batch["jobs"] if job["kind"] == "embed" and job["status"] == "failed"]
+                for job in failed_embeds:
+                    st.warning(f"⚠️ RAG 저장 실패: {job.get('error')} (크롤링 데이터는 세션에 저장됩니다)")
+                
+                if batch["done"]:
+                    # 완료된 묶음의 크롤링 결과를 한 번만 세션 상태에 저장
+                    if not st.session_state.get("crawl_batch_done"):
+                        if "crawled_data" not in st.session_state:
+                            st.session_state.crawled_data = []
+                        for job in crawl_jobs:
+                            if job["status"] == "succeeded" and job.get("result"):
+                                # 작업 결과에는 본문 미리보기만 있음
+                                # (자동 RAG 저장이면 전체 본문은 벡터 DB에, 아니면 보관된 본문을 가져와 나중에 RAG에 추가 가능)
+                                item = {
+                                    "url": job["result"]["url"],
+                                    "preview": job["result"].get("preview", ""),
+                                    "length": job["result"]["length"]
+                                }
+                                if job["result"].get("content_key"):
+                                    job_id = job.get("job_id") or job.get("id")
+                                    try:
+                                        if api_client:
+                                            stored = api_client.get_job_content(job_id)
+                                        else:
+                                            from app.services.ingest_jobs import get_crawl_content
+                                            stored = get_crawl_content(job_id)
+                                        if stored:
+                                            item["content"] = stored["content"]
+                                    except Exception as e:
+                                        st.warning(f"⚠️ 크롤링 본문을 불러오지 못했습니다: {item['url']} ({str(e)})")
+                                st.session_state.crawled_data.append(item)
+                        st.session_state.crawl_batch_done = True
+                        st.rerun()
+                else:
+                    col1, col2 = st.columns([1, 3])
                     with col1:
-                        st.success(f"✅ 크롤링 성공: {success_count}개")
+                        st.button("🔄 새로고침", key="crawl_batch_refresh")
                     with col2:
-                        if error_count > 0:
-                            st.error(f"❌ 크롤링 실패: {error_count}개")
-                    with col3:
-                        if auto_rag_multi and rag_added_count > 0:
-                            st.success(f"📚 RAG 저장: {rag_added_count}개")
-                    
-                    # 결과 상세 표시
-                    st.subheader("📊 크롤링 결과 상세")
-                    
-                    for idx, result in enumerate(results):
-                        with st.expander(f"{'✅' if result['status'] == 'success' else '❌'} {result['url']}", expanded=False):
-                            if result["status"] == "success":
-                                st.metric("텍스트 길이", f"{result['length']:,}자")
-                                st.text_area(
-                                    "내용",
-                                    result["content"],
-                                    height=200,
-                                    key=f"content_{idx}",
-                                    label_visibility="collapsed"
-                                )
-                            else:
-                                st.error(f"오류: {result['error']}")
-                    
-                    # 세션 상태에 저장
-                    if "crawled_data" not in st.session_state:
-                        st.session_state.crawled_data = []
-                    
-                    for result in results:
-                        if result["status"] == "success":
-                            st.session_state.crawled_data.append({
-                                "url": result["url"],
-                                "content": result["content"],
-                                "length": result["length"]
-                            })
+                        auto_refresh = st.checkbox("자동 새로고침", value=True, key="crawl_batch_auto_refresh")
+                    if auto_refresh:
+                        time.sleep(max(1.0, settings.job_poll_interval))
+                        st.rerun()
     
     # 크롤링된 데이터 요약
     if "crawled_data" in st.session_state and st.session_state.crawled_data:
@@ -726,8 +781,8 @@ elif page == "🕷️ 웹 크롤링":
         for idx, item in enumerate(st.session_state.crawled_data):
             with st.expander(f"📄 {item['url']} ({item['length']:,}자)", expanded=False):
                 st.text_area(
-                    "내용",
-                    item["content"],
+                    "내용" if "content" in item else "내용 (미리보기)",
+                    item.get("content", item.get("preview", "")),
                     height=200,
                     key=f"summary_{idx}",
                     label_visibility="collapsed"
@@ -742,17 +797,30 @@ elif page == "❓ 질문 생성":
     st.header("❓ 면접 질문 생성 챗봇")
     st.markdown("자연스러운 대화로 맞춤형 면접 질문을 생성합니다. 크롤링한 데이터나 PDF를 기반으로 답변합니다.")
     
-    # RAG 서비스 초기화
-    rag_service = RAGService()
+    # API 서버가 설정되어 있으면 질문 생성은 API로 요청 (Streamlit은 화면만 담당)
+    from app.services.api_client import get_api_client
+    api_client = get_api_client()
     
-    # Bedrock 클라이언트 초기화
-    session_kwargs = {"region_name": settings.aws_region}
-    if settings.aws_access_key_id and settings.aws_secret_access_key:
-        session_kwargs.update({
-            "aws_access_key_id": settings.aws_access_key_id,
-            "aws_secret_access_key": settings.aws_secret_access_key
-        })
-    bedrock_runtime = boto3.client("bedrock-runtime", **session_kwargs)
+    # RAG 서비스 초기화 (직접 처리하거나 개발자용 문서 관리를 쓸 때만)
+    rag_service = None
+    if api_client is None or st.session_state.get('developer_mode', False):
+        rag_service = RAGService()
+    
+    # 프롬프트에 넣을 대화 메모리 (오래된 대화는 백그라운드에서 요약)
+    # API 모드에서는 서버가 세션 메모리를 관리하므로 화면 표시용으로만 유지 (요약 없음)
+    if "question_memory" not in st.session_state:
+        from app.services.conversation_memory import SummarizingMemory, bedrock_summarizer
+        summarizer = bedrock_summarizer(rag_service.bedrock_runtime) if api_client is None else None
+        question_memory = SummarizingMemory(summarizer=summarizer)
+        # 면접 기록에서 이어서 대화하는 경우 기존 대화로 채움 (초기 환영 메시지 제외)
+        for message in st.session_state.get("question_messages", [])[1:]:
+            question_memory.add_message(message["role"], message["content"])
+        st.session_state.question_memory = question_memory
+    
+    # 면접 기록 저장용 대화 세션 ID
+    if "question_session_id" not in st.session_state:
+        import uuid
+        st.session_state.question_session_id = str(uuid.uuid4())
     
     # 세션 상태 초기화
     if "question_messages" not in st.session_state:
@@ -768,311 +836,104 @@ elif page == "❓ 질문 생성":
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
     
-    def chunk_handler(chunk):
-        """스트리밍 청크 처리"""
-        text = ""
-        chunk_type = chunk.get("type")
+    def render_question_event(event, developer_mode_debug):
+        """QuestionService 이벤트를 화면에 표시할 텍스트로 변환 (디버깅 정보는 개발자 모드에서만)"""
+        event_type = event.get("type")
         
-        if chunk_type == "content_block_delta":
-            # 스트리밍 중인 응답 텍스트의 일부
-            text = chunk.get("delta", {}).get("text", "")
-        elif chunk_type == "content_block_start":
-            # 응답 텍스트 시작
-            text = chunk.get("content_block", {}).get("text", "")
+        if event_type == "text":
+            return event["text"]
         
-        return text
+        if event_type == "usage":
+            st.session_state.last_prompt_usage = event["usage"]
+            return ""
+        
+        if event_type == "retrieval" and developer_mode_debug:
+            text = f"🔍 **{event['status']}**\n\n"
+            if settings.reranker_enabled and api_client is None:
+                from app.services.reranker import get_reranker
+                rerank_stats = get_reranker().latency_summary()
+                text += (
+                    f"⚖️ **재정렬**: p50 {rerank_stats['total_ms']['p50']}ms / "
+                    f"p95 {rerank_stats['total_ms']['p95']}ms, "
+                    f"캐시 적중률 {rerank_stats['cache_hit_rate']:.0%}\n\n"
+                )
+            if event["documents"]:
+                text += f"📚 **검색된 문서 미리보기:**\n"
+                for i, doc in enumerate(event["documents"], 1):
+                    text += f"{i}. [{doc['source']}] {doc['preview']}...\n"
+                text += "\n---\n\n"
+            return text
+        
+        if event_type == "prompt" and developer_mode_debug:
+            token_usage = event["token_usage"]
+            text = (
+                f"\n🔧 **디버깅 정보:**\n"
+                f"- 전체 대화 메시지 수: {len(st.session_state.question_messages)}개\n"
+                f"- 히스토리에 포함된 메시지: {event['included_messages']}개\n"
+                f"- 참고 자료에 포함된 문서: {event['included_documents']}개\n"
+                f"- 추정 입력 토큰: 시스템 {token_usage['system']} / 참고 자료 {token_usage['context']} / "
+                f"요약 {token_usage['summary']} / 히스토리 {token_usage['history']} / 질문 {token_usage['question']}\n"
+            )
+            if event["summarizing"]:
+                text += f"- 이전 대화 요약 진행 중 (백그라운드)\n"
+            return text + f"\n---\n\n"
+        
+        if event_type == "retry" and developer_mode_debug:
+            # 일반 사용자 모드에서는 조용히 재시도 (메시지 없음)
+            return f"\n\n⏳ 요청이 많아 {event['delay']}초 대기 후 재시도합니다... (시도 {event['attempt']}/{event['max_retries']})\n\n"
+        
+        if event_type == "error":
+            if event.get("throttled"):
+                if developer_mode_debug:
+                    return f"\n\n❌ 오류: 서버가 과부하 상태입니다. 5분 정도 기다린 후 다시 시도해주세요.\n\n"
+                return f"\n\n⏳ 응답을 생성하는 중입니다. 잠시만 기다려주세요...\n\n"
+            if developer_mode_debug:
+                return f"\n\n❌ 오류 발생: {event['message']}\n\n"
+            return f"\n\n⏳ 응답 생성 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.\n\n"
+        
+        return ""
     
-    def get_streaming_response_with_rag(user_prompt):
-        """RAG를 사용한 스트리밍 응답 생성 (Rate Limiting & Retry 포함)"""
-        import time
-        from app.services.rate_limiter import rate_limiter
+    def iterate_question_events(user_prompt):
+        """질문 생성 이벤트 (API 모드면 SSE, 아니면 QuestionService를 직접 실행)"""
+        if api_client is not None:
+            yield from api_client.stream_questions(
+                user_prompt,
+                session_id=st.session_state.question_session_id,
+                user_id=st.session_state.get('user_id') or "guest"
+            )
+            return
         
-        # Retry 설정
-        max_retries = 5
-        base_delay = 5  # 기본 대기 시간 5초로 증가
+        from app.services.question_service import QuestionService
+        question_service = QuestionService(rag_service)
+        events = question_service.stream(user_prompt, st.session_state.question_memory)
         
-        for attempt in range(max_retries):
-            try:
-                # Rate Limiting: 요청 전 대기 (매 시도마다)
-                loop_rate = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop_rate)
-                loop_rate.run_until_complete(rate_limiter.wait_if_needed(key="bedrock_stream"))
-                loop_rate.close()
-                
-                # 회사명 추출 (회사 특화 문서 검색용)
-                import re
-                company_keywords = ["카카오", "네이버", "라인", "토스", "당근", "쿠팡", "배달의민족", "우아한형제들", 
-                                   "삼성", "LG", "SK", "현대", "기아", "한화", "롯데", "CJ", "GS",
-                                   "당근마켓", "무신사", "야놀자", "직방", "왓챠", "브랜디", "마켓컬리",
-                                   "Apple", "Google", "Microsoft", "Amazon", "Meta", "Netflix", "Tesla",
-                                   "애플", "구글", "마이크로소프트", "아마존", "메타", "넷플릭스", "테슬라"]
-                
-                extracted_companies = []
-                user_prompt_lower = user_prompt.lower()
-                for keyword in company_keywords:
-                    if keyword.lower() in user_prompt_lower or keyword in user_prompt:
-                        extracted_companies.append(keyword)
-                
-                # 검색 쿼리 개선: 회사명이 있으면 검색 쿼리에 포함
-                search_query = user_prompt
-                if extracted_companies:
-                    # 회사명을 명시적으로 검색 쿼리에 추가
-                    company_query = " ".join(extracted_companies)
-                    search_query = f"{user_prompt} {company_query}"
-                
-                # RAG를 사용하여 관련 문서 검색
-                relevant_docs = []
-                rag_status = "❌ RAG 미사용 (일반 LLM 모드)"
+        # 비동기 제너레이터를 Streamlit 스트리밍용 동기 제너레이터로 변환
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            while True:
                 try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    # 검색 범위를 넓게 설정 (회사 특화 문서를 더 찾기 위해)
-                    relevant_docs = loop.run_until_complete(
-                        rag_service.search_documents(search_query, k=15)  # 검색 범위 확대: 10개 → 15개
-                    )
-                    loop.close()
-                    
-                    # 중복 제거: 같은 문서의 여러 청크 중 가장 긴 것만 유지
-                    # url 또는 doc_id를 기준으로 중복 제거 (url 우선, 같은 URL = 같은 문서)
-                    seen_documents = {}  # key: identifier, value: doc
-                    
-                    for doc in relevant_docs:
-                        # 문서 식별자 생성 (url 우선, 없으면 doc_id, 없으면 source 사용)
-                        doc_url = doc.metadata.get('url', '')
-                        doc_id = doc.metadata.get('doc_id', '')
-                        doc_source = doc.metadata.get('source', '')
-                        
-                        # URL이 있으면 URL을 식별자로, 없으면 doc_id, 없으면 source 사용
-                        doc_identifier = doc_url if doc_url else (doc_id if doc_id else doc_source)
-                        
-                        if doc_identifier:
-                            # 같은 문서를 아직 보지 않았으면 추가
-                            if doc_identifier not in seen_documents:
-                                seen_documents[doc_identifier] = doc
-                            else:
-                                # 이미 있는 문서의 청크보다 더 긴 청크면 교체 (더 많은 정보 포함)
-                                existing_doc = seen_documents[doc_identifier]
-                                if len(doc.page_content) > len(existing_doc.page_content):
-                                    seen_documents[doc_identifier] = doc
-                        else:
-                            # 식별자가 없으면 그대로 추가 (중복 가능하지만 일단 포함)
-                            # 고유 키 생성 (내용의 일부 사용)
-                            unique_key = doc.page_content[:50] if doc.page_content else str(len(seen_documents))
-                            if unique_key not in seen_documents:
-                                seen_documents[unique_key] = doc
-                    
-                    # 중복 제거된 문서 리스트 생성
-                    relevant_docs = list(seen_documents.values())
-                    
-                    # 회사명이 추출된 경우, 회사 관련 문서를 우선순위로 필터링
-                    if extracted_companies and relevant_docs:
-                        company_docs = []
-                        other_docs = []
-                        for doc in relevant_docs:
-                            doc_content = doc.page_content.lower()
-                            doc_url = doc.metadata.get('url', '').lower()
-                            doc_source = str(doc.metadata.get('source', '')).lower()
-                            
-                            # 회사명이 문서 내용이나 메타데이터에 포함되어 있는지 확인
-                            is_company_doc = any(
-                                company.lower() in doc_content or 
-                                company.lower() in doc_url or 
-                                company.lower() in doc_source
-                                for company in extracted_companies
-                            )
-                            
-                            if is_company_doc:
-                                company_docs.append(doc)
-                            else:
-                                other_docs.append(doc)
-                        
-                        # 회사 관련 문서를 먼저, 그 다음 일반 문서 (각각 중복 제거된 상태)
-                        relevant_docs = company_docs[:10] + other_docs[:5]
-                    
-                    if relevant_docs:
-                        company_info = f" (회사: {', '.join(extracted_companies)})" if extracted_companies else ""
-                        rag_status = f"✅ RAG 사용 중 (관련 문서 {len(relevant_docs)}개 발견{company_info})"
-                    else:
-                        rag_status = "⚠️ RAG 검색됐지만 관련 문서 없음 (일반 LLM 모드)"
-                except Exception as rag_error:
-                    # RAG 검색 실패 시 무시하고 계속 진행
-                    rag_status = f"❌ RAG 검색 실패: {str(rag_error)[:50]}... (일반 LLM 모드)"
-                
-                # 컨텍스트 구성 (검색 범위 확대에 맞춰 길이도 증가)
-                context = "\n\n".join([doc.page_content[:500] for doc in relevant_docs]) if relevant_docs else ""
-                
-                # RAG 상태 정보를 yield로 전달 (개발자 모드에서만 표시)
-                # 일반 사용자 모드에서는 절대 표시하지 않음
-                developer_mode_debug = st.session_state.get('developer_mode', False)
-                if developer_mode_debug:
-                    # 개발자 모드일 때만 디버깅 정보 표시
-                    yield f"🔍 **{rag_status}**\n\n"
-                    if relevant_docs:
-                        yield f"📚 **검색된 문서 미리보기:**\n"
-                        for i, doc in enumerate(relevant_docs, 1):
-                            preview = doc.page_content[:100].replace('\n', ' ')
-                            source = doc.metadata.get('url', doc.metadata.get('source', 'unknown'))
-                            yield f"{i}. [{source}] {preview}...\n"
-                        yield "\n---\n\n"
-                # 일반 사용자 모드일 때는 아무것도 표시하지 않고 바로 LLM 응답으로 넘어감
-                
-                # 시스템 프롬프트 구성
-                system_message = """당신은 면접 준비를 도와주는 전문 챗봇입니다. 
-사용자의 요청에 따라 맞춤형 면접 질문을 생성해주세요.
-
-**중요: 대화 맥락 이해**
-- 이전 대화 내용을 반드시 참고하여 답변하세요
-- 사용자가 "1번", "2번", "그 질문", "위 질문" 등으로 참조할 때는 이전에 생성한 질문을 의미합니다
-- 사용자가 "그것", "이것", "그건" 등으로 참조할 때는 이전 대화에서 언급된 내용을 의미합니다
-- 대화 히스토리를 꼼꼼히 확인하여 사용자의 의도를 정확히 파악하세요
-
-**참고 자료 활용 (가장 중요)**
-- 참고 자료가 제공된 경우, 반드시 참고 자료의 내용을 우선적으로 사용하세요
-- 참고 자료에 포함된 구체적인 정보, 용어, 기술 스택, 회사 특성 등을 정확히 반영하여 질문을 생성하세요
-- 참고 자료의 내용이 일반적인 지식과 다를 경우, 참고 자료의 내용을 기준으로 질문하세요
-- 참고 자료에 특정 회사명, 서비스명, 기술명이 나오면 그것을 반드시 포함하여 질문하세요
-- 참고 자료의 세부 내용(예: 특정 알고리즘, 아키텍처, 경험 사례)을 그대로 반영하세요
-
-다음 정보를 참고하여 답변하세요:
-- 회사명, 직무, 기술 스택이 언급되면 그것을 반영한 질문 생성
-- 질문 개수가 명시되지 않으면 5개 정도 생성
-- 기술 질문, 행동 질문, 상황 질문 등 다양한 유형 제공
-- 실제 면접에서 나올 수 있는 수준의 질문 생성
-- 이전에 생성한 질문에 대한 후속 질문(답변 예시, 설명 등)도 제공하세요
-
-**절대 하지 말아야 할 것:**
-- 참고 자료, RAG 검색, 벡터 검색, 문서 검색 등 기술적 정보를 답변에 포함하지 마세요
-- 검색된 문서의 출처나 URL을 답변에 표시하지 마세요
-- "참고 자료를 기반으로", "검색 결과", "벡터 RAG", "VECTOR 검색" 등의 표현을 사용하지 마세요
-- 참고 자료의 내용을 자연스럽게 활용하되, 기술적 용어는 언급하지 마세요
-
-답변은 친근하고 도움이 되는 톤으로 작성해주세요."""
-                
-                # 메시지 히스토리 구성 (시스템 메시지 + 대화 히스토리)
-                history = []
-                
-                # 시스템 메시지 추가 (참고 자료 포함)
-                if context:
-                    system_content = f"""{system_message}
-
-[참고 자료]
-{context[:1000]}"""  # 참고 자료도 길이 제한
-                else:
-                    system_content = f"""{system_message}
-
-[참고 자료]
-참고 자료가 없습니다. 일반적인 면접 질문을 생성해주세요."""
-                
-                # 대화 히스토리 추가 (최근 4개 메시지만 - 토큰 절약 & Throttling 방지)
-                # 초기 환영 메시지 제외: 첫 번째 메시지가 assistant이고 실제 대화가 없는 경우
-                all_messages = st.session_state.question_messages
-                
-                # 실제 대화 메시지만 필터링 (초기 환영 메시지 제외)
-                # 첫 번째 메시지가 assistant인 경우 제외
-                actual_conversation = []
-                if len(all_messages) > 1:
-                    # 첫 번째 메시지가 assistant인 경우 제외하고 나머지만
-                    actual_conversation = all_messages[1:]  # 초기 환영 메시지 제외
-                elif len(all_messages) == 1 and all_messages[0]["role"] == "user":
-                    # 첫 메시지가 user인 경우 (초기 메시지 없음)
-                    actual_conversation = all_messages
-                
-                # 현재 질문(user_prompt)은 히스토리에 포함하지 않음
-                # 마지막 메시지가 user이고 현재 질문과 같으면 제외
-                if actual_conversation and actual_conversation[-1]["role"] == "user":
-                    # 마지막 user 메시지가 현재 질문이므로 제외
-                    actual_conversation = actual_conversation[:-1]
-                
-                # 최근 4개만 선택 (실제 대화 메시지 중, 현재 질문 제외)
-                recent_messages = actual_conversation[-4:] if len(actual_conversation) > 0 else []
-                
-                history_count = 0
-                for msg in recent_messages:
-                    if msg["role"] in ["user", "assistant"]:
-                        # 메시지 내용 길이 제한 완화 (500자 → 1500자) - Multi-turn을 위해 더 많은 컨텍스트 필요
-                        content = msg["content"][:1500] if len(msg["content"]) > 1500 else msg["content"]
-                        history.append({
-                            "role": msg["role"],
-                            "content": [{"type": "text", "text": content}]
-                        })
-                        history_count += 1
-                
-                # 시스템 메시지를 히스토리 앞에 추가 (컨텍스트를 먼저 제공)
-                history.insert(0, {
-                    "role": "user",
-                    "content": [{"type": "text", "text": system_content}]
-                })
-                
-                # 현재 사용자 메시지 추가
-                history.append({
-                    "role": "user",
-                    "content": [{"type": "text", "text": user_prompt}]
-                })
-                
-                # 디버깅 정보 (개발자 모드에서만 표시)
-                developer_mode_debug = st.session_state.get('developer_mode', False)
-                if developer_mode_debug:
-                    yield f"\n🔧 **디버깅 정보:**\n"
-                    yield f"- 전체 대화 메시지 수: {len(st.session_state.question_messages)}개\n"
-                    yield f"- 히스토리에 포함된 메시지: {history_count}개 (최근 4개 중)\n"
-                    yield f"- LLM에 전달될 총 메시지 수: {len(history)}개\n"
-                    yield f"\n---\n\n"
-                
-                body = json.dumps({
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": 1500,  # 토큰 수 감소 (2000 → 1500)
-                    "messages": history,
-                })
-                
-                # 스트리밍 응답 (성공 시 yield하고 return으로 종료)
-                response = bedrock_runtime.invoke_model_with_response_stream(
-                    modelId=settings.bedrock_model_id,
-                    body=body,
-                )
-                
-                stream = response.get("body")
-                if stream:
-                    for event in stream:
-                        chunk = event.get("chunk")
-                        if chunk:
-                            chunk_json = json.loads(chunk.get("bytes").decode())
-                            text = chunk_handler(chunk_json)
-                            if text:
-                                yield text
-                
-                # 성공적으로 완료되면 함수 종료
-                return
-                                
-            except Exception as e:
-                error_str = str(e)
-                developer_mode_debug = st.session_state.get('developer_mode', False)
-                
-                # ThrottlingException인 경우 재시도
-                if "ThrottlingException" in error_str or "Too many requests" in error_str or "throttl" in error_str.lower():
-                    if attempt < max_retries - 1:
-                        # 지수 백오프: 5초, 10초, 20초, 40초, 80초
-                        delay = base_delay * (2 ** attempt)
-                        # 개발자 모드일 때만 재시도 메시지 표시
-                        if developer_mode_debug:
-                            yield f"\n\n⏳ 요청이 많아 {delay}초 대기 후 재시도합니다... (시도 {attempt + 1}/{max_retries})\n\n"
-                        # 일반 사용자 모드에서는 조용히 재시도 (메시지 없음)
-                        time.sleep(delay)
-                        continue
-                    else:
-                        # 개발자 모드일 때만 상세 오류 표시
-                        if developer_mode_debug:
-                            yield f"\n\n❌ 오류: 서버가 과부하 상태입니다. 5분 정도 기다린 후 다시 시도해주세요.\n\n"
-                        else:
-                            yield f"\n\n⏳ 응답을 생성하는 중입니다. 잠시만 기다려주세요...\n\n"
-                        return
-                else:
-                    # 다른 오류는 즉시 반환
-                    # 개발자 모드일 때만 상세 오류 표시
-                    if developer_mode_debug:
-                        yield f"\n\n❌ 오류 발생: {str(e)}\n\n"
-                    else:
-                        yield f"\n\n⏳ 응답 생성 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.\n\n"
-                    return
+                    yield loop.run_until_complete(events.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(events.aclose())
+            loop.close()
+    
+    def get_streaming_response_with_rag(user_prompt):
+        """RAG를 사용한 스트리밍 응답 생성 (Rate Limiting & Retry는 QuestionService에서 처리)"""
+        developer_mode_debug = st.session_state.get('developer_mode', False)
+        # 디버깅 정보를 뺀 실제 답변 (대화 메모리/면접 기록 저장용)
+        st.session_state.last_answer = ""
+        try:
+            for event in iterate_question_events(user_prompt):
+                if event.get("type") == "text":
+                    st.session_state.last_answer += event["text"]
+                text = render_question_event(event, developer_mode_debug)
+                if text:
+                    yield text
+        except Exception as e:
+            yield render_question_event({"type": "error", "message": str(e), "throttled": False}, developer_mode_debug)
     
     # 사용자 입력
     if prompt := st.chat_input("면접 질문에 대해 물어보세요..."):
@@ -1084,9 +945,36 @@ elif page == "❓ 질문 생성":
         # AI 응답 생성 (스트리밍)
         with st.chat_message("assistant"):
             model_output = st.write_stream(get_streaming_response_with_rag(prompt))
+            
+            # 프롬프트 캐시 효과 확인 (개발자 모드에서만 표시)
+            last_usage = st.session_state.get("last_prompt_usage")
+            if st.session_state.get('developer_mode', False) and last_usage:
+                st.caption(
+                    f"🧾 입력 토큰: 캐시 읽기 {last_usage['cache_read_input_tokens']} / "
+                    f"캐시 쓰기 {last_usage['cache_creation_input_tokens']} / "
+                    f"캐시 미사용 {last_usage['input_tokens']} · 출력 토큰 {last_usage['output_tokens']}"
+                )
         
         # 보조 응답 세션 상태에 추가
         st.session_state.question_messages.append({"role": "assistant", "content": model_output})
+        
+        # 대화 메모리에 추가 (필요하면 오래된 대화 요약이 백그라운드에서 시작됨)
+        answer = st.session_state.get("last_answer", "")
+        if answer:
+            st.session_state.question_memory.add_user_message(prompt)
+            st.session_state.question_memory.add_ai_message(answer)
+        
+        # 면접 기록 저장 (백그라운드에서 모아서 저장하므로 응답 지연 없음, API 모드에서는 서버가 저장)
+        if settings.history_enabled and answer and api_client is None:
+            try:
+                from app.services.history_store import get_history_store
+                history_store = get_history_store()
+                user_id = st.session_state.get('user_id') or "guest"
+                history_store.append(user_id, st.session_state.question_session_id, "user", prompt)
+                history_store.append(user_id, st.session_state.question_session_id, "assistant", answer)
+            except Exception as e:
+                if st.session_state.get('developer_mode', False):
+                    st.warning(f"면접 기록 저장 실패: {str(e)}")
     
     # 사이드바에 RAG 문서 관리 추가 (개발자 모드에서만 표시)
     developer_mode_rag = st.session_state.get('developer_mode', False)
@@ -1165,10 +1053,12 @@ elif page == "❓ 질문 생성":
             )
         
             if add_mode == "크롤링 데이터":
-                if "crawled_data" in st.session_state and st.session_state.crawled_data:
+                # 자동 RAG 저장한 일괄 크롤링 결과는 미리보기만 있으므로(이미 벡터 DB에 있음) 전체 본문이 있는 항목만 선택 가능
+                crawled_items = [item for item in st.session_state.get("crawled_data", []) if item.get("content")]
+                if crawled_items:
                     selected_urls = st.multiselect(
                         "선택",
-                        options=[item["url"] for item in st.session_state.crawled_data],
+                        options=[item["url"] for item in crawled_items],
                         format_func=lambda x: x[:50] + "..." if len(x) > 50 else x,
                         key="rag_crawler_select"
                     )
@@ -1193,14 +1083,22 @@ elif page == "❓ 질문 생성":
                                                     continue
                                                 
                                                 # RAG에 추가
-                                                doc_id = loop.run_until_complete(
-                                                    rag_service.add_document(
+                                                # 이미 저장한 URL이면 바뀐 청크만 임베딩하고 사라진 청크는 삭제
+                                                update = loop.run_until_complete(
+                                                    rag_service.update_document(
                                                         content,
                                                         {"source": "crawler", "url": url}
                                                     )
                                                 )
+                                                from app.services.source_catalog import track_crawled_document
+                                                track_crawled_document(
+                                                    url,
+                                                    content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(),
+                                                    doc_id=update["doc_id"],
+                                                    changed=update["added"] + update["removed"] > 0
+                                                )
                                                 added_count += 1
-                                                st.info(f"✅ {url[:50]}... 추가됨 (ID: {doc_id[:8]}...)")
+                                                st.info(f"✅ {url[:50]}... 추가됨 (ID: {update['doc_id'][:8]}...)")
                                                 break
                                     except Exception as e:
                                         errors.append(f"{url}: {str(e)}")
@@ -1227,12 +1125,23 @@ elif page == "❓ 질문 생성":
                     if st.button("📥 PDF 텍스트 RAG에 추가", key="rag_add_pdf"):
                         with st.spinner("추가 중..."):
                             try:
+                                # 같은 PDF를 이전에 분할했다면 캐시된 청크 재사용
+                                pdf_cache_key = st.session_state.get("pdf_cache_key")
+                                pdf_chunks = None
+                                if pdf_cache_key:
+                                    pdf_service = PDFService()
+                                    pdf_chunks = pdf_service.get_cached_chunks(pdf_cache_key, rag_service.chunker_key)
+                                    if pdf_chunks is None:
+                                        pdf_chunks = rag_service.split_document(st.session_state.pdf_text, {"source": "pdf"})
+                                        pdf_service.cache_chunks(pdf_cache_key, rag_service.chunker_key, pdf_chunks)
+                                
                                 loop = asyncio.new_event_loop()
                                 asyncio.set_event_loop(loop)
                                 loop.run_until_complete(
                                     rag_service.add_document(
                                         st.session_state.pdf_text,
-                                        {"source": "pdf", "filename": st.session_state.get("pdf_filename", "unknown")}
+                                        {"source": "pdf", "filename": st.session_state.get("pdf_filename", "unknown")},
+                                        chunks=pdf_chunks
                                     )
                                 )
                                 loop.close()
@@ -1278,19 +1187,16 @@ elif page == "❓ 질문 생성":
             
             # 최근 대화 히스토리 확인 (LLM에 전달되는 메시지)
             with st.expander("📋 최근 대화 히스토리 (LLM에 전달)", expanded=False):
-                # 실제 대화 메시지만 필터링 (초기 환영 메시지 제외)
-                all_messages = st.session_state.question_messages
-                if len(all_messages) > 1:
-                    # 첫 번째 메시지가 assistant인 경우 제외
-                    actual_conversation = all_messages[1:]
-                elif len(all_messages) == 1 and all_messages[0]["role"] == "user":
-                    actual_conversation = all_messages
-                else:
-                    actual_conversation = []
+                question_memory = st.session_state.question_memory
+                if question_memory.summary:
+                    st.info("📝 이전 대화 요약이 함께 포함됩니다:")
+                    st.write(question_memory.summary)
+                if question_memory.is_summarizing:
+                    st.caption("⏳ 오래된 대화를 백그라운드에서 요약하는 중입니다.")
                 
-                recent_for_llm = actual_conversation[-4:] if len(actual_conversation) > 0 else []
+                recent_for_llm = question_memory.history()
                 if recent_for_llm:
-                    st.info(f"💡 최근 {len(recent_for_llm)}개 메시지가 다음 질문에 포함됩니다:")
+                    st.info(f"💡 최근 {len(recent_for_llm)}개 메시지가 토큰 예산 안에서 다음 질문에 포함됩니다:")
                     for i, msg in enumerate(recent_for_llm, 1):
                         role_emoji = "👤" if msg["role"] == "user" else "🤖"
                         content_preview = msg["content"][:100] + "..." if len(msg["content"]) > 100 else msg["content"]
@@ -1322,5 +1228,156 @@ elif page == "❓ 질문 생성":
                         "content": "대화가 초기화되었습니다. 새로운 질문을 해주세요! 🎯"
                     }
                 ]
+                st.session_state.pop("question_memory", None)
+                st.session_state.pop("question_session_id", None)
                 st.rerun()
 
+elif page == "📜 면접 기록":
+    st.header("📜 면접 기록")
+    st.markdown("이전에 나눈 면접 질문 대화를 다시 보거나 이어서 진행할 수 있습니다.")
+    
+    if not settings.history_enabled:
+        st.info("면접 기록 저장이 꺼져 있습니다. (HISTORY_ENABLED)")
+    else:
+        from datetime import datetime
+        from app.services.history_store import get_history_store
+        
+        history_store = get_history_store()
+        user_id = st.session_state.get('user_id') or "guest"
+        page_size = settings.history_page_size
+        
+        # 방금 나눈 대화도 목록에 보이도록 대기 중인 메시지 저장
+        history_store.flush()
+        
+        # 세션 목록 (커서 기반 페이지, "더 보기"로 이전 세션 추가)
+        if st.session_state.get("history_user_id") != user_id:
+            st.session_state.history_user_id = user_id
+            st.session_state.history_cursors = [None]
+            st.session_state.pop("history_selected_session", None)
+        
+        sessions = []
+        next_cursor = None
+        for cursor in st.session_state.history_cursors:
+            page_sessions, next_cursor = history_store.list_sessions(user_id, limit=page_size, before=cursor)
+            sessions.extend(page_sessions)
+        
+        if not sessions:
+            st.info(f"'{user_id}' 이름으로 저장된 면접 기록이 없습니다. 질문 생성 페이지에서 대화를 시작해보세요!")
+        else:
+            def format_session(session):
+                last_at = datetime.fromtimestamp(session["last_at"]).strftime("%Y-%m-%d %H:%M")
+                return f"{last_at} · {session['message_count']}개 메시지 · {session['preview'][:40]}"
+            
+            session_ids = [session["session_id"] for session in sessions]
+            session_by_id = {session["session_id"]: session for session in sessions}
+            selected_session_id = st.radio(
+                "대화 선택",
+                session_ids,
+                format_func=lambda session_id: format_session(session_by_id[session_id]),
+                key="history_selected_session"
+            )
+            
+            if next_cursor is not None and st.button("⬇️ 이전 기록 더 보기"):
+                st.session_state.history_cursors.append(next_cursor)
+                st.rerun()
+            
+            st.markdown("---")
+            
+            # 선택한 세션 메시지 (최근 메시지부터 페이지 단위로 불러옴)
+            message_pages_key = f"history_message_cursors_{selected_session_id}"
+            if message_pages_key not in st.session_state:
+                st.session_state[message_pages_key] = [None]
+            
+            messages = []
+            older_cursor = None
+            for cursor in st.session_state[message_pages_key]:
+                page_messages, older_cursor = history_store.get_messages(
+                    user_id, selected_session_id, limit=page_size * 2, before=cursor
+                )
+                messages = page_messages + messages
+            
+            if older_cursor is not None and st.button("⬆️ 이전 메시지 더 보기"):
+                st.session_state[message_pages_key].append(older_cursor)
+                st.rerun()
+            
+            for message in messages:
+                with st.chat_message(message["role"]):
+                    st.markdown(message["content"])
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("▶️ 이 대화 이어서 하기", type="primary"):
+                    # 전체 대화를 불러와 질문 생성 페이지 세션으로 설정
+                    all_messages = []
+                    cursor = None
+                    while True:
+                        page_messages, cursor = history_store.get_messages(
+                            user_id, selected_session_id, limit=200, before=cursor
+                        )
+                        all_messages = page_messages + all_messages
+                        if cursor is None:
+                            break
+                    
+                    st.session_state.question_session_id = selected_session_id
+                    st.session_state.question_messages = [
+                        {"role": "assistant", "content": "이전 대화를 불러왔습니다. 이어서 질문해주세요! 🎯"}
+                    ] + [{"role": message["role"], "content": message["content"]} for message in all_messages]
+                    st.session_state.pop("question_memory", None)
+                    st.success("✅ 대화를 불러왔습니다. '❓ 질문 생성' 페이지에서 이어서 진행하세요.")
+            with col2:
+                if st.button("🗑️ 이 기록 삭제", type="secondary"):
+                    history_store.delete_session(user_id, selected_session_id)
+                    st.session_state.pop("history_selected_session", None)
+                    st.session_state.pop(message_pages_key, None)
+                    st.rerun()
+
+# 단계별 지연 시간 패널 (개발자 모드, 이번 실행에서 처리한 요청까지 반영되도록 페이지 렌더링 후 표시)
+if st.session_state.get('developer_mode', False):
+    with st.sidebar:
+        st.markdown("---")
+        st.subheader("⏱️ 단계별 지연 시간 (개발자)")
+        
+        from app.services.api_client import get_api_client
+        from app.services.metrics import metrics
+        
+        metrics_client = get_api_client()
+        try:
+            # API 모드면 요청을 처리한 서버 워커의 지표, 아니면 이 Streamlit 프로세스의 지표
+            snapshot = metrics_client.get_metrics() if metrics_client else metrics.snapshot()
+        except Exception as e:
+            snapshot = None
+            st.warning(f"지표를 불러오지 못했습니다: {str(e)}")
+        
+        if snapshot and snapshot["stages"]:
+            st.dataframe(
+                [
+                    {
+                        "단계": stage["label"],
+                        "횟수": stage["count"],
+                        "최근(ms)": round(stage["last"] * 1000, 1),
+                        "p50(ms)": round(stage["p50"] * 1000, 1),
+                        "p95(ms)": round(stage["p95"] * 1000, 1),
+                        "합계(s)": round(stage["total"], 2)
+                    }
+                    for stage in snapshot["stages"].values()
+                ],
+                hide_index=True,
+                use_container_width=True
+            )
+            for counter in snapshot["counters"]:
+                labels = ", ".join(f"{key}={value}" for key, value in counter["labels"].items())
+                st.caption(f"🔁 {counter['name']} ({labels}): {counter['value']:g}")
+            
+            with st.expander("🧭 최근 구간 기록", expanded=False):
+                # 요청 ID로 동시에 처리된 요청의 구간을 구분 (요청 밖의 구간은 "-")
+                st.text("\n".join(
+                    f"{span['seconds'] * 1000:9.1f} ms  {span.get('request_id') or '-':8}  {span['stage']}"
+                    + "".join(f" {key}={value}" for key, value in span.get("labels", {}).items())
+                    for span in snapshot["recent"][:40]
+                ))
+            
+            if metrics_client is None and st.button("🧹 지표 초기화", use_container_width=True):
+                metrics.reset()
+                st.rerun()
+        elif snapshot is not None:
+            st.caption("아직 기록된 지표가 없습니다. 질문을 생성하면 단계별 시간이 표시됩니다.")
@@ -12,17 +12,37 @@ class Settings(BaseSettings):
     aws_region: str = "us-east-1"  # Bedrock 사용 가능한 리전
     aws_access_key_id: str = ""  # 선택사항 (환경변수나 IAM 역할 사용 가능)
     aws_secret_access_key: str = ""  # 선택사항
+    # Bedrock 엔드포인트 (비어 있으면 AWS 기본값, 부하 테스트용 가짜 서버: "http://localhost:8900")
+    bedrock_endpoint_url: str = ""
+    bedrock_client_max_attempts: int = 0  # botocore 자체 재시도를 포함한 최대 시도 횟수 (0이면 botocore 기본값)
+    bedrock_retry_delay_scale: float = 1.0  # 요청 제한 재시도 대기 시간 배율 (벤치마크에서 줄여 빠르게 재현)
     
     # Database
     database_url: str = "sqlite:///./interview_coach.db"
     
     # ChromaDB
     chroma_persist_directory: str = "./chroma_db"
+    chroma_write_batch_size: int = 5000  # 한 번에 upsert할 최대 청크 수 (Chroma 클라이언트 한도를 넘으면 한도 사용)
+    # 컬렉션 이름 접두사 (소스 유형/회사별 파티션: {접두사}__{source}__{company})
+    chroma_collection_prefix: str = "interview"
+    # 파티션 목록을 다시 읽는 주기 (초, 다른 워커/작업자 프로세스가 만든 파티션 반영)
+    collection_refresh_seconds: float = 5.0
+    
+    # 벡터 저장소 백엔드 ("chroma" | "quantized": int8/이진 양자화 로컬 인덱스)
+    vector_backend: str = "chroma"
+    quantized_index_directory: str = "./vector_index"
+    quantized_vector_type: str = "int8"  # "int8" (차원당 1바이트) | "binary" (차원당 1비트)
+    quantized_rescore_factor: int = 8  # 결과 수 × 배수만큼 후보를 골라 float32 원본으로 정확히 재정렬
     
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
     
+    # API 서버 주소 (설정하면 Streamlit이 FastAPI 백엔드를 호출하는 얇은 클라이언트로 동작)
+    # 예: "http://localhost:8000" (비어 있으면 Streamlit 프로세스 안에서 직접 처리)
+    api_base_url: str = ""
+    api_timeout: float = 300.0  # 스트리밍 응답 포함 요청 타임아웃 (초)
+    
     # CORS
     cors_origins: List[str] = ["http://localhost:3000", "http://localhost:5173"]
     
@@ -34,9 +54,108 @@ class Settings(BaseSettings):
     # Titan Embeddings (최신 버전)
     embedding_model: str = "amazon.titan-embed-text-v2:0"
     # 또는 구버전: "amazon.titan-embed-text-v1"
+    # Titan v2 출력 차원 (256 | 512 | 1024) / 단위 벡터 정규화
+    # 기본값(1024, 정규화)이 아니면 별도 컬렉션({접두사}_d512 등)에 저장해 기존 벡터와 나란히 둠
+    embedding_dimensions: int = 1024
+    embedding_normalize: bool = True
+    # 임베딩 제공자: "bedrock"(Titan) | "local"(로컬 CPU sentence-transformers, 네트워크 없이 동작)
+    # local은 벡터 차원이 다르므로 모델별 별도 컬렉션({접두사}_st<모델 해시>)에 저장
+    embedding_provider: str = "bedrock"
+    local_embedding_model: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"  # 한국어 지원 다국어 모델 (384차원)
+    local_embedding_backend: str = "torch"  # "onnx"이면 optimum + onnxruntime 사용
+    local_embedding_batch_size: int = 32
+    local_embedding_threads: int = 0  # CPU 스레드 수 (0이면 라이브러리 기본값)
+    local_embedding_normalize: bool = True
+    local_embedding_onnx_directory: str = "./embedding_onnx"
     temperature: float = 0.7
     max_tokens: int = 4096
     
+    # PDF 텍스트 추출
+    # 기본은 빠른 PyPDF2, 비었거나 깨진 페이지만 pdfplumber로 다시 추출
+    pdf_extraction_backend: str = "pypdf2"
+    pdf_fallback_backend: str = "pdfplumber"  # 빈 문자열이면 폴백 사용 안 함
+    # 추출 결과 캐시 (파일 sha256 + 추출기 버전 기준)
+    pdf_cache_directory: str = "./pdf_cache"
+    
+    # RAG 청크 분할 (토큰 기준, 섹션/헤딩 경계 보존)
+    chunk_max_tokens: int = 600
+    chunk_min_tokens: int = 150  # 이보다 작은 섹션은 이웃 섹션과 합침
+    chunk_overlap_tokens: int = 60  # 문장 중간에서 잘린 경우에만 적용
+    
+    # 검색 결과 재정렬 (로컬 CPU cross-encoder, sentence-transformers 필요)
+    reranker_enabled: bool = False
+    reranker_model: str = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"  # 한국어 지원 다국어 모델
+    reranker_candidates: int = 30  # 재정렬할 후보 수 (이 중 상위 k개 반환)
+    reranker_batch_size: int = 16
+    reranker_max_length: int = 512
+    reranker_cache_size: int = 10000  # (질문, 청크 ID)별 점수 캐시 항목 수
+    reranker_backend: str = "torch"  # "onnx"이면 optimum + onnxruntime 사용
+    reranker_quantize: bool = False  # onnx 백엔드에서 int8 동적 양자화 모델 사용
+    reranker_onnx_directory: str = "./reranker_onnx"
+    
+    # 검색 방식: "similarity"(유사도 순) 또는 "mmr"(관련도 + 다양성, 중복 청크 감소)
+    retrieval_mode: str = "similarity"
+    mmr_fetch_k: int = 40  # mmr 선택 전에 가져올 후보 수
+    mmr_lambda: float = 0.5  # 1에 가까울수록 관련도, 0에 가까울수록 다양성 우선
+    context_token_budget: int = 1500  # 참고 자료 토큰 예산 (mmr 검색, 프롬프트 조립 공용)
+    
+    # 프롬프트 토큰 예산 (시스템 프롬프트/현재 질문 > 참고 자료 > 대화 히스토리 순으로 배분)
+    prompt_max_input_tokens: int = 8000
+    prompt_history_tokens: int = 2000  # 참고 자료가 남긴 예산은 히스토리가 추가로 사용
+    # Bedrock 프롬프트 캐싱 (지원 모델에서만 적용, 고정 시스템 프롬프트와 이전 대화를 캐시)
+    prompt_cache_enabled: bool = True
+    
+    # 대화 메모리 (오래된 대화는 백그라운드에서 요약하여 프롬프트 크기를 일정하게 유지)
+    memory_recent_tokens: int = 1500  # 요약하지 않고 원문으로 유지할 최근 대화 토큰
+    memory_summary_trigger_tokens: int = 3000  # 원문 대화가 이보다 커지면 오래된 부분을 요약
+    memory_summary_max_tokens: int = 500
+    memory_summary_model_id: str = "anthropic.claude-3-haiku-20240307-v1:0"  # 요약용 저비용 모델
+    memory_summary_workers: int = 2
+    memory_max_messages: int = 100  # 요약이 실패할 때도 유지할 원문 메시지 상한
+    
+    # 세션 저장소 (RAGService 세션별 대화 메모리, 오래 쓰지 않은 세션부터 제거)
+    session_max_sessions: int = 1000
+    session_idle_ttl_seconds: float = 3600  # 이 시간 동안 쓰지 않은 세션 제거
+    session_max_memory_mb: int = 200  # 보관 중인 대화 텍스트 합계 상한
+    session_spill_enabled: bool = False  # 제거된 세션을 database_url(SQLite)에 저장했다가 복원
+    
+    # 면접 대화 히스토리 저장 (database_url, 백그라운드에서 모아서 저장)
+    history_enabled: bool = True
+    history_batch_size: int = 50  # 한 트랜잭션에 저장할 최대 메시지 수
+    history_flush_interval: float = 0.5  # 메시지를 모으는 최대 대기 시간 (초)
+    history_page_size: int = 20  # 히스토리 화면 페이지 크기
+    
+    # 백그라운드 수집 작업 큐 (database_url에 저장, 프로세스별 작업자 스레드)
+    job_workers: int = 4
+    job_crawl_concurrency: int = 3  # 동시에 크롤링할 URL 수
+    job_embed_concurrency: int = 1  # 동시에 임베딩/저장할 문서 수 (Bedrock Throttling 방지)
+    job_max_attempts: int = 3
+    job_retry_base_delay: float = 5.0  # 재시도 대기 (초, 시도마다 2배)
+    job_lease_seconds: float = 600  # 작업자가 이 시간 동안 lease를 연장하지 못하면(프로세스 종료 등) 중단된 작업으로 보고 다시 실행
+    job_poll_interval: float = 1.0
+    
+    # 대량 수집 파이프라인 (내려받기 → 정리/분할 → 임베딩 → 저장 단계 동시 실행)
+    pipeline_fetch_workers: int = 8  # 내려받기 스레드 수 (네트워크 I/O)
+    pipeline_clean_workers: int = 2  # HTML 정리/청크 분할 프로세스 수 (0이면 스레드에서 실행)
+    pipeline_embed_workers: int = 2  # 임베딩 스레드 수
+    pipeline_embed_min_interval: float = 0.05  # 임베딩 요청 최소 간격 (초)
+    pipeline_queue_size: int = 32  # 단계 사이 큐 최대 크기 (메모리 상한)
+    pipeline_upsert_batch_size: int = 256  # 한 번에 저장할 최대 청크 수
+    
+    # 출처 최신성 재크롤링 (수집한 URL을 조건부 요청으로 주기적으로 확인, 바뀐 청크만 재색인)
+    freshness_enabled: bool = True
+    freshness_initial_interval_hours: float = 24  # 처음 수집한 URL의 재확인 주기
+    freshness_min_interval_hours: float = 6  # 자주 바뀌는 페이지의 최소 주기
+    freshness_max_interval_hours: float = 24 * 14  # 바뀌지 않는 페이지의 최대 주기
+    freshness_check_interval: float = 300  # 확인할 URL을 찾는 주기 (초)
+    freshness_batch_size: int = 20  # 한 번에 등록할 최대 확인 작업 수
+    freshness_concurrency: int = 1  # 동시에 확인할 URL 수
+    
+    # 단계별 지연 시간 지표 (Rate Limiter 대기, 임베딩, 벡터 검색, Bedrock 첫 토큰 등, 워커별 집계)
+    # FastAPI /metrics(Prometheus 형식)와 Streamlit 개발자 모드 패널에서 확인
+    metrics_enabled: bool = True
+    metrics_recent_spans: int = 200  # 개발자 패널에 표시할 최근 구간 기록 수
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
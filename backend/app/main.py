@@ -0,0 +1,387 @@
+"""
+FastAPI 백엔드 (RAG 검색/생성, SSE 스트리밍, 백그라운드 문서 수집)
+
+실행:
+    uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers 4
+
+각 워커는 서비스 인스턴스를 하나씩 만들어 요청 간에 재사용하고,
+Streamlit(app.py)은 settings.api_base_url이 설정되면 이 API를 호출하는 얇은 클라이언트로 동작합니다.
+"""
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Dict, List
+from fastapi import FastAPI, File, HTTPException, Request, UploadFile
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from app.config import settings
+from app.schemas import (
+    BatchStatus, ChatRequest, GenerateRequest, IngestUrlsRequest, JobStatus, QuestionRequest, SearchRequest, SearchResult
+)
+from app.services.bedrock_service import BedrockService
+from app.services.ingest_jobs import (
+    enqueue_document, enqueue_pipeline, enqueue_urls, get_crawl_content, get_ingest_queue
+)
+from app.services.metrics import metrics
+from app.services.pdf_service import PDFService
+from app.services.prompt_builder import empty_usage
+from app.services.question_service import QuestionService
+from app.services.rag_service import RAGService
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """워커 시작 시 서비스 초기화 (Bedrock 클라이언트, Chroma 연결을 요청마다 만들지 않음)"""
+    app.state.rag_service = RAGService()
+    app.state.bedrock_service = BedrockService()
+    app.state.pdf_service = PDFService()
+    app.state.question_service = QuestionService(app.state.rag_service)
+    get_ingest_queue()  # 수집 작업자 시작 (작업 상태는 DB에 있어 모든 워커가 공유)
+    yield
+
+
+app = FastAPI(title="면접 준비 도우미 API", lifespan=lifespan)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=settings.cors_origins,
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"]
+)
+
+
+def _sse(event: str, data: Dict) -> str:
+    """Server-Sent Events 메시지 형식으로 변환"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _event_stream(generator: AsyncGenerator[str, None]) -> StreamingResponse:
+    return StreamingResponse(
+        generator,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/health")
+async def health():
+    """헬스 체크 (로드 밸런서용)"""
+    return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """단계별 지연 시간 지표 (Prometheus 텍스트 형식, 이 워커 기준)"""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/metrics")
+async def metrics_snapshot():
+    """단계별 지연 시간 요약 (개발자 모드 패널용, 이 워커 기준)"""
+    return metrics.snapshot()
+
+
+# ----------------------------------------------------------------------------
+# Bedrock
+# ----------------------------------------------------------------------------
+
+@app.get("/api/bedrock/test")
+async def test_bedrock(request: Request):
+    """Bedrock 연결 테스트"""
+    return await request.app.state.bedrock_service.test_connection()
+
+
+@app.post("/api/chat")
+async def chat(payload: ChatRequest, request: Request):
+    """일반 채팅 (스트리밍 없음)"""
+    try:
+        response = await request.app.state.bedrock_service.chat(payload.message)
+        return {"response": response}
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+
+@app.post("/api/chat/stream")
+async def stream_chat(payload: ChatRequest, request: Request):
+    """일반 채팅 스트리밍 (SSE: text 이벤트 반복 후 done)"""
+    bedrock_service = request.app.state.bedrock_service
+    
+    async def generate():
+        try:
+            async for chunk in bedrock_service.stream_chat(payload.message):
+                if chunk:
+                    yield _sse("text", {"text": chunk})
+            yield _sse("done", {})
+        except Exception as e:
+            yield _sse("error", {"message": str(e)})
+    
+    return _event_stream(generate())
+
+
+# ----------------------------------------------------------------------------
+# RAG
+# ----------------------------------------------------------------------------
+
+@app.post("/api/rag/search", response_model=List[SearchResult])
+async def search_documents(payload: SearchRequest, request: Request):
+    """문서 검색"""
+    try:
+        documents = await request.app.state.rag_service.search_documents(
+            payload.query,
+            k=payload.k,
+            source_types=payload.source_types,
+            companies=payload.companies,
+            rerank=payload.rerank,
+            mode=payload.mode,
+            token_budget=payload.token_budget
+        )
+        return [SearchResult(content=doc.page_content, metadata=doc.metadata) for doc in documents]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/rag/generate")
+async def generate_with_rag(payload: GenerateRequest, request: Request):
+    """RAG 답변 생성 (스트리밍 없음)"""
+    rag_service = request.app.state.rag_service
+    usage = empty_usage()
+    try:
+        answer = await rag_service.generate_with_rag(
+            payload.question,
+            context=payload.context,
+            session_id=payload.session_id,
+            usage_result=usage
+        )
+        return {"answer": answer, "usage": usage}
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+
+@app.post("/api/rag/generate/stream")
+async def stream_generate_with_rag(payload: GenerateRequest, request: Request):
+    """RAG 답변 스트리밍 (SSE: text 이벤트 반복 후 done에 토큰 사용량)"""
+    rag_service = request.app.state.rag_service
+    
+    async def generate():
+        usage = empty_usage()
+        try:
+            async for chunk in rag_service.stream_generate_with_rag(
+                payload.question,
+                context=payload.context,
+                session_id=payload.session_id,
+                usage_result=usage
+            ):
+                yield _sse("text", {"text": chunk})
+            yield _sse("done", {"usage": usage})
+        except Exception as e:
+            yield _sse("error", {"message": str(e)})
+    
+    return _event_stream(generate())
+
+
+@app.get("/api/rag/documents")
+async def list_documents(request: Request):
+    """저장된 문서 목록"""
+    try:
+        return await request.app.state.rag_service.list_documents()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.delete("/api/rag/documents/{document_id}")
+async def delete_document(document_id: str, request: Request):
+    """문서 삭제"""
+    try:
+        await request.app.state.rag_service.delete_document(document_id)
+        return {"deleted": document_id}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/rag/sessions/metrics")
+async def session_metrics(request: Request):
+    """세션 메모리 저장소 지표 (이 워커 기준)"""
+    return request.app.state.rag_service.memories.metrics()
+
+
+# ----------------------------------------------------------------------------
+# 면접 질문 생성
+# ----------------------------------------------------------------------------
+
+def _memory_key(user_id: str, session_id: str) -> str:
+    """워커 세션 메모리 키 (다른 사용자의 같은 세션 ID와 섞이지 않도록 사용자별로 구분)"""
+    return f"{len(user_id)}:{user_id}:{session_id}"
+
+
+# 응답 저장이 끝날 때까지 스트림 종료를 늦추는 최대 시간 (초)
+HISTORY_WRITE_TIMEOUT = 5.0
+
+
+def _sync_memory_from_history(memory, user_id: str, session_id: str):
+    """
+    요청마다 저장된 면접 기록 중 워커 메모리에 없는 메시지를 추가
+    
+    로드 밸런서 뒤에서 세션이 여러 워커를 오가면 각 워커의 메모리에는 다른 워커가 답한 대화가 없으므로,
+    메모리가 반영한 메시지 수(message_count) 이후의 기록을 가져와 이어 붙입니다.
+    (처음 보는 세션이면 전체 기록, 재시작 후에도 같은 방식으로 복원)
+    """
+    if not settings.history_enabled:
+        return
+    from app.services.history_store import get_history_store
+    
+    for message in get_history_store().get_messages_since(user_id, session_id, memory.message_count):
+        memory.add_message(message["role"], message["content"])
+
+
+@app.post("/api/questions/stream")
+async def stream_questions(payload: QuestionRequest, request: Request):
+    """
+    면접 질문 스트리밍 생성 (SSE)
+    
+    QuestionService 이벤트(retrieval, prompt, text, retry, usage, error)를 같은 이름의 SSE 이벤트로 전달하고,
+    응답이 끝나면 세션 메모리와 면접 기록에 대화를 저장합니다.
+    """
+    rag_service = request.app.state.rag_service
+    question_service = request.app.state.question_service
+    
+    memory_key = _memory_key(payload.user_id, payload.session_id)
+    memory = rag_service.memories.get(memory_key)
+    try:
+        await asyncio.to_thread(_sync_memory_from_history, memory, payload.user_id, payload.session_id)
+    except Exception:
+        # 기록을 불러오지 못해도 새 대화로 진행
+        pass
+    
+    async def generate():
+        answer = ""
+        async for event in question_service.stream(payload.question, memory, max_tokens=payload.max_tokens):
+            if event["type"] == "text":
+                answer += event["text"]
+            yield _sse(event["type"], event)
+        
+        if not answer:
+            return
+        memory.add_user_message(payload.question)
+        memory.add_ai_message(answer)
+        rag_service.memories.record_write(memory_key)
+        if settings.history_enabled:
+            try:
+                from app.services.history_store import get_history_store
+                
+                history_store = get_history_store()
+                history_store.append(payload.user_id, payload.session_id, "user", payload.question)
+                written = history_store.append(payload.user_id, payload.session_id, "assistant", answer)
+                # 다음 요청이 다른 워커로 가도 이번 대화를 읽을 수 있도록 저장될 때까지 스트림을 닫지 않음
+                await asyncio.to_thread(written.wait, HISTORY_WRITE_TIMEOUT)
+            except Exception as e:
+                yield _sse("error", {"message": f"면접 기록 저장 실패: {str(e)}", "throttled": False})
+    
+    return _event_stream(generate())
+
+
+# ----------------------------------------------------------------------------
+# 문서 수집 (백그라운드 작업)
+# ----------------------------------------------------------------------------
+
+def _job_status(job: Dict) -> JobStatus:
+    return JobStatus(
+        job_id=job["id"],
+        kind=job["kind"],
+        status=job["status"],
+        payload={key: value for key, value in job["payload"].items() if key != "content"},
+        attempts=job["attempts"],
+        max_attempts=job["max_attempts"],
+        progress=job["progress"],
+        message=job["message"] or "",
+        result=job["result"],
+        error=job["error"]
+    )
+
+
+def _batch_status(batch_id: str) -> BatchStatus:
+    status = get_ingest_queue().batch_status(batch_id)
+    return BatchStatus(
+        batch_id=batch_id,
+        jobs=[_job_status(job) for job in status["jobs"]],
+        counts=status["counts"],
+        by_kind=status["by_kind"],
+        progress=status["progress"],
+        done=status["done"]
+    )
+
+
+@app.post("/api/pdf/analyze")
+async def analyze_pdf(request: Request, file: UploadFile = File(...)):
+    """PDF 텍스트 추출 및 요약 (같은 파일은 캐시에서 바로 반환)"""
+    try:
+        file_content = await file.read()
+        return await request.app.state.pdf_service.analyze_pdf(file_content, file.filename)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/api/ingest/pdf", response_model=BatchStatus, status_code=202)
+async def ingest_pdf(request: Request, file: UploadFile = File(...)):
+    """PDF 텍스트 추출 후 RAG 추가 작업 등록 (분할/임베딩은 작업 큐에서 처리)"""
+    file_content = await file.read()
+    try:
+        analysis = await request.app.state.pdf_service.analyze_pdf(file_content, file.filename)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    batch_id = str(uuid.uuid4())
+    await asyncio.to_thread(
+        enqueue_document,
+        analysis["text"],
+        {"source": "pdf", "filename": file.filename},
+        batch_id,
+        analysis["cache_key"]
+    )
+    return await asyncio.to_thread(_batch_status, batch_id)
+
+
+@app.post("/api/ingest/urls", response_model=BatchStatus, status_code=202)
+async def ingest_urls(payload: IngestUrlsRequest):
+    """URL 크롤링(+RAG 추가) 작업 등록 (같은 batch_id로 다시 요청하면 기존 작업 반환)"""
+    if payload.pipeline:
+        batch_id = await asyncio.to_thread(enqueue_pipeline, payload.urls, payload.batch_id)
+    else:
+        batch_id = await asyncio.to_thread(enqueue_urls, payload.urls, payload.auto_rag, payload.batch_id)
+    return await asyncio.to_thread(_batch_status, batch_id)
+
+
+@app.get("/api/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """백그라운드 작업 상태 조회"""
+    job = await asyncio.to_thread(get_ingest_queue().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return _job_status(job)
+
+
+@app.get("/api/jobs/{job_id}/content")
+async def get_job_content(job_id: str):
+    """RAG 자동 추가 없이 크롤링한 작업의 전체 본문 (작업 상태에는 미리보기만 포함)"""
+    content = await asyncio.to_thread(get_crawl_content, job_id)
+    if content is None:
+        raise HTTPException(status_code=404, detail="저장된 크롤링 본문이 없습니다.")
+    return content
+
+
+@app.get("/api/batches/{batch_id}", response_model=BatchStatus)
+async def get_batch(batch_id: str):
+    """작업 묶음 진행률 조회 (작업 큐가 DB에 있어 어느 워커에서 조회해도 같음)"""
+    status = await asyncio.to_thread(_batch_status, batch_id)
+    if not status.jobs:
+        raise HTTPException(status_code=404, detail="작업 묶음을 찾을 수 없습니다.")
+    return status
+
+
+@app.get("/api/sources")
+async def list_sources(limit: int = 100):
+    """수집한 URL 출처 목록 (최신성 확인 주기, 마지막 확인/변경 시각, 최근 기록)"""
+    from app.services.source_catalog import get_source_catalog
+    
+    return await asyncio.to_thread(get_source_catalog().list, limit)
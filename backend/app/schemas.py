@@ -0,0 +1,74 @@
+"""
+API 요청/응답 스키마
+"""
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class ChatRequest(BaseModel):
+    """일반 채팅 요청"""
+    message: str
+
+
+class SearchRequest(BaseModel):
+    """문서 검색 요청"""
+    query: str
+    k: int = 10
+    source_types: Optional[List[str]] = None
+    companies: Optional[List[str]] = None
+    mode: Optional[str] = None
+    rerank: Optional[bool] = None
+    token_budget: Optional[int] = None
+
+
+class SearchResult(BaseModel):
+    """검색된 문서"""
+    content: str
+    metadata: Dict
+
+
+class GenerateRequest(BaseModel):
+    """RAG 답변 생성 요청"""
+    question: str
+    context: Optional[str] = None
+    session_id: Optional[str] = None
+
+
+class QuestionRequest(BaseModel):
+    """면접 질문 생성 요청"""
+    question: str
+    session_id: str
+    user_id: str = "guest"
+    max_tokens: int = 1500
+
+
+class IngestUrlsRequest(BaseModel):
+    """URL 크롤링 후 RAG 추가 요청"""
+    urls: List[str] = Field(..., min_length=1)
+    auto_rag: bool = True
+    pipeline: bool = False  # True면 대량 수집 파이프라인 작업 하나로 처리 (auto_rag 무시, 본문은 결과에 포함하지 않음)
+    batch_id: Optional[str] = None  # 같은 요청을 다시 보낼 때 작업 중복 등록 방지
+
+
+class JobStatus(BaseModel):
+    """백그라운드 작업 상태"""
+    job_id: str
+    kind: str  # crawl, embed, pipeline
+    status: str  # queued, running, succeeded, failed
+    payload: Dict = Field(default_factory=dict)  # 작업 입력 (문서 내용 제외)
+    attempts: int = 0
+    max_attempts: int = 0
+    progress: float = 0.0
+    message: str = ""
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+
+
+class BatchStatus(BaseModel):
+    """작업 묶음 진행률"""
+    batch_id: str
+    jobs: List[JobStatus]
+    counts: Dict[str, int]
+    by_kind: Dict[str, Dict[str, int]]
+    progress: float
+    done: bool
@@ -0,0 +1,155 @@
+"""
+FastAPI 백엔드 클라이언트 (Streamlit 얇은 클라이언트 모드용)
+"""
+import json
+from typing import Dict, Iterator, List, Optional
+import httpx
+from app.config import settings
+
+
+class APIClient:
+    """app.main API를 호출하는 동기 클라이언트 (Streamlit 스크립트에서 사용)"""
+    
+    def __init__(self, base_url: Optional[str] = None, timeout: Optional[float] = None):
+        """
+        Args:
+            base_url: API 서버 주소 (기본값: settings.api_base_url)
+            timeout: 요청 타임아웃 초 (기본값: settings.api_timeout)
+        """
+        self.base_url = (base_url or settings.api_base_url).rstrip("/")
+        self.client = httpx.Client(base_url=self.base_url, timeout=timeout or settings.api_timeout)
+    
+    def _request(self, method: str, path: str, **kwargs) -> Dict:
+        try:
+            response = self.client.request(method, path, **kwargs)
+        except httpx.HTTPError as e:
+            raise Exception(f"API 서버 연결 오류 ({self.base_url}): {str(e)}")
+        if response.status_code >= 400:
+            try:
+                detail = response.json().get("detail", response.text)
+            except ValueError:
+                detail = response.text
+            raise Exception(f"API 오류 ({response.status_code}): {detail}")
+        return response.json()
+    
+    def _stream_events(self, path: str, payload: Dict) -> Iterator[Dict]:
+        """
+        SSE 응답을 이벤트 딕셔너리로 변환 (data JSON에 type이 없으면 이벤트 이름으로 채움)
+        
+        Yields:
+            {"type": 이벤트 이름, ...data}
+        """
+        try:
+            with self.client.stream("POST", path, json=payload) as response:
+                if response.status_code >= 400:
+                    response.read()
+                    raise Exception(f"API 오류 ({response.status_code}): {response.text}")
+                
+                event_name = "message"
+                data_lines: List[str] = []
+                for line in response.iter_lines():
+                    if line.startswith("event:"):
+                        event_name = line[len("event:"):].strip()
+                    elif line.startswith("data:"):
+                        data_lines.append(line[len("data:"):].strip())
+                    elif not line and data_lines:
+                        event = json.loads("\n".join(data_lines))
+                        event.setdefault("type", event_name)
+                        yield event
+                        event_name = "message"
+                        data_lines = []
+        except httpx.HTTPError as e:
+            raise Exception(f"API 서버 연결 오류 ({self.base_url}): {str(e)}")
+    
+    def health(self) -> Dict:
+        """헬스 체크"""
+        return self._request("GET", "/health")
+    
+    def test_bedrock(self) -> Dict:
+        """Bedrock 연결 테스트"""
+        return self._request("GET", "/api/bedrock/test")
+    
+    def stream_chat(self, message: str) -> Iterator[Dict]:
+        """일반 채팅 스트리밍 (text, done, error 이벤트)"""
+        return self._stream_events("/api/chat/stream", {"message": message})
+    
+    def stream_questions(self, question: str, session_id: str, user_id: str, max_tokens: int = 1500) -> Iterator[Dict]:
+        """면접 질문 스트리밍 (QuestionService 이벤트)"""
+        return self._stream_events("/api/questions/stream", {
+            "question": question,
+            "session_id": session_id,
+            "user_id": user_id,
+            "max_tokens": max_tokens
+        })
+    
+    def search_documents(self, query: str, k: int = 10, **kwargs) -> List[Dict]:
+        """문서 검색 ([{content, metadata}])"""
+        return self._request("POST", "/api/rag/search", json={"query": query, "k": k, **kwargs})
+    
+    def list_documents(self) -> List[Dict]:
+        """저장된 문서 목록"""
+        return self._request("GET", "/api/rag/documents")
+    
+    def delete_document(self, document_id: str) -> Dict:
+        """문서 삭제"""
+        return self._request("DELETE", f"/api/rag/documents/{document_id}")
+    
+    def analyze_pdf(self, file_content: bytes, filename: str) -> Dict:
+        """PDF 텍스트 추출 및 요약"""
+        return self._request(
+            "POST", "/api/pdf/analyze",
+            files={"file": (filename, file_content, "application/pdf")}
+        )
+    
+    def ingest_pdf(self, file_content: bytes, filename: str) -> Dict:
+        """PDF 텍스트 추출 후 RAG 추가 작업 등록 (BatchStatus)"""
+        return self._request(
+            "POST", "/api/ingest/pdf",
+            files={"file": (filename, file_content, "application/pdf")}
+        )
+    
+    def ingest_urls(
+        self,
+        urls: List[str],
+        auto_rag: bool = True,
+        batch_id: Optional[str] = None,
+        pipeline: bool = False
+    ) -> Dict:
+        """URL 크롤링(+RAG 추가) 작업 등록 (BatchStatus, pipeline이면 대량 수집 파이프라인 작업 하나)"""
+        return self._request(
+            "POST", "/api/ingest/urls",
+            json={"urls": urls, "auto_rag": auto_rag, "batch_id": batch_id, "pipeline": pipeline}
+        )
+    
+    def get_job(self, job_id: str) -> Dict:
+        """백그라운드 작업 상태"""
+        return self._request("GET", f"/api/jobs/{job_id}")
+    
+    def get_job_content(self, job_id: str) -> Dict:
+        """RAG 자동 추가 없이 크롤링한 작업의 전체 본문 ({"url", "content"})"""
+        return self._request("GET", f"/api/jobs/{job_id}/content")
+    
+    def get_batch(self, batch_id: str) -> Dict:
+        """작업 묶음 진행률"""
+        return self._request("GET", f"/api/batches/{batch_id}")
+    
+    def list_sources(self, limit: int = 100) -> List[Dict]:
+        """수집한 URL 출처 목록 (최신성 확인 상태)"""
+        return self._request("GET", "/api/sources", params={"limit": limit})
+    
+    def get_metrics(self) -> Dict:
+        """단계별 지연 시간 요약 (요청을 처리한 워커 기준)"""
+        return self._request("GET", "/api/metrics")
+
+
+_api_client: Optional[APIClient] = None
+
+
+def get_api_client() -> Optional[APIClient]:
+    """API 클라이언트 (settings.api_base_url이 비어 있으면 None → 프로세스 안에서 직접 처리)"""
+    global _api_client
+    if not settings.api_base_url:
+        return None
+    if _api_client is None:
+        _api_client = APIClient()
+    return _api_client
@@ -0,0 +1,46 @@
+"""
+bedrock-runtime boto3 클라이언트 생성 (자격 증명 / 엔드포인트 / 재시도 설정 공용)
+"""
+from app.config import settings
+
+
+def create_bedrock_runtime():
+    """
+    설정에 맞는 bedrock-runtime 클라이언트 생성
+    
+    - settings.bedrock_endpoint_url이 있으면 해당 주소로 요청 (로컬 가짜 Bedrock 서버 등)
+    - settings.bedrock_client_max_attempts가 있으면 botocore 자체 재시도 횟수 지정
+    
+    Returns:
+        boto3 bedrock-runtime 클라이언트
+    """
+    import boto3
+    
+    session_kwargs = {
+        "region_name": settings.aws_region
+    }
+    
+    if settings.aws_access_key_id and settings.aws_secret_access_key:
+        session_kwargs.update({
+            "aws_access_key_id": settings.aws_access_key_id,
+            "aws_secret_access_key": settings.aws_secret_access_key
+        })
+    elif settings.bedrock_endpoint_url:
+        # 가짜 서버는 서명을 확인하지 않지만 botocore는 서명할 자격 증명이 필요
+        # (실제 자격 증명이 로컬 서버로 전송되지 않도록 더미 값 사용)
+        session_kwargs.update({
+            "aws_access_key_id": "fake",
+            "aws_secret_access_key": "fake"
+        })
+    
+    if settings.bedrock_endpoint_url:
+        session_kwargs["endpoint_url"] = settings.bedrock_endpoint_url
+    
+    if settings.bedrock_client_max_attempts:
+        from botocore.config import Config
+        
+        session_kwargs["config"] = Config(
+            retries={"total_max_attempts": settings.bedrock_client_max_attempts, "mode": "standard"}
+        )
+    
+    return boto3.client("bedrock-runtime", **session_kwargs)
@@ -3,9 +3,10 @@ AWS Bedrock 서비스
 """
 from typing import Optional, AsyncGenerator
 from langchain_aws import ChatBedrock
-from langchain_community.embeddings import BedrockEmbeddings
 from app.config import settings
-import boto3
+from app.services.bedrock_client import create_bedrock_runtime
+from app.services.embeddings import create_embeddings
+from app.services.metrics import metrics, record_retry
 
 
 class BedrockService:
@@ -13,22 +14,8 @@ class BedrockService:
     
     def __init__(self):
         """초기화"""
-        # AWS 세션 생성
-        session_kwargs = {
-            "region_name": settings.aws_region
-        }
-        
-        # 자격증명이 .env에 있으면 사용
-        if settings.aws_access_key_id and settings.aws_secret_access_key:
-            session_kwargs.update({
-                "aws_access_key_id": settings.aws_access_key_id,
-                "aws_secret_access_key": settings.aws_secret_access_key
-            })
-        
-        self.bedrock_runtime = boto3.client(
-            "bedrock-runtime",
-            **session_kwargs
-        )
+        # Bedrock 클라이언트 생성 (자격 증명/엔드포인트/재시도 설정 공용)
+        self.bedrock_runtime = create_bedrock_runtime()
         
         # LLM 초기화 (Claude 3 Sonnet)
         self.llm = ChatBedrock(
@@ -40,11 +27,8 @@ class BedrockService:
             }
         )
         
-        # Embeddings 초기화 (Titan Embeddings)
-        self.embeddings = BedrockEmbeddings(
-            model_id=settings.embedding_model,
-            client=self.bedrock_runtime
-        )
+        # Embeddings 초기화 (settings.embedding_provider: Bedrock Titan 또는 로컬 CPU 모델)
+        self.embeddings = create_embeddings(self.bedrock_runtime)
     
     async def chat(self, message: str) -> str:
         """
@@ -67,7 +51,8 @@ class BedrockService:
         
         for attempt in range(max_retries):
             try:
-                response = await self.llm.ainvoke(message)
+                with metrics.span("bedrock_invoke"):
+                    response = await self.llm.ainvoke(message)
                 return response.content
             except Exception as e:
                 error_str = str(e)
@@ -75,7 +60,8 @@ class BedrockService:
                 if "ThrottlingException" in error_str or "Too many requests" in error_str:
                     if attempt < max_retries - 1:
                         # 지수 백오프: 3초, 6초, 12초, 24초, 48초
-                        delay = base_delay * (2 ** attempt)
+                        delay = base_delay * (2 ** attempt) * settings.bedrock_retry_delay_scale
+                        record_retry("chat", delay)
                         await asyncio.sleep(delay)
                         continue
                 raise Exception(f"Bedrock 호출 오류: {str(e)}")
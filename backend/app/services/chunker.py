@@ -0,0 +1,225 @@
+"""
+구조 인식 청크 분할기 (이력서 섹션 / 크롤링 문서 헤딩 경계 보존)
+"""
+import re
+from typing import Dict, List, Optional
+from app.config import settings
+from app.services.token_counter import estimate_tokens
+
+
+# 이력서 섹션 키 → 청크 헤딩에 표시할 이름
+SECTION_TITLES = {
+    "personal_info": "개인정보",
+    "education": "학력",
+    "experience": "경력",
+    "projects": "프로젝트",
+    "skills": "기술",
+    "other": "기타"
+}
+
+_MARKDOWN_HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+)$")
+_PAGE_MARKER_PATTERN = re.compile(r"^=== 페이지 \d+ ===$")
+# 문장이 끝난 줄인지 판단 (영문 구두점, 한국어 종결 어미)
+_SENTENCE_END_PATTERN = re.compile(r"([.!?。…]|[다요죠음함됨임])[\"')\]]*$")
+_SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?。])\s+")
+
+
+class StructureAwareChunker:
+    """
+    문서 구조(섹션/헤딩)를 경계로 삼아 토큰 기준으로 청크를 나누는 분할기
+    
+    - 섹션/헤딩 블록은 가능한 한 하나의 청크로 유지하고, 작은 블록은 이웃과 합쳐 밀도를 높임
+    - 블록이 max_tokens를 넘을 때만 나누며, 문장 중간에서 잘린 경우에만 짧은 겹침을 둠
+    - 나뉜 블록의 두 번째 청크부터는 헤딩 경로를 앞에 붙여 문맥을 유지
+    """
+    
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        min_tokens: Optional[int] = None,
+        overlap_tokens: Optional[int] = None
+    ):
+        """
+        Args:
+            max_tokens: 청크 최대 토큰 수 (기본값: settings.chunk_max_tokens)
+            min_tokens: 이보다 작은 블록은 이웃 블록과 합침 (기본값: settings.chunk_min_tokens)
+            overlap_tokens: 블록을 나눌 때 최대 겹침 토큰 수 (기본값: settings.chunk_overlap_tokens)
+        """
+        self.max_tokens = max_tokens or settings.chunk_max_tokens
+        self.min_tokens = min_tokens if min_tokens is not None else settings.chunk_min_tokens
+        self.overlap_tokens = overlap_tokens if overlap_tokens is not None else settings.chunk_overlap_tokens
+    
+    @property
+    def cache_key(self) -> str:
+        """분할 설정 식별자 (캐시된 청크 재사용 여부 판단용)"""
+        return f"structure-v1-{self.max_tokens}-{self.min_tokens}-{self.overlap_tokens}"
+    
+    def split(
+        self,
+        content: str,
+        metadata: Optional[Dict] = None,
+        section_spans: Optional[List[Dict]] = None
+    ) -> List[Dict]:
+        """
+        문서를 구조 단위 청크로 분할
+        
+        Args:
+            content: 문서 내용
+            metadata: 문서 메타데이터 (source가 "pdf"이면 이력서 섹션 기준으로 분할)
+            section_spans: PDFService.extract_section_spans 결과 (있으면 재계산 생략)
+            
+        Returns:
+            청크 리스트. 각 청크는 text, heading, tokens를 담은 딕셔너리
+        """
+        source = (metadata or {}).get("source")
+        
+        if section_spans is None and source == "pdf":
+            from app.services.pdf_service import PDFService
+            section_spans = PDFService(use_cache=False).extract_section_spans(content)
+        
+        if section_spans is not None:
+            blocks = self._blocks_from_spans(section_spans)
+        else:
+            blocks = self._blocks_from_markdown(content)
+        
+        chunks = []
+        for block in self._merge_small_blocks(blocks):
+            chunks.extend(self._split_block(block))
+        return chunks
+    
+    def _make_block(self, path: List[str], lines: List[str]) -> Dict:
+        return {
+            "path": path,
+            "lines": lines,
+            "tokens": sum(estimate_tokens(line) for line in lines)
+        }
+    
+    def _blocks_from_spans(self, spans: List[Dict]) -> List[Dict]:
+        """이력서 섹션 구간을 블록으로 변환 (페이지 구분선 제거)"""
+        blocks = []
+        for span in spans:
+            lines = [
+                line for line in span["text"].split("\n")
+                if line.strip() and not _PAGE_MARKER_PATTERN.match(line.strip())
+            ]
+            if lines:
+                blocks.append(self._make_block([SECTION_TITLES.get(span["section"], span["section"])], lines))
+        return blocks
+    
+    def _blocks_from_markdown(self, content: str) -> List[Dict]:
+        """마크다운 헤딩(크롤러가 h1~h6에 붙인 #) 기준으로 블록 분리"""
+        blocks = []
+        heading_stack: List[tuple] = []  # (레벨, 제목)
+        lines: List[str] = []
+        
+        for line in content.split("\n"):
+            stripped = line.strip()
+            if not stripped:
+                continue
+            
+            heading = _MARKDOWN_HEADING_PATTERN.match(stripped)
+            if heading:
+                if lines:
+                    blocks.append(self._make_block([title for _, title in heading_stack], lines))
+                level = len(heading.group(1))
+                while heading_stack and heading_stack[-1][0] >= level:
+                    heading_stack.pop()
+                heading_stack.append((level, heading.group(2).strip()))
+                lines = []
+            
+            lines.append(stripped)
+        
+        if lines:
+            blocks.append(self._make_block([title for _, title in heading_stack], lines))
+        return blocks
+    
+    def _merge_small_blocks(self, blocks: List[Dict]) -> List[Dict]:
+        """작은 블록을 다음 블록과 합쳐 너무 잘게 쪼개진 청크를 줄임"""
+        merged: List[Dict] = []
+        for block in blocks:
+            if merged:
+                previous = merged[-1]
+                is_small = previous["tokens"] < self.min_tokens or block["tokens"] < self.min_tokens
+                if is_small and previous["tokens"] + block["tokens"] <= self.max_tokens:
+                    previous["lines"].extend(block["lines"])
+                    previous["tokens"] += block["tokens"]
+                    continue
+            merged.append({**block, "lines": list(block["lines"])})
+        return merged
+    
+    def _split_long_line(self, line: str, limit: int) -> List[str]:
+        """limit 토큰을 넘는 한 줄을 문장 → 글자 단위로 나눔"""
+        pieces = []
+        for sentence in _SENTENCE_SPLIT_PATTERN.split(line):
+            sentence_tokens = estimate_tokens(sentence)
+            if sentence_tokens <= limit:
+                pieces.append(sentence)
+                continue
+            # 문장도 너무 길면 토큰 비율에 맞춰 글자 단위로 자름
+            window = max(1, len(sentence) * limit // sentence_tokens)
+            pieces.extend(sentence[i:i + window] for i in range(0, len(sentence), window))
+        return pieces
+    
+    def _overlap_units(self, units: List[tuple]) -> List[tuple]:
+        """
+        다음 청크로 이어 붙일 겹침 단위 선택
+        마지막 단위가 문장 끝이면 자연스러운 경계이므로 겹치지 않음
+        """
+        if not self.overlap_tokens or not units or _SENTENCE_END_PATTERN.search(units[-1][0]):
+            return []
+        
+        overlap: List[tuple] = []
+        overlap_tokens = 0
+        for unit in reversed(units):
+            if overlap_tokens + unit[1] > self.overlap_tokens:
+                break
+            overlap.insert(0, unit)
+            overlap_tokens += unit[1]
+        return overlap
+    
+    def _split_block(self, block: Dict) -> List[Dict]:
+        """블록을 max_tokens 이하 청크로 분할"""
+        heading = " > ".join(block["path"])
+        
+        if block["tokens"] <= self.max_tokens:
+            return [{"text": "\n".join(block["lines"]), "heading": heading, "tokens": block["tokens"]}]
+        
+        # 이어지는 청크 앞에 붙일 헤딩 경로
+        prefix = f"[{heading}]" if heading else ""
+        prefix_tokens = estimate_tokens(prefix)
+        
+        unit_limit = max(1, self.max_tokens - prefix_tokens)
+        units: List[tuple] = []  # (텍스트, 토큰 수)
+        for line in block["lines"]:
+            line_tokens = estimate_tokens(line)
+            if line_tokens <= unit_limit:
+                units.append((line, line_tokens))
+            else:
+                units.extend((piece, estimate_tokens(piece)) for piece in self._split_long_line(line, unit_limit))
+        
+        chunks = []
+        current: List[tuple] = []
+        current_tokens = 0
+        
+        def emit():
+            lines = [text for text, _ in current]
+            if chunks and prefix:
+                lines.insert(0, prefix)
+            text = "\n".join(lines)
+            chunks.append({"text": text, "heading": heading, "tokens": estimate_tokens(text)})
+        
+        for unit in units:
+            # 첫 청크 이후에는 헤딩 경로가 앞에 붙으므로 그만큼 예산에서 제외
+            budget = self.max_tokens - (prefix_tokens if chunks else 0)
+            if current and current_tokens + unit[1] > budget:
+                emit()
+                current = self._overlap_units(current)
+                current_tokens = sum(tokens for _, tokens in current)
+                if current_tokens + unit[1] > self.max_tokens - prefix_tokens:
+                    current, current_tokens = [], 0
+            current.append(unit)
+            current_tokens += unit[1]
+        
+        if current:
+            emit()
+        return chunks
@@ -0,0 +1,205 @@
+"""
+Chroma 컬렉션 라우팅 (소스 유형 / 회사별 파티션)
+"""
+import hashlib
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+from app.config import settings
+from app.services.company_index import company_index
+from app.services.embeddings import collection_prefix
+
+
+# 파티션 도입 전 모든 문서가 저장되던 컬렉션 (기존 데이터 검색을 위해 계속 조회)
+LEGACY_COLLECTION = "interview_documents"
+
+# 파티션으로 나누는 소스 유형 (그 외 값은 "manual"로 취급)
+SOURCE_TYPES = ["pdf", "crawler", "manual"]
+
+# 회사가 감지되지 않은 문서의 파티션 이름
+GENERAL_PARTITION = "general"
+
+_SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+
+
+def company_slug(company: str) -> str:
+    """
+    회사 식별자를 컬렉션 이름에 쓸 수 있는 형태로 변환
+    (영문/숫자가 아닌 이름은 해시로 대체)
+    
+    Args:
+        company: 회사 식별자
+        
+    Returns:
+        소문자 영문/숫자 슬러그
+    """
+    slug = _SLUG_PATTERN.sub("", company.lower())
+    if slug and slug == company.lower():
+        return slug[:32]
+    return "c" + hashlib.sha1(company.encode("utf-8")).hexdigest()[:10]
+
+
+def detect_company_from_url(url: str) -> Optional[str]:
+    """
+    URL 도메인/경로로 회사 감지
+    
+    Args:
+        url: 문서 URL
+        
+    Returns:
+        회사 식별자 (감지되지 않으면 None)
+    """
+    return company_index.company_from_url(url)
+
+
+class CollectionRouter:
+    """
+    문서를 소스 유형/회사별 Chroma 컬렉션(파티션)으로 나누어 저장하고,
+    검색 시 조건에 맞는 파티션만 고르는 라우터
+    
+    파티션 이름: {prefix}__{소스 유형}__{회사 슬러그 또는 general}
+    """
+    
+    def __init__(self, client, prefix: Optional[str] = None):
+        """
+        Args:
+            client: 벡터 저장소 클라이언트 (chromadb 클라이언트 또는 QuantizedVectorClient)
+            prefix: 컬렉션 이름 접두사 (기본값: 임베딩 차원/정규화 설정별 접두사, embeddings.collection_prefix)
+        """
+        self.client = client
+        self.prefix = prefix or collection_prefix()
+        # 파티션 이름 → 컬렉션 (매 요청마다 조회하지 않도록 캐시)
+        self._collections: Dict[str, object] = {}
+        # 여러 스레드(수집 파이프라인 등)가 같은 새 파티션을 동시에 만들지 않도록 보호
+        self._collections_lock = threading.Lock()
+        # 파티션 이름 → {"source": ..., "company": ...}
+        # (다른 프로세스가 만든 파티션도 보이도록 settings.collection_refresh_seconds마다 다시 읽음)
+        self._partitions: Optional[Dict[str, Dict[str, str]]] = None
+        self._has_legacy = False
+        self._listed_at = 0.0
+    
+    def partition_name(self, source: str, company: Optional[str] = None) -> str:
+        """소스 유형/회사로 파티션 이름 생성"""
+        company_part = company_slug(company) if company else GENERAL_PARTITION
+        return f"{self.prefix}__{source}__{company_part}"
+    
+    @staticmethod
+    def normalize_source(source: Optional[str]) -> str:
+        """메타데이터 source 값을 파티션 소스 유형으로 변환"""
+        return source if source in SOURCE_TYPES else "manual"
+    
+    def route(self, metadata: Optional[Dict]) -> str:
+        """
+        문서 메타데이터로 저장할 파티션 결정
+        
+        Args:
+            metadata: 문서 메타데이터 (source, company, url)
+            
+        Returns:
+            파티션 이름
+        """
+        metadata = metadata or {}
+        source = self.normalize_source(metadata.get("source"))
+        company = metadata.get("company") or detect_company_from_url(metadata.get("url", ""))
+        return self.partition_name(source, company)
+    
+    def get_collection(self, name: str, source: Optional[str] = None, company: Optional[str] = None):
+        """파티션 컬렉션 가져오기 (없으면 생성)"""
+        if name in self._collections:
+            return self._collections[name]
+        with self._collections_lock:
+            if name in self._collections:
+                return self._collections[name]
+            if source is None:
+                # 이미 존재하는 파티션/기존 컬렉션 조회 (메타데이터를 덮어쓰지 않음)
+                self._collections[name] = self.client.get_collection(name=name)
+            else:
+                collection_metadata = {"source": source, "company": company or ""}
+                self._collections[name] = self.client.get_or_create_collection(
+                    name=name,
+                    metadata=collection_metadata
+                )
+                if self._partitions is not None:
+                    self._partitions[name] = collection_metadata
+        return self._collections[name]
+    
+    def get_collection_for(self, metadata: Optional[Dict]):
+        """문서 메타데이터에 해당하는 파티션 컬렉션 가져오기"""
+        metadata = metadata or {}
+        source = self.normalize_source(metadata.get("source"))
+        company = metadata.get("company") or detect_company_from_url(metadata.get("url", ""))
+        return self.get_collection(self.partition_name(source, company), source, company)
+    
+    def refresh(self):
+        """다음 조회 때 저장소의 파티션 목록 다시 읽기"""
+        self._partitions = None
+    
+    def partitions(self, refresh: bool = False) -> Dict[str, Dict[str, str]]:
+        """
+        현재 존재하는 파티션 목록 (이름 → source/company)
+        
+        Args:
+            refresh: 주기와 관계없이 저장소에서 다시 읽을지 여부 (갱신/삭제처럼 누락되면 안 되는 작업용)
+        """
+        expired = time.monotonic() - self._listed_at >= settings.collection_refresh_seconds
+        if self._partitions is None or refresh or expired:
+            partitions = {}
+            has_legacy = False
+            for collection in self.client.list_collections():
+                if collection.name.startswith(f"{self.prefix}__"):
+                    metadata = collection.metadata or {}
+                    partitions[collection.name] = {
+                        "source": metadata.get("source", ""),
+                        "company": metadata.get("company", "")
+                    }
+                    self._collections.setdefault(collection.name, collection)
+                elif collection.name == LEGACY_COLLECTION:
+                    has_legacy = True
+            self._partitions = partitions
+            # 파티션 도입 전 컬렉션은 기본 임베딩 설정의 접두사일 때만 조회 (벡터 차원이 다름)
+            self._has_legacy = has_legacy and self.prefix == settings.chroma_collection_prefix
+            self._listed_at = time.monotonic()
+        return self._partitions
+    
+    def has_legacy_collection(self) -> bool:
+        """파티션 도입 전 컬렉션이 존재하는지 확인 (파티션 목록과 함께 읽은 결과)"""
+        self.partitions()
+        return self._has_legacy
+    
+    def select_partitions(
+        self,
+        source_types: Optional[List[str]] = None,
+        companies: Optional[List[str]] = None,
+        include_general: bool = True,
+        include_legacy: bool = True,
+        refresh: bool = False
+    ) -> List[str]:
+        """
+        검색 조건에 맞는 파티션만 선택
+        
+        Args:
+            source_types: 검색할 소스 유형 (None이면 전체)
+            companies: 검색할 회사 (None이면 전체)
+            include_general: 회사를 지정했을 때 회사 미감지 파티션도 포함할지 여부
+            include_legacy: 파티션 도입 전 컬렉션 포함 여부
+            refresh: 파티션 목록을 저장소에서 다시 읽을지 여부
+            
+        Returns:
+            파티션(컬렉션) 이름 리스트
+        """
+        selected = []
+        company_set = set(companies) if companies else None
+        
+        for name, info in self.partitions(refresh).items():
+            if source_types and info["source"] not in source_types:
+                continue
+            if company_set is not None:
+                is_general = not info["company"]
+                if not (info["company"] in company_set or (include_general and is_general)):
+                    continue
+            selected.append(name)
+        
+        if include_legacy and self._has_legacy:
+            selected.append(LEGACY_COLLECTION)
+        return selected
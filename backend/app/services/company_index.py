@@ -0,0 +1,329 @@
+"""
+회사 엔티티 인덱스 (회사명 별칭 매칭 및 청크 메타데이터 태깅)
+"""
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+# 회사 식별자 → 표시 이름, 별칭, 기술 블로그 도메인
+COMPANIES = {
+    "kakao": {"name": "카카오", "aliases": ["카카오", "카카오톡", "kakao"], "domains": ["kakao.com", "kakaocorp.com", "kakaobank.com", "kakaopay.com"]},
+    "naver": {"name": "네이버", "aliases": ["네이버", "naver"], "domains": ["naver.com", "navercorp.com"]},
+    "line": {"name": "라인", "aliases": ["라인", "라인플러스", "line corp", "linecorp", "line플러스"], "domains": ["linecorp.com"]},
+    "toss": {"name": "토스", "aliases": ["토스", "토스뱅크", "토스증권", "토스페이먼츠", "비바리퍼블리카", "toss"], "domains": ["toss.tech", "toss.im"]},
+    "daangn": {"name": "당근마켓", "aliases": ["당근마켓", "당근", "daangn", "karrot"], "domains": ["daangn.com", "karrotmarket.com", "medium.com/daangn"]},
+    "coupang": {"name": "쿠팡", "aliases": ["쿠팡", "coupang"], "domains": ["coupang.com", "medium.com/coupang-engineering"]},
+    "woowahan": {"name": "우아한형제들", "aliases": ["우아한형제들", "배달의민족", "배민", "woowahan", "baemin"], "domains": ["woowahan.com", "baemin.com"]},
+    "samsung": {"name": "삼성", "aliases": ["삼성", "삼성전자", "samsung"], "domains": ["samsung.com", "samsungsds.com"]},
+    "lg": {"name": "LG", "aliases": ["lg", "엘지"], "domains": ["lg.com", "lgcns.com"]},
+    "sk": {"name": "SK", "aliases": ["sk", "에스케이"], "domains": ["sk.com", "sktelecom.com", "devocean.sk.com"]},
+    "hyundai": {"name": "현대", "aliases": ["현대", "현대자동차", "현대차", "현대오토에버", "hyundai"], "domains": ["hyundai.com", "hyundai-autoever.com"]},
+    "kia": {"name": "기아", "aliases": ["기아", "기아자동차", "기아차", "kia"], "domains": ["kia.com"]},
+    "hanwha": {"name": "한화", "aliases": ["한화", "hanwha"], "domains": ["hanwha.com"]},
+    "lotte": {"name": "롯데", "aliases": ["롯데", "lotte"], "domains": ["lotte.co.kr", "lotteon.com"]},
+    "cj": {"name": "CJ", "aliases": ["cj", "씨제이"], "domains": ["cj.net", "cjolivenetworks.co.kr"]},
+    "gs": {"name": "GS", "aliases": ["gs", "지에스"], "domains": ["gs.co.kr", "gsretail.com"]},
+    "musinsa": {"name": "무신사", "aliases": ["무신사", "musinsa"], "domains": ["musinsa.com"]},
+    "yanolja": {"name": "야놀자", "aliases": ["야놀자", "yanolja"], "domains": ["yanolja.com"]},
+    "zigbang": {"name": "직방", "aliases": ["직방", "zigbang"], "domains": ["zigbang.com"]},
+    "watcha": {"name": "왓챠", "aliases": ["왓챠", "watcha"], "domains": ["watcha.com", "medium.com/watcha"]},
+    "brandi": {"name": "브랜디", "aliases": ["브랜디", "brandi"], "domains": ["brandi.co.kr"]},
+    "kurly": {"name": "마켓컬리", "aliases": ["마켓컬리", "컬리", "kurly"], "domains": ["kurly.com", "helloworld.kurly.com"]},
+    "apple": {"name": "Apple", "aliases": ["애플", "apple"], "domains": ["apple.com"]},
+    "google": {"name": "Google", "aliases": ["구글", "google"], "domains": ["google.com", "googleblog.com"]},
+    "microsoft": {"name": "Microsoft", "aliases": ["마이크로소프트", "microsoft"], "domains": ["microsoft.com"]},
+    "amazon": {"name": "Amazon", "aliases": ["아마존", "amazon"], "domains": ["amazon.com", "amazon.science"]},
+    "meta": {"name": "Meta", "aliases": ["메타", "meta", "facebook", "페이스북"], "domains": ["meta.com", "fb.com", "engineering.fb.com"]},
+    "netflix": {"name": "Netflix", "aliases": ["넷플릭스", "netflix"], "domains": ["netflix.com", "netflixtechblog.com"]},
+    "tesla": {"name": "Tesla", "aliases": ["테슬라", "tesla"], "domains": ["tesla.com"]},
+}
+
+# 청크 메타데이터에 회사별로 저장하는 불리언 키 접두사 (예: company_kakao=True)
+COMPANY_METADATA_PREFIX = "company_"
+
+# 일반 단어로도 흔히 쓰이는 한글 별칭 ("라인 단위 로그", "토스 버튼", "메타 정보")
+# 바로 뒤(조사 다음)에 회사 맥락 단어가 올 때만 회사로 인식
+AMBIGUOUS_ALIASES = {"라인", "토스", "메타", "현대", "기아", "당근"}
+
+# 회사 맥락 단어 (모호한 별칭 바로 다음 단어가 이 단어로 시작하면 회사로 인식)
+COMPANY_CONTEXT_WORDS = (
+    "면접", "채용", "기업", "회사", "개발", "백엔드", "프론트엔드", "서버", "엔지니어", "기술", "테크",
+    "신입", "경력", "입사", "직무", "코딩", "인턴", "합격", "지원", "연봉", "블로그", "서비스", "팀"
+)
+
+# 한글 별칭 뒤에 붙어도 같은 단어로 보는 조사
+KOREAN_PARTICLES = {
+    "은", "는", "이", "가", "을", "를", "의", "에", "에서", "에게", "와", "과", "도", "로", "으로", "만",
+    "까지", "부터", "처럼", "보다", "이나", "나", "랑", "이랑", "하고", "같은", "에서는", "에서도", "에서의",
+    "에는", "에도", "으로는", "로는", "와의", "과의", "만큼", "이라는", "라는", "이라면", "라면", "님", "사"
+}
+
+
+def _is_hangul(char: str) -> bool:
+    return "가" <= char <= "힣"
+
+
+def _is_ascii_word(char: str) -> bool:
+    return char.isascii() and char.isalnum()
+
+
+def _hangul_run(text: str, start: int) -> str:
+    """start부터 이어지는 한글 글자들"""
+    end = start
+    while end < len(text) and _is_hangul(text[end]):
+        end += 1
+    return text[start:end]
+
+
+def _has_company_context(text: str, end: int) -> bool:
+    """별칭(+조사) 다음 단어가 회사 맥락 단어인지 확인 ("토스 백엔드 면접" → True, "토스 버튼" → False)"""
+    end += len(_hangul_run(text, end))
+    following = text[end:end + 20].lstrip()
+    return following.startswith(COMPANY_CONTEXT_WORDS)
+
+
+class AhoCorasickMatcher:
+    """
+    여러 패턴을 텍스트 한 번 순회로 찾는 Aho–Corasick 매처
+    (대소문자 구분 없음, 패턴은 소문자로 저장)
+    """
+    
+    def __init__(self, patterns: Dict[str, str]):
+        """
+        Args:
+            patterns: 패턴 → 값 (예: 별칭 → 회사 식별자)
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str]]] = [[]]
+        
+        for pattern, value in patterns.items():
+            self._add(pattern.lower(), value)
+        self._build_failure_links()
+    
+    def _add(self, pattern: str, value: str):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((pattern, value))
+    
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+    
+    def find(self, text: str) -> List[Tuple[int, str, str]]:
+        """
+        텍스트에서 모든 패턴 위치 찾기
+        
+        Args:
+            text: 검색할 텍스트
+            
+        Returns:
+            (시작 위치, 패턴, 값) 리스트
+        """
+        text = text.lower()
+        matches = []
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern, value in self._output[state]:
+                start = index - len(pattern) + 1
+                if self._is_word_boundary(text, start, index + 1, pattern):
+                    matches.append((start, pattern, value))
+        return matches
+    
+    @staticmethod
+    def _is_word_boundary(text: str, start: int, end: int, pattern: str) -> bool:
+        """
+        단어 일부에 걸린 매칭 제외
+        - 한글 별칭: 앞 글자가 한글이면 제외 ("파이프라인"의 "라인"),
+          뒤에 이어지는 한글은 조사일 때만 허용 ("메타데이터", "토스트", "현대적인" 제외)
+        - 영문 별칭: 앞뒤가 영문/숫자면 제외 ("gsap"의 "gs")
+        """
+        before = text[start - 1] if start > 0 else ""
+        after = text[end] if end < len(text) else ""
+        if _is_hangul(pattern[0]) and before and _is_hangul(before):
+            return False
+        if _is_hangul(pattern[-1]):
+            suffix = _hangul_run(text, end)
+            return not suffix or suffix in KOREAN_PARTICLES
+        if before and _is_ascii_word(before):
+            return False
+        if after and _is_ascii_word(pattern[-1]) and _is_ascii_word(after):
+            return False
+        return True
+
+
+class CompanyIndex:
+    """
+    회사 엔티티 인덱스
+    
+    - 수집 시: 문서/청크에서 언급된 회사를 찾아 메타데이터(company_<id>=True)로 저장
+    - 질문 시: 프롬프트에서 회사를 찾아 메타데이터 필터로 검색
+    """
+    
+    def __init__(self, companies: Optional[Dict[str, Dict]] = None):
+        """
+        Args:
+            companies: 회사 식별자 → {name, aliases, domains} (기본값: COMPANIES)
+        """
+        self.companies = companies or COMPANIES
+        self.aliases = {}
+        for company_id, info in self.companies.items():
+            for alias in info["aliases"] + [info["name"]]:
+                self.aliases[alias.lower()] = company_id
+        self.matcher = AhoCorasickMatcher(self.aliases)
+    
+    def find(self, text: str) -> List[Tuple[int, str, str]]:
+        """
+        텍스트에서 회사 별칭 위치 찾기 (모호한 별칭은 회사 맥락 단어가 이어질 때만)
+        
+        Returns:
+            (시작 위치, 별칭, 회사 식별자) 리스트
+        """
+        lowered = text.lower()
+        return [
+            (start, alias, company_id)
+            for start, alias, company_id in self.matcher.find(lowered)
+            if alias not in AMBIGUOUS_ALIASES or _has_company_context(lowered, start + len(alias))
+        ]
+    
+    def display_name(self, company_id: str) -> str:
+        """회사 표시 이름"""
+        return self.companies.get(company_id, {}).get("name", company_id)
+    
+    def match(self, text: str) -> List[str]:
+        """
+        텍스트에 언급된 회사 식별자 (처음 언급된 순서)
+        
+        Args:
+            text: 질문 또는 문서 텍스트
+            
+        Returns:
+            회사 식별자 리스트
+        """
+        found = []
+        for _, _, company_id in sorted(self.find(text)):
+            if company_id not in found:
+                found.append(company_id)
+        return found
+    
+    def count_mentions(self, text: str) -> Counter:
+        """회사별 언급 횟수"""
+        return Counter(company_id for _, _, company_id in self.find(text))
+    
+    def company_from_url(self, url: str) -> Optional[str]:
+        """
+        URL 도메인/경로로 회사 감지
+        
+        Args:
+            url: 문서 URL
+            
+        Returns:
+            회사 식별자 (감지되지 않으면 None)
+        """
+        if not url:
+            return None
+        parsed = urlparse(url)
+        host = parsed.netloc.lower()
+        host_and_path = f"{host}{parsed.path.lower()}"
+        for company_id, info in self.companies.items():
+            for domain in info["domains"]:
+                if "/" in domain:
+                    if host_and_path.startswith(domain) or host_and_path.startswith(f"www.{domain}"):
+                        return company_id
+                elif host == domain or host.endswith(f".{domain}"):
+                    return company_id
+        return None
+    
+    def primary_company(self, content: str, metadata: Optional[Dict] = None) -> Optional[str]:
+        """
+        문서의 대표 회사 결정
+        (메타데이터 company → URL 도메인 → 문서 앞부분에서 2회 이상 가장 많이 언급된 회사)
+        
+        Args:
+            content: 문서 내용
+            metadata: 문서 메타데이터 (company, url)
+            
+        Returns:
+            회사 식별자 (없으면 None)
+        """
+        metadata = metadata or {}
+        if metadata.get("company"):
+            company = str(metadata["company"])
+            if company in self.companies:
+                return company
+            return self.aliases.get(company.lower()) or (self.match(company) or [company])[0]
+        
+        company = self.company_from_url(metadata.get("url", ""))
+        if company:
+            return company
+        
+        mentions = self.count_mentions(content[:3000])
+        if mentions:
+            company, count = mentions.most_common(1)[0]
+            if count >= 2:
+                return company
+        return None
+    
+    def tag_chunk(self, text: str, primary_company: Optional[str] = None) -> Dict:
+        """
+        청크 메타데이터에 추가할 회사 태그 생성
+        
+        Args:
+            text: 청크 텍스트
+            primary_company: 문서 대표 회사
+            
+        Returns:
+            {"company_<id>": True, ..., "companies": "id1,id2"} (회사가 없으면 빈 딕셔너리)
+        """
+        company_ids = set(self.match(text))
+        if primary_company:
+            company_ids.add(primary_company)
+        if not company_ids:
+            return {}
+        
+        tags = {f"{COMPANY_METADATA_PREFIX}{company_id}": True for company_id in sorted(company_ids)}
+        tags["companies"] = ",".join(sorted(company_ids))
+        return tags
+    
+    @staticmethod
+    def where_filter(company_ids: List[str]) -> Optional[Dict]:
+        """
+        회사 식별자로 Chroma 메타데이터 필터 생성
+        
+        Args:
+            company_ids: 회사 식별자 리스트
+            
+        Returns:
+            where 필터 (회사가 없으면 None)
+        """
+        conditions = [{f"{COMPANY_METADATA_PREFIX}{company_id}": True} for company_id in company_ids]
+        if not conditions:
+            return None
+        if len(conditions) == 1:
+            return conditions[0]
+        return {"$or": conditions}
+
+
+company_index = CompanyIndex()
@@ -0,0 +1,230 @@
+"""
+요약 기반 대화 메모리 (오래된 대화를 백그라운드에서 요약하여 프롬프트 크기 유지)
+"""
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from app.config import settings
+from app.services.token_counter import estimate_tokens
+
+
+# 요약 함수: (이전 요약, 요약할 메시지) → 새 요약
+Summarizer = Callable[[str, List[Dict]], str]
+
+# 요약은 응답 스트리밍과 무관하게 백그라운드 스레드에서 실행
+_summary_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _summary_executor
+    with _executor_lock:
+        if _summary_executor is None:
+            _summary_executor = ThreadPoolExecutor(
+                max_workers=settings.memory_summary_workers,
+                thread_name_prefix="memory-summary"
+            )
+        return _summary_executor
+
+
+SUMMARY_PROMPT = """다음은 면접 준비 챗봇과 사용자의 이전 대화입니다.
+이후 대화에서 참조할 수 있도록 핵심 내용을 한국어로 간결하게 요약해주세요.
+- 사용자가 지원하는 회사, 직무, 기술 스택, 경력 등 사용자 정보
+- 생성된 면접 질문 (번호를 유지하여 "2번 질문"처럼 다시 참조할 수 있도록)
+- 사용자의 답변과 받은 피드백의 요점
+요약만 출력하세요."""
+
+
+def bedrock_summarizer(bedrock_runtime, model_id: Optional[str] = None) -> Summarizer:
+    """
+    Bedrock Claude로 대화를 요약하는 요약 함수 생성
+    
+    Args:
+        bedrock_runtime: boto3 bedrock-runtime 클라이언트
+        model_id: 요약 모델 ID (기본값: settings.memory_summary_model_id)
+        
+    Returns:
+        요약 함수
+    """
+    model_id = model_id or settings.memory_summary_model_id
+    
+    def summarize(previous_summary: str, messages: List[Dict]) -> str:
+        transcript = "\n".join(
+            f"{'사용자' if message['role'] == 'user' else '어시스턴트'}: {message['content']}"
+            for message in messages
+        )
+        content = f"[기존 요약]\n{previous_summary}\n\n[이어진 대화]\n{transcript}" if previous_summary else transcript
+        
+        response = bedrock_runtime.invoke_model(
+            modelId=model_id,
+            body=json.dumps({
+                "anthropic_version": "bedrock-2023-05-31",
+                "max_tokens": settings.memory_summary_max_tokens,
+                "system": SUMMARY_PROMPT,
+                "messages": [{"role": "user", "content": [{"type": "text", "text": content}]}]
+            })
+        )
+        result = json.loads(response["body"].read())
+        return "".join(block.get("text", "") for block in result.get("content", []) if block.get("type") == "text").strip()
+    
+    return summarize
+
+
+class SummarizingMemory:
+    """
+    최근 대화는 원문으로, 그 이전 대화는 누적 요약으로 유지하는 대화 메모리
+    
+    - 원문 대화가 memory_summary_trigger_tokens를 넘으면 최근 memory_recent_tokens만 남기고
+      나머지를 백그라운드 스레드에서 요약 (응답 생성 경로에서는 기다리지 않음)
+    - 요약이 끝나기 전까지는 원문을 그대로 사용하므로 대화 맥락이 갑자기 끊기지 않음
+    """
+    
+    def __init__(
+        self,
+        summarizer: Optional[Summarizer] = None,
+        recent_tokens: Optional[int] = None,
+        trigger_tokens: Optional[int] = None,
+        max_messages: Optional[int] = None
+    ):
+        """
+        Args:
+            summarizer: 요약 함수 (None이면 요약하지 않고 max_messages개만 유지)
+            recent_tokens: 원문으로 유지할 최근 대화 토큰 (기본값: settings.memory_recent_tokens)
+            trigger_tokens: 요약을 시작할 원문 대화 토큰 (기본값: settings.memory_summary_trigger_tokens)
+            max_messages: 원문 메시지 최대 개수 (요약 실패가 이어질 때의 상한, 기본값: settings.memory_max_messages)
+        """
+        self.summarizer = summarizer
+        self.recent_tokens = recent_tokens or settings.memory_recent_tokens
+        self.trigger_tokens = trigger_tokens or settings.memory_summary_trigger_tokens
+        self.max_messages = max_messages or settings.memory_max_messages
+        
+        self.summary = ""
+        self.messages: List[Dict] = []
+        # 지금까지 추가된 전체 메시지 수 (요약된 메시지 포함, 저장된 면접 기록과 맞출 때 사용)
+        self.message_count = 0
+        self._message_tokens: List[int] = []
+        self._lock = threading.Lock()
+        self._pending: Optional[Future] = None
+    
+    def add_user_message(self, content: str):
+        """사용자 메시지 추가"""
+        self.add_message("user", content)
+    
+    def add_ai_message(self, content: str):
+        """어시스턴트 메시지 추가 (필요하면 백그라운드 요약 시작)"""
+        self.add_message("assistant", content)
+    
+    def add_message(self, role: str, content: str):
+        """메시지 추가"""
+        with self._lock:
+            self.messages.append({"role": role, "content": content})
+            self._message_tokens.append(estimate_tokens(content))
+            self.message_count += 1
+        self._maybe_summarize()
+    
+    def history(self) -> List[Dict]:
+        """요약되지 않은 최근 대화 (원문)"""
+        with self._lock:
+            return list(self.messages)
+    
+    def size_bytes(self) -> int:
+        """메모리에 보관 중인 대화/요약 텍스트 크기 (UTF-8 바이트, 세션 저장소 상한 계산용)"""
+        with self._lock:
+            return len(self.summary.encode("utf-8")) + sum(
+                len(message["content"].encode("utf-8")) for message in self.messages
+            )
+    
+    def to_dict(self) -> Dict:
+        """직렬화 (세션 저장소가 SQLite로 내보낼 때 사용, 진행 중인 요약은 포함하지 않음)"""
+        with self._lock:
+            return {"summary": self.summary, "messages": list(self.messages), "message_count": self.message_count}
+    
+    @classmethod
+    def from_dict(cls, data: Dict, summarizer: Optional[Summarizer] = None) -> "SummarizingMemory":
+        """
+        to_dict 결과로 메모리 복원
+        
+        Args:
+            data: to_dict 결과
+            summarizer: 요약 함수
+            
+        Returns:
+            복원된 메모리
+        """
+        memory = cls(summarizer=summarizer)
+        memory.summary = data.get("summary", "")
+        memory.messages = list(data.get("messages", []))
+        memory._message_tokens = [estimate_tokens(message["content"]) for message in memory.messages]
+        memory.message_count = data.get("message_count", len(memory.messages))
+        return memory
+    
+    @property
+    def is_summarizing(self) -> bool:
+        """백그라운드 요약 진행 중 여부"""
+        return self._pending is not None and not self._pending.done()
+    
+    def wait(self, timeout: Optional[float] = None):
+        """진행 중인 요약이 끝날 때까지 대기 (종료/테스트용)"""
+        pending = self._pending
+        while pending is not None:
+            pending.result(timeout=timeout)
+            if pending is self._pending:
+                break
+            pending = self._pending
+    
+    def _maybe_summarize(self):
+        with self._lock:
+            if self.is_summarizing:
+                return
+            
+            if self.summarizer is None or sum(self._message_tokens) <= self.trigger_tokens:
+                # 요약하지 않는 경우에도 원문 메시지 수는 제한
+                if len(self.messages) > self.max_messages:
+                    overflow = len(self.messages) - self.max_messages
+                    del self.messages[:overflow]
+                    del self._message_tokens[:overflow]
+                return
+            
+            # 최근 recent_tokens 이내(최소 2개 메시지)만 원문으로 남기고 그 앞을 요약
+            keep = 0
+            kept_tokens = 0
+            for tokens in reversed(self._message_tokens):
+                if keep >= 2 and kept_tokens + tokens > self.recent_tokens:
+                    break
+                keep += 1
+                kept_tokens += tokens
+            summarize_count = len(self.messages) - keep
+            if summarize_count <= 0:
+                return
+            
+            to_summarize = self.messages[:summarize_count]
+            previous_summary = self.summary
+            self._pending = _get_executor().submit(
+                self._summarize, previous_summary, to_summarize, summarize_count
+            )
+    
+    def _summarize(self, previous_summary: str, messages: List[Dict], count: int):
+        """백그라운드 스레드에서 요약 후 요약된 원문 메시지 제거"""
+        try:
+            summary = self.summarizer(previous_summary, messages)
+        except Exception:
+            # 요약 실패 시 원문을 유지하고 다음 메시지 추가 시 다시 시도 (원문 메시지 수만 제한)
+            summary = ""
+        
+        with self._lock:
+            self._pending = None
+            if not summary:
+                if len(self.messages) > self.max_messages:
+                    overflow = len(self.messages) - self.max_messages
+                    del self.messages[:overflow]
+                    del self._message_tokens[:overflow]
+                return
+            
+            # 요약하는 동안 메시지는 뒤에만 추가되므로 앞쪽 count개가 요약 대상과 같음
+            self.summary = summary
+            del self.messages[:count]
+            del self._message_tokens[:count]
+        
+        # 요약하는 동안 추가된 메시지로 다시 기준을 넘었으면 이어서 요약
+        self._maybe_summarize()
@@ -3,10 +3,11 @@
 """
 import requests
 from bs4 import BeautifulSoup
-from typing import Optional, List
+from typing import Dict, Optional, List
 from urllib.parse import urljoin, urlparse
 import time
 import re
+from app.services.metrics import metrics
 
 
 class CrawlerService:
@@ -33,6 +34,39 @@ class CrawlerService:
         Returns:
             크롤링된 텍스트 내용
         """
+        with metrics.span("crawl_fetch"):
+            page = self.fetch_page(url, max_length)
+        if page["text"] is not None:
+            return page["text"]
+        try:
+            with metrics.span("crawl_clean"):
+                return clean_html(page["html"], max_length)
+        except Exception as e:
+            raise Exception(f"크롤링 처리 중 오류: {str(e)}")
+    
+    def fetch_page(
+        self,
+        url: str,
+        max_length: int = 50000,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> Dict:
+        """
+        URL 내려받기 (I/O 단계, HTML 정리는 clean_html에서 별도로 수행)
+        
+        JavaScript 렌더링이 필요한 사이트(Selenium)는 브라우저에서 바로 텍스트를 추출하므로 text를 채워 반환합니다.
+        etag/last_modified를 주면 조건부 요청을 보내고, 서버가 304로 응답하면 not_modified만 True로 반환합니다.
+        
+        Args:
+            url: 크롤링할 URL
+            max_length: 최대 텍스트 길이 (Selenium 추출 시 적용)
+            etag: 이전 응답의 ETag (If-None-Match)
+            last_modified: 이전 응답의 Last-Modified (If-Modified-Since)
+            
+        Returns:
+            {"url", "html": HTML 바이트 또는 None, "text": 추출된 텍스트 또는 None,
+             "not_modified", "etag", "last_modified"}
+        """
         try:
             # URL 유효성 검사
             parsed = urlparse(url)
@@ -41,82 +75,55 @@ class CrawlerService:
             
             # GitHub URL 처리
             if 'github.com' in parsed.netloc:
-                return self._crawl_github(url, max_length)
+                return self._page(url, text=self._crawl_github(url, max_length))
             
             # 카카오 기술 블로그 URL 처리 (JavaScript 렌더링 필요)
             if 'tech.kakao.com' in parsed.netloc:
-                return self._crawl_kakao_tech(url, max_length)
+                return self._page(url, text=self._crawl_kakao_tech(url, max_length))
             
             # 네이버 블로그 URL 처리 (Selenium 필요)
             if 'blog.naver.com' in parsed.netloc:
-                return self._crawl_naver_blog(url, max_length)
+                return self._page(url, text=self._crawl_naver_blog(url, max_length))
             
             # 티스토리 블로그 URL 처리 (Selenium 필요)
             if 'tistory.com' in parsed.netloc:
-                return self._crawl_tistory(url, max_length)
+                return self._page(url, text=self._crawl_tistory(url, max_length))
             
             # 일반 URL 크롤링 (SSL 인증서 검증 비활성화 - 개발 환경용)
-            response = self.session.get(url, timeout=10, verify=False)
+            headers = {}
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+            response = self.session.get(url, timeout=10, verify=False, headers=headers)
+            if response.status_code == 304:
+                return self._page(url, not_modified=True, response=response)
             response.raise_for_status()
-            
-            # HTML 파싱
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 불필요한 태그 제거 (더 많은 태그 추가)
-            unwanted_tags = [
-                'script', 'style', 'nav', 'footer', 'header', 'aside',
-                'noscript', 'iframe', 'embed', 'object', 'form',
-                'button', 'input', 'select', 'textarea', 'label'
-            ]
-            for tag in soup(unwanted_tags):
-                tag.decompose()
-            
-            # aria-label이나 role로 네비게이션 요소 제거
-            for tag in soup.find_all(attrs={'role': ['navigation', 'banner', 'complementary', 'search']}):
-                tag.decompose()
-            
-            # aria-label에 "바로가기", "메뉴" 등이 포함된 요소 제거
-            for tag in soup.find_all(attrs={'aria-label': True}):
-                aria_label = tag.get('aria-label', '').lower()
-                if any(keyword in aria_label for keyword in ['바로가기', '메뉴', 'navigation', 'menu', 'skip']):
-                    tag.decompose()
-            
-            # class나 id에 nav, menu, header, footer가 포함된 요소 제거
-            for tag in soup.find_all(class_=lambda x: x and any(keyword in str(x).lower() for keyword in ['nav', 'menu', 'header', 'footer', 'sidebar', 'skip'])):
-                tag.decompose()
-            for tag in soup.find_all(id=lambda x: x and any(keyword in str(x).lower() for keyword in ['nav', 'menu', 'header', 'footer', 'sidebar', 'skip'])):
-                tag.decompose()
-            
-            # 메인 콘텐츠 영역 우선 추출 시도
-            main_content = None
-            for selector in ['main', 'article', '[role="main"]', '.content', '#content', '.main-content', '#main-content']:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    break
-            
-            # 메인 콘텐츠가 있으면 그것만 사용, 없으면 전체 사용
-            if main_content:
-                text = main_content.get_text(separator='\n', strip=True)
-            else:
-                text = soup.get_text(separator='\n', strip=True)
-            
-            # 텍스트 정리
-            lines = [line.strip() for line in text.split('\n') if line.strip()]
-            # 너무 짧은 줄 제거 (1-2자만 있는 줄)
-            lines = [line for line in lines if len(line) > 2]
-            cleaned_text = '\n'.join(lines)
-            
-            # 길이 제한
-            if len(cleaned_text) > max_length:
-                cleaned_text = cleaned_text[:max_length] + "... (내용이 너무 길어 일부만 추출했습니다)"
-            
-            return cleaned_text
+            return self._page(url, html=response.content, response=response)
         
         except requests.exceptions.RequestException as e:
             raise Exception(f"웹 크롤링 오류: {str(e)}")
         except Exception as e:
             raise Exception(f"크롤링 처리 중 오류: {str(e)}")
     
+    @staticmethod
+    def _page(
+        url: str,
+        html: Optional[bytes] = None,
+        text: Optional[str] = None,
+        not_modified: bool = False,
+        response: Optional[requests.Response] = None
+    ) -> Dict:
+        """fetch_page 결과 딕셔너리 (응답이 있으면 조건부 요청용 검증자 포함)"""
+        return {
+            "url": url,
+            "html": html,
+            "text": text,
+            "not_modified": not_modified,
+            "etag": response.headers.get('ETag') if response is not None else None,
+            "last_modified": response.headers.get('Last-Modified') if response is not None else None
+        }
+    
     def crawl_multiple_urls(self, urls: List[str]) -> List[dict]:
         """
         여러 URL을 크롤링
@@ -177,6 +184,10 @@ class CrawlerService:
         except Exception as e:
             return []
     
+    def _mark_headings(self, soup: BeautifulSoup):
+        """h1~h6 태그 내용 앞에 마크다운 헤딩 표시(#)를 붙임 (mark_headings 참고)"""
+        mark_headings(soup)
+    
     def _crawl_github(self, url: str, max_length: int = 50000) -> str:
         """
         GitHub 페이지 크롤링 (Selenium 사용)
@@ -305,6 +316,9 @@ class CrawlerService:
                 for tag in soup.find_all(class_=lambda x: x and any(keyword in str(x).lower() for keyword in ['header', 'footer', 'sidebar', 'navigation', 'menu'])):
                     tag.decompose()
                 
+                # 제목 태그를 마크다운 헤딩으로 표시 (청크 분할 시 문서 구조 보존용)
+                self._mark_headings(soup)
+                
                 # 메인 콘텐츠 영역 찾기
                 main_content = None
                 for selector in ['main', 'article', '[role="main"]', '.repository-content', '.Box', '.markdown-body']:
@@ -470,6 +484,9 @@ class CrawlerService:
                 ])):
                     tag.decompose()
                 
+                # 제목 태그를 마크다운 헤딩으로 표시 (청크 분할 시 문서 구조 보존용)
+                self._mark_headings(soup)
+                
                 # 카카오 기술 블로그 본문 영역 찾기
                 main_content = None
                 selectors = [
@@ -665,6 +682,9 @@ class CrawlerService:
                 ])):
                     tag.decompose()
                 
+                # 제목 태그를 마크다운 헤딩으로 표시 (청크 분할 시 문서 구조 보존용)
+                self._mark_headings(soup)
+                
                 # 네이버 블로그 본문 영역 찾기 (여러 선택자 시도)
                 main_content = None
                 selectors = [
@@ -862,6 +882,9 @@ class CrawlerService:
                 ])):
                     tag.decompose()
                 
+                # 제목 태그를 마크다운 헤딩으로 표시 (청크 분할 시 문서 구조 보존용)
+                self._mark_headings(soup)
+                
                 # 티스토리 본문 영역 찾기 (여러 선택자 시도)
                 main_content = None
                 selectors = [
@@ -924,3 +947,84 @@ class CrawlerService:
         except Exception as e:
             raise Exception(f"티스토리 크롤링 중 오류: {str(e)}")
 
+
+def mark_headings(soup: BeautifulSoup):
+    """
+    h1~h6 태그 내용 앞에 마크다운 헤딩 표시(#)를 붙임
+    get_text 이후에도 제목 계층이 남아 RAG 청크 분할 시 섹션 경계로 사용됨
+    
+    Args:
+        soup: 파싱된 HTML
+    """
+    for tag in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+        heading_text = tag.get_text(' ', strip=True)
+        if heading_text:
+            tag.string = f"{'#' * int(tag.name[1])} {heading_text}"
+
+
+def clean_html(html: bytes, max_length: int = 50000) -> str:
+    """
+    HTML에서 본문 텍스트 추출 (CPU 단계, 모듈 함수라 프로세스 풀에서 실행 가능)
+    
+    Args:
+        html: 내려받은 HTML
+        max_length: 최대 텍스트 길이
+        
+    Returns:
+        정리된 텍스트
+    """
+    # HTML 파싱
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # 불필요한 태그 제거 (더 많은 태그 추가)
+    unwanted_tags = [
+        'script', 'style', 'nav', 'footer', 'header', 'aside',
+        'noscript', 'iframe', 'embed', 'object', 'form',
+        'button', 'input', 'select', 'textarea', 'label'
+    ]
+    for tag in soup(unwanted_tags):
+        tag.decompose()
+    
+    # aria-label이나 role로 네비게이션 요소 제거
+    for tag in soup.find_all(attrs={'role': ['navigation', 'banner', 'complementary', 'search']}):
+        tag.decompose()
+    
+    # aria-label에 "바로가기", "메뉴" 등이 포함된 요소 제거
+    for tag in soup.find_all(attrs={'aria-label': True}):
+        aria_label = tag.get('aria-label', '').lower()
+        if any(keyword in aria_label for keyword in ['바로가기', '메뉴', 'navigation', 'menu', 'skip']):
+            tag.decompose()
+    
+    # class나 id에 nav, menu, header, footer가 포함된 요소 제거
+    for tag in soup.find_all(class_=lambda x: x and any(keyword in str(x).lower() for keyword in ['nav', 'menu', 'header', 'footer', 'sidebar', 'skip'])):
+        tag.decompose()
+    for tag in soup.find_all(id=lambda x: x and any(keyword in str(x).lower() for keyword in ['nav', 'menu', 'header', 'footer', 'sidebar', 'skip'])):
+        tag.decompose()
+    
+    # 제목 태그를 마크다운 헤딩으로 표시 (청크 분할 시 문서 구조 보존용)
+    mark_headings(soup)
+    
+    # 메인 콘텐츠 영역 우선 추출 시도
+    main_content = None
+    for selector in ['main', 'article', '[role="main"]', '.content', '#content', '.main-content', '#main-content']:
+        main_content = soup.select_one(selector)
+        if main_content:
+            break
+    
+    # 메인 콘텐츠가 있으면 그것만 사용, 없으면 전체 사용
+    if main_content:
+        text = main_content.get_text(separator='\n', strip=True)
+    else:
+        text = soup.get_text(separator='\n', strip=True)
+    
+    # 텍스트 정리
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    # 너무 짧은 줄 제거 (1-2자만 있는 줄)
+    lines = [line for line in lines if len(line) > 2]
+    cleaned_text = '\n'.join(lines)
+    
+    # 길이 제한
+    if len(cleaned_text) > max_length:
+        cleaned_text = cleaned_text[:max_length] + "... (내용이 너무 길어 일부만 추출했습니다)"
+    
+    return cleaned_text
@@ -0,0 +1,263 @@
+"""
+임베딩 제공자 (Bedrock Titan / 로컬 CPU 모델)와 임베딩 설정별 컬렉션 접두사
+"""
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from app.config import settings
+
+
+# 지원하는 임베딩 제공자
+EMBEDDING_PROVIDERS = ["bedrock", "local"]
+
+# Titan Text Embeddings v2가 지원하는 출력 차원
+TITAN_V2_DIMENSIONS = [256, 512, 1024]
+
+# 설정을 도입하기 전 저장된 벡터의 차원/정규화 (Titan v2 API 기본값)
+DEFAULT_DIMENSIONS = 1024
+DEFAULT_NORMALIZE = True
+
+
+def supports_dimensions(model_id: Optional[str] = None) -> bool:
+    """출력 차원/정규화를 지정할 수 있는 모델인지 확인 (Titan v2만 지원)"""
+    return "titan-embed-text-v2" in (model_id or settings.embedding_model)
+
+
+def embedding_model_kwargs(
+    model_id: Optional[str] = None,
+    dimensions: Optional[int] = None,
+    normalize: Optional[bool] = None
+) -> Optional[Dict]:
+    """
+    BedrockEmbeddings model_kwargs (Titan v2 요청 본문의 dimensions/normalize)
+    
+    Args:
+        model_id: 임베딩 모델 ID (기본값: settings.embedding_model)
+        dimensions: 출력 차원 (기본값: settings.embedding_dimensions)
+        normalize: 단위 벡터로 정규화할지 여부 (기본값: settings.embedding_normalize)
+        
+    Returns:
+        model_kwargs (차원을 지정할 수 없는 모델이면 None)
+    """
+    if not supports_dimensions(model_id):
+        return None
+    dimensions = dimensions or settings.embedding_dimensions
+    normalize = settings.embedding_normalize if normalize is None else normalize
+    if dimensions not in TITAN_V2_DIMENSIONS:
+        raise Exception(
+            f"지원하지 않는 임베딩 차원입니다: {dimensions} (사용 가능: {', '.join(map(str, TITAN_V2_DIMENSIONS))})"
+        )
+    return {"dimensions": dimensions, "normalize": normalize}
+
+
+def create_bedrock_embeddings(
+    client,
+    model_id: Optional[str] = None,
+    dimensions: Optional[int] = None,
+    normalize: Optional[bool] = None
+):
+    """
+    설정된 차원/정규화로 BedrockEmbeddings 생성
+    
+    Args:
+        client: bedrock-runtime boto3 클라이언트
+        model_id: 임베딩 모델 ID (기본값: settings.embedding_model)
+        dimensions: 출력 차원 (기본값: settings.embedding_dimensions)
+        normalize: 정규화 여부 (기본값: settings.embedding_normalize)
+        
+    Returns:
+        BedrockEmbeddings
+    """
+    from langchain_community.embeddings import BedrockEmbeddings
+    
+    model_id = model_id or settings.embedding_model
+    return BedrockEmbeddings(
+        model_id=model_id,
+        client=client,
+        model_kwargs=embedding_model_kwargs(model_id, dimensions, normalize)
+    )
+
+
+class LocalEmbeddings:
+    """
+    로컬 CPU 임베딩 모델 (BedrockEmbeddings와 같은 embed_documents/embed_query 인터페이스)
+    
+    - 모델은 첫 호출 시 로드 (sentence-transformers 또는 ONNX Runtime)
+    - 여러 텍스트를 batch_size 단위로 묶어 한 번에 계산
+    - 네트워크 호출이 없으므로 요청 간격 제한 없이 호출 가능 (rate_limited = False)
+    """
+    
+    rate_limited = False
+    
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        backend: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        threads: Optional[int] = None,
+        normalize: Optional[bool] = None
+    ):
+        """
+        Args:
+            model_name: sentence-transformers 모델 이름 (기본값: settings.local_embedding_model)
+            backend: "torch" 또는 "onnx" (기본값: settings.local_embedding_backend)
+            batch_size: 배치 크기 (기본값: settings.local_embedding_batch_size)
+            threads: CPU 스레드 수, 0이면 라이브러리 기본값 (기본값: settings.local_embedding_threads)
+            normalize: 단위 벡터로 정규화할지 여부 (기본값: settings.local_embedding_normalize)
+        """
+        self.model_name = model_name or settings.local_embedding_model
+        self.backend = backend or settings.local_embedding_backend
+        self.batch_size = batch_size or settings.local_embedding_batch_size
+        self.threads = threads if threads is not None else settings.local_embedding_threads
+        self.normalize = settings.local_embedding_normalize if normalize is None else normalize
+        
+        self._model = None
+        self._tokenizer = None
+        self._load_lock = threading.Lock()
+    
+    def _load_model(self):
+        """모델 로드 (최초 1회)"""
+        if self._model is not None:
+            return
+        
+        with self._load_lock:
+            if self._model is not None:
+                return
+            
+            if self.backend == "onnx":
+                self._load_onnx_model()
+                return
+            
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                raise Exception("로컬 임베딩을 위해 sentence-transformers가 필요합니다. pip install sentence-transformers")
+            
+            if self.threads:
+                import torch
+                
+                torch.set_num_threads(self.threads)
+            self._model = SentenceTransformer(self.model_name, device="cpu")
+    
+    def _load_onnx_model(self):
+        """ONNX Runtime 모델 로드 (처음이면 변환해 settings.local_embedding_onnx_directory에 저장)"""
+        try:
+            import onnxruntime
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+            from transformers import AutoTokenizer
+        except ImportError:
+            raise Exception("ONNX 임베딩 모델을 위해 optimum과 onnxruntime이 필요합니다. pip install optimum[onnxruntime]")
+        
+        export_dir = Path(settings.local_embedding_onnx_directory) / self.model_name.replace("/", "__")
+        if not (export_dir / "model.onnx").exists():
+            model = ORTModelForFeatureExtraction.from_pretrained(self.model_name, export=True)
+            model.save_pretrained(export_dir)
+            AutoTokenizer.from_pretrained(self.model_name).save_pretrained(export_dir)
+        
+        session_options = onnxruntime.SessionOptions()
+        if self.threads:
+            session_options.intra_op_num_threads = self.threads
+        self._tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        self._model = ORTModelForFeatureExtraction.from_pretrained(export_dir, session_options=session_options)
+    
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        """텍스트 배치 임베딩"""
+        if not texts:
+            return []
+        self._load_model()
+        
+        if self.backend != "onnx":
+            vectors = self._model.encode(
+                texts,
+                batch_size=self.batch_size,
+                normalize_embeddings=self.normalize,
+                show_progress_bar=False
+            )
+            return [[float(value) for value in vector] for vector in vectors]
+        
+        import numpy as np
+        
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            inputs = self._tokenizer(
+                texts[start:start + self.batch_size],
+                padding=True,
+                truncation=True,
+                return_tensors="np"
+            )
+            hidden = self._model(**inputs).last_hidden_state
+            # 패딩을 제외한 토큰 평균 (sentence-transformers mean pooling과 같음)
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if self.normalize:
+                pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            vectors.extend(pooled.tolist())
+        return vectors
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """문서 청크 임베딩"""
+        return self._encode(list(texts))
+    
+    def embed_query(self, text: str) -> List[float]:
+        """질문 임베딩"""
+        return self._encode([text])[0]
+
+
+def create_embeddings(client=None, provider: Optional[str] = None):
+    """
+    설정된 제공자의 임베딩 모델 생성
+    
+    Args:
+        client: bedrock-runtime boto3 클라이언트 (bedrock 제공자에서 사용)
+        provider: "bedrock" 또는 "local" (기본값: settings.embedding_provider)
+        
+    Returns:
+        embed_documents/embed_query를 제공하는 임베딩 객체
+    """
+    provider = provider or settings.embedding_provider
+    if provider == "bedrock":
+        return create_bedrock_embeddings(client)
+    if provider == "local":
+        return LocalEmbeddings()
+    raise Exception(f"지원하지 않는 임베딩 제공자입니다: {provider} (사용 가능: {', '.join(EMBEDDING_PROVIDERS)})")
+
+
+def collection_prefix(
+    dimensions: Optional[int] = None,
+    normalize: Optional[bool] = None,
+    base: Optional[str] = None,
+    provider: Optional[str] = None
+) -> str:
+    """
+    임베딩 설정별 컬렉션 접두사
+    
+    차원이 다른 벡터는 한 컬렉션에 섞을 수 없으므로 기본 설정(Titan 1024차원, 정규화)이 아니면
+    접두사에 설정을 붙여 별도 컬렉션에 저장합니다. 기존 컬렉션을 그대로 둔 채 새 설정으로
+    다시 임베딩해 두고, 설정만 바꿔 전환할 수 있습니다.
+    
+    Args:
+        dimensions: Titan 출력 차원 (기본값: settings.embedding_dimensions)
+        normalize: Titan 정규화 여부 (기본값: settings.embedding_normalize)
+        base: 기본 접두사 (기본값: settings.chroma_collection_prefix)
+        provider: 임베딩 제공자 (기본값: settings.embedding_provider)
+        
+    Returns:
+        예: "interview" (기본 설정), "interview_d512", "interview_d256_raw", "interview_st1a2b3c4d" (로컬 모델)
+    """
+    base = base or settings.chroma_collection_prefix
+    provider = provider or settings.embedding_provider
+    if provider == "local":
+        # 모델 이름은 길 수 있으므로 해시로 줄임 (컬렉션 이름 최대 63자)
+        profile = f"{settings.local_embedding_model}:{settings.local_embedding_normalize}"
+        return f"{base}_st{hashlib.sha1(profile.encode('utf-8')).hexdigest()[:8]}"
+    if not supports_dimensions():
+        return base
+    dimensions = dimensions or settings.embedding_dimensions
+    normalize = settings.embedding_normalize if normalize is None else normalize
+    suffix = ""
+    if dimensions != DEFAULT_DIMENSIONS:
+        suffix += f"_d{dimensions}"
+    if normalize != DEFAULT_NORMALIZE:
+        suffix += "_raw"
+    return base + suffix
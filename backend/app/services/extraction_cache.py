@@ -0,0 +1,103 @@
+"""
+PDF 추출 결과 캐시 (파일 내용 해시 기반 디스크 캐시)
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+from app.config import settings
+
+
+# 추출/섹션 분석 로직이 바뀌면 올려서 기존 캐시를 무효화
+EXTRACTOR_VERSION = "1"
+
+
+class ExtractionCache:
+    """
+    추출 결과(텍스트, 페이지별 텍스트, 섹션, 통계, 청크)를 디스크에 저장하는 캐시
+    
+    키는 파일 바이트의 sha256과 추출기 식별자(버전 + 백엔드 구성)로 만들어지므로
+    같은 파일을 다시 업로드하면 파싱 없이 바로 결과를 돌려줍니다.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리 (기본값: settings.pdf_cache_directory)
+        """
+        self.cache_dir = Path(cache_dir or settings.pdf_cache_directory)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def content_hash(file_content: bytes) -> str:
+        """파일 바이트의 sha256 해시"""
+        return hashlib.sha256(file_content).hexdigest()
+    
+    @staticmethod
+    def make_key(content_hash: str, extractor_id: str) -> str:
+        """
+        캐시 키 생성
+        
+        Args:
+            content_hash: 파일 내용 해시
+            extractor_id: 추출기 식별자 (버전, 백엔드 구성)
+            
+        Returns:
+            캐시 키
+        """
+        extractor_digest = hashlib.sha256(f"{EXTRACTOR_VERSION}:{extractor_id}".encode()).hexdigest()[:12]
+        return f"{content_hash}_{extractor_digest}"
+    
+    def _path(self, key: str) -> Path:
+        # 한 디렉토리에 파일이 너무 많아지지 않도록 해시 앞 2자리로 분산
+        return self.cache_dir / key[:2] / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """캐시 조회 (없거나 손상된 경우 None)"""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+    
+    def put(self, key: str, data: Dict):
+        """캐시 저장 (임시 파일에 쓴 뒤 교체하여 동시 접근 시에도 깨지지 않도록 함)"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def get_chunks(self, key: str, chunker_key: str) -> Optional[List[Dict]]:
+        """
+        캐시된 청크 조회
+        
+        Args:
+            key: 추출 결과 캐시 키
+            chunker_key: 청크 분할 설정 식별자
+            
+        Returns:
+            청크 리스트 (없으면 None)
+        """
+        entry = self.get(key)
+        if not entry:
+            return None
+        return entry.get("chunks", {}).get(chunker_key)
+    
+    def put_chunks(self, key: str, chunker_key: str, chunks: List[Dict]):
+        """추출 결과 캐시 항목에 청크 분할 결과 추가"""
+        entry = self.get(key)
+        if entry is None:
+            return
+        entry.setdefault("chunks", {})[chunker_key] = chunks
+        self.put(key, entry)
@@ -0,0 +1,305 @@
+"""
+면접 대화 히스토리 저장소 (SQLAlchemy, 백그라운드 일괄 쓰기)
+"""
+import atexit
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+
+
+class HistoryStore:
+    """
+    사용자/세션별 면접 대화 기록 저장소
+    
+    - 쓰기: append는 큐에 넣고 바로 반환, 백그라운드 스레드가 모아서 한 트랜잭션으로 저장
+      (스트리밍 응답 경로에 DB 쓰기 지연을 더하지 않음)
+    - SQLite는 WAL 모드로 열어 쓰기 중에도 히스토리 조회가 막히지 않음
+    - 읽기: (user_id, session_id, created_at) 인덱스를 사용하는 커서 기반 페이지 조회
+    """
+    
+    def __init__(
+        self,
+        database_url: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            database_url: DB URL (기본값: settings.database_url)
+            batch_size: 한 번에 저장할 최대 메시지 수 (기본값: settings.history_batch_size)
+            flush_interval: 메시지를 모으는 최대 대기 시간 초 (기본값: settings.history_flush_interval)
+        """
+        try:
+            from sqlalchemy import (
+                Column, Float, Index, Integer, MetaData, String, Table, Text, create_engine, event
+            )
+        except ImportError:
+            raise Exception("히스토리 저장을 위해 sqlalchemy가 필요합니다. pip install sqlalchemy")
+        
+        self.database_url = database_url or settings.database_url
+        self.batch_size = batch_size or settings.history_batch_size
+        self.flush_interval = flush_interval or settings.history_flush_interval
+        
+        self.engine = create_engine(self.database_url)
+        if self.engine.dialect.name == "sqlite":
+            @event.listens_for(self.engine, "connect")
+            def _set_sqlite_pragma(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")  # WAL에서는 NORMAL로도 손상 없이 안전
+                cursor.close()
+        
+        metadata = MetaData()
+        self.messages = Table(
+            "interview_messages",
+            metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("user_id", String(128), nullable=False),
+            Column("session_id", String(128), nullable=False),
+            Column("role", String(16), nullable=False),
+            Column("content", Text, nullable=False),
+            Column("created_at", Float, nullable=False),
+            Index("ix_interview_messages_user_session_created", "user_id", "session_id", "created_at")
+        )
+        metadata.create_all(self.engine)
+        
+        # (메시지, 저장 완료 이벤트) 또는 종료 표시 None
+        self._queue: "queue.Queue[Optional[Tuple[Dict, threading.Event]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+        self.stats = {"queued": 0, "written": 0, "batches": 0, "write_errors": 0}
+    
+    def append(self, user_id: str, session_id: str, role: str, content: str) -> threading.Event:
+        """
+        메시지 저장 요청 (즉시 반환, 백그라운드에서 일괄 저장)
+        
+        Args:
+            user_id: 사용자 ID
+            session_id: 대화 세션 ID
+            role: "user" 또는 "assistant"
+            content: 메시지 내용
+            
+        Returns:
+            이 메시지가 들어간 배치의 저장이 끝나면 설정되는 이벤트
+            (다른 워커가 바로 읽어야 하면 wait로 기다림, 저장 실패 시에도 설정됨)
+        """
+        written = threading.Event()
+        self._queue.put(({
+            "user_id": user_id,
+            "session_id": session_id,
+            "role": role,
+            "content": content,
+            "created_at": time.time()
+        }, written))
+        self.stats["queued"] += 1
+        return written
+    
+    def _write_loop(self):
+        """큐의 메시지를 batch_size개 또는 flush_interval초 단위로 모아 저장"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            try:
+                with self.engine.begin() as connection:
+                    connection.execute(self.messages.insert(), [row for row, _ in batch])
+                self.stats["written"] += len(batch)
+                self.stats["batches"] += 1
+            except Exception:
+                # 저장 실패는 대화를 막지 않음 (해당 배치만 유실)
+                self.stats["write_errors"] += len(batch)
+            finally:
+                for _, written in batch:
+                    written.set()
+                for _ in range(len(batch) + (1 if stop else 0)):
+                    self._queue.task_done()
+            
+            if stop:
+                return
+    
+    def flush(self):
+        """대기 중인 메시지가 모두 저장될 때까지 대기"""
+        if self._writer.is_alive():
+            self._queue.join()
+    
+    def close(self):
+        """남은 메시지를 저장하고 쓰기 스레드 종료"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+    
+    def list_sessions(
+        self,
+        user_id: str,
+        limit: int = 20,
+        before: Optional[Tuple[float, str]] = None
+    ) -> Tuple[List[Dict], Optional[Tuple[float, str]]]:
+        """
+        사용자의 대화 세션 목록 (최근 대화 순)
+        
+        Args:
+            user_id: 사용자 ID
+            limit: 페이지 크기
+            before: 이전 페이지가 반환한 커서 (last_at, session_id)
+            
+        Returns:
+            ([{session_id, started_at, last_at, message_count, preview}], 다음 페이지 커서 또는 None)
+        """
+        from sqlalchemy import and_, func, or_, select
+        
+        table = self.messages
+        last_at = func.max(table.c.created_at).label("last_at")
+        query = (
+            select(
+                table.c.session_id,
+                func.min(table.c.created_at).label("started_at"),
+                last_at,
+                func.count().label("message_count")
+            )
+            .where(table.c.user_id == user_id)
+            .group_by(table.c.session_id)
+            .order_by(last_at.desc(), table.c.session_id.desc())
+            .limit(limit + 1)
+        )
+        if before is not None:
+            # 마지막 대화 시각이 같은 세션은 session_id로 순서를 정해 페이지 경계에서 빠지지 않게 함
+            before_at, before_session_id = before
+            query = query.having(or_(
+                last_at < before_at,
+                and_(last_at == before_at, table.c.session_id < before_session_id)
+            ))
+        
+        with self.engine.connect() as connection:
+            rows = connection.execute(query).all()
+            sessions = [dict(row._mapping) for row in rows[:limit]]
+            
+            # 세션 미리보기: 첫 사용자 메시지
+            for session in sessions:
+                preview = connection.execute(
+                    select(table.c.content)
+                    .where(
+                        table.c.user_id == user_id,
+                        table.c.session_id == session["session_id"],
+                        table.c.role == "user"
+                    )
+                    .order_by(table.c.created_at, table.c.id)
+                    .limit(1)
+                ).scalar()
+                session["preview"] = (preview or "")[:100]
+        
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = (sessions[-1]["last_at"], sessions[-1]["session_id"])
+        return sessions, next_cursor
+    
+    def get_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        limit: int = 50,
+        before: Optional[Tuple[float, int]] = None
+    ) -> Tuple[List[Dict], Optional[Tuple[float, int]]]:
+        """
+        세션 메시지 조회 (최근 메시지부터 limit개씩, 반환은 시간 순)
+        
+        Args:
+            user_id: 사용자 ID
+            session_id: 대화 세션 ID
+            limit: 페이지 크기
+            before: 이전 페이지가 반환한 커서 (created_at, id)
+            
+        Returns:
+            ([{id, role, content, created_at}], 더 이전 메시지 커서 또는 None)
+        """
+        from sqlalchemy import and_, or_, select
+        
+        table = self.messages
+        query = (
+            select(table.c.id, table.c.role, table.c.content, table.c.created_at)
+            .where(table.c.user_id == user_id, table.c.session_id == session_id)
+            .order_by(table.c.created_at.desc(), table.c.id.desc())
+            .limit(limit + 1)
+        )
+        if before is not None:
+            created_at, message_id = before
+            query = query.where(or_(
+                table.c.created_at < created_at,
+                and_(table.c.created_at == created_at, table.c.id < message_id)
+            ))
+        
+        with self.engine.connect() as connection:
+            rows = connection.execute(query).all()
+        
+        messages = [dict(row._mapping) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = (messages[-1]["created_at"], messages[-1]["id"])
+        messages.reverse()
+        return messages, next_cursor
+    
+    def get_messages_since(self, user_id: str, session_id: str, offset: int) -> List[Dict]:
+        """
+        세션의 offset번째 이후 메시지 (시간 순, 메모리에 아직 없는 대화만 가져올 때 사용)
+        
+        Args:
+            user_id: 사용자 ID
+            session_id: 대화 세션 ID
+            offset: 건너뛸 메시지 수 (이미 반영한 메시지 수)
+            
+        Returns:
+            [{id, role, content, created_at}]
+        """
+        from sqlalchemy import select
+        
+        table = self.messages
+        query = (
+            select(table.c.id, table.c.role, table.c.content, table.c.created_at)
+            .where(table.c.user_id == user_id, table.c.session_id == session_id)
+            .order_by(table.c.created_at, table.c.id)
+            .offset(offset)
+        )
+        with self.engine.connect() as connection:
+            return [dict(row._mapping) for row in connection.execute(query).all()]
+    
+    def delete_session(self, user_id: str, session_id: str):
+        """세션 기록 삭제 (대기 중인 메시지를 먼저 저장)"""
+        self.flush()
+        table = self.messages
+        with self.engine.begin() as connection:
+            connection.execute(
+                table.delete().where(table.c.user_id == user_id, table.c.session_id == session_id)
+            )
+
+
+_history_store: Optional[HistoryStore] = None
+_history_store_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore:
+    """전역 히스토리 저장소 (프로세스 종료 시 남은 메시지 저장)"""
+    global _history_store
+    with _history_store_lock:
+        if _history_store is None:
+            _history_store = HistoryStore()
+            atexit.register(_history_store.close)
+        return _history_store
@@ -0,0 +1,372 @@
+"""
+문서 수집 작업 (크롤링 → RAG 추가) 정의 및 전역 작업 큐
+"""
+import asyncio
+import hashlib
+import threading
+import uuid
+from typing import Callable, Dict, List, Optional
+from app.config import settings
+from app.services.job_queue import JobQueue
+
+
+# 크롤링 작업 결과에 남길 본문 미리보기 길이 (전체 본문은 작업 DB에 저장하지 않음)
+CRAWL_PREVIEW_CHARS = 1000
+
+_services: Dict[str, object] = {}
+_services_lock = threading.Lock()
+
+
+def _get_service(name: str):
+    """작업자 스레드가 공유하는 서비스 인스턴스 (처음 사용할 때 생성)"""
+    with _services_lock:
+        if name not in _services:
+            if name == "crawler":
+                from app.services.crawler_service import CrawlerService
+                _services[name] = CrawlerService()
+            elif name == "rag":
+                from app.services.rag_service import RAGService
+                _services[name] = RAGService()
+            elif name == "pdf":
+                from app.services.pdf_service import PDFService
+                _services[name] = PDFService()
+        return _services[name]
+
+
+def _page_text(page: Dict) -> str:
+    """fetch_page 결과에서 정리된 본문 텍스트 추출"""
+    from app.services.crawler_service import clean_html
+    
+    if page["text"] is not None:
+        content = page["text"]
+    else:
+        try:
+            content = clean_html(page["html"])
+        except Exception as e:
+            raise Exception(f"크롤링 처리 중 오류: {str(e)}")
+    if not content or not content.strip():
+        raise Exception("크롤링된 내용이 없습니다.")
+    return content
+
+
+def crawl_job(payload: Dict, report: Callable[[float, str], None]) -> Dict:
+    """
+    URL 크롤링 작업 (auto_rag이면 RAG 추가 작업을 이어서 등록)
+    
+    Args:
+        payload: {"url", "auto_rag", "batch_id"}
+        report: 진행률 보고 함수
+        
+    Returns:
+        {"url", "length", "preview", "embed_job_id", "content_key"}
+        (결과에는 미리보기만 저장해 작업 행과 상태 조회 응답을 작게 유지, 전체 본문은 auto_rag이면 RAG 추가 작업
+         payload로 전달하고 아니면 추출 캐시에 저장해 get_crawl_content로 조회)
+    """
+    url = payload["url"]
+    report(0.1, f"크롤링 중: {url}")
+    page = _get_service("crawler").fetch_page(url)
+    content = _page_text(page)
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    
+    embed_job_id = None
+    content_key = None
+    if payload.get("auto_rag", True):
+        embed_job_id = get_ingest_queue().enqueue(
+            "embed",
+            {
+                "content": content,
+                "metadata": {"source": "crawler", "url": url},
+                # 최신성 확인용 조건부 요청 검증자 (RAG 저장 후 출처 카탈로그에 기록)
+                "etag": page.get("etag"),
+                "last_modified": page.get("last_modified")
+            },
+            idempotency_key=f"embed:{payload.get('batch_id')}:{url}:{content_hash}",
+            batch_id=payload.get("batch_id")
+        )
+    else:
+        # RAG에 바로 넣지 않는 경우 나중에 화면에서 추가할 수 있도록 전체 본문 보관 (내용 해시 키)
+        from app.services.extraction_cache import ExtractionCache
+        
+        content_key = f"{content_hash}_crawl"
+        ExtractionCache().put(content_key, {"url": url, "content": content})
+    
+    return {
+        "url": url,
+        "length": len(content),
+        "preview": content[:CRAWL_PREVIEW_CHARS],
+        "embed_job_id": embed_job_id,
+        "content_key": content_key
+    }
+
+
+def get_crawl_content(job_id: str) -> Optional[Dict]:
+    """
+    RAG 자동 추가 없이 크롤링한 작업의 전체 본문
+    
+    Args:
+        job_id: 크롤링 작업 ID
+        
+    Returns:
+        {"url", "content"} (작업이 없거나 아직 끝나지 않았거나 본문을 보관하지 않은 경우 None)
+    """
+    from app.services.extraction_cache import ExtractionCache
+    
+    job = get_ingest_queue().get(job_id)
+    content_key = ((job or {}).get("result") or {}).get("content_key")
+    if job is None or job["kind"] != "crawl" or not content_key:
+        return None
+    return ExtractionCache().get(content_key)
+
+
+def embed_job(payload: Dict, report: Callable[[float, str], None]) -> Dict:
+    """
+    문서 분할 → 임베딩 → 벡터 DB 저장 작업
+    
+    Args:
+        payload: {"content", "metadata", "pdf_cache_key"(선택: PDF 청크 캐시 재사용), "etag", "last_modified"}
+        report: 진행률 보고 함수
+        
+    Returns:
+        {"doc_id", "source", "added", "removed", "unchanged"}
+    """
+    metadata = payload.get("metadata") or {}
+    report(0.1, f"RAG 저장 중: {metadata.get('url', metadata.get('filename', metadata.get('source', '')))}")
+    rag_service = _get_service("rag")
+    
+    chunks = None
+    cache_key = payload.get("pdf_cache_key")
+    if cache_key:
+        pdf_service = _get_service("pdf")
+        chunks = pdf_service.get_cached_chunks(cache_key, rag_service.chunker_key)
+        if chunks is None:
+            chunks = rag_service.split_document(payload["content"], {"source": metadata.get("source", "pdf")})
+            pdf_service.cache_chunks(cache_key, rag_service.chunker_key, chunks)
+    
+    # 같은 URL/파일을 다시 수집한 경우 바뀐 청크만 임베딩하고 사라진 청크는 삭제
+    update = asyncio.run(rag_service.update_document(payload["content"], metadata, chunks=chunks))
+    # 크롤링한 URL은 출처 카탈로그에 등록해 최신성 스케줄러가 주기적으로 다시 확인
+    if metadata.get("source") == "crawler" and metadata.get("url"):
+        from app.services.source_catalog import track_crawled_document
+        
+        track_crawled_document(
+            metadata["url"],
+            content_hash=hashlib.sha256(payload["content"].encode("utf-8")).hexdigest(),
+            doc_id=update["doc_id"],
+            changed=update["added"] + update["removed"] > 0,
+            etag=payload.get("etag"),
+            last_modified=payload.get("last_modified")
+        )
+    
+    return {
+        "doc_id": update["doc_id"],
+        "source": metadata.get("url", metadata.get("filename", metadata.get("source", ""))),
+        "added": update["added"],
+        "removed": update["removed"],
+        "unchanged": update["unchanged"]
+    }
+
+
+def pipeline_job(payload: Dict, report: Callable[[float, str], None]) -> Dict:
+    """
+    대량 URL 수집 작업 (IngestPipeline으로 단계를 동시에 실행)
+    
+    Args:
+        payload: {"urls"}
+        report: 진행률 보고 함수
+        
+    Returns:
+        {"documents": URL별 결과, "stats": 단계별 통계, "elapsed"}
+    """
+    from app.services.ingest_pipeline import IngestPipeline
+    from app.services.source_catalog import track_crawled_document
+    
+    urls = payload["urls"]
+    finished = []
+    
+    def on_result(result: Dict):
+        finished.append(result)
+        if result["status"] == "succeeded":
+            # 작업 큐 경로(embed_job)와 같이 출처 카탈로그에 등록
+            track_crawled_document(
+                result["url"],
+                content_hash=result["content_hash"],
+                doc_id=result["doc_id"],
+                changed=result["skipped"] < result["chunks"] or result["removed"] > 0,
+                etag=result.get("etag"),
+                last_modified=result.get("last_modified")
+            )
+        report(len(finished) / len(urls), f"{len(finished)}/{len(urls)} 처리: {result['url']}")
+    
+    pipeline = IngestPipeline(rag_service=_get_service("rag"), crawler_service=_get_service("crawler"))
+    return pipeline.run(urls, on_result=on_result)
+
+
+def refresh_job(payload: Dict, report: Callable[[float, str], None]) -> Dict:
+    """
+    출처 최신성 확인 작업 (조건부 요청 → 바뀐 경우에만 증분 재색인)
+    
+    Args:
+        payload: {"url"}
+        report: 진행률 보고 함수
+        
+    Returns:
+        {"url", "status": "not_modified" | "unchanged" | "updated" | "untracked", ...}
+    """
+    from app.services.source_catalog import get_source_catalog
+    
+    url = payload["url"]
+    catalog = get_source_catalog()
+    source = catalog.get(url)
+    if source is None:
+        return {"url": url, "status": "untracked"}
+    
+    report(0.1, f"최신성 확인 중: {url}")
+    try:
+        page = _get_service("crawler").fetch_page(url, etag=source["etag"], last_modified=source["last_modified"])
+        if page["not_modified"]:
+            catalog.record_fetch(
+                url, changed=False, not_modified=True, etag=page["etag"], last_modified=page["last_modified"]
+            )
+            return {"url": url, "status": "not_modified"}
+        
+        content = _page_text(page)
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if content_hash == source["content_hash"]:
+            catalog.record_fetch(url, changed=False, etag=page["etag"], last_modified=page["last_modified"])
+            return {"url": url, "status": "unchanged"}
+        
+        report(0.5, f"바뀐 내용 재색인 중: {url}")
+        update = asyncio.run(_get_service("rag").update_document(content, {"source": "crawler", "url": url}))
+        catalog.record_fetch(
+            url,
+            changed=update["added"] + update["removed"] > 0,
+            content_hash=content_hash,
+            etag=page["etag"],
+            last_modified=page["last_modified"],
+            doc_id=update["doc_id"]
+        )
+        return {"url": url, "status": "updated", **update}
+    except Exception as e:
+        # 실패가 이어질수록 다음 확인을 늦춤 (작업 큐 재시도 대신 카탈로그 주기로 처리)
+        catalog.record_error(url, str(e))
+        raise
+
+
+def enqueue_refresh(url: str, due_at: float) -> str:
+    """
+    출처 최신성 확인 작업 등록 (같은 URL/예정 시각이면 한 번만 등록)
+    
+    Args:
+        url: 출처 URL
+        due_at: 카탈로그의 다음 확인 예정 시각
+        
+    Returns:
+        작업 ID
+    """
+    return get_ingest_queue().enqueue(
+        "refresh",
+        {"url": url},
+        idempotency_key=f"refresh:{url}:{due_at}",
+        max_attempts=1
+    )
+
+
+def enqueue_urls(urls: List[str], auto_rag: bool = True, batch_id: Optional[str] = None) -> str:
+    """
+    URL 목록 크롤링 작업 등록 (같은 묶음 ID로 다시 요청하면 작업을 중복 등록하지 않음)
+    
+    Args:
+        urls: 크롤링할 URL 목록
+        auto_rag: 크롤링 후 RAG에 추가할지 여부
+        batch_id: 작업 묶음 ID (없으면 새로 생성, 같은 요청을 다시 보낼 때 멱등 키로 사용)
+        
+    Returns:
+        작업 묶음 ID
+    """
+    batch_id = batch_id or str(uuid.uuid4())
+    queue = get_ingest_queue()
+    for url in dict.fromkeys(urls):
+        queue.enqueue(
+            "crawl",
+            {"url": url, "auto_rag": auto_rag, "batch_id": batch_id},
+            idempotency_key=f"crawl:{batch_id}:{url}",
+            batch_id=batch_id
+        )
+    return batch_id
+
+
+def enqueue_pipeline(urls: List[str], batch_id: Optional[str] = None) -> str:
+    """
+    URL 목록을 대량 수집 파이프라인 작업 하나로 등록 (URL별 작업보다 처리량이 높음)
+    
+    Args:
+        urls: 수집할 URL 목록
+        batch_id: 작업 묶음 ID (없으면 새로 생성, 같은 요청을 다시 보낼 때 멱등 키로 사용)
+        
+    Returns:
+        작업 묶음 ID
+    """
+    batch_id = batch_id or str(uuid.uuid4())
+    get_ingest_queue().enqueue(
+        "pipeline",
+        {"urls": list(dict.fromkeys(urls))},
+        idempotency_key=f"pipeline:{batch_id}",
+        batch_id=batch_id,
+        max_attempts=1  # 일부 문서가 이미 저장됐을 수 있으므로 자동 재시도하지 않음
+    )
+    return batch_id
+
+
+def enqueue_document(
+    content: str,
+    metadata: Dict,
+    batch_id: Optional[str] = None,
+    pdf_cache_key: Optional[str] = None
+) -> str:
+    """
+    문서 RAG 추가 작업 등록 (같은 묶음에서 같은 내용/출처는 한 번만 저장)
+    
+    Args:
+        content: 문서 내용
+        metadata: 문서 메타데이터
+        batch_id: 작업 묶음 ID
+        pdf_cache_key: PDF 분석 캐시 키 (있으면 분할 결과를 캐시에서 재사용)
+        
+    Returns:
+        작업 ID
+    """
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    source = metadata.get("url") or metadata.get("filename") or metadata.get("source", "")
+    return get_ingest_queue().enqueue(
+        "embed",
+        {"content": content, "metadata": metadata, "pdf_cache_key": pdf_cache_key},
+        idempotency_key=f"embed:{batch_id}:{source}:{content_hash}",
+        batch_id=batch_id
+    )
+
+
+_ingest_queue: Optional[JobQueue] = None
+_freshness_scheduler = None
+_ingest_queue_lock = threading.Lock()
+
+
+def get_ingest_queue() -> JobQueue:
+    """전역 수집 작업 큐 (이 프로세스의 작업자 스레드도 함께 시작)"""
+    global _ingest_queue
+    with _ingest_queue_lock:
+        if _ingest_queue is None:
+            queue = JobQueue()
+            queue.register("crawl", crawl_job, concurrency=settings.job_crawl_concurrency)
+            queue.register("embed", embed_job, concurrency=settings.job_embed_concurrency)
+            queue.register("pipeline", pipeline_job, concurrency=1)
+            queue.register("refresh", refresh_job, concurrency=settings.freshness_concurrency)
+            queue.start()
+            _ingest_queue = queue
+            
+            if settings.freshness_enabled:
+                from app.services.source_catalog import FreshnessScheduler, get_source_catalog
+                
+                global _freshness_scheduler
+                _freshness_scheduler = FreshnessScheduler(get_source_catalog(), enqueue_refresh)
+                _freshness_scheduler.start()
+        return _ingest_queue
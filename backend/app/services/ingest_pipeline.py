@@ -0,0 +1,316 @@
+"""
+대량 문서 수집 파이프라인 (내려받기 → 정리/분할 → 임베딩 → 저장 단계를 동시에 실행)
+"""
+import asyncio
+import hashlib
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from app.config import settings
+from app.services.chunker import StructureAwareChunker
+from app.services.crawler_service import clean_html
+from app.services.metrics import metrics
+from app.services.rate_limiter import RateLimiter
+
+
+# 단계 종료 표시 (앞 단계 작업자가 모두 끝나면 다음 단계 작업자 수만큼 넣음)
+_STOP = object()
+
+STAGES = ["fetch", "clean", "embed", "upsert"]
+
+
+def _clean_and_chunk(
+    html: Optional[bytes],
+    text: Optional[str],
+    metadata: Dict,
+    max_length: int,
+    chunker_params: Tuple[int, int, int]
+) -> Tuple[str, List[Dict]]:
+    """
+    HTML 정리 + 청크 분할 (CPU 단계, 프로세스 풀에서 실행되므로 모듈 함수로 둠)
+    
+    Returns:
+        (정리된 텍스트, 청크 리스트)
+    """
+    if html is not None:
+        text = clean_html(html, max_length)
+    if not text or not text.strip():
+        raise Exception("크롤링된 내용이 없습니다.")
+    max_tokens, min_tokens, overlap_tokens = chunker_params
+    chunker = StructureAwareChunker(max_tokens=max_tokens, min_tokens=min_tokens, overlap_tokens=overlap_tokens)
+    return text, chunker.split(text, metadata)
+
+
+class IngestPipeline:
+    """
+    단계별 작업자와 크기 제한 큐로 연결된 수집 파이프라인
+    
+    - fetch: 스레드 (네트워크 I/O)
+    - clean: 프로세스 풀 (BeautifulSoup 정리 + 청크 분할, GIL 회피)
+    - embed: 스레드 + 요청 간격 제한 (Bedrock Throttling 방지, 로컬 임베딩 모델은 제한 없이 문서 단위 배치)
+    - upsert: 스레드 1개, 여러 문서의 청크를 모아 파티션별로 한 번에 저장
+    
+    큐 크기가 제한되어 있어 느린 단계가 있으면 앞 단계가 기다리므로 메모리가 무한히 늘지 않고,
+    전체 처리량은 가장 느린 단계에 맞춰집니다.
+    """
+    
+    def __init__(
+        self,
+        rag_service,
+        crawler_service,
+        fetch_workers: Optional[int] = None,
+        clean_workers: Optional[int] = None,
+        embed_workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        upsert_batch_size: Optional[int] = None,
+        embed_min_interval: Optional[float] = None,
+        max_length: int = 50000
+    ):
+        """
+        Args:
+            rag_service: 청크 준비/임베딩/저장을 담당하는 RAGService
+            crawler_service: 페이지를 내려받는 CrawlerService
+            fetch_workers: 내려받기 스레드 수 (기본값: settings.pipeline_fetch_workers)
+            clean_workers: 정리/분할 프로세스 수, 0이면 스레드에서 실행 (기본값: settings.pipeline_clean_workers)
+            embed_workers: 임베딩 스레드 수 (기본값: settings.pipeline_embed_workers)
+            queue_size: 단계 사이 큐 최대 크기 (기본값: settings.pipeline_queue_size)
+            upsert_batch_size: 한 번에 저장할 최대 청크 수 (기본값: settings.pipeline_upsert_batch_size)
+            embed_min_interval: 임베딩 요청 최소 간격 초 (기본값: settings.pipeline_embed_min_interval)
+            max_length: 문서 최대 텍스트 길이
+        """
+        self.rag_service = rag_service
+        self.crawler_service = crawler_service
+        self.fetch_workers = fetch_workers or settings.pipeline_fetch_workers
+        self.clean_workers = clean_workers if clean_workers is not None else settings.pipeline_clean_workers
+        self.embed_workers = embed_workers or settings.pipeline_embed_workers
+        self.queue_size = queue_size or settings.pipeline_queue_size
+        self.upsert_batch_size = upsert_batch_size or settings.pipeline_upsert_batch_size
+        self.max_length = max_length
+        
+        self.embed_limiter = RateLimiter(
+            min_interval=embed_min_interval if embed_min_interval is not None else settings.pipeline_embed_min_interval
+        )
+        self._embed_lock = threading.Lock()
+        self._lock = threading.Lock()
+    
+    def run(
+        self,
+        urls: List[str],
+        metadata: Optional[Dict] = None,
+        on_result: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        """
+        URL 목록을 수집해 벡터 DB에 저장
+        
+        Args:
+            urls: 수집할 URL 목록
+            metadata: 모든 문서에 붙일 메타데이터 (기본값: {"source": "crawler"})
+            on_result: 문서 하나가 끝날 때마다 호출 (성공/실패 결과 딕셔너리)
+            
+        Returns:
+            {"documents": URL별 결과, "stats": 단계별 처리 수/실패 수/작업 시간, "elapsed": 전체 시간}
+        """
+        urls = list(dict.fromkeys(urls))
+        base_metadata = metadata or {"source": "crawler"}
+        
+        self._results: Dict[str, Dict] = {}
+        self._on_result = on_result
+        self._stats = {stage: {"processed": 0, "failed": 0, "busy_seconds": 0.0} for stage in STAGES}
+        
+        url_queue: queue.Queue = queue.Queue()
+        clean_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        embed_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        upsert_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        
+        for url in urls:
+            url_queue.put({"url": url, "metadata": {**base_metadata, "url": url}})
+        for _ in range(self.fetch_workers):
+            url_queue.put(_STOP)
+        
+        clean_threads = max(1, self.clean_workers)
+        remaining = {"fetch": self.fetch_workers, "clean": clean_threads, "embed": self.embed_workers}
+        
+        # 작업 큐 스레드 안에서도 안전하도록 fork 대신 spawn으로 프로세스 생성
+        pool = None
+        if self.clean_workers > 0:
+            pool = ProcessPoolExecutor(max_workers=self.clean_workers, mp_context=multiprocessing.get_context("spawn"))
+        chunker = self.rag_service.chunker
+        chunker_params = (chunker.max_tokens, chunker.min_tokens, chunker.overlap_tokens)
+        
+        def fetch(item: Dict) -> Dict:
+            with metrics.span("crawl_fetch"):
+                page = self.crawler_service.fetch_page(item["url"], self.max_length)
+            return {
+                **item,
+                "html": page["html"],
+                "text": page["text"],
+                "etag": page.get("etag"),
+                "last_modified": page.get("last_modified")
+            }
+        
+        def clean(item: Dict) -> Dict:
+            args = (item["html"], item["text"], item["metadata"], self.max_length, chunker_params)
+            if pool is not None:
+                text, chunks = pool.submit(_clean_and_chunk, *args).result()
+            else:
+                text, chunks = _clean_and_chunk(*args)
+            prepared = self.rag_service.prepare_document(text, item["metadata"], chunks)
+            return {
+                "url": item["url"],
+                "length": len(text),
+                "content_hash": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                "etag": item["etag"],
+                "last_modified": item["last_modified"],
+                "prepared": prepared
+            }
+        
+        def embed(item: Dict) -> Dict:
+            embedder = self.rag_service.embeddings
+            if not getattr(embedder, "rate_limited", True):
+                # 로컬 모델은 요청 간격 제한 없이 문서의 청크를 한 배치로 계산
+                item["prepared"]["embeddings"] = embedder.embed_documents(item["prepared"]["texts"])
+                return item
+            
+            embeddings = []
+            for text in item["prepared"]["texts"]:
+                # 여러 임베딩 스레드가 공유하는 요청 간격 제한
+                with self._embed_lock:
+                    asyncio.run(self.embed_limiter.wait_if_needed(key="bedrock_embed"))
+                embeddings.extend(embedder.embed_documents([text]))
+            item["prepared"]["embeddings"] = embeddings
+            return item
+        
+        started = time.perf_counter()
+        threads = (
+            [self._start(self._stage, "fetch", url_queue, clean_queue, fetch, remaining, clean_threads)
+             for _ in range(self.fetch_workers)]
+            + [self._start(self._stage, "clean", clean_queue, embed_queue, clean, remaining, self.embed_workers)
+               for _ in range(clean_threads)]
+            + [self._start(self._stage, "embed", embed_queue, upsert_queue, embed, remaining, 1)
+               for _ in range(self.embed_workers)]
+            + [self._start(self._upsert_stage, upsert_queue)]
+        )
+        
+        try:
+            for thread in threads:
+                thread.join()
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        elapsed = time.perf_counter() - started
+        
+        return {
+            "documents": [self._results.get(url, {"url": url, "status": "failed", "error": "처리되지 않음"}) for url in urls],
+            "stats": self._stats,
+            "elapsed": elapsed
+        }
+    
+    @staticmethod
+    def _start(target, *args) -> threading.Thread:
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        return thread
+    
+    def _finish(self, url: str, result: Dict):
+        with self._lock:
+            self._results[url] = result
+        if self._on_result:
+            try:
+                self._on_result(result)
+            except Exception:
+                pass
+    
+    def _record(self, stage: str, started: float, count: int = 1, failed: bool = False):
+        with self._lock:
+            stats = self._stats[stage]
+            stats["busy_seconds"] += time.perf_counter() - started
+            stats["failed" if failed else "processed"] += count
+    
+    def _stage(
+        self,
+        name: str,
+        inbox: queue.Queue,
+        outbox: queue.Queue,
+        handler: Callable[[Dict], Dict],
+        remaining: Dict[str, int],
+        next_workers: int
+    ):
+        """단계 작업자: inbox에서 꺼내 처리 후 outbox로 전달 (실패한 문서는 결과만 기록하고 건너뜀)"""
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                with self._lock:
+                    remaining[name] -= 1
+                    last = remaining[name] == 0
+                if last:
+                    for _ in range(next_workers):
+                        outbox.put(_STOP)
+                return
+            
+            started = time.perf_counter()
+            try:
+                result = handler(item)
+            except Exception as e:
+                self._record(name, started, failed=True)
+                self._finish(item["url"], {"url": item["url"], "status": "failed", "stage": name, "error": str(e)})
+                continue
+            self._record(name, started)
+            outbox.put(result)
+    
+    def _upsert_stage(self, inbox: queue.Queue):
+        """저장 작업자: 청크가 upsert_batch_size만큼 모이거나 입력이 잠시 끊기면 한 번에 저장"""
+        buffer: List[Dict] = []
+        buffered_chunks = 0
+        
+        def flush():
+            nonlocal buffer, buffered_chunks
+            if not buffer:
+                return
+            started = time.perf_counter()
+            try:
+                self.rag_service.upsert_prepared([item["prepared"] for item in buffer])
+            except Exception as e:
+                self._record("upsert", started, count=len(buffer), failed=True)
+                for item in buffer:
+                    self._finish(item["url"], {"url": item["url"], "status": "failed", "stage": "upsert", "error": str(e)})
+            else:
+                for item in buffer:
+                    # 다시 수집한 URL은 새 버전에 없는 이전 청크 삭제 (update_document와 같은 결과)
+                    try:
+                        removed = self.rag_service.remove_stale_chunks(item["prepared"])
+                    except Exception as e:
+                        self._finish(item["url"], {"url": item["url"], "status": "failed", "stage": "upsert", "error": str(e)})
+                        continue
+                    self._finish(item["url"], {
+                        "url": item["url"],
+                        "status": "succeeded",
+                        "doc_id": item["prepared"]["doc_id"],
+                        "chunks": item["prepared"]["total_chunks"],
+                        "skipped": item["prepared"]["skipped"],
+                        "removed": removed,
+                        "length": item["length"],
+                        # 출처 카탈로그 등록용 (최신성 확인 시 조건부 요청/내용 비교)
+                        "content_hash": item["content_hash"],
+                        "etag": item["etag"],
+                        "last_modified": item["last_modified"]
+                    })
+                self._record("upsert", started, count=len(buffer))
+            buffer = []
+            buffered_chunks = 0
+        
+        while True:
+            try:
+                item = inbox.get(timeout=0.5)
+            except queue.Empty:
+                flush()
+                continue
+            if item is _STOP:
+                flush()
+                return
+            buffer.append(item)
+            buffered_chunks += len(item["prepared"]["ids"])
+            if buffered_chunks >= self.upsert_batch_size:
+                flush()
@@ -0,0 +1,385 @@
+"""
+SQLite 기반 백그라운드 작업 큐 (재시도, 멱등 키, 작업 종류별 동시 실행 제한, 진행률)
+"""
+import json
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+from app.config import settings
+
+
+# 작업 처리 함수: (payload, report) → result
+# report(progress, message)로 0~1 진행률과 상태 메시지를 기록
+JobHandler = Callable[[Dict, Callable[[float, str], None]], Optional[Dict]]
+
+JOB_STATUSES = ["queued", "running", "succeeded", "failed"]
+
+
+class JobQueue:
+    """
+    DB에 저장되는 작업 큐와 로컬 작업자 스레드 풀
+    
+    - enqueue: 작업을 DB에 저장하고 바로 반환 (같은 멱등 키면 기존 작업 반환)
+    - 작업자: 실행 가능한 작업을 원자적으로 가져와(lease) 종류별 동시 실행 수 안에서 처리
+    - 실패 시 지수 백오프로 max_attempts까지 재시도, lease가 만료된 작업(프로세스 종료 등)은 다시 실행
+      (실행 중인 작업은 heartbeat 스레드가 lease를 연장하므로 오래 걸려도 회수되지 않음)
+    - 진행률/결과는 DB에 기록되어 다른 프로세스(Streamlit, API 워커)에서도 조회 가능
+    """
+    
+    def __init__(
+        self,
+        database_url: Optional[str] = None,
+        workers: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            database_url: DB URL (기본값: settings.database_url)
+            workers: 작업자 스레드 수 (기본값: settings.job_workers)
+            poll_interval: 실행할 작업이 없을 때 대기 시간 초 (기본값: settings.job_poll_interval)
+            lease_seconds: 실행 중 작업 점유 시간 초, 실행 중에는 1/3 주기로 연장 (기본값: settings.job_lease_seconds)
+        """
+        try:
+            from sqlalchemy import Column, Float, Index, Integer, MetaData, String, Table, Text, create_engine, event
+        except ImportError:
+            raise Exception("작업 큐를 위해 sqlalchemy가 필요합니다. pip install sqlalchemy")
+        
+        self.database_url = database_url or settings.database_url
+        self.workers = workers or settings.job_workers
+        self.poll_interval = poll_interval or settings.job_poll_interval
+        self.lease_seconds = lease_seconds or settings.job_lease_seconds
+        
+        self.engine = create_engine(self.database_url)
+        if self.engine.dialect.name == "sqlite":
+            @event.listens_for(self.engine, "connect")
+            def _set_sqlite_pragma(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA busy_timeout=5000")  # 여러 작업자가 동시에 쓸 때 잠금 대기
+                cursor.close()
+        
+        metadata = MetaData()
+        self.jobs = Table(
+            "ingest_jobs",
+            metadata,
+            Column("id", String(36), primary_key=True),
+            Column("kind", String(32), nullable=False),
+            Column("batch_id", String(36)),
+            Column("idempotency_key", String(512), unique=True),
+            Column("payload", Text, nullable=False),
+            Column("status", String(16), nullable=False),
+            Column("attempts", Integer, nullable=False, default=0),
+            Column("max_attempts", Integer, nullable=False),
+            Column("progress", Float, nullable=False, default=0.0),
+            Column("message", Text, default=""),
+            Column("result", Text),
+            Column("error", Text),
+            Column("created_at", Float, nullable=False),
+            Column("updated_at", Float, nullable=False),
+            Column("run_after", Float, nullable=False),
+            Column("lease_expires_at", Float),
+            Index("ix_ingest_jobs_status_run_after", "status", "run_after"),
+            Index("ix_ingest_jobs_batch", "batch_id")
+        )
+        metadata.create_all(self.engine)
+        
+        self._handlers: Dict[str, JobHandler] = {}
+        self._limits: Dict[str, int] = {}
+        self._running: Dict[str, int] = {}
+        self._running_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+    
+    def register(self, kind: str, handler: JobHandler, concurrency: int = 1):
+        """
+        작업 종류 등록
+        
+        Args:
+            kind: 작업 종류 (예: "crawl", "embed")
+            handler: 작업 처리 함수
+            concurrency: 이 프로세스에서 동시에 실행할 최대 작업 수
+        """
+        self._handlers[kind] = handler
+        self._limits[kind] = max(1, concurrency)
+        self._running.setdefault(kind, 0)
+    
+    def start(self):
+        """작업자 스레드 시작 (이미 시작했으면 무시)"""
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work_loop, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def stop(self, timeout: Optional[float] = None):
+        """작업자 스레드 종료 (실행 중인 작업은 끝까지 처리)"""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stop.clear()
+    
+    # ------------------------------------------------------------------
+    # 등록/조회
+    # ------------------------------------------------------------------
+    
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict,
+        idempotency_key: Optional[str] = None,
+        batch_id: Optional[str] = None,
+        max_attempts: Optional[int] = None
+    ) -> str:
+        """
+        작업 등록
+        
+        같은 멱등 키의 작업이 있으면 새로 만들지 않고 기존 작업 ID를 반환합니다.
+        (기존 작업이 최종 실패한 경우에만 다시 대기 상태로 되돌림)
+        
+        Args:
+            kind: 작업 종류
+            payload: 작업 입력 (JSON 직렬화 가능)
+            idempotency_key: 멱등 키 (예: "crawl:<url>")
+            batch_id: 함께 진행률을 보여줄 작업 묶음 ID
+            max_attempts: 최대 시도 횟수 (기본값: settings.job_max_attempts)
+            
+        Returns:
+            작업 ID
+        """
+        from sqlalchemy.exc import IntegrityError
+        
+        if kind not in self._handlers:
+            raise Exception(f"등록되지 않은 작업 종류입니다: {kind}")
+        
+        now = time.time()
+        job_id = str(uuid.uuid4())
+        row = {
+            "id": job_id,
+            "kind": kind,
+            "batch_id": batch_id,
+            "idempotency_key": idempotency_key,
+            "payload": json.dumps(payload, ensure_ascii=False),
+            "status": "queued",
+            "attempts": 0,
+            "max_attempts": max_attempts or settings.job_max_attempts,
+            "progress": 0.0,
+            "message": "",
+            "created_at": now,
+            "updated_at": now,
+            "run_after": now
+        }
+        
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(self.jobs.insert().values(**row))
+        except IntegrityError:
+            table = self.jobs
+            with self.engine.begin() as connection:
+                existing = connection.execute(
+                    table.select().where(table.c.idempotency_key == idempotency_key)
+                ).first()
+                if existing is None:
+                    raise
+                job_id = existing.id
+                if existing.status == "failed":
+                    connection.execute(
+                        table.update().where(table.c.id == job_id).values(
+                            status="queued", attempts=0, error=None, run_after=now, updated_at=now,
+                            batch_id=batch_id or existing.batch_id
+                        )
+                    )
+                elif batch_id and existing.batch_id != batch_id and existing.status != "running":
+                    # 새 묶음에서 다시 요청한 경우 진행률을 새 묶음에서 볼 수 있도록 연결
+                    connection.execute(table.update().where(table.c.id == job_id).values(batch_id=batch_id))
+        
+        self._wakeup.set()
+        return job_id
+    
+    @staticmethod
+    def _row_to_dict(row) -> Dict:
+        job = dict(row._mapping)
+        job["payload"] = json.loads(job["payload"]) if job["payload"] else {}
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+    
+    def get(self, job_id: str) -> Optional[Dict]:
+        """작업 상태 조회"""
+        with self.engine.connect() as connection:
+            row = connection.execute(self.jobs.select().where(self.jobs.c.id == job_id)).first()
+        return self._row_to_dict(row) if row else None
+    
+    def batch_status(self, batch_id: str) -> Dict:
+        """
+        작업 묶음 진행률
+        
+        Args:
+            batch_id: 작업 묶음 ID
+            
+        Returns:
+            {"jobs": [...], "counts": {status: 개수}, "by_kind": {kind: {status: 개수}}, "progress": 0~1, "done": bool}
+        """
+        table = self.jobs
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                table.select().where(table.c.batch_id == batch_id).order_by(table.c.created_at)
+            ).all()
+        
+        jobs = [self._row_to_dict(row) for row in rows]
+        counts = {status: 0 for status in JOB_STATUSES}
+        by_kind: Dict[str, Dict[str, int]] = {}
+        for job in jobs:
+            counts[job["status"]] += 1
+            kind_counts = by_kind.setdefault(job["kind"], {status: 0 for status in JOB_STATUSES})
+            kind_counts[job["status"]] += 1
+        
+        progress = 0.0
+        if jobs:
+            progress = sum(
+                1.0 if job["status"] in ("succeeded", "failed") else job["progress"] for job in jobs
+            ) / len(jobs)
+        return {
+            "jobs": jobs,
+            "counts": counts,
+            "by_kind": by_kind,
+            "progress": progress,
+            "done": bool(jobs) and counts["queued"] == 0 and counts["running"] == 0
+        }
+    
+    # ------------------------------------------------------------------
+    # 작업자
+    # ------------------------------------------------------------------
+    
+    def _available_kinds(self) -> List[str]:
+        with self._running_lock:
+            return [kind for kind, limit in self._limits.items() if self._running[kind] < limit]
+    
+    def _claim(self) -> Optional[Dict]:
+        """실행 가능한 작업 하나를 원자적으로 점유 (동시 실행 한도가 남은 종류만)"""
+        from sqlalchemy import and_, or_
+        
+        kinds = self._available_kinds()
+        if not kinds:
+            return None
+        
+        table = self.jobs
+        now = time.time()
+        runnable = and_(
+            table.c.kind.in_(kinds),
+            or_(
+                and_(table.c.status == "queued", table.c.run_after <= now),
+                and_(table.c.status == "running", table.c.lease_expires_at < now)  # 중단된 작업 회수
+            )
+        )
+        with self.engine.begin() as connection:
+            candidates = connection.execute(
+                table.select().where(runnable).order_by(table.c.run_after).limit(10)
+            ).all()
+            for candidate in candidates:
+                with self._running_lock:
+                    if self._running[candidate.kind] >= self._limits[candidate.kind]:
+                        continue
+                    claimed = connection.execute(
+                        table.update()
+                        .where(table.c.id == candidate.id, table.c.updated_at == candidate.updated_at)
+                        .values(
+                            status="running",
+                            attempts=candidate.attempts + 1,
+                            lease_expires_at=now + self.lease_seconds,
+                            updated_at=now
+                        )
+                    ).rowcount
+                    if claimed == 1:
+                        self._running[candidate.kind] += 1
+                        job = self._row_to_dict(candidate)
+                        job["attempts"] += 1
+                        return job
+        return None
+    
+    def _update(self, job_id: str, **values):
+        values["updated_at"] = time.time()
+        with self.engine.begin() as connection:
+            connection.execute(self.jobs.update().where(self.jobs.c.id == job_id).values(**values))
+    
+    def _renew_lease(self, job_id: str):
+        """실행 중인 작업의 lease 연장 (이미 끝났거나 다른 작업자가 회수한 작업은 건드리지 않음)"""
+        table = self.jobs
+        with self.engine.begin() as connection:
+            connection.execute(
+                table.update()
+                .where(table.c.id == job_id, table.c.status == "running")
+                .values(lease_expires_at=time.time() + self.lease_seconds)
+            )
+    
+    def _run(self, job: Dict):
+        handler = self._handlers[job["kind"]]
+        
+        def report(progress: float, message: str = ""):
+            self._update(
+                job["id"],
+                progress=max(0.0, min(1.0, progress)),
+                message=message,
+                lease_expires_at=time.time() + self.lease_seconds
+            )
+        
+        # 진행률 보고가 드문 긴 작업(큰 문서 임베딩 등)이 lease 만료로 회수되어 중복 실행되지 않도록
+        # 처리 함수가 실행되는 동안 주기적으로 lease 연장
+        heartbeat_stop = threading.Event()
+        
+        def heartbeat():
+            while not heartbeat_stop.wait(self.lease_seconds / 3):
+                try:
+                    self._renew_lease(job["id"])
+                except Exception:
+                    # DB 잠금 등 일시적인 오류는 다음 주기에 다시 시도
+                    pass
+        
+        heartbeat_thread = threading.Thread(target=heartbeat, name=f"job-heartbeat-{job['id'][:8]}", daemon=True)
+        heartbeat_thread.start()
+        try:
+            result = handler(job["payload"], report)
+            self._update(
+                job["id"],
+                status="succeeded",
+                progress=1.0,
+                result=json.dumps(result or {}, ensure_ascii=False),
+                error=None,
+                lease_expires_at=None
+            )
+        except Exception as e:
+            if job["attempts"] < job["max_attempts"]:
+                delay = settings.job_retry_base_delay * (2 ** (job["attempts"] - 1))
+                self._update(
+                    job["id"],
+                    status="queued",
+                    error=str(e),
+                    message=f"재시도 대기 ({job['attempts']}/{job['max_attempts']})",
+                    run_after=time.time() + delay,
+                    lease_expires_at=None
+                )
+            else:
+                self._update(job["id"], status="failed", error=str(e), lease_expires_at=None)
+        finally:
+            heartbeat_stop.set()
+            heartbeat_thread.join()
+            with self._running_lock:
+                self._running[job["kind"]] -= 1
+            self._wakeup.set()
+    
+    def _work_loop(self):
+        while not self._stop.is_set():
+            try:
+                job = self._claim()
+            except Exception:
+                # DB 잠금 등 일시적인 오류는 잠시 후 다시 시도
+                job = None
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self._run(job)
@@ -0,0 +1,320 @@
+"""
+단계별 지연 시간 지표 (히스토그램 + 카운터, Prometheus 텍스트 형식 출력)
+
+질문 하나가 오래 걸릴 때 Rate Limiter 대기, 쿼리 임베딩, 벡터 검색, 후보 필터링, 프롬프트 조립,
+Bedrock 첫 토큰/전체 스트리밍, 재시도 대기 중 어디에서 시간이 쓰였는지 구분하기 위한 지표입니다.
+지표는 프로세스(워커)별 메모리에 집계되며, FastAPI /metrics와 Streamlit 개발자 모드 패널에서 확인합니다.
+최근 구간 기록에는 요청 ID가 붙어 동시에 처리된 요청들의 구간을 요청별로 나눠 볼 수 있습니다.
+"""
+import functools
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, Callable, Dict, Iterator, List, Optional, Tuple
+from app.config import settings
+
+
+# 단계 이름 → 표시 이름 (개발자 패널용, 여기에 없는 단계도 기록 가능)
+STAGES = {
+    "rate_limit_wait": "Rate Limiter 대기",
+    "query_embedding": "쿼리 임베딩",
+    "vector_query": "벡터 검색",
+    "candidate_filter": "회사/일반 후보 필터링",
+    "document_selection": "문서 선택 (MMR 중복 제거/재정렬)",
+    "prompt_assembly": "프롬프트 조립",
+    "bedrock_ttft": "Bedrock 첫 토큰",
+    "bedrock_stream": "Bedrock 전체 스트리밍",
+    "bedrock_invoke": "Bedrock 호출 (비스트리밍)",
+    "retry_backoff": "재시도 대기",
+    "crawl_fetch": "크롤링 내려받기",
+    "crawl_clean": "HTML 정리",
+    "pdf_extract": "PDF 텍스트 추출",
+    "pdf_summary": "PDF 요약"
+}
+
+# 현재 처리 중인 요청 ID (trace_request가 설정, asyncio.to_thread로 넘긴 작업에도 전달됨)
+current_request_id: ContextVar[Optional[str]] = ContextVar("current_request_id", default=None)
+
+# 히스토그램 버킷 상한 (초), Rate Limiter 대기(4초)와 재시도 대기(최대 80초)까지 구분
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (백분위 계산용 최근 관측값 포함)"""
+    
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, recent: int = 1000):
+        """
+        Args:
+            buckets: 버킷 상한 (오름차순, +Inf는 자동 추가)
+            recent: 백분위 계산에 사용할 최근 관측값 수
+        """
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=recent)
+    
+    def observe(self, value: float):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[index] += 1
+                break
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+    
+    def percentile(self, q: float) -> float:
+        """최근 관측값의 백분위 (q: 0~100, 관측값이 없으면 0)"""
+        if not self.recent:
+            return 0.0
+        values = sorted(self.recent)
+        return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+    
+    def cumulative_counts(self) -> List[int]:
+        """Prometheus 형식의 누적 버킷 개수 (le 상한 이하 관측 수)"""
+        counts = []
+        total = 0
+        for count in self.bucket_counts:
+            total += count
+            counts.append(total)
+        return counts
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in sorted(labels.items())) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _label_items(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class MetricsRegistry:
+    """
+    단계별 지연 시간 히스토그램과 카운터 (스레드 안전)
+    
+    - span()/observe(): 단계 소요 시간 기록 (stage 레이블 + 선택 레이블별 히스토그램, 예: rate_limit_wait의 key)
+    - increment(): 재시도 횟수 등 카운터 증가
+    - render_prometheus(): Prometheus 텍스트 형식 출력 (/metrics)
+    - snapshot(): 단계별 count/평균/p50/p95/최근값과 최근 구간 기록 (개발자 패널)
+    """
+    
+    def __init__(self, namespace: str = "interview", buckets: Tuple[float, ...] = DEFAULT_BUCKETS, recent_spans: int = 200):
+        """
+        Args:
+            namespace: Prometheus 지표 이름 접두사
+            buckets: 히스토그램 버킷 상한 (초)
+            recent_spans: 보관할 최근 구간 기록 수
+        """
+        self.namespace = namespace
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.stages: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+        self.counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self.recent = deque(maxlen=recent_spans)
+        self.started_at = time.time()
+    
+    def observe(self, stage: str, seconds: float, **labels: str):
+        """
+        단계 소요 시간 기록
+        
+        Args:
+            stage: 단계 이름 (STAGES 참고)
+            seconds: 소요 시간 (초)
+            labels: 추가 Prometheus 레이블 (값 종류가 적은 것만, 예: key="bedrock_embed")
+        """
+        if not settings.metrics_enabled:
+            return
+        key = (stage, _label_items(labels))
+        with self.lock:
+            histogram = self.stages.get(key)
+            if histogram is None:
+                histogram = self.stages[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            self.recent.append({
+                "time": time.time(),
+                "stage": stage,
+                "labels": dict(key[1]),
+                "seconds": seconds,
+                "request_id": current_request_id.get()
+            })
+    
+    @contextmanager
+    def span(self, stage: str, **labels: str) -> Iterator[None]:
+        """
+        with 블록 소요 시간을 단계 지표로 기록 (예외가 나도 기록)
+        
+        Args:
+            stage: 단계 이름 (STAGES 참고)
+            labels: 추가 Prometheus 레이블
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, **labels)
+    
+    def increment(self, name: str, value: float = 1, **labels: str):
+        """
+        카운터 증가
+        
+        Args:
+            name: 카운터 이름 (예: "bedrock_retries_total")
+            value: 증가량
+            labels: Prometheus 레이블 (예: operation="question_stream")
+        """
+        if not settings.metrics_enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+    
+    def snapshot(self) -> Dict:
+        """
+        현재 지표 요약
+        
+        Returns:
+            {"stages": {단계 + 레이블: {stage, labels, label, count, total, mean, p50, p95, last}},
+             "counters": [{name, labels, value}],
+             "recent": 최근 구간 기록 (최신순, {time, stage, labels, seconds, request_id}), "uptime": 초}
+        """
+        with self.lock:
+            stages = {
+                stage + _format_labels(dict(labels)): {
+                    "stage": stage,
+                    "labels": dict(labels),
+                    "label": STAGES.get(stage, stage) + (
+                        f" ({', '.join(value for _, value in labels)})" if labels else ""
+                    ),
+                    "count": histogram.count,
+                    "total": histogram.sum,
+                    "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+                    "p50": histogram.percentile(50),
+                    "p95": histogram.percentile(95),
+                    "last": histogram.recent[-1] if histogram.recent else 0.0
+                }
+                for (stage, labels), histogram in sorted(self.stages.items())
+            }
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+            recent = list(reversed(self.recent))
+        return {"stages": stages, "counters": counters, "recent": recent, "uptime": time.time() - self.started_at}
+    
+    def render_prometheus(self) -> str:
+        """
+        Prometheus 텍스트 형식 (exposition format 0.0.4)
+        
+        Returns:
+            {namespace}_stage_duration_seconds 히스토그램과 {namespace}_{카운터 이름} 카운터
+        """
+        name = f"{self.namespace}_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} 요청 처리 단계별 소요 시간 (초)",
+            f"# TYPE {name} histogram"
+        ]
+        with self.lock:
+            for (stage, extra), histogram in sorted(self.stages.items()):
+                series = {**dict(extra), "stage": stage}
+                for bound, count in zip(histogram.buckets, histogram.cumulative_counts()):
+                    labels = _format_labels({**series, "le": _format_value(bound)})
+                    lines.append(f"{name}_bucket{labels} {count}")
+                lines.append(f"{name}_bucket{_format_labels({**series, 'le': '+Inf'})} {histogram.count}")
+                lines.append(f"{name}_sum{_format_labels(series)} {repr(histogram.sum)}")
+                lines.append(f"{name}_count{_format_labels(series)} {histogram.count}")
+            
+            counter_names: Dict[str, List[str]] = {}
+            for (counter, labels), value in sorted(self.counters.items()):
+                counter_names.setdefault(counter, []).append(
+                    f"{self.namespace}_{counter}{_format_labels(dict(labels))} {_format_value(value)}"
+                )
+        for counter, samples in counter_names.items():
+            lines.append(f"# TYPE {self.namespace}_{counter} counter")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+    
+    def reset(self):
+        """모든 지표 초기화"""
+        with self.lock:
+            self.stages.clear()
+            self.counters.clear()
+            self.recent.clear()
+            self.started_at = time.time()
+
+
+def trace_request(stream: Callable[..., AsyncGenerator]) -> Callable[..., AsyncGenerator]:
+    """
+    스트리밍 응답 하나를 요청 ID로 묶는 데코레이터 (최근 구간 기록의 request_id)
+    
+    Streamlit은 단계마다 새 태스크(새 컨텍스트)로 제너레이터를 진행하므로, 진행할 때마다 같은 ID를 설정하고
+    그 단계가 끝나면 되돌립니다. 이미 요청 ID가 있는 컨텍스트에서 호출되면 그 ID를 그대로 사용합니다.
+    """
+    @functools.wraps(stream)
+    async def wrapper(*args, **kwargs):
+        request_id = current_request_id.get() or uuid.uuid4().hex[:8]
+        events = stream(*args, **kwargs)
+        try:
+            while True:
+                token = current_request_id.set(request_id)
+                try:
+                    event = await events.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    current_request_id.reset(token)
+                yield event
+        finally:
+            await events.aclose()
+    
+    return wrapper
+
+
+def record_retry(operation: str, delay: float):
+    """
+    Bedrock 요청 제한 재시도 기록 (재시도 횟수 카운터 + 대기 시간)
+    
+    Args:
+        operation: 호출 구분 (question_stream, rag_stream, rag_generate, chat, simple_chat)
+        delay: 재시도 전 대기 시간 (초)
+    """
+    metrics.increment("bedrock_retries_total", operation=operation)
+    metrics.observe("retry_backoff", delay)
+
+
+class StreamTimer:
+    """
+    Bedrock 스트리밍 시간 측정 (요청 시작 → 첫 토큰, 요청 시작 → 스트림 종료)
+    
+    비동기 제너레이터 안에서는 with 블록이 yield를 넘나들므로 시작/첫 토큰/종료 시점을 직접 기록합니다.
+    """
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_token: Optional[float] = None
+    
+    def token(self):
+        """응답 텍스트를 받을 때마다 호출 (처음 한 번만 첫 토큰 지연으로 기록)"""
+        if self.first_token is None:
+            self.first_token = time.perf_counter()
+            metrics.observe("bedrock_ttft", self.first_token - self.started)
+    
+    def finish(self):
+        """스트림을 끝까지 읽은 뒤 호출"""
+        metrics.observe("bedrock_stream", time.perf_counter() - self.started)
+
+
+# 전역 지표 저장소 (프로세스/워커별)
+metrics = MetricsRegistry(recent_spans=settings.metrics_recent_spans)
@@ -0,0 +1,72 @@
+"""
+MMR (Maximal Marginal Relevance) 기반 다양성 검색
+"""
+from typing import List, Optional
+import numpy as np
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def mmr_select(
+    query_embedding: List[float],
+    embeddings: List[List[float]],
+    k: int,
+    lambda_mult: float = 0.5,
+    token_counts: Optional[List[int]] = None,
+    token_budget: Optional[int] = None
+) -> List[int]:
+    """
+    질문과의 관련도는 높고 이미 고른 청크와는 겹치지 않는 청크를 차례로 선택
+    
+    score = λ · sim(질문, 청크) − (1 − λ) · max sim(청크, 선택된 청크)
+    
+    Args:
+        query_embedding: 질문 임베딩
+        embeddings: 후보 청크 임베딩 (이미 검색된 후보의 임베딩을 그대로 사용)
+        k: 최대 선택 수
+        lambda_mult: 관련도 가중치 (1이면 유사도 순, 0이면 다양성만 고려)
+        token_counts: 후보별 토큰 수 (token_budget과 함께 사용)
+        token_budget: 선택한 청크 토큰 합계 상한 (남은 예산에 맞지 않는 후보는 건너뜀)
+        
+    Returns:
+        선택된 후보 인덱스 (선택 순서)
+    """
+    if not embeddings or k <= 0:
+        return []
+    
+    candidates = _normalize(np.asarray(embeddings, dtype=np.float32))
+    query = _normalize(np.asarray(query_embedding, dtype=np.float32))
+    
+    relevance = candidates @ query
+    # 후보끼리의 코사인 유사도 중 선택된 청크와의 최댓값 (선택할 때마다 갱신)
+    max_redundancy = np.full(len(candidates), -np.inf, dtype=np.float32)
+    available = np.ones(len(candidates), dtype=bool)
+    
+    tokens = np.asarray(token_counts if token_counts is not None else [0] * len(candidates))
+    remaining_budget = token_budget
+    
+    selected: List[int] = []
+    while len(selected) < k:
+        if remaining_budget is not None:
+            available &= tokens <= remaining_budget
+        if not available.any():
+            break
+        
+        if selected:
+            scores = lambda_mult * relevance - (1 - lambda_mult) * max_redundancy
+        else:
+            scores = relevance.copy()
+        scores[~available] = -np.inf
+        
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        max_redundancy = np.maximum(max_redundancy, candidates @ candidates[best])
+        if remaining_budget is not None:
+            remaining_budget -= int(tokens[best])
+    
+    return selected
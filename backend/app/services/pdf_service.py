@@ -1,42 +1,382 @@
 """
 PDF 처리 서비스
 """
-import pdfplumber
-from typing import Optional, Dict
+from typing import Optional, Dict, List
+from app.config import settings
+from app.services.extraction_cache import ExtractionCache
+from app.services.metrics import metrics
 import io
+import re
+
+
+# 추출 결과가 깨졌다고 판단하는 문자 패턴
+# (대체 문자, 제어 문자, Private Use Area, pdfminer의 "(cid:123)" 표기)
+_GARBLED_PATTERN = re.compile(r"[\ufffd\x00-\x08\x0b\x0c\x0e-\x1f\ue000-\uf8ff]|\(cid:\d+\)")
+_WORD_CHAR_PATTERN = re.compile(r"\w")
+
+# 섹션 키워드 (우선순위 순: 한 줄에 여러 섹션 키워드가 있으면 앞쪽 섹션으로 분류)
+SECTION_KEYWORDS = [
+    ("personal_info", ["이름", "연락처", "이메일", "주소", "전화번호", "phone", "email"]),
+    ("education", ["학력", "교육", "education", "학위", "학교"]),
+    ("experience", ["경력", "경험", "experience", "근무", "회사", "work"]),
+    ("projects", ["프로젝트", "project", "작업"]),
+    ("skills", ["기술", "스킬", "skill", "능력", "보유기술"]),
+]
+_KEYWORD_PRIORITY = {
+    keyword: priority
+    for priority, (_, keywords) in reversed(list(enumerate(SECTION_KEYWORDS)))
+    for keyword in keywords
+}
+
+# 모든 섹션 키워드를 하나의 alternation 정규식으로 컴파일
+# 그룹/IGNORECASE 없이 리터럴만 나열해야 첫 글자 집합 기반 빠른 스캔이 적용되므로
+# 소문자로 변환한 텍스트에 적용하고, 긴 키워드를 먼저 두어 "보유기술"처럼 겹치는 키워드도 처리
+_SECTION_PATTERN = re.compile(
+    "|".join(re.escape(keyword) for keyword in sorted(_KEYWORD_PRIORITY, key=len, reverse=True))
+)
+# 소문자 변환 시 길이가 바뀌는 특수 문자가 있으면 오프셋 유지를 위해 이 패턴 사용
+_SECTION_PATTERN_IGNORECASE = re.compile(_SECTION_PATTERN.pattern, re.IGNORECASE)
+
+
+def is_garbled_text(text: str, max_garbled_ratio: float = 0.05, min_word_ratio: float = 0.4) -> bool:
+    """
+    빠른 추출 결과가 비었거나 깨졌는지 판단
+    
+    Args:
+        text: 페이지 텍스트
+        max_garbled_ratio: 허용하는 깨진 문자 비율
+        min_word_ratio: 공백 제외 문자 중 글자/숫자의 최소 비율
+        
+    Returns:
+        비었거나 깨진 텍스트이면 True
+    """
+    if not text or not text.strip():
+        return True
+    
+    compact = "".join(text.split())
+    garbled_count = sum(len(match) for match in _GARBLED_PATTERN.findall(compact))
+    if garbled_count / len(compact) > max_garbled_ratio:
+        return True
+    
+    word_count = len(_WORD_CHAR_PATTERN.findall(compact))
+    return word_count / len(compact) < min_word_ratio
+
+
+class PDFExtractionBackend:
+    """PDF 텍스트 추출 백엔드 인터페이스"""
+    
+    name = "base"
+    
+    def extract_pages(self, file_content: bytes, page_indexes: Optional[List[int]] = None) -> List[str]:
+        """
+        페이지별 텍스트 추출
+        
+        Args:
+            file_content: PDF 파일의 바이트 내용
+            page_indexes: 추출할 페이지 인덱스 (0부터 시작, None이면 전체)
+            
+        Returns:
+            페이지별 텍스트 리스트 (page_indexes 순서)
+        """
+        raise NotImplementedError
+
+
+class PyPDF2Backend(PDFExtractionBackend):
+    """PyPDF2 기반 빠른 추출 백엔드 (레이아웃 분석 없음)"""
+    
+    name = "pypdf2"
+    
+    def extract_pages(self, file_content: bytes, page_indexes: Optional[List[int]] = None) -> List[str]:
+        try:
+            from PyPDF2 import PdfReader
+        except ImportError:
+            raise Exception("빠른 PDF 추출을 위해 PyPDF2가 필요합니다. pip install PyPDF2")
+        
+        reader = PdfReader(io.BytesIO(file_content))
+        if page_indexes is None:
+            page_indexes = list(range(len(reader.pages)))
+        
+        pages = []
+        for index in page_indexes:
+            try:
+                pages.append(reader.pages[index].extract_text() or "")
+            except Exception:
+                # 페이지 단위 실패는 빈 텍스트로 처리하여 폴백 대상이 되도록 함
+                pages.append("")
+        return pages
+
+
+class PdfplumberBackend(PDFExtractionBackend):
+    """pdfplumber 기반 레이아웃 분석 백엔드 (느리지만 정확)"""
+    
+    name = "pdfplumber"
+    
+    def extract_pages(self, file_content: bytes, page_indexes: Optional[List[int]] = None) -> List[str]:
+        try:
+            import pdfplumber
+        except ImportError:
+            raise Exception("PDF 레이아웃 분석을 위해 pdfplumber가 필요합니다. pip install pdfplumber")
+        
+        with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+            if page_indexes is None:
+                page_indexes = list(range(len(pdf.pages)))
+            return [pdf.pages[index].extract_text() or "" for index in page_indexes]
+
+
+# 사용 가능한 추출 백엔드
+EXTRACTION_BACKENDS: Dict[str, type] = {
+    PyPDF2Backend.name: PyPDF2Backend,
+    PdfplumberBackend.name: PdfplumberBackend,
+}
+
+
+def get_extraction_backend(name: str) -> PDFExtractionBackend:
+    """이름으로 추출 백엔드 생성"""
+    if name not in EXTRACTION_BACKENDS:
+        raise ValueError(f"지원하지 않는 PDF 추출 백엔드: {name} (사용 가능: {', '.join(EXTRACTION_BACKENDS)})")
+    return EXTRACTION_BACKENDS[name]()
 
 
 class PDFService:
     """PDF 처리 서비스 클래스"""
     
-    async def extract_text(self, file_content: bytes, filename: str) -> str:
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        fallback_backend: Optional[str] = None,
+        use_cache: bool = True
+    ):
         """
-        PDF 파일에서 텍스트 추출
+        초기화
+        
+        Args:
+            backend: 기본 추출 백엔드 이름 (기본값: settings.pdf_extraction_backend)
+            fallback_backend: 빈/깨진 페이지에만 사용할 백엔드 이름
+                (기본값: settings.pdf_fallback_backend, 빈 문자열이면 폴백 없음)
+            use_cache: 파일 해시 기반 추출 결과 캐시 사용 여부
+        """
+        self.backend = get_extraction_backend(backend or settings.pdf_extraction_backend)
+        
+        fallback_name = settings.pdf_fallback_backend if fallback_backend is None else fallback_backend
+        self.fallback_backend = (
+            get_extraction_backend(fallback_name)
+            if fallback_name and fallback_name != self.backend.name
+            else None
+        )
+        
+        # 마지막 추출의 백엔드 사용 통계 (비교 도구/디버깅용)
+        self.last_extraction_stats: Dict[str, int] = {}
+        
+        # 추출 결과 캐시
+        self.cache = ExtractionCache() if use_cache else None
+    
+    @property
+    def extractor_id(self) -> str:
+        """캐시 키에 포함되는 추출기 구성 식별자"""
+        fallback_name = self.fallback_backend.name if self.fallback_backend else "none"
+        return f"{self.backend.name}+{fallback_name}"
+    
+    def extract_pages(self, file_content: bytes) -> List[str]:
+        """
+        페이지별 텍스트 추출 (빠른 백엔드 우선, 빈/깨진 페이지만 폴백)
+        
+        Args:
+            file_content: PDF 파일의 바이트 내용
+            
+        Returns:
+            페이지별 텍스트 리스트
+        """
+        pages = self.backend.extract_pages(file_content)
+        
+        retry_indexes = [index for index, text in enumerate(pages) if is_garbled_text(text)]
+        fallback_used = 0
+        
+        if retry_indexes and self.fallback_backend:
+            fallback_pages = self.fallback_backend.extract_pages(file_content, retry_indexes)
+            for index, fallback_text in zip(retry_indexes, fallback_pages):
+                # 폴백 결과가 더 나은 경우에만 교체
+                if fallback_text.strip() and (
+                    not is_garbled_text(fallback_text) or not pages[index].strip()
+                ):
+                    pages[index] = fallback_text
+                    fallback_used += 1
+        
+        self.last_extraction_stats = {
+            "pages": len(pages),
+            "fallback_candidates": len(retry_indexes),
+            "fallback_used": fallback_used,
+        }
+        
+        return pages
+    
+    async def analyze_pdf(self, file_content: bytes, filename: str) -> Dict[str, any]:
+        """
+        PDF 텍스트 추출 및 요약 분석 (같은 파일은 캐시에서 바로 반환)
         
         Args:
             file_content: PDF 파일의 바이트 내용
             filename: 파일명
             
         Returns:
-            추출된 텍스트
+            content_hash, cache_key, cached, text, pages, summary를 담은 딕셔너리
         """
+        content_hash = ExtractionCache.content_hash(file_content)
+        cache_key = ExtractionCache.make_key(content_hash, self.extractor_id)
+        
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached:
+                return {
+                    "content_hash": content_hash,
+                    "cache_key": cache_key,
+                    "cached": True,
+                    "text": cached["text"],
+                    "pages": cached["pages"],
+                    "summary": cached["summary"]
+                }
+        
         try:
-            text_content = []
+            with metrics.span("pdf_extract"):
+                pages = self.extract_pages(file_content)
             
-            # PDF 파싱
-            with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    text = page.extract_text()
-                    if text:
-                        text_content.append(f"=== 페이지 {page_num} ===\n{text}\n")
+            text_content = [
+                f"=== 페이지 {page_num} ===\n{text}\n"
+                for page_num, text in enumerate(pages, 1)
+                if text
+            ]
             
             if not text_content:
                 raise Exception("PDF에서 텍스트를 추출할 수 없습니다. 이미지 기반 PDF일 수 있습니다.")
             
-            return "\n".join(text_content)
+            text = "\n".join(text_content)
         
         except Exception as e:
             raise Exception(f"PDF 처리 중 오류 발생: {str(e)}")
+        
+        with metrics.span("pdf_summary"):
+            summary = self.get_summary(text)
+        
+        if self.cache:
+            self.cache.put(cache_key, {
+                "filename": filename,
+                "text": text,
+                "pages": pages,
+                "summary": summary,
+                "chunks": {}
+            })
+        
+        return {
+            "content_hash": content_hash,
+            "cache_key": cache_key,
+            "cached": False,
+            "text": text,
+            "pages": pages,
+            "summary": summary
+        }
+    
+    async def extract_text(self, file_content: bytes, filename: str) -> str:
+        """
+        PDF 파일에서 텍스트 추출
+        
+        Args:
+            file_content: PDF 파일의 바이트 내용
+            filename: 파일명
+            
+        Returns:
+            추출된 텍스트
+        """
+        result = await self.analyze_pdf(file_content, filename)
+        return result["text"]
+    
+    def get_cached_chunks(self, cache_key: str, chunker_key: str) -> Optional[List[Dict]]:
+        """
+        이전에 분할해 둔 청크 조회 (RAG 추가 시 재분할 생략용)
+        
+        Args:
+            cache_key: analyze_pdf가 반환한 cache_key
+            chunker_key: 청크 분할 설정 식별자
+            
+        Returns:
+            청크 리스트 (없으면 None)
+        """
+        if not self.cache:
+            return None
+        return self.cache.get_chunks(cache_key, chunker_key)
+    
+    def cache_chunks(self, cache_key: str, chunker_key: str, chunks: List[Dict]):
+        """청크 분할 결과를 추출 결과 캐시에 저장"""
+        if self.cache:
+            self.cache.put_chunks(cache_key, chunker_key, chunks)
+    
+    def extract_section_spans(self, text: str) -> List[Dict[str, any]]:
+        """
+        텍스트를 연속된 섹션 구간으로 분리 (줄/문자 오프셋 포함)
+        
+        Args:
+            text: 추출된 텍스트
+            
+        Returns:
+            구간 리스트. 각 구간은 section, text, start_line, end_line(미포함),
+            start, end(문자 오프셋, 미포함)를 담은 딕셔너리
+        """
+        # 전체 텍스트를 한 번만 스캔하여 섹션이 바뀌는 줄(경계) 찾기
+        # 경계: (줄 번호, 줄 시작 오프셋, 섹션)
+        boundaries = [(0, 0, "other")]
+        line_index = 0
+        line_start = 0
+        scanned = 0
+        line_priority = None
+        
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            matches = _SECTION_PATTERN.finditer(lowered)
+        else:
+            matches = _SECTION_PATTERN_IGNORECASE.finditer(text)
+        
+        for match in matches:
+            position = match.start()
+            newline_count = text.count("\n", scanned, position)
+            if newline_count:
+                line_index += newline_count
+                line_start = text.rfind("\n", scanned, position) + 1
+                line_priority = None
+            scanned = position
+            
+            # 한 줄에 여러 키워드가 있으면 우선순위가 높은 섹션으로 분류
+            priority = _KEYWORD_PRIORITY[match.group().lower()]
+            if line_priority is not None and priority >= line_priority:
+                continue
+            line_priority = priority
+            section = SECTION_KEYWORDS[priority][0]
+            
+            if boundaries[-1][0] == line_index:
+                boundaries.pop()
+            if boundaries and boundaries[-1][2] == section:
+                continue
+            boundaries.append((line_index, line_start, section))
+        
+        total_lines = text.count("\n") + 1
+        spans = []
+        for index, (start_line, start, section) in enumerate(boundaries):
+            if index + 1 < len(boundaries):
+                end_line, next_start, _ = boundaries[index + 1]
+                end = next_start - 1
+            else:
+                end_line, end = total_lines, len(text)
+            
+            # 빈 줄을 제외하고 리스트로 모아 한 번에 합치기
+            span_text = "\n".join(filter(str.strip, text[start:end].split("\n")))
+            if span_text:
+                spans.append({
+                    "section": section,
+                    "text": span_text,
+                    "start_line": start_line,
+                    "end_line": end_line,
+                    "start": start,
+                    "end": end
+                })
+        
+        return spans
     
     def extract_sections(self, text: str) -> Dict[str, str]:
         """
@@ -49,40 +389,18 @@ class PDFService:
         Returns:
             섹션별로 분리된 딕셔너리
         """
-        sections = {
-            "personal_info": "",
-            "education": "",
-            "experience": "",
-            "projects": "",
-            "skills": "",
-            "other": ""
-        }
+        return self._sections_from_spans(self.extract_section_spans(text))
+    
+    @staticmethod
+    def _sections_from_spans(spans: List[Dict[str, any]]) -> Dict[str, str]:
+        """섹션 구간을 섹션별 텍스트로 합치기"""
+        section_parts: Dict[str, List[str]] = {name: [] for name, _ in SECTION_KEYWORDS}
+        section_parts["other"] = []
         
-        lines = text.split("\n")
-        current_section = "other"
+        for span in spans:
+            section_parts[span["section"]].append(span["text"])
         
-        for line in lines:
-            line_lower = line.lower().strip()
-            
-            # 섹션 키워드 감지
-            if any(keyword in line_lower for keyword in ["이름", "연락처", "이메일", "주소", "전화번호", "phone", "email"]):
-                current_section = "personal_info"
-            elif any(keyword in line_lower for keyword in ["학력", "교육", "education", "학위", "학교"]):
-                current_section = "education"
-            elif any(keyword in line_lower for keyword in ["경력", "경험", "experience", "근무", "회사", "work"]):
-                current_section = "experience"
-            elif any(keyword in line_lower for keyword in ["프로젝트", "project", "작업"]):
-                current_section = "projects"
-            elif any(keyword in line_lower for keyword in ["기술", "스킬", "skill", "능력", "보유기술"]):
-                current_section = "skills"
-            
-            # 빈 줄이 아닌 경우 현재 섹션에 추가
-            if line.strip():
-                if sections[current_section]:
-                    sections[current_section] += "\n"
-                sections[current_section] += line
-        
-        return sections
+        return {name: "\n".join(parts) for name, parts in section_parts.items()}
     
     def get_summary(self, text: str) -> Dict[str, any]:
         """
@@ -94,12 +412,13 @@ class PDFService:
         Returns:
             요약 정보 딕셔너리
         """
+        lines = text.split("\n")
         sections = self.extract_sections(text)
         
         # 기본 통계
         total_chars = len(text)
-        total_lines = len(text.split("\n"))
-        non_empty_lines = len([line for line in text.split("\n") if line.strip()])
+        total_lines = len(lines)
+        non_empty_lines = len(list(filter(str.strip, lines)))
         
         return {
             "total_characters": total_chars,
@@ -114,4 +433,3 @@ class PDFService:
             },
             "sections": sections
         }
-
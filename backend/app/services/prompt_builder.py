@@ -0,0 +1,278 @@
+"""
+토큰 예산 기반 프롬프트 조립 (RAGService / 질문 생성 페이지 공용)
+"""
+import json
+from typing import Dict, List, Optional
+from app.config import settings
+from app.services.token_counter import estimate_tokens, truncate_to_tokens
+
+
+ANTHROPIC_VERSION = "bedrock-2023-05-31"
+
+# 이보다 적은 토큰만 남으면 청크/메시지를 잘라 넣지 않고 생략
+_MIN_PARTIAL_TOKENS = 50
+
+# Bedrock 프롬프트 캐싱(cache_control)을 지원하는 Claude 모델 (리전 접두사 "us." 등은 무시)
+PROMPT_CACHING_MODELS = [
+    "anthropic.claude-3-5-haiku",
+    "anthropic.claude-3-5-sonnet-20241022-v2",
+    "anthropic.claude-3-7-sonnet",
+    "anthropic.claude-sonnet-4",
+    "anthropic.claude-opus-4",
+]
+
+
+def supports_prompt_caching(model_id: Optional[str] = None) -> bool:
+    """
+    모델이 프롬프트 캐싱을 지원하고 설정에서 켜져 있는지 확인
+    
+    Args:
+        model_id: Bedrock 모델 ID (기본값: settings.bedrock_model_id)
+        
+    Returns:
+        cache_control 사용 여부
+    """
+    if not settings.prompt_cache_enabled:
+        return False
+    model_id = model_id or settings.bedrock_model_id
+    return any(model in model_id for model in PROMPT_CACHING_MODELS)
+
+
+def empty_usage() -> Dict[str, int]:
+    """요청별 토큰 사용량 초기값"""
+    return {
+        "input_tokens": 0,  # 캐시되지 않은 입력 토큰
+        "cache_read_input_tokens": 0,
+        "cache_creation_input_tokens": 0,
+        "output_tokens": 0
+    }
+
+
+def update_usage(usage: Dict[str, int], event: Dict) -> Dict[str, int]:
+    """
+    응답 본문 또는 스트리밍 이벤트에서 토큰 사용량 반영
+    
+    - invoke_model 응답: usage
+    - 스트리밍: message_start(message.usage), message_delta(usage.output_tokens),
+      마지막 청크의 amazon-bedrock-invocationMetrics
+    
+    Args:
+        usage: empty_usage()로 만든 사용량 딕셔너리 (갱신됨)
+        event: 응답 JSON 또는 스트리밍 청크 JSON
+        
+    Returns:
+        갱신된 usage
+    """
+    event_usage = event.get("usage") or event.get("message", {}).get("usage") or {}
+    for key in usage:
+        if event_usage.get(key) is not None:
+            usage[key] = event_usage[key]
+    
+    metrics = event.get("amazon-bedrock-invocationMetrics")
+    if metrics:
+        usage["output_tokens"] = metrics.get("outputTokenCount", usage["output_tokens"])
+        if metrics.get("cacheReadInputTokenCount") is not None:
+            usage["cache_read_input_tokens"] = metrics["cacheReadInputTokenCount"]
+        if metrics.get("cacheWriteInputTokenCount") is not None:
+            usage["cache_creation_input_tokens"] = metrics["cacheWriteInputTokenCount"]
+        if not usage["input_tokens"]:
+            usage["input_tokens"] = metrics.get("inputTokenCount", 0)
+    return usage
+
+
+class PromptAssembler:
+    """
+    시스템 프롬프트, 참고 자료, 대화 히스토리, 현재 질문을 토큰 예산 안에서 조립하여
+    Bedrock Claude Messages API 요청으로 만드는 조립기
+    
+    우선순위: 시스템 프롬프트 = 현재 질문 (자르지 않음) > 참고 자료 > 대화 히스토리
+    - 참고 자료: 검색 순위대로 청크 단위로 넣고, 예산 경계의 청크만 잘라서 넣음
+    - 대화 히스토리: 최근 메시지부터 넣고, 가장 오래된 메시지만 잘라서 넣음
+    - 참고 자료가 예산을 다 쓰지 않으면 남은 토큰은 히스토리가 사용
+    """
+    
+    def __init__(
+        self,
+        max_input_tokens: Optional[int] = None,
+        context_tokens: Optional[int] = None,
+        history_tokens: Optional[int] = None
+    ):
+        """
+        Args:
+            max_input_tokens: 입력 전체 토큰 상한 (기본값: settings.prompt_max_input_tokens)
+            context_tokens: 참고 자료 토큰 예산 (기본값: settings.context_token_budget)
+            history_tokens: 대화 히스토리 토큰 예산 (기본값: settings.prompt_history_tokens)
+        """
+        self.max_input_tokens = max_input_tokens or settings.prompt_max_input_tokens
+        self.context_tokens = context_tokens if context_tokens is not None else settings.context_token_budget
+        self.history_tokens = history_tokens if history_tokens is not None else settings.prompt_history_tokens
+    
+    def _fit_context(self, documents: List[str], budget: int) -> List[str]:
+        """검색 순위대로 예산 안에 들어가는 참고 자료 선택"""
+        selected = []
+        remaining = budget
+        for text in documents:
+            text = text.strip()
+            if not text:
+                continue
+            tokens = estimate_tokens(text)
+            if tokens <= remaining:
+                selected.append(text)
+                remaining -= tokens
+                continue
+            if remaining >= _MIN_PARTIAL_TOKENS:
+                selected.append(truncate_to_tokens(text, remaining))
+            break
+        return selected
+    
+    def _fit_history(self, history: List[Dict], budget: int) -> List[Dict]:
+        """최근 메시지부터 예산 안에 들어가는 대화 히스토리 선택"""
+        selected = []
+        remaining = budget
+        for message in reversed(history):
+            if message.get("role") not in ("user", "assistant") or not message.get("content"):
+                continue
+            content = message["content"]
+            tokens = estimate_tokens(content)
+            if tokens > remaining:
+                if remaining >= _MIN_PARTIAL_TOKENS:
+                    selected.insert(0, {"role": message["role"], "content": truncate_to_tokens(content, remaining)})
+                break
+            selected.insert(0, {"role": message["role"], "content": content})
+            remaining -= tokens
+        return selected
+    
+    @staticmethod
+    def _to_bedrock_messages(history: List[Dict], user_turn: str) -> List[Dict]:
+        """
+        Bedrock 메시지 형식으로 변환
+        (첫 메시지는 user, 같은 역할이 연속되면 합쳐서 user/assistant가 번갈아 나오도록 함)
+        """
+        turns = history + [{"role": "user", "content": user_turn}]
+        while turns and turns[0]["role"] != "user":
+            turns = turns[1:]
+        
+        messages: List[Dict] = []
+        for turn in turns:
+            if messages and messages[-1]["role"] == turn["role"]:
+                messages[-1]["content"][0]["text"] += f"\n\n{turn['content']}"
+            else:
+                messages.append({"role": turn["role"], "content": [{"type": "text", "text": turn["content"]}]})
+        return messages
+    
+    def assemble(
+        self,
+        system_prompt: str,
+        question: str,
+        documents: Optional[List[str]] = None,
+        history: Optional[List[Dict]] = None,
+        empty_context_text: Optional[str] = None,
+        summary: Optional[str] = None
+    ) -> Dict:
+        """
+        프롬프트 조립
+        
+        Args:
+            system_prompt: 시스템 프롬프트
+            question: 현재 질문
+            documents: 참고 자료 텍스트 (검색 순위 순)
+            history: 이전 대화 [{"role": "user"|"assistant", "content": str}, ...] (현재 질문 제외)
+            empty_context_text: 참고 자료가 없을 때 [참고 자료] 자리에 넣을 문구 (None이면 섹션 생략)
+            summary: 이전 대화 요약 (SummarizingMemory.summary, 히스토리 예산에서 먼저 사용)
+            
+        Returns:
+            system, summary, messages와 구간별 토큰 사용량(token_usage), 포함된 문서/메시지 수
+        """
+        fixed_tokens = estimate_tokens(system_prompt) + estimate_tokens(question)
+        available = max(self.max_input_tokens - fixed_tokens, 0)
+        
+        context = self._fit_context(documents or [], min(self.context_tokens, available))
+        context_text = "\n\n".join(context)
+        context_used = estimate_tokens(context_text)
+        
+        # 참고 자료가 쓰고 남은 예산은 히스토리로 넘김
+        history_budget = min(
+            self.history_tokens + max(self.context_tokens - context_used, 0),
+            available - context_used
+        )
+        # 이전 대화 요약은 최근 대화보다 먼저 히스토리 예산을 사용
+        summary_text = truncate_to_tokens(summary.strip(), history_budget) if summary else ""
+        summary_used = estimate_tokens(summary_text)
+        selected_history = self._fit_history(history or [], history_budget - summary_used)
+        
+        # 참고 자료는 매 요청 달라지므로 시스템 프롬프트가 아닌 현재 질문 앞에 배치
+        # (시스템 프롬프트 → 이전 대화까지의 앞부분이 요청마다 같아야 프롬프트 캐시가 적중함)
+        user_turn = question
+        if context_text or empty_context_text:
+            user_turn = f"[참고 자료]\n{context_text or empty_context_text}\n\n[질문]\n{question}"
+        
+        return {
+            "system": system_prompt,
+            "summary": summary_text,
+            "messages": self._to_bedrock_messages(selected_history, user_turn),
+            "token_usage": {
+                "system": estimate_tokens(system_prompt),
+                "context": context_used,
+                "summary": summary_used,
+                "history": sum(estimate_tokens(message["content"]) for message in selected_history),
+                "question": estimate_tokens(question)
+            },
+            "included_documents": len(context),
+            "included_messages": len(selected_history)
+        }
+    
+    @staticmethod
+    def to_bedrock_body(
+        prompt: Dict,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        prompt_caching: Optional[bool] = None
+    ) -> str:
+        """
+        조립된 프롬프트를 invoke_model 요청 본문(JSON)으로 변환
+        
+        프롬프트 캐싱 사용 시 시스템 프롬프트 끝과 이전 대화의 마지막 메시지에
+        cache_control 지점을 두어, 다음 요청에서 그 앞부분을 캐시에서 읽도록 합니다.
+        이전 대화 요약은 고정 시스템 프롬프트 뒤의 별도 블록으로 붙여 요약이 바뀌어도
+        시스템 프롬프트 캐시는 유지됩니다.
+        
+        Args:
+            prompt: assemble 결과
+            max_tokens: 최대 출력 토큰 (기본값: settings.max_tokens)
+            temperature: 샘플링 온도 (None이면 모델 기본값)
+            prompt_caching: cache_control 사용 여부 (기본값: 모델 지원 여부)
+            
+        Returns:
+            요청 본문 JSON 문자열
+        """
+        if prompt_caching is None:
+            prompt_caching = supports_prompt_caching()
+        
+        summary = prompt.get("summary")
+        summary_text = f"[이전 대화 요약]\n{summary}" if summary else ""
+        
+        system = "\n\n".join(text for text in [prompt["system"], summary_text] if text)
+        messages = prompt["messages"]
+        if prompt_caching and prompt["system"]:
+            system = [{"type": "text", "text": prompt["system"], "cache_control": {"type": "ephemeral"}}]
+            if summary_text:
+                system.append({"type": "text", "text": summary_text})
+            if len(messages) > 1:
+                # 현재 질문 직전 메시지까지 캐시 (원본 prompt는 바꾸지 않도록 복사)
+                messages = [dict(message) for message in messages]
+                last_history = messages[-2]
+                last_history["content"] = [
+                    *last_history["content"][:-1],
+                    {**last_history["content"][-1], "cache_control": {"type": "ephemeral"}}
+                ]
+        
+        body = {
+            "anthropic_version": ANTHROPIC_VERSION,
+            "max_tokens": max_tokens or settings.max_tokens,
+            "messages": messages
+        }
+        if system:
+            body["system"] = system
+        if temperature is not None:
+            body["temperature"] = temperature
+        return json.dumps(body, ensure_ascii=False)
@@ -0,0 +1,728 @@
+"""
+양자화 로컬 벡터 인덱스 (Chroma 대체 백엔드)
+
+- 검색용 코드: int8(차원당 1바이트) 또는 이진(차원당 1비트) 양자화 벡터를 메모리 매핑 NumPy 배열에 저장
+- 정확 재계산: 양자화 점수로 고른 상위 후보만 디스크의 float32 원본(메모리 매핑)에서 읽어 제곱 L2 거리로 다시 정렬
+- 청크 ID/문서 본문/메타데이터: SQLite (where 필터도 SQLite에서 json_extract로 계산해 메모리에 올리지 않음)
+
+float32(차원당 4바이트) 벡터를 HNSW 그래프와 함께 메모리에 올리는 Chroma보다
+같은 메모리에 int8은 약 4배, 이진은 약 32배 많은 청크의 검색 코드를 둘 수 있습니다.
+
+여러 프로세스(uvicorn 워커, Streamlit, 작업 큐)가 같은 디렉터리를 열어도 손상되지 않도록
+- 프로세스 안에서는 경로별 클라이언트 하나를 공유 (get_quantized_client)
+- 프로세스 사이에서는 파일 잠금(쓰기: 배타, 읽기: 공유)을 잡고, 다른 프로세스가 기록한 변경(meta.json 버전)이 있으면
+  배열을 다시 열고 작업합니다.
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from app.config import settings
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: 파일 잠금 없이 동작 (한 프로세스에서만 사용)
+    fcntl = None
+
+
+QUANTIZATION_TYPES = ["int8", "binary"]
+
+# 바이트별 1비트 개수 (이진 코드 해밍 거리 계산용)
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+_COLLECTION_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{1,62}$")
+
+# 양자화 점수를 계산할 때 한 번에 처리할 행 수 (임시 배열 크기 제한)
+_SCAN_BLOCK_ROWS = 32768
+
+
+# SQLite 비교 연산자 (IS/IS NOT은 값이 없는(NULL) 키도 Chroma 필터와 같게 비교)
+_SQL_OPERATORS = {"$eq": "IS", "$ne": "IS NOT", "$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+
+# SQLite 바인딩 변수 수 제한 안에서 한 번에 조회할 ID/행 수
+_SQL_BATCH = 500
+
+
+def _json_path(key: str) -> str:
+    return '$."' + key.replace('"', '\\"') + '"'
+
+
+def _sql_value(value):
+    # JSON의 true/false는 json_extract에서 1/0이 됨
+    return int(value) if isinstance(value, bool) else value
+
+
+def _condition_sql(key: str, condition) -> Tuple[str, List]:
+    column = "json_extract(metadata, ?)"
+    if not isinstance(condition, dict):
+        condition = {"$eq": condition}
+    clauses: List[str] = []
+    params: List = []
+    for operator, operand in condition.items():
+        if operator in _SQL_OPERATORS:
+            clauses.append(f"{column} {_SQL_OPERATORS[operator]} ?")
+            params.extend([_json_path(key), _sql_value(operand)])
+        elif operator in ("$in", "$nin"):
+            values = [_sql_value(value) for value in operand]
+            placeholders = ",".join("?" * len(values)) or "NULL"
+            if operator == "$in":
+                clauses.append(f"{column} IN ({placeholders})")
+                params.extend([_json_path(key), *values])
+            else:
+                clauses.append(f"({column} IS NULL OR {column} NOT IN ({placeholders}))")
+                params.extend([_json_path(key), _json_path(key), *values])
+        else:
+            raise ValueError(f"지원하지 않는 where 연산자입니다: {operator}")
+    return " AND ".join(clauses) or "1", params
+
+
+def where_sql(where: Optional[Dict]) -> Tuple[str, List]:
+    """
+    Chroma where 필터를 records.metadata(JSON)에 대한 SQLite 조건으로 변환
+    
+    Args:
+        where: {"키": 값}, {"키": {"$in": [...]}}, {"$and": [...]}, {"$or": [...]} 형식 필터
+        
+    Returns:
+        (SQL 조건식, 바인딩 값)
+    """
+    if not where:
+        return "1", []
+    clauses: List[str] = []
+    params: List = []
+    for key, condition in where.items():
+        if key in ("$and", "$or"):
+            parts = [where_sql(sub) for sub in condition]
+            joiner = " AND " if key == "$and" else " OR "
+            clauses.append("(" + (joiner.join(sql for sql, _ in parts) or "1") + ")")
+            for _, sub_params in parts:
+                params.extend(sub_params)
+        else:
+            sql, sub_params = _condition_sql(key, condition)
+            clauses.append(f"({sql})")
+            params.extend(sub_params)
+    return " AND ".join(clauses), params
+
+
+class QuantizedCollection:
+    """
+    양자화 인덱스 컬렉션 하나 (chromadb Collection과 같은 연산)
+    
+    디렉터리 구성: meta.json, codes.npy(양자화 코드), scales.npy(int8 행별 배율),
+    norms.npy(원본 제곱 노름), vectors.npy(float32 원본, 재계산용), alive.npy(행 사용 여부)
+    
+    청크 ID/본문/메타데이터는 SQLite(records)에만 두고 where 필터도 SQLite에서 계산하므로
+    메모리에는 검색 코드와 행별 고정 크기 값만 상주하고, 다른 프로세스가 저장한 뒤 다시 불러올 때도
+    메타데이터를 다시 읽지 않습니다 (배열은 메모리 매핑으로 다시 열기만 함).
+    """
+    
+    def __init__(self, client: "QuantizedVectorClient", name: str, metadata: Optional[Dict] = None):
+        self.client = client
+        self.name = name
+        self.metadata = metadata or {}
+        self.directory = os.path.join(client.path, name)
+        self.quantization = client.quantization
+        self.dimensions: Optional[int] = None
+        self.size = 0  # 사용한 행 수 (삭제된 행 포함)
+        self.capacity = 0
+        self.version = 0  # 저장할 때마다 증가 (다른 프로세스의 변경 감지용)
+        
+        self._codes = self._scales = self._norms = self._vectors = self._alive = None
+        self._where_cache: Dict[str, np.ndarray] = {}
+        
+        meta_path = self._path("meta.json")
+        if os.path.exists(meta_path):
+            self._load(self._read_meta())
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            self._save_meta()
+    
+    # ------------------------------------------------------------------
+    # 저장/불러오기
+    # ------------------------------------------------------------------
+    
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+    
+    def _save_meta(self):
+        meta = {
+            "name": self.name,
+            "metadata": self.metadata,
+            "quantization": self.quantization,
+            "dimensions": self.dimensions,
+            "size": self.size,
+            "capacity": self.capacity,
+            "version": self.version
+        }
+        temp_path = self._path("meta.json.tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(meta, file, ensure_ascii=False)
+        os.replace(temp_path, self._path("meta.json"))
+    
+    def _read_meta(self) -> Optional[Dict]:
+        try:
+            with open(self._path("meta.json"), encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+    
+    def _load(self, meta: Dict):
+        self.metadata = meta.get("metadata") or {}
+        self.quantization = meta.get("quantization", self.quantization)
+        self.dimensions = meta.get("dimensions")
+        self.size = meta.get("size", 0)
+        self.capacity = meta.get("capacity", 0)
+        self.version = meta.get("version", 0)
+        self._where_cache = {}
+        
+        self._codes = self._scales = self._norms = self._vectors = self._alive = None
+        if self.dimensions and self.capacity:
+            self._codes = np.load(self._path("codes.npy"), mmap_mode="r+")
+            self._scales = np.load(self._path("scales.npy"), mmap_mode="r+")
+            self._norms = np.load(self._path("norms.npy"), mmap_mode="r+")
+            self._vectors = np.load(self._path("vectors.npy"), mmap_mode="r+")
+            if not os.path.exists(self._path("alive.npy")):
+                self._build_alive()
+            self._alive = np.load(self._path("alive.npy"), mmap_mode="r+")
+    
+    def _build_alive(self):
+        """alive.npy가 없는 이전 형식 인덱스: 레코드가 있는 행으로 사용 여부 배열 생성 (한 번만)"""
+        alive = np.zeros(self.capacity, dtype=bool)
+        rows = [row for (row,) in self.client._execute(
+            "SELECT row FROM records WHERE collection = ?", (self.name,)
+        ).fetchall() if row < self.size]
+        alive[rows] = True
+        temp_path = self._path("alive.tmp.npy")
+        np.save(temp_path, alive)
+        os.replace(temp_path, self._path("alive.npy"))
+    
+    def _code_width(self) -> int:
+        if self.quantization == "binary":
+            return (self.dimensions + 7) // 8
+        return self.dimensions
+    
+    def _open_array(self, filename: str, shape, dtype, previous):
+        array = np.lib.format.open_memmap(self._path(filename + ".tmp"), mode="w+", dtype=dtype, shape=shape)
+        if previous is not None and self.size:
+            array[:self.size] = previous[:self.size]
+        array.flush()
+        del previous
+        os.replace(self._path(filename + ".tmp"), self._path(filename))
+        return np.load(self._path(filename), mmap_mode="r+")
+    
+    def _ensure_capacity(self, rows_needed: int):
+        if self.size + rows_needed <= self.capacity:
+            return
+        capacity = max(1024, self.capacity)
+        while capacity < self.size + rows_needed:
+            capacity *= 2
+        code_dtype = np.uint8 if self.quantization == "binary" else np.int8
+        self._codes = self._open_array("codes.npy", (capacity, self._code_width()), code_dtype, self._codes)
+        self._scales = self._open_array("scales.npy", (capacity,), np.float32, self._scales)
+        self._norms = self._open_array("norms.npy", (capacity,), np.float32, self._norms)
+        self._vectors = self._open_array("vectors.npy", (capacity, self.dimensions), np.float32, self._vectors)
+        self._alive = self._open_array("alive.npy", (capacity,), bool, self._alive)
+        self.capacity = capacity
+    
+    def _flush(self):
+        for array in (self._codes, self._scales, self._norms, self._vectors, self._alive):
+            if array is not None:
+                array.flush()
+        self.version += 1
+        self._save_meta()
+        self._where_cache = {}
+    
+    def _sync(self):
+        """
+        다른 프로세스가 저장한 변경이 있으면 다시 불러오기 (client.locked() 안에서 호출)
+        
+        메모리에 남은 크기/행 번호로 쓰면 다른 프로세스가 추가한 행을 덮어쓰므로 읽기/쓰기 전에 항상 확인합니다.
+        """
+        meta = self._read_meta()
+        if meta is None:
+            raise ValueError(f"Collection {self.name} does not exist.")
+        if meta.get("version", 0) != self.version:
+            self._load(meta)
+    
+    # ------------------------------------------------------------------
+    # 레코드 (SQLite)
+    # ------------------------------------------------------------------
+    
+    def _rows_for_ids(self, ids: List[str]) -> Dict[str, int]:
+        """청크 ID → 행 번호 (없는 ID는 제외)"""
+        rows: Dict[str, int] = {}
+        for start in range(0, len(ids), _SQL_BATCH):
+            batch = ids[start:start + _SQL_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            for chunk_id, row in self.client._execute(
+                f"SELECT id, row FROM records WHERE collection = ? AND id IN ({placeholders})",
+                (self.name, *batch)
+            ).fetchall():
+                rows[chunk_id] = row
+        return rows
+    
+    def _records(self, rows, include_documents: bool, include_metadatas: bool) -> Dict[int, Tuple]:
+        """행 번호 → (ID, 본문, 메타데이터)"""
+        columns = "row, id" + (", document" if include_documents else ", NULL") + (", metadata" if include_metadatas else ", NULL")
+        records: Dict[int, Tuple] = {}
+        rows = [int(row) for row in rows]
+        for start in range(0, len(rows), _SQL_BATCH):
+            batch = rows[start:start + _SQL_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            for row, chunk_id, document, metadata_json in self.client._execute(
+                f"SELECT {columns} FROM records WHERE collection = ? AND row IN ({placeholders})",
+                (self.name, *batch)
+            ).fetchall():
+                records[row] = (chunk_id, document, json.loads(metadata_json) if metadata_json else None)
+        return records
+    
+    # ------------------------------------------------------------------
+    # 양자화
+    # ------------------------------------------------------------------
+    
+    def _quantize(self, vectors: np.ndarray):
+        """float32 벡터 → (코드, 배율)"""
+        if self.quantization == "binary":
+            return np.packbits(vectors > 0, axis=1), np.ones(len(vectors), dtype=np.float32)
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales.astype(np.float32)
+    
+    def _write_rows(self, rows: List[int], vectors: np.ndarray):
+        codes, scales = self._quantize(vectors)
+        index = np.asarray(rows)
+        self._codes[index] = codes
+        self._scales[index] = scales
+        self._norms[index] = (vectors * vectors).sum(axis=1)
+        self._vectors[index] = vectors
+    
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    
+    def count(self) -> int:
+        """저장된 청크 수"""
+        with self.client.locked(exclusive=False):
+            self._sync()
+            return int(self._alive[:self.size].sum()) if self._alive is not None else 0
+    
+    def add(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict]):
+        """청크 추가 (이미 있는 ID는 Chroma처럼 무시)"""
+        self._write(ids, embeddings, documents, metadatas, overwrite=False)
+    
+    def upsert(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict]):
+        """청크 추가 또는 덮어쓰기"""
+        self._write(ids, embeddings, documents, metadatas, overwrite=True)
+    
+    def _write(self, ids, embeddings, documents, metadatas, overwrite: bool):
+        if len(set(ids)) != len(ids):
+            raise ValueError("한 번에 저장하는 청크 ID가 중복되었습니다.")
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(ids):
+            raise ValueError("임베딩 개수가 청크 ID 개수와 다릅니다.")
+        
+        with self.client.locked():
+            self._sync()
+            if self.dimensions is None:
+                self.dimensions = vectors.shape[1]
+            elif vectors.shape[1] != self.dimensions:
+                raise ValueError(f"임베딩 차원이 다릅니다: {vectors.shape[1]} (컬렉션: {self.dimensions})")
+            
+            existing = self._rows_for_ids(list(ids))
+            new_positions = [i for i, chunk_id in enumerate(ids) if chunk_id not in existing]
+            old_positions = [i for i, chunk_id in enumerate(ids) if chunk_id in existing] if overwrite else []
+            self._ensure_capacity(len(new_positions))
+            
+            rows: List[int] = []
+            positions: List[int] = []
+            for i in old_positions:
+                rows.append(existing[ids[i]])
+                positions.append(i)
+            for i in new_positions:
+                rows.append(self.size)
+                positions.append(i)
+                self.size += 1
+            if not rows:
+                return
+            
+            self._write_rows(rows, vectors[positions])
+            self._alive[np.asarray(rows)] = True
+            records = []
+            for row, i in zip(rows, positions):
+                metadata = metadatas[i] if metadatas else None
+                records.append((
+                    self.name, row, ids[i],
+                    documents[i] if documents else None,
+                    json.dumps(metadata, ensure_ascii=False) if metadata is not None else None
+                ))
+            self.client._executemany(
+                "INSERT OR REPLACE INTO records (collection, row, id, document, metadata) VALUES (?, ?, ?, ?, ?)",
+                records
+            )
+            self._flush()
+    
+    def update(
+        self,
+        ids: List[str],
+        metadatas: Optional[List[Dict]] = None,
+        embeddings: Optional[List[List[float]]] = None,
+        documents: Optional[List[str]] = None
+    ):
+        """기존 청크의 메타데이터/임베딩/본문 갱신 (없는 ID는 무시)"""
+        with self.client.locked():
+            self._sync()
+            existing = self._rows_for_ids(list(ids))
+            positions = [i for i, chunk_id in enumerate(ids) if chunk_id in existing]
+            if not positions:
+                return
+            rows = [existing[ids[i]] for i in positions]
+            if embeddings is not None:
+                vectors = np.asarray(embeddings, dtype=np.float32)[positions]
+                self._write_rows(rows, vectors)
+            for i in positions:
+                if metadatas is not None:
+                    self.client._execute(
+                        "UPDATE records SET metadata = ? WHERE collection = ? AND id = ?",
+                        (json.dumps(metadatas[i], ensure_ascii=False), self.name, ids[i])
+                    )
+                if documents is not None:
+                    self.client._execute(
+                        "UPDATE records SET document = ? WHERE collection = ? AND id = ?",
+                        (documents[i], self.name, ids[i])
+                    )
+            self.client._commit()
+            self._flush()
+    
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict] = None):
+        """청크 삭제 (행은 비워 두고, 삭제된 행이 절반을 넘으면 압축)"""
+        with self.client.locked():
+            self._sync()
+            rows = self._select_rows(ids, where)
+            if len(rows) == 0:
+                return
+            deleted_ids = [chunk_id for chunk_id, _, _ in self._records(rows, False, False).values()]
+            self._alive[rows] = False
+            self.client._executemany(
+                "DELETE FROM records WHERE collection = ? AND id = ?",
+                [(self.name, chunk_id) for chunk_id in deleted_ids]
+            )
+            if self.size > 1024 and int(self._alive[:self.size].sum()) < self.size // 2:
+                self.compact()
+            self._flush()
+    
+    def compact(self):
+        """삭제된 행을 제거하고 남은 행을 앞으로 모음"""
+        with self.client.locked():
+            self._sync()
+            if self._alive is None:
+                return
+            live = np.nonzero(self._alive[:self.size])[0]
+            for array in (self._codes, self._scales, self._norms, self._vectors):
+                array[:len(live)] = array[live]
+            moved = [(new_row, int(old_row)) for new_row, old_row in enumerate(live) if new_row != old_row]
+            
+            self.size = len(live)
+            self._alive[:] = False
+            self._alive[:self.size] = True
+            # 앞으로 옮기는 행만 레코드 행 번호 갱신 (새 번호는 항상 이전 번호보다 작으므로 순서대로 바꿔도 겹치지 않음)
+            self.client._executemany(
+                "UPDATE records SET row = ? WHERE collection = ? AND row = ?",
+                [(new_row, self.name, old_row) for new_row, old_row in moved]
+            )
+            self._flush()
+    
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+    
+    def _where_mask(self, where: Optional[Dict]) -> np.ndarray:
+        alive = self._alive[:self.size] if self._alive is not None else np.zeros(0, dtype=bool)
+        if not where:
+            return alive
+        key = json.dumps(where, sort_keys=True, ensure_ascii=False)
+        mask = self._where_cache.get(key)
+        if mask is None:
+            sql, params = where_sql(where)
+            mask = np.zeros(self.size, dtype=bool)
+            rows = [row for (row,) in self.client._execute(
+                f"SELECT row FROM records WHERE collection = ? AND {sql}", (self.name, *params)
+            ).fetchall() if row < self.size]
+            mask[rows] = True
+            mask &= alive
+            self._where_cache[key] = mask
+        return mask
+    
+    def _select_rows(self, ids: Optional[List[str]], where: Optional[Dict]) -> np.ndarray:
+        if ids is not None:
+            found = self._rows_for_ids(list(ids))
+            rows = [found[chunk_id] for chunk_id in dict.fromkeys(ids) if chunk_id in found]
+            if where:
+                mask = self._where_mask(where)
+                rows = [row for row in rows if mask[row]]
+            return np.asarray(rows, dtype=np.int64)
+        return np.nonzero(self._where_mask(where))[0]
+    
+    def _results(self, rows, include: List[str]) -> Dict:
+        records = self._records(rows, "documents" in include, "metadatas" in include)
+        return {
+            "ids": [records[int(row)][0] for row in rows],
+            "embeddings": [self._vectors[row].tolist() for row in rows] if "embeddings" in include else None,
+            "documents": [records[int(row)][1] for row in rows] if "documents" in include else None,
+            "metadatas": [records[int(row)][2] for row in rows] if "metadatas" in include else None
+        }
+    
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict] = None,
+        include: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> Dict:
+        """ID/메타데이터 필터로 청크 조회 (Chroma get과 같은 결과 형식)"""
+        include = ["metadatas", "documents"] if include is None else include
+        with self.client.locked(exclusive=False):
+            self._sync()
+            rows = list(self._select_rows(ids, where))
+            rows = rows[offset or 0:]
+            if limit is not None:
+                rows = rows[:limit]
+            return self._results(rows, include)
+    
+    def _approximate_scores(self, rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """양자화 코드로 근사 점수 계산 (작을수록 가까움)"""
+        scores = np.empty(len(rows), dtype=np.float32)
+        if self.quantization == "binary":
+            query_bits = np.packbits(query > 0)
+            for start in range(0, len(rows), _SCAN_BLOCK_ROWS):
+                block = rows[start:start + _SCAN_BLOCK_ROWS]
+                scores[start:start + len(block)] = _POPCOUNT[self._codes[block] ^ query_bits].sum(axis=1)
+        else:
+            for start in range(0, len(rows), _SCAN_BLOCK_ROWS):
+                block = rows[start:start + _SCAN_BLOCK_ROWS]
+                dots = (self._codes[block].astype(np.float32) @ query) * self._scales[block]
+                # 제곱 L2 거리에서 질의 노름(상수)을 뺀 값
+                scores[start:start + len(block)] = self._norms[block] - 2 * dots
+        return scores
+    
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 10,
+        where: Optional[Dict] = None,
+        include: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        유사 청크 검색 (양자화 점수로 n_results × rescore_factor개 후보 → float32 원본으로 정확 재정렬)
+        
+        Returns:
+            Chroma query와 같은 형식 (distances는 제곱 L2 거리)
+        """
+        include = ["metadatas", "documents", "distances"] if include is None else include
+        results = {"ids": [], "embeddings": [], "documents": [], "metadatas": [], "distances": []}
+        
+        with self.client.locked(exclusive=False):
+            self._sync()
+            rows = self._select_rows(None, where)
+            for query_embedding in query_embeddings:
+                query = np.asarray(query_embedding, dtype=np.float32)
+                selected: List[int] = []
+                distances: List[float] = []
+                if len(rows):
+                    k = min(n_results, len(rows))
+                    candidate_count = min(len(rows), k * self.client.rescore_factor)
+                    scores = self._approximate_scores(rows, query)
+                    if candidate_count < len(rows):
+                        candidates = rows[np.argpartition(scores, candidate_count - 1)[:candidate_count]]
+                    else:
+                        candidates = rows
+                    candidates = np.sort(candidates)  # 메모리 매핑 파일을 순서대로 읽도록 정렬
+                    exact = ((self._vectors[candidates] - query) ** 2).sum(axis=1)
+                    order = np.argsort(exact)[:k]
+                    selected = [int(row) for row in candidates[order]]
+                    distances = [float(distance) for distance in exact[order]]
+                
+                partial = self._results(selected, include)
+                results["ids"].append(partial["ids"])
+                results["embeddings"].append(partial["embeddings"])
+                results["documents"].append(partial["documents"])
+                results["metadatas"].append(partial["metadatas"])
+                results["distances"].append(distances)
+        
+        for key in ("embeddings", "documents", "metadatas", "distances"):
+            if key not in include:
+                results[key] = None
+        return results
+    
+    def memory_bytes(self) -> Dict[str, int]:
+        """
+        저장 공간 사용량
+        
+        Returns:
+            {"resident": 검색 시 메모리에 올라가는 코드/배율/노름/사용 여부, "float32": 디스크의 원본 벡터,
+             "metadata": SQLite의 청크 ID/메타데이터 (where 필터 때만 디스크에서 읽음)}
+        """
+        with self.client.locked(exclusive=False):
+            self._sync()
+            if self.dimensions is None:
+                return {"resident": 0, "float32": 0, "metadata": 0}
+            metadata_bytes = self.client._execute(
+                "SELECT COALESCE(SUM(LENGTH(id) + LENGTH(metadata)), 0) FROM records WHERE collection = ?",
+                (self.name,)
+            ).fetchone()[0]
+            return {
+                "resident": self.size * (self._code_width() + 9),
+                "float32": self.size * self.dimensions * 4,
+                "metadata": int(metadata_bytes)
+            }
+
+
+class QuantizedVectorClient:
+    """
+    양자화 인덱스 컬렉션 목록 (chromadb Client와 같은 연산)
+    
+    같은 디렉터리의 인스턴스는 프로세스마다 하나만 두고(get_quantized_client) 프로세스 사이는 파일 잠금으로 보호합니다.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        quantization: Optional[str] = None,
+        rescore_factor: Optional[int] = None
+    ):
+        """
+        Args:
+            path: 인덱스 디렉터리 (기본값: settings.quantized_index_directory)
+            quantization: "int8" 또는 "binary" (기본값: settings.quantized_vector_type, 기존 컬렉션은 저장된 방식 유지)
+            rescore_factor: 정확 재계산할 후보 배수 (기본값: settings.quantized_rescore_factor)
+        """
+        self.path = path or settings.quantized_index_directory
+        self.quantization = quantization or settings.quantized_vector_type
+        if self.quantization not in QUANTIZATION_TYPES:
+            raise Exception(f"지원하지 않는 양자화 방식입니다: {self.quantization} (사용 가능: {', '.join(QUANTIZATION_TYPES)})")
+        self.rescore_factor = rescore_factor or settings.quantized_rescore_factor
+        self.max_batch_size = settings.chroma_write_batch_size
+        self.lock = threading.RLock()
+        
+        os.makedirs(self.path, exist_ok=True)
+        # 프로세스 간 잠금 파일 (flock은 열린 파일마다 잠기므로 같은 프로세스의 다른 인스턴스와도 배타적)
+        self._lock_file = open(os.path.join(self.path, ".lock"), "a")
+        self._lock_depth = 0
+        self._connection = sqlite3.connect(os.path.join(self.path, "records.db"), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "collection TEXT NOT NULL, row INTEGER NOT NULL, id TEXT NOT NULL, document TEXT, metadata TEXT, "
+            "PRIMARY KEY (collection, id))"
+        )
+        # 검색 결과 행 번호로 ID/본문/메타데이터 조회
+        self._connection.execute("CREATE INDEX IF NOT EXISTS records_row ON records (collection, row)")
+        self._connection.commit()
+        
+        self._collections: Dict[str, QuantizedCollection] = {}
+        with self.locked(exclusive=False):
+            self._scan()
+    
+    @contextmanager
+    def locked(self, exclusive: bool = True) -> Iterator[None]:
+        """
+        프로세스 안(스레드 잠금)과 프로세스 사이(파일 잠금)에서 인덱스 점유 (중첩 호출 가능)
+        
+        Args:
+            exclusive: 쓰기면 True (배타 잠금), 읽기면 False (공유 잠금)
+        """
+        with self.lock:
+            if self._lock_depth == 0 and fcntl is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and fcntl is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+    
+    def _scan(self):
+        """디렉터리의 컬렉션 목록 다시 읽기 (다른 프로세스가 만들거나 삭제한 컬렉션 반영)"""
+        names = {
+            name for name in os.listdir(self.path)
+            if os.path.exists(os.path.join(self.path, name, "meta.json"))
+        }
+        for name in list(self._collections):
+            if name not in names:
+                del self._collections[name]
+        for name in sorted(names - set(self._collections)):
+            self._collections[name] = QuantizedCollection(self, name)
+    
+    def _execute(self, sql: str, parameters=()):
+        with self.lock:
+            return self._connection.execute(sql, parameters)
+    
+    def _executemany(self, sql: str, rows):
+        with self.lock:
+            self._connection.executemany(sql, rows)
+            self._connection.commit()
+    
+    def _commit(self):
+        with self.lock:
+            self._connection.commit()
+    
+    def list_collections(self) -> List[QuantizedCollection]:
+        """컬렉션 목록"""
+        with self.locked(exclusive=False):
+            self._scan()
+            return list(self._collections.values())
+    
+    def get_collection(self, name: str) -> QuantizedCollection:
+        """컬렉션 조회 (없으면 ValueError, Chroma와 같음)"""
+        with self.locked(exclusive=False):
+            if name not in self._collections:
+                self._scan()
+            if name not in self._collections:
+                raise ValueError(f"Collection {name} does not exist.")
+            return self._collections[name]
+    
+    def get_or_create_collection(self, name: str, metadata: Optional[Dict] = None) -> QuantizedCollection:
+        """컬렉션 조회 (없으면 생성)"""
+        with self.locked():
+            self._scan()
+            if name not in self._collections:
+                if not _COLLECTION_NAME_PATTERN.match(name):
+                    raise ValueError(f"사용할 수 없는 컬렉션 이름입니다: {name}")
+                self._collections[name] = QuantizedCollection(self, name, metadata)
+            return self._collections[name]
+    
+    def delete_collection(self, name: str):
+        """컬렉션 삭제"""
+        import shutil
+        
+        with self.locked():
+            self.get_collection(name)
+            del self._collections[name]
+            self._executemany("DELETE FROM records WHERE collection = ?", [(name,)])
+            shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+
+
+_clients: Dict[str, QuantizedVectorClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_quantized_client(path: Optional[str] = None) -> QuantizedVectorClient:
+    """
+    경로별 프로세스 전역 클라이언트 (RAGService를 여러 개 만들어도 같은 인덱스 상태와 잠금을 공유)
+    
+    Args:
+        path: 인덱스 디렉터리 (기본값: settings.quantized_index_directory)
+    """
+    key = os.path.realpath(path or settings.quantized_index_directory)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = QuantizedVectorClient(path=key)
+        return _clients[key]
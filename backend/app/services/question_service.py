@@ -0,0 +1,237 @@
+"""
+면접 질문 생성 서비스 (회사별 문서 검색 + 프롬프트 조립 + 스트리밍 생성)
+"""
+import asyncio
+import json
+from typing import AsyncGenerator, Dict, List
+from langchain.schema import Document
+from app.config import settings
+from app.services.rate_limiter import rate_limiter
+from app.services.company_index import company_index
+from app.services.conversation_memory import SummarizingMemory
+from app.services.metrics import StreamTimer, metrics, record_retry, trace_request
+from app.services.prompt_builder import PromptAssembler, empty_usage, update_usage
+
+
+# 면접 질문 생성 시스템 프롬프트
+QUESTION_SYSTEM_PROMPT = """당신은 면접 준비를 도와주는 전문 챗봇입니다.
+사용자의 요청에 따라 맞춤형 면접 질문을 생성해주세요.
+
+**중요: 대화 맥락 이해**
+- 이전 대화 내용을 반드시 참고하여 답변하세요
+- 사용자가 "1번", "2번", "그 질문", "위 질문" 등으로 참조할 때는 이전에 생성한 질문을 의미합니다
+- 사용자가 "그것", "이것", "그건" 등으로 참조할 때는 이전 대화에서 언급된 내용을 의미합니다
+- 대화 히스토리를 꼼꼼히 확인하여 사용자의 의도를 정확히 파악하세요
+
+**참고 자료 활용 (가장 중요)**
+- 참고 자료가 제공된 경우, 반드시 참고 자료의 내용을 우선적으로 사용하세요
+- 참고 자료에 포함된 구체적인 정보, 용어, 기술 스택, 회사 특성 등을 정확히 반영하여 질문을 생성하세요
+- 참고 자료의 내용이 일반적인 지식과 다를 경우, 참고 자료의 내용을 기준으로 질문하세요
+- 참고 자료에 특정 회사명, 서비스명, 기술명이 나오면 그것을 반드시 포함하여 질문하세요
+- 참고 자료의 세부 내용(예: 특정 알고리즘, 아키텍처, 경험 사례)을 그대로 반영하세요
+
+다음 정보를 참고하여 답변하세요:
+- 회사명, 직무, 기술 스택이 언급되면 그것을 반영한 질문 생성
+- 질문 개수가 명시되지 않으면 5개 정도 생성
+- 기술 질문, 행동 질문, 상황 질문 등 다양한 유형 제공
+- 실제 면접에서 나올 수 있는 수준의 질문 생성
+- 이전에 생성한 질문에 대한 후속 질문(답변 예시, 설명 등)도 제공하세요
+
+**절대 하지 말아야 할 것:**
+- 참고 자료, RAG 검색, 벡터 검색, 문서 검색 등 기술적 정보를 답변에 포함하지 마세요
+- 검색된 문서의 출처나 URL을 답변에 표시하지 마세요
+- "참고 자료를 기반으로", "검색 결과", "벡터 RAG", "VECTOR 검색" 등의 표현을 사용하지 마세요
+- 참고 자료의 내용을 자연스럽게 활용하되, 기술적 용어는 언급하지 마세요
+
+답변은 친근하고 도움이 되는 톤으로 작성해주세요."""
+
+EMPTY_CONTEXT_TEXT = "참고 자료가 없습니다. 일반적인 면접 질문을 생성해주세요."
+
+
+class QuestionService:
+    """
+    면접 질문 생성 서비스 (Streamlit 질문 생성 페이지와 API 공용)
+    
+    stream()은 화면 표시 방식과 무관한 이벤트 딕셔너리를 차례로 반환합니다.
+    - retrieval: 검색 상태와 검색된 문서 미리보기
+    - prompt: 조립된 프롬프트의 구간별 토큰 사용량
+    - text: 응답 텍스트 조각
+    - retry: 요청 제한으로 재시도 대기
+    - usage: 요청별 토큰 사용량 (응답 완료)
+    - error: 오류 (throttled이면 재시도 횟수 초과)
+    """
+    
+    def __init__(self, rag_service):
+        """
+        Args:
+            rag_service: 문서 검색과 Bedrock 클라이언트를 제공하는 RAGService
+        """
+        self.rag_service = rag_service
+        self.bedrock_runtime = rag_service.bedrock_runtime
+        self.prompt_assembler = PromptAssembler()
+    
+    async def retrieve(self, question: str) -> Dict:
+        """
+        질문에 언급된 회사를 찾아 관련 문서 검색 (검색 실패 시 참고 자료 없이 진행)
+        
+        Args:
+            question: 사용자 질문
+            
+        Returns:
+            documents, company_ids, status를 담은 딕셔너리
+        """
+        # 회사명 추출 (회사 특화 문서 검색용, Aho–Corasick 매처로 한 번에 찾음)
+        company_ids = company_index.match(question)
+        companies = [company_index.display_name(company_id) for company_id in company_ids]
+        
+        # 검색 쿼리 개선: 회사명이 있으면 검색 쿼리에 포함
+        search_query = f"{question} {' '.join(companies)}" if companies else question
+        
+        documents: List[Document] = []
+        try:
+            if company_ids:
+                # 회사 관련 문서는 수집 시 저장한 회사 태그(메타데이터 필터)로 검색
+                # MMR: 같은 문서의 비슷한 청크 대신 서로 다른 정보를 담은 청크를 토큰 예산 안에서 선택
+                results = await self.rag_service.search_company_documents(
+                    search_query,
+                    company_ids,
+                    company_k=10,
+                    general_k=5,
+                    mode="mmr",
+                    token_budget=settings.context_token_budget
+                )
+                # 회사 관련 문서를 먼저, 그 다음 일반 문서
+                documents = results["company"] + results["general"]
+            else:
+                documents = await self.rag_service.search_documents(
+                    search_query,
+                    k=15,
+                    mode="mmr",
+                    token_budget=settings.context_token_budget
+                )
+            
+            if documents:
+                company_info = f" (회사: {', '.join(companies)})" if companies else ""
+                status = f"✅ RAG 사용 중 (관련 문서 {len(documents)}개 발견{company_info})"
+            else:
+                status = "⚠️ RAG 검색됐지만 관련 문서 없음 (일반 LLM 모드)"
+        except Exception as e:
+            # RAG 검색 실패 시 무시하고 계속 진행
+            status = f"❌ RAG 검색 실패: {str(e)[:50]}... (일반 LLM 모드)"
+        
+        return {"documents": documents, "company_ids": company_ids, "status": status}
+    
+    @trace_request
+    async def stream(
+        self,
+        question: str,
+        memory: SummarizingMemory,
+        max_tokens: int = 1500
+    ) -> AsyncGenerator[Dict, None]:
+        """
+        면접 질문 스트리밍 생성 (Rate Limiting & Retry 포함)
+        
+        메모리에 대화를 추가하지 않으므로 호출한 쪽에서 응답 완료 후 추가합니다.
+        
+        Args:
+            question: 사용자 질문
+            memory: 대화 메모리 (요약 + 최근 대화를 프롬프트에 사용)
+            max_tokens: 최대 출력 토큰
+            
+        Yields:
+            이벤트 딕셔너리 (클래스 설명 참고)
+        """
+        max_retries = 5
+        base_delay = 5
+        
+        for attempt in range(max_retries):
+            answered = False
+            try:
+                # Rate Limiting: 요청 전 대기 (매 시도마다)
+                await rate_limiter.wait_if_needed(key="bedrock_stream")
+                
+                retrieval = await self.retrieve(question)
+                documents = retrieval["documents"]
+                yield {
+                    "type": "retrieval",
+                    "status": retrieval["status"],
+                    "company_ids": retrieval["company_ids"],
+                    "documents": [
+                        {
+                            "source": doc.metadata.get("url", doc.metadata.get("source", "unknown")),
+                            "preview": doc.page_content[:100].replace("\n", " ")
+                        }
+                        for doc in documents
+                    ]
+                }
+                
+                # 토큰 예산 안에서 시스템 프롬프트, 참고 자료, 히스토리, 현재 질문 조립
+                with metrics.span("prompt_assembly"):
+                    prompt = self.prompt_assembler.assemble(
+                        system_prompt=QUESTION_SYSTEM_PROMPT,
+                        question=question,
+                        documents=[doc.page_content for doc in documents],
+                        history=memory.history(),
+                        summary=memory.summary,
+                        empty_context_text=EMPTY_CONTEXT_TEXT
+                    )
+                yield {
+                    "type": "prompt",
+                    "token_usage": prompt["token_usage"],
+                    "included_messages": prompt["included_messages"],
+                    "included_documents": prompt["included_documents"],
+                    "summarizing": memory.is_summarizing
+                }
+                
+                body = self.prompt_assembler.to_bedrock_body(prompt, max_tokens=max_tokens)
+                timer = StreamTimer()
+                response = await asyncio.to_thread(
+                    self.bedrock_runtime.invoke_model_with_response_stream,
+                    modelId=settings.bedrock_model_id,
+                    body=body
+                )
+                
+                # 이벤트 스트림 읽기는 블로킹이므로 스레드에서 한 이벤트씩 가져옴
+                usage = empty_usage()
+                events = iter(response["body"])
+                while True:
+                    event = await asyncio.to_thread(next, events, None)
+                    if event is None:
+                        break
+                    chunk = event.get("chunk")
+                    if not chunk:
+                        continue
+                    chunk_json = json.loads(chunk["bytes"].decode())
+                    update_usage(usage, chunk_json)
+                    
+                    text = ""
+                    if chunk_json.get("type") == "content_block_delta":
+                        text = chunk_json.get("delta", {}).get("text", "")
+                    elif chunk_json.get("type") == "content_block_start":
+                        text = chunk_json.get("content_block", {}).get("text", "")
+                    if text:
+                        timer.token()
+                        answered = True
+                        yield {"type": "text", "text": text}
+                
+                timer.finish()
+                yield {"type": "usage", "usage": usage}
+                return
+            
+            except Exception as e:
+                error_str = str(e)
+                throttled = (
+                    "ThrottlingException" in error_str
+                    or "Too many requests" in error_str
+                    or "throttl" in error_str.lower()
+                )
+                # 이미 일부를 전송한 뒤에는 중복 출력을 막기 위해 재시도하지 않음
+                if throttled and not answered and attempt < max_retries - 1:
+                    # 지수 백오프: 5초, 10초, 20초, 40초, 80초
+                    delay = base_delay * (2 ** attempt) * settings.bedrock_retry_delay_scale
+                    record_retry("question_stream", delay)
+                    yield {"type": "retry", "delay": delay, "attempt": attempt + 1, "max_retries": max_retries}
+                    await asyncio.sleep(delay)
+                    continue
+                yield {"type": "error", "message": error_str, "throttled": throttled}
+                return
@@ -1,20 +1,30 @@
 """
 RAG (Retrieval Augmented Generation) 서비스
 """
-import uuid
+import asyncio
+import hashlib
+import json
 from typing import List, Optional, AsyncGenerator, Dict
-from langchain_aws import ChatBedrock
-from langchain_community.embeddings import BedrockEmbeddings
-from langchain_community.vectorstores import Chroma
 from langchain.schema import Document
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.memory import ConversationBufferMemory
 from langchain.chains import ConversationalRetrievalChain
 from app.config import settings
+from app.services.bedrock_client import create_bedrock_runtime
 from app.services.rate_limiter import rate_limiter
-import boto3
-import chromadb
-from chromadb.config import Settings as ChromaSettings
+from app.services.metrics import StreamTimer, metrics, record_retry, trace_request
+from app.services.chunker import StructureAwareChunker
+from app.services.collection_router import CollectionRouter
+from app.services.company_index import company_index, COMPANY_METADATA_PREFIX
+from app.services.mmr import mmr_select
+from app.services.token_counter import estimate_tokens
+from app.services.prompt_builder import PromptAssembler, empty_usage, update_usage
+from app.services.conversation_memory import SummarizingMemory, bedrock_summarizer
+from app.services.session_store import SessionStore
+from app.services.vector_store import create_vector_client
+from app.services.embeddings import create_embeddings
+
+
+# RAG 답변 생성 시스템 프롬프트
+RAG_SYSTEM_PROMPT = "다음 대화 히스토리와 참고 자료를 참고하여 질문에 답변해주세요."
 
 
 class RAGService:
@@ -22,164 +32,686 @@ class RAGService:
     
     def __init__(self):
         """초기화"""
-        # AWS 세션 생성
-        session_kwargs = {
-            "region_name": settings.aws_region
-        }
+        # Bedrock 클라이언트 생성 (자격 증명/엔드포인트/재시도 설정 공용)
+        self.bedrock_runtime = create_bedrock_runtime()
         
-        if settings.aws_access_key_id and settings.aws_secret_access_key:
-            session_kwargs.update({
-                "aws_access_key_id": settings.aws_access_key_id,
-                "aws_secret_access_key": settings.aws_secret_access_key
-            })
+        # Embeddings 초기화 (settings.embedding_provider: Bedrock Titan 또는 로컬 CPU 모델)
+        self.embeddings = create_embeddings(self.bedrock_runtime)
         
-        self.bedrock_runtime = boto3.client(
-            "bedrock-runtime",
-            **session_kwargs
-        )
-        
-        # Embeddings 초기화
-        self.embeddings = BedrockEmbeddings(
-            model_id=settings.embedding_model,
-            client=self.bedrock_runtime
-        )
-        
-        # LLM 초기화
-        self.llm = ChatBedrock(
-            model_id=settings.bedrock_model_id,
-            client=self.bedrock_runtime,
-            model_kwargs={
-                "temperature": settings.temperature,
-                "max_tokens": settings.max_tokens
-            }
-        )
-        
-        # ChromaDB 클라이언트 초기화
-        self.client = chromadb.PersistentClient(
-            path=settings.chroma_persist_directory
-        )
-        
-        # Vector Store 초기화
-        self.vectorstore = Chroma(
-            client=self.client,
-            collection_name="interview_documents",
-            embedding_function=self.embeddings
-        )
-        
-        # 텍스트 분할기
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len
-        )
-        
-        # 세션별 메모리 관리 (Multi-turn 대화)
-        self.memories: Dict[str, ConversationBufferMemory] = {}
+        # 프롬프트 조립기 (토큰 예산 안에서 시스템 프롬프트/참고 자료/히스토리 배분)
+        self.prompt_assembler = PromptAssembler()
+        
+        # 벡터 저장소 클라이언트 초기화 (settings.vector_backend: Chroma 또는 양자화 로컬 인덱스)
+        self.client = create_vector_client()
+        
+        # 소스 유형/회사별 컬렉션 라우터 (검색 시 관련 파티션만 조회)
+        self.router = CollectionRouter(self.client)
+        
+        # 텍스트 분할기 (이력서 섹션 / 크롤링 문서 헤딩 경계를 보존하는 토큰 기준 분할)
+        self.chunker = StructureAwareChunker()
+        # 분할 설정 식별자 (캐시된 청크 재사용 시 설정이 같은지 확인용)
+        self.chunker_key = self.chunker.cache_key
+        
+        # 세션별 메모리 관리 (Multi-turn 대화, 오래된 대화는 요약)
+        self.summarizer = bedrock_summarizer(self.bedrock_runtime)
+        self.memories = SessionStore(lambda: SummarizingMemory(summarizer=self.summarizer))
+    
+    def split_document(self, content: str, metadata: Optional[Dict] = None) -> List[Dict]:
+        """
+        문서 내용을 구조 단위 청크로 분할
+        
+        Args:
+            content: 문서 내용
+            metadata: 문서 메타데이터 (source에 따라 섹션/헤딩 기준 분할)
+            
+        Returns:
+            청크 리스트 (text, heading, tokens)
+        """
+        return self.chunker.split(content, metadata)
     
-    async def add_document(self, content: str, metadata: Optional[Dict] = None) -> str:
+    async def add_document(
+        self,
+        content: str,
+        metadata: Optional[Dict] = None,
+        chunks: Optional[List[Dict]] = None
+    ) -> str:
         """
         문서를 벡터 스토어에 추가
         
         Args:
             content: 문서 내용
             metadata: 문서 메타데이터 (url, source 등)
+            chunks: 미리 분할된 청크 (split_document 결과 캐시 재사용 시, 없으면 content를 분할)
             
         Returns:
             문서 ID
         """
         try:
-            doc_id = str(uuid.uuid4())
-            
-            # 텍스트를 청크로 분할
-            chunks = self.text_splitter.split_text(content)
-            
-            # 문서 생성
-            documents = [
-                Document(
-                    page_content=chunk,
-                    metadata={
-                        **(metadata or {}),
-                        "chunk_id": f"{doc_id}_{i}",
-                        "doc_id": doc_id
-                    }
-                )
-                for i, chunk in enumerate(chunks)
-            ]
-            
-            # 벡터 스토어에 추가
-            if not documents:
-                raise Exception("분할된 문서가 없습니다. 내용이 너무 짧거나 비어있을 수 있습니다.")
+            # 크롤링 문서는 URL로 문서 ID가 정해지므로 다시 추가하면 이전 버전 청크가 남지 않도록 갱신으로 처리
+            metadata = metadata or {}
+            if metadata.get("source") == "crawler" and metadata.get("url"):
+                return (await self.update_document(content, metadata, chunks))["doc_id"]
             
-            # Embedding 생성 및 저장
-            self.vectorstore.add_documents(documents)
+            prepared = self.prepare_document(content, metadata, chunks)
             
-            # 저장 확인
-            if len(documents) > 0:
-                # 저장 성공 확인을 위해 간단한 검색 테스트
-                try:
-                    test_results = self.vectorstore.similarity_search(
-                        documents[0].page_content[:50], 
-                        k=1
-                    )
-                except:
-                    pass  # 검색 테스트 실패는 무시
+            # 이미 저장된 청크(같은 출처 + 같은 내용)는 건너뛰고 새 청크만 임베딩
+            if prepared["texts"]:
+                prepared["embeddings"] = await asyncio.to_thread(self.embeddings.embed_documents, prepared["texts"])
+                self.upsert_prepared([prepared])
             
-            return doc_id
+            return prepared["doc_id"]
         
         except Exception as e:
             raise Exception(f"문서 추가 중 오류: {str(e)}")
     
-    async def search_documents(self, query: str, k: int = 10) -> List[Document]:
+    async def update_document(
+        self,
+        content: str,
+        metadata: Optional[Dict] = None,
+        chunks: Optional[List[Dict]] = None
+    ) -> Dict:
+        """
+        다시 가져온 문서로 저장된 청크 갱신 (바뀐 청크만 임베딩)
+        
+        같은 출처의 저장된 청크 해시와 새 청크 해시를 비교해
+        새로 생긴 청크만 임베딩/저장하고, 사라진 청크는 삭제합니다.
+        바뀌지 않은 청크는 임베딩 없이 메타데이터(순서, 헤딩 등)만 갱신합니다.
+        
+        Args:
+            content: 새 문서 내용
+            metadata: 문서 메타데이터 (url 또는 filename으로 기존 문서를 찾음)
+            chunks: 미리 분할된 청크 (없으면 content를 분할)
+            
+        Returns:
+            {"doc_id", "added", "removed", "unchanged"}
+        """
+        try:
+            prepared = self.prepare_document(content, metadata, chunks, skip_existing=False)
+            doc_id = prepared["doc_id"]
+            target = prepared["collection"]
+            
+            existing = self._find_document_chunks(doc_id, prepared["source"])
+            new_ids = set(prepared["ids"])
+            kept = set(existing.get(target.name, [])) & new_ids
+            
+            # 바뀐 청크만 임베딩/저장
+            added = {
+                "doc_id": doc_id,
+                "collection": target,
+                "ids": [],
+                "texts": [],
+                "metadatas": []
+            }
+            unchanged_ids: List[str] = []
+            unchanged_metadatas: List[Dict] = []
+            for chunk_id, text, chunk_metadata in zip(prepared["ids"], prepared["texts"], prepared["metadatas"]):
+                if chunk_id in kept:
+                    unchanged_ids.append(chunk_id)
+                    unchanged_metadatas.append(chunk_metadata)
+                else:
+                    added["ids"].append(chunk_id)
+                    added["texts"].append(text)
+                    added["metadatas"].append(chunk_metadata)
+            
+            if added["texts"]:
+                added["embeddings"] = await asyncio.to_thread(self.embeddings.embed_documents, added["texts"])
+                self.upsert_prepared([added])
+            
+            batch_size = self._write_batch_size()
+            for start in range(0, len(unchanged_ids), batch_size):
+                target.update(
+                    ids=unchanged_ids[start:start + batch_size],
+                    metadatas=unchanged_metadatas[start:start + batch_size]
+                )
+            
+            removed = self._delete_stale_chunks(existing, target.name, new_ids)
+            
+            return {
+                "doc_id": doc_id,
+                "added": len(added["ids"]),
+                "removed": removed,
+                "unchanged": len(unchanged_ids)
+            }
+        
+        except Exception as e:
+            raise Exception(f"문서 갱신 중 오류: {str(e)}")
+    
+    def _find_document_chunks(self, doc_id: str, source: str) -> Dict[str, List[str]]:
+        """
+        같은 소스 유형 파티션에 저장된 문서 청크 ID (회사 감지 결과가 바뀌어 파티션이 달라졌을 수 있음)
+        
+        다른 프로세스가 만든 파티션의 이전 청크도 찾도록 파티션 목록을 다시 읽습니다.
+        
+        Returns:
+            {파티션 이름: 청크 ID 목록}
+        """
+        existing: Dict[str, List[str]] = {}
+        for name in self.router.select_partitions(source_types=[source], include_legacy=False, refresh=True):
+            collection = self.router.get_collection(name)
+            ids = collection.get(where={"doc_id": doc_id}, include=[])["ids"]
+            if ids:
+                existing[collection.name] = ids
+        return existing
+    
+    def _delete_stale_chunks(self, existing: Dict[str, List[str]], target_name: str, new_ids: set) -> int:
+        """새 버전에 없는 청크 삭제 (다른 파티션에 남은 이전 버전 포함), 삭제한 청크 수 반환"""
+        batch_size = self._write_batch_size()
+        removed = 0
+        for name, ids in existing.items():
+            stale = [chunk_id for chunk_id in ids if name != target_name or chunk_id not in new_ids]
+            if not stale:
+                continue
+            collection = self.router.get_collection(name)
+            for start in range(0, len(stale), batch_size):
+                collection.delete(ids=stale[start:start + batch_size])
+            removed += len(stale)
+        return removed
+    
+    def remove_stale_chunks(self, prepared: Dict) -> int:
+        """
+        저장한 문서의 새 버전에 없는 이전 청크 삭제 (prepare_document → upsert_prepared 경로용)
+        
+        Args:
+            prepared: prepare_document 결과 (저장 후)
+            
+        Returns:
+            삭제한 청크 수
+        """
+        existing = self._find_document_chunks(prepared["doc_id"], prepared["source"])
+        return self._delete_stale_chunks(existing, prepared["collection"].name, set(prepared["chunk_ids"]))
+    
+    @staticmethod
+    def document_key(content: str, metadata: Optional[Dict] = None) -> str:
+        """
+        문서 출처 식별 키 (크롤링 문서는 URL, 그 외에는 내용 해시)
+        
+        같은 URL을 다시 크롤링하면 같은 키가 되어 문서 ID가 유지되고 바뀐 청크만 갱신됩니다.
+        PDF 등 업로드 문서는 파일명이 겹칠 수 있으므로(예: resume.pdf, unknown) 파일명과 내용 해시로 구분합니다.
+        (같은 파일을 다시 올리면 같은 키, 이름만 같은 다른 파일은 다른 문서)
+        """
+        metadata = metadata or {}
+        source = metadata.get("source", "")
+        if source == "crawler" and metadata.get("url"):
+            return f"crawler:{metadata['url']}"
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if metadata.get("filename"):
+            return f"{source}:{metadata['filename']}:{content_hash}"
+        return "content:" + content_hash
+    
+    @staticmethod
+    def chunk_hash(text: str) -> str:
+        """청크 내용 해시 (청크 ID와 변경 비교에 사용)"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+    
+    def prepare_document(
+        self,
+        content: str,
+        metadata: Optional[Dict] = None,
+        chunks: Optional[List[Dict]] = None,
+        skip_existing: bool = True
+    ) -> Dict:
+        """
+        문서를 저장할 청크 ID/텍스트/메타데이터와 대상 파티션으로 변환 (임베딩 전 단계)
+        
+        문서 ID는 출처 키의 해시, 청크 ID는 "문서 ID_청크 내용 해시"로 정해지므로
+        같은 문서를 다시 추가해도 바뀌지 않은 청크는 같은 ID가 됩니다.
+        
+        Args:
+            content: 문서 내용
+            metadata: 문서 메타데이터
+            chunks: 미리 분할된 청크 (없으면 content를 분할)
+            skip_existing: 컬렉션에 이미 있는 청크 ID를 결과에서 제외 (다시 임베딩하지 않음)
+            
+        Returns:
+            {"doc_id", "source", "collection", "ids", "texts", "metadatas", "chunk_ids"(건너뛴 청크 포함 전체), "total_chunks", "skipped"}
+        """
+        doc_id = hashlib.sha256(self.document_key(content, metadata).encode("utf-8")).hexdigest()[:32]
+        
+        # 텍스트를 청크로 분할
+        if chunks is None:
+            chunks = self.split_document(content, metadata)
+        
+        if not chunks:
+            raise Exception("분할된 문서가 없습니다. 내용이 너무 짧거나 비어있을 수 있습니다.")
+        
+        # 대표 회사 감지 (파티션 라우팅 및 회사 필터 검색용)
+        metadata = dict(metadata or {})
+        primary_company = company_index.primary_company(content, metadata)
+        if primary_company:
+            metadata["company"] = primary_company
+        
+        ids: List[str] = []
+        texts: List[str] = []
+        metadatas: List[Dict] = []
+        for index, chunk in enumerate(chunks):
+            chunk_hash = self.chunk_hash(chunk["text"])
+            chunk_id = f"{doc_id}_{chunk_hash}"
+            if chunk_id in ids:
+                # 문서 안에서 내용이 같은 청크는 한 번만 저장
+                continue
+            ids.append(chunk_id)
+            texts.append(chunk["text"])
+            metadatas.append({
+                **metadata,
+                **company_index.tag_chunk(chunk["text"], primary_company),
+                "chunk_id": chunk_id,
+                "chunk_hash": chunk_hash,
+                "chunk_index": index,
+                "doc_id": doc_id,
+                "heading": chunk.get("heading", ""),
+                "tokens": chunk.get("tokens") or estimate_tokens(chunk["text"])
+            })
+        
+        collection = self.router.get_collection_for(metadata)
+        chunk_ids = list(ids)
+        total_chunks = len(ids)
+        
+        if skip_existing:
+            existing = self._existing_ids(collection, ids)
+            if existing:
+                keep = [i for i, chunk_id in enumerate(ids) if chunk_id not in existing]
+                ids = [ids[i] for i in keep]
+                texts = [texts[i] for i in keep]
+                metadatas = [metadatas[i] for i in keep]
+        
+        return {
+            "doc_id": doc_id,
+            "source": self.router.normalize_source(metadata.get("source")),
+            "collection": collection,
+            "ids": ids,
+            "texts": texts,
+            "metadatas": metadatas,
+            "chunk_ids": chunk_ids,
+            "total_chunks": total_chunks,
+            "skipped": total_chunks - len(ids)
+        }
+    
+    def _write_batch_size(self) -> int:
+        """한 번에 쓸 최대 청크 수 (설정값과 Chroma 클라이언트 한도 중 작은 값)"""
+        limit = getattr(self.client, "max_batch_size", 0) or settings.chroma_write_batch_size
+        return max(1, min(settings.chroma_write_batch_size, limit))
+    
+    def _existing_ids(self, collection, ids: List[str]) -> set:
+        """컬렉션에 이미 있는 청크 ID"""
+        existing = set()
+        batch_size = self._write_batch_size()
+        for start in range(0, len(ids), batch_size):
+            result = collection.get(ids=ids[start:start + batch_size], include=[])
+            existing.update(result["ids"])
+        return existing
+    
+    def upsert_prepared(self, prepared_documents: List[Dict]):
+        """
+        임베딩까지 끝난 문서들을 파티션별로 묶어 저장 (Chroma 배치 한도 단위로 나눠 upsert)
+        
+        Args:
+            prepared_documents: prepare_document 결과에 embeddings를 채운 리스트
+        """
+        groups: Dict[str, Dict] = {}
+        for prepared in prepared_documents:
+            if not prepared["ids"]:
+                continue
+            collection = prepared["collection"]
+            group = groups.setdefault(
+                collection.name,
+                {"collection": collection, "ids": [], "embeddings": [], "documents": [], "metadatas": [], "seen": set()}
+            )
+            for chunk_id, embedding, text, metadata in zip(
+                prepared["ids"], prepared["embeddings"], prepared["texts"], prepared["metadatas"]
+            ):
+                # 같은 배치에 같은 문서가 두 번 들어온 경우 중복 ID 오류 방지
+                if chunk_id in group["seen"]:
+                    continue
+                group["seen"].add(chunk_id)
+                group["ids"].append(chunk_id)
+                group["embeddings"].append(embedding)
+                group["documents"].append(text)
+                group["metadatas"].append(metadata)
+        
+        batch_size = self._write_batch_size()
+        for group in groups.values():
+            for start in range(0, len(group["ids"]), batch_size):
+                end = start + batch_size
+                group["collection"].upsert(
+                    ids=group["ids"][start:end],
+                    embeddings=group["embeddings"][start:end],
+                    documents=group["documents"][start:end],
+                    metadatas=group["metadatas"][start:end]
+                )
+    
+    def _query_collection(
+        self,
+        name: str,
+        query_embedding: List[float],
+        n_results: int,
+        where: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        파티션 하나에서 유사 청크 조회
+        
+        Returns:
+            후보 리스트 (id, document, metadata, distance, embedding, partition)
+        """
+        collection = self.router.get_collection(name)
+        count = collection.count()
+        if count == 0:
+            return []
+        
+        try:
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=min(n_results, count),
+                where=where or None,
+                include=["documents", "metadatas", "distances", "embeddings"]
+            )
+        except RuntimeError:
+            # 필터 결과가 n_results보다 적으면 HNSW가 오류를 낼 수 있으므로 필터된 개수만큼 다시 조회
+            matched = len(collection.get(where=where, include=[])["ids"]) if where else count
+            if matched == 0:
+                return []
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=min(n_results, matched),
+                where=where or None,
+                include=["documents", "metadatas", "distances", "embeddings"]
+            )
+        
+        embeddings = results.get("embeddings")
+        candidates = []
+        for i, chunk_id in enumerate(results["ids"][0]):
+            candidates.append({
+                "id": chunk_id,
+                "document": results["documents"][0][i],
+                "metadata": results["metadatas"][0][i] or {},
+                "distance": results["distances"][0][i],
+                "embedding": embeddings[0][i] if embeddings else None,
+                "partition": name
+            })
+        return candidates
+    
+    async def _embed_query(self, query: str) -> List[float]:
+        """검색 쿼리 임베딩 (블로킹 호출이므로 스레드에서 실행)"""
+        with metrics.span("query_embedding"):
+            return await asyncio.to_thread(self.embeddings.embed_query, query)
+    
+    async def _query_partitions(
+        self,
+        query: str,
+        n_results: int,
+        where: Optional[Dict] = None,
+        source_types: Optional[List[str]] = None,
+        companies: Optional[List[str]] = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Dict]:
+        """
+        쿼리를 한 번만 임베딩하여 관련 파티션들을 병렬로 조회하고 거리순으로 합침
+        
+        Args:
+            query: 검색 쿼리
+            n_results: 파티션별/전체 최대 후보 수
+            where: Chroma 메타데이터 필터
+            source_types: 검색할 소스 유형 (pdf, crawler, manual)
+            companies: 검색할 회사 식별자
+            query_embedding: 미리 계산한 쿼리 임베딩 (없으면 query를 임베딩)
+            
+        Returns:
+            거리 오름차순 후보 리스트
+        """
+        partitions = self.router.select_partitions(source_types=source_types, companies=companies)
+        if not partitions:
+            return []
+        
+        if query_embedding is None:
+            query_embedding = await self._embed_query(query)
+        with metrics.span("vector_query"):
+            results = await asyncio.gather(*[
+                asyncio.to_thread(self._query_collection, name, query_embedding, n_results, where)
+                for name in partitions
+            ])
+        
+        candidates = [candidate for partition_candidates in results for candidate in partition_candidates]
+        candidates.sort(key=lambda candidate: candidate["distance"])
+        return candidates[:n_results]
+    
+    async def search_documents(
+        self,
+        query: str,
+        k: int = 10,
+        where: Optional[Dict] = None,
+        source_types: Optional[List[str]] = None,
+        companies: Optional[List[str]] = None,
+        rerank: Optional[bool] = None,
+        mode: Optional[str] = None,
+        token_budget: Optional[int] = None
+    ) -> List[Document]:
         """
         관련 문서 검색
         
         Args:
             query: 검색 쿼리
             k: 반환할 문서 수 (기본값: 10개로 증가)
+            where: Chroma 메타데이터 필터 (예: {"source": "crawler"})
+            source_types: 이 소스 유형의 파티션만 검색 (None이면 전체)
+            companies: 이 회사(및 회사 미감지) 파티션만 검색 (None이면 전체)
+            rerank: cross-encoder 재정렬 여부 (기본값: settings.reranker_enabled)
+            mode: "similarity" 또는 "mmr" (기본값: settings.retrieval_mode)
+            token_budget: mmr 모드에서 반환 청크 토큰 합계 상한
             
         Returns:
-            관련 문서 리스트
+            관련 문서 리스트 (metadata에 distance, 재정렬 시 rerank_score 포함)
         """
         try:
-            # ChromaDB retriever는 search_kwargs에 k만 전달
-            retriever = self.vectorstore.as_retriever(
-                search_kwargs={"k": k}
+            use_reranker = settings.reranker_enabled if rerank is None else rerank
+            mode = mode or settings.retrieval_mode
+            query_embedding = await self._embed_query(query)
+            candidates = await self._query_partitions(
+                query,
+                n_results=self._candidate_count(k, mode, use_reranker),
+                where=where,
+                source_types=source_types,
+                companies=companies,
+                query_embedding=query_embedding
+            )
+            return await self._select_documents(
+                query, query_embedding, candidates, k, mode, token_budget, use_reranker
             )
-            docs = retriever.get_relevant_documents(query)
-            return docs
         except Exception as e:
             raise Exception(f"문서 검색 중 오류: {str(e)}")
     
-    def _get_memory(self, session_id: Optional[str] = None) -> ConversationBufferMemory:
-        """세션별 메모리 가져오기 (대화 히스토리 길이 제한)"""
-        if session_id is None:
-            session_id = str(uuid.uuid4())
-        
-        if session_id not in self.memories:
-            self.memories[session_id] = ConversationBufferMemory(
-                memory_key="chat_history",
-                return_messages=True,
-                output_key="answer",
-                max_token_limit=2000  # 최대 토큰 수 제한
+    @staticmethod
+    def _candidate_count(k: int, mode: str, use_reranker: bool) -> int:
+        """최종 k개를 고르기 위해 벡터 검색에서 가져올 후보 수"""
+        n_results = k
+        if mode == "mmr":
+            n_results = max(n_results, settings.mmr_fetch_k)
+        if use_reranker:
+            n_results = max(n_results, settings.reranker_candidates)
+        return n_results
+    
+    async def _select_documents(
+        self,
+        query: str,
+        query_embedding: List[float],
+        candidates: List[Dict],
+        k: int,
+        mode: str,
+        token_budget: Optional[int],
+        use_reranker: bool
+    ) -> List[Document]:
+        """
+        검색 후보에서 최종 문서 선택
+        (mmr 모드면 이미 가져온 임베딩으로 다양성 선택, 재정렬 사용 시 선택된 문서 순서를 재정렬)
+        """
+        with metrics.span("document_selection"):
+            if mode == "mmr" and candidates:
+                token_counts = [
+                    candidate["metadata"].get("tokens") or estimate_tokens(candidate["document"])
+                    for candidate in candidates
+                ]
+                selected = mmr_select(
+                    query_embedding,
+                    [candidate["embedding"] for candidate in candidates],
+                    k,
+                    lambda_mult=settings.mmr_lambda,
+                    token_counts=token_counts,
+                    token_budget=token_budget
+                )
+                candidates = [candidates[index] for index in selected]
+        
+            documents = self._to_documents(candidates)
+            if use_reranker:
+                return await self._rerank(query, documents, k)
+            return documents[:k]
+    
+    @staticmethod
+    def _to_documents(candidates: List[Dict]) -> List[Document]:
+        return [
+            Document(
+                page_content=candidate["document"],
+                metadata={**candidate["metadata"], "distance": candidate["distance"]}
             )
+            for candidate in candidates
+        ]
+    
+    async def _rerank(self, query: str, documents: List[Document], top_n: int) -> List[Document]:
+        """cross-encoder로 후보 재정렬 (CPU 연산이므로 스레드에서 실행)"""
+        from app.services.reranker import get_reranker
+        return await asyncio.to_thread(get_reranker().rerank, query, documents, top_n)
+    
+    async def search_company_documents(
+        self,
+        query: str,
+        company_ids: List[str],
+        company_k: int = 10,
+        general_k: int = 5,
+        rerank: Optional[bool] = None,
+        mode: Optional[str] = None,
+        token_budget: Optional[int] = None
+    ) -> Dict[str, List[Document]]:
+        """
+        회사 관련 문서와 일반 문서를 메타데이터 필터로 나누어 검색
+        (쿼리 임베딩은 한 번만 계산)
+        
+        Args:
+            query: 검색 쿼리
+            company_ids: 회사 식별자 (company_index.match 결과)
+            company_k: 회사 관련 문서 수
+            general_k: 회사와 무관한 일반 문서 수
+            rerank: cross-encoder 재정렬 여부 (기본값: settings.reranker_enabled)
+            mode: "similarity" 또는 "mmr" (기본값: settings.retrieval_mode)
+            token_budget: mmr 모드에서 반환 청크 토큰 합계 상한 (문서 수 비율로 회사/일반에 나눔)
+            
+        Returns:
+            {"company": 회사 관련 문서, "general": 일반 문서}
+        """
+        try:
+            use_reranker = settings.reranker_enabled if rerank is None else rerank
+            mode = mode or settings.retrieval_mode
+            candidate_k = self._candidate_count(company_k, mode, use_reranker)
+            query_embedding = await self._embed_query(query)
+            
+            # 회사 문서는 청크의 company_<id> 태그로 필터
+            # (다른 회사 블로그에서 언급된 청크도 찾도록 파티션은 좁히지 않음)
+            company_candidates, general_candidates = await asyncio.gather(
+                self._query_partitions(
+                    query,
+                    n_results=candidate_k,
+                    where=company_index.where_filter(company_ids),
+                    query_embedding=query_embedding
+                ),
+                self._query_partitions(
+                    query,
+                    n_results=candidate_k + general_k,
+                    query_embedding=query_embedding
+                )
+            )
+            
+            # 일반 문서: 회사 태그가 없는 청크 (메타데이터만 확인)
+            company_keys = [f"{COMPANY_METADATA_PREFIX}{company_id}" for company_id in company_ids]
+            with metrics.span("candidate_filter"):
+                general_candidates = [
+                    candidate for candidate in general_candidates
+                    if not any(candidate["metadata"].get(key) for key in company_keys)
+                ]
+            
+            company_budget = general_budget = None
+            if token_budget is not None:
+                company_budget = token_budget * company_k // max(company_k + general_k, 1)
+                general_budget = token_budget - company_budget
+            
+            company_documents, general_documents = await asyncio.gather(
+                self._select_documents(
+                    query, query_embedding, company_candidates, company_k, mode, company_budget, use_reranker
+                ),
+                self._select_documents(
+                    query, query_embedding, general_candidates, general_k, mode, general_budget, use_reranker
+                )
+            )
+            
+            return {
+                "company": company_documents,
+                "general": general_documents
+            }
+        except Exception as e:
+            raise Exception(f"문서 검색 중 오류: {str(e)}")
+    
+    def _get_memory(self, session_id: Optional[str] = None) -> SummarizingMemory:
+        """
+        세션별 메모리 가져오기 (오래된 대화는 백그라운드에서 요약)
+        
+        세션 ID가 없으면 저장소에 넣지 않는 일회용 메모리를 반환합니다.
+        """
+        if session_id is None:
+            return SummarizingMemory(summarizer=self.summarizer)
+        
+        return self.memories.get(session_id)
+    
+    async def _build_prompt(
+        self,
+        question: str,
+        memory: SummarizingMemory,
+        context: Optional[str] = None,
+        conversation_history: Optional[List[Dict]] = None
+    ) -> Dict:
+        """
+        관련 문서를 검색하고 토큰 예산 안에서 프롬프트 조립
         
-        memory = self.memories[session_id]
+        Args:
+            question: 질문
+            memory: 세션 메모리 (conversation_history가 없을 때 요약 + 최근 대화로 사용)
+            context: 추가 컨텍스트 (검색 문서보다 먼저 배치)
+            conversation_history: 대화 히스토리 [{"role", "content"}, ...]
+            
+        Returns:
+            PromptAssembler.assemble 결과
+        """
+        summary = None
+        if conversation_history is None:
+            conversation_history = memory.history()
+            summary = memory.summary
         
-        # 대화 히스토리 길이 제한 (최근 10개 대화만 유지)
-        if hasattr(memory, 'chat_memory') and hasattr(memory.chat_memory, 'messages'):
-            messages = memory.chat_memory.messages
-            if len(messages) > 20:  # 10개 대화 (user + assistant = 20개 메시지)
-                # 최근 20개만 유지
-                memory.chat_memory.messages = messages[-20:]
+        # 관련 문서 검색
+        relevant_docs = await self.search_documents(question, k=10)
+        documents = [doc.page_content for doc in relevant_docs]
+        if context:
+            documents.insert(0, context)
         
-        return memory
+        with metrics.span("prompt_assembly"):
+            return self.prompt_assembler.assemble(
+                system_prompt=RAG_SYSTEM_PROMPT,
+                question=question,
+                documents=documents,
+                history=conversation_history,
+                summary=summary
+            )
     
     async def generate_with_rag(
         self,
         question: str,
         context: Optional[str] = None,
         session_id: Optional[str] = None,
-        conversation_history: Optional[List[Dict]] = None
+        conversation_history: Optional[List[Dict]] = None,
+        usage_result: Optional[Dict[str, int]] = None
     ) -> str:
         """
         RAG를 사용하여 답변 생성 (Multi-turn 대화 지원)
@@ -189,59 +721,22 @@ class RAGService:
             context: 추가 컨텍스트 (선택사항)
             session_id: 세션 ID (대화 히스토리 유지용)
             conversation_history: 대화 히스토리 (선택사항)
+            usage_result: 토큰 사용량(캐시 읽기/쓰기/미사용 입력, 출력)을 채울 딕셔너리
+                (요청마다 호출한 쪽이 넘기므로 동시 요청끼리 섞이지 않음)
             
         Returns:
             생성된 답변
         """
         try:
-            import asyncio
-            
             # 세션별 메모리 가져오기
             memory = self._get_memory(session_id)
             
-            # 대화 히스토리 구성 (메모리에서 가져오기)
-            chat_history_text = ""
-            if hasattr(memory, 'chat_memory') and hasattr(memory.chat_memory, 'messages'):
-                messages = memory.chat_memory.messages
-                # 최근 10개 메시지만 사용 (5개 대화)
-                recent_messages = messages[-10:] if len(messages) > 10 else messages
-                for msg in recent_messages:
-                    if hasattr(msg, 'content'):
-                        role = "사용자" if msg.__class__.__name__ == "HumanMessage" else "어시스턴트"
-                        chat_history_text += f"{role}: {msg.content}\n"
-            
-            # 관련 문서 검색
-            relevant_docs = await self.search_documents(question, k=10)
-            context_text = "\n\n".join([doc.page_content for doc in relevant_docs])
-            
-            # 프롬프트 구성
-            if chat_history_text:
-                prompt = f"""다음 대화 히스토리와 컨텍스트를 참고하여 질문에 답변해주세요.
-
-[대화 히스토리]
-{chat_history_text}
-
-[참고 컨텍스트]
-{context_text}
-
-[현재 질문]
-{question}
-
-답변:"""
-            else:
-                prompt = f"""다음 컨텍스트를 참고하여 질문에 답변해주세요.
-
-[참고 컨텍스트]
-{context_text}
-
-[질문]
-{question}
-
-답변:"""
+            prompt = await self._build_prompt(question, memory, context, conversation_history)
+            body = self.prompt_assembler.to_bedrock_body(prompt, temperature=settings.temperature)
             
             # Rate Limiting: 첫 요청은 빠르게, 이후 요청만 간격 제어
             if session_id and session_id in self.memories:
-                await rate_limiter.wait_if_needed(key=session_id)
+                await rate_limiter.wait_if_needed(key=session_id, metric_key="rag_session")
             
             # LLM 호출 (재시도 로직 포함)
             max_retries = 3
@@ -249,19 +744,34 @@ class RAGService:
             
             for attempt in range(max_retries):
                 try:
-                    response = await self.llm.ainvoke(prompt)
-                    answer = response.content if hasattr(response, 'content') else str(response)
+                    with metrics.span("bedrock_invoke"):
+                        response = await asyncio.to_thread(
+                            self.bedrock_runtime.invoke_model,
+                            modelId=settings.bedrock_model_id,
+                            body=body
+                        )
+                        result = json.loads(response["body"].read())
+                    if usage_result is not None:
+                        usage_result.update(update_usage(empty_usage(), result))
+                    answer = "".join(
+                        block.get("text", "")
+                        for block in result.get("content", [])
+                        if block.get("type") == "text"
+                    )
                     
                     # 메모리에 대화 추가
-                    memory.chat_memory.add_user_message(question)
-                    memory.chat_memory.add_ai_message(answer)
+                    memory.add_user_message(question)
+                    memory.add_ai_message(answer)
+                    if session_id:
+                        self.memories.record_write(session_id)
                     
                     return answer
                 except Exception as e:
                     error_str = str(e)
                     if "ThrottlingException" in error_str or "Too many requests" in error_str:
                         if attempt < max_retries - 1:
-                            delay = base_delay * (2 ** attempt)
+                            delay = base_delay * (2 ** attempt) * settings.bedrock_retry_delay_scale
+                            record_retry("rag_generate", delay)
                             await asyncio.sleep(delay)
                             continue
                     raise Exception(f"RAG 생성 중 오류: {error_str}")
@@ -271,12 +781,14 @@ class RAGService:
         except Exception as e:
             raise Exception(f"RAG 생성 중 오류: {str(e)}")
     
+    @trace_request
     async def stream_generate_with_rag(
         self,
         question: str,
         context: Optional[str] = None,
         session_id: Optional[str] = None,
-        conversation_history: Optional[List[Dict]] = None
+        conversation_history: Optional[List[Dict]] = None,
+        usage_result: Optional[Dict[str, int]] = None
     ) -> AsyncGenerator[str, None]:
         """
         RAG를 사용하여 스트리밍 방식으로 답변 생성 (Multi-turn 대화 지원)
@@ -286,59 +798,21 @@ class RAGService:
             context: 추가 컨텍스트 (선택사항)
             session_id: 세션 ID (대화 히스토리 유지용)
             conversation_history: 대화 히스토리 (선택사항)
+            usage_result: 스트림이 끝나면 토큰 사용량을 채울 딕셔너리 (요청마다 호출한 쪽이 넘김)
             
         Yields:
             생성된 답변 청크
         """
         try:
-            import asyncio
-            
             # 세션별 메모리 가져오기
             memory = self._get_memory(session_id)
             
-            # 대화 히스토리 구성 (메모리에서 가져오기)
-            chat_history_text = ""
-            if hasattr(memory, 'chat_memory') and hasattr(memory.chat_memory, 'messages'):
-                messages = memory.chat_memory.messages
-                # 최근 10개 메시지만 사용 (5개 대화)
-                recent_messages = messages[-10:] if len(messages) > 10 else messages
-                for msg in recent_messages:
-                    if hasattr(msg, 'content'):
-                        role = "사용자" if msg.__class__.__name__ == "HumanMessage" else "어시스턴트"
-                        chat_history_text += f"{role}: {msg.content}\n"
-            
-            # 관련 문서 검색
-            relevant_docs = await self.search_documents(question, k=10)
-            context_text = "\n\n".join([doc.page_content for doc in relevant_docs])
-            
-            # 프롬프트 구성
-            if chat_history_text:
-                prompt = f"""다음 대화 히스토리와 컨텍스트를 참고하여 질문에 답변해주세요.
-
-[대화 히스토리]
-{chat_history_text}
-
-[참고 컨텍스트]
-{context_text}
-
-[현재 질문]
-{question}
-
-답변:"""
-            else:
-                prompt = f"""다음 컨텍스트를 참고하여 질문에 답변해주세요.
-
-[참고 컨텍스트]
-{context_text}
-
-[질문]
-{question}
-
-답변:"""
+            prompt = await self._build_prompt(question, memory, context, conversation_history)
+            body = self.prompt_assembler.to_bedrock_body(prompt, temperature=settings.temperature)
             
             # Rate Limiting: 첫 요청은 빠르게, 이후 요청만 간격 제어
             if session_id and session_id in self.memories:
-                await rate_limiter.wait_if_needed(key=session_id)
+                await rate_limiter.wait_if_needed(key=session_id, metric_key="rag_session")
             
             # 스트리밍 실행 (재시도 로직 포함)
             max_retries = 3
@@ -347,26 +821,49 @@ class RAGService:
             full_answer = ""
             for attempt in range(max_retries):
                 try:
-                    async for chunk in self.llm.astream(prompt):
-                        if hasattr(chunk, 'content'):
-                            content = chunk.content
-                            full_answer += content
-                            yield content
-                        else:
-                            content = str(chunk)
-                            full_answer += content
-                            yield content
+                    timer = StreamTimer()
+                    response = await asyncio.to_thread(
+                        self.bedrock_runtime.invoke_model_with_response_stream,
+                        modelId=settings.bedrock_model_id,
+                        body=body
+                    )
+                    
+                    # 이벤트 스트림 읽기는 블로킹이므로 스레드에서 한 이벤트씩 가져옴
+                    usage = empty_usage()
+                    events = iter(response["body"])
+                    while True:
+                        event = await asyncio.to_thread(next, events, None)
+                        if event is None:
+                            break
+                        chunk = event.get("chunk")
+                        if not chunk:
+                            continue
+                        chunk_json = json.loads(chunk["bytes"].decode())
+                        update_usage(usage, chunk_json)
+                        if chunk_json.get("type") == "content_block_delta":
+                            content = chunk_json.get("delta", {}).get("text", "")
+                            if content:
+                                timer.token()
+                                full_answer += content
+                                yield content
+                    timer.finish()
+                    if usage_result is not None:
+                        usage_result.update(usage)
                     
                     # 메모리에 대화 추가
-                    memory.chat_memory.add_user_message(question)
-                    memory.chat_memory.add_ai_message(full_answer)
+                    memory.add_user_message(question)
+                    memory.add_ai_message(full_answer)
+                    if session_id:
+                        self.memories.record_write(session_id)
                     
                     return  # 성공 시 종료
                 except Exception as e:
                     error_str = str(e)
-                    if "ThrottlingException" in error_str or "Too many requests" in error_str:
+                    # 이미 일부를 전송한 뒤에는 중복 출력을 막기 위해 재시도하지 않음
+                    if ("ThrottlingException" in error_str or "Too many requests" in error_str) and not full_answer:
                         if attempt < max_retries - 1:
-                            delay = base_delay * (2 ** attempt)
+                            delay = base_delay * (2 ** attempt) * settings.bedrock_retry_delay_scale
+                            record_retry("rag_stream", delay)
                             await asyncio.sleep(delay)
                             continue
                     raise Exception(f"RAG 스트리밍 중 오류: {error_str}")
@@ -377,46 +874,41 @@ class RAGService:
             raise Exception(f"RAG 스트리밍 중 오류: {str(e)}")
     
     async def list_documents(self) -> List[dict]:
-        """업로드된 문서 목록 조회"""
+        """업로드된 문서 목록 조회 (모든 파티션)"""
         try:
-            collection = self.client.get_collection("interview_documents")
-            results = collection.get()
-            
             # 고유한 문서 ID 수집
             seen_doc_ids = set()
             documents = []
             
-            for i, metadata in enumerate(results.get("metadatas", [])):
-                doc_id = metadata.get("doc_id")
-                if doc_id and doc_id not in seen_doc_ids:
-                    seen_doc_ids.add(doc_id)
-                    documents.append({
-                        "id": doc_id,
-                        "source": metadata.get("source", "unknown"),
-                        "url": metadata.get("url", ""),
-                        "type": metadata.get("type", "web")
-                    })
+            for name in self.router.select_partitions(refresh=True):
+                collection = self.router.get_collection(name)
+                results = collection.get(include=["metadatas"])
+                
+                for metadata in results.get("metadatas", []):
+                    doc_id = metadata.get("doc_id")
+                    if doc_id and doc_id not in seen_doc_ids:
+                        seen_doc_ids.add(doc_id)
+                        documents.append({
+                            "id": doc_id,
+                            "source": metadata.get("source", "unknown"),
+                            "url": metadata.get("url", ""),
+                            "type": metadata.get("type", "web"),
+                            "partition": name
+                        })
             
             return documents
         except Exception as e:
             return []
     
     async def delete_document(self, document_id: str):
-        """문서 삭제"""
+        """문서 삭제 (문서가 저장된 파티션에서 모든 청크 삭제, 크롤링 문서는 출처 카탈로그에서도 제거)"""
         try:
-            collection = self.client.get_collection("interview_documents")
-            
-            # 해당 문서의 모든 청크 찾기
-            results = collection.get()
-            ids_to_delete = []
+            for name in self.router.select_partitions(refresh=True):
+                collection = self.router.get_collection(name)
+                collection.delete(where={"doc_id": document_id})
             
-            for i, metadata in enumerate(results.get("metadatas", [])):
-                if metadata.get("doc_id") == document_id:
-                    ids_to_delete.append(results["ids"][i])
-            
-            # 청크 삭제
-            if ids_to_delete:
-                collection.delete(ids=ids_to_delete)
+            # 카탈로그에 남아 있으면 최신성 스케줄러가 URL을 다시 수집해 삭제한 문서가 되살아남
+            from app.services.source_catalog import get_source_catalog
+            get_source_catalog().remove_document(document_id)
         except Exception as e:
             raise Exception(f"문서 삭제 중 오류: {str(e)}")
-
@@ -3,8 +3,9 @@ Rate Limiter - 요청 간격 제어
 """
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, Optional
 from collections import deque
+from app.services.metrics import metrics
 
 
 class RateLimiter:
@@ -19,26 +20,31 @@ class RateLimiter:
         self.last_request_time: Dict[str, datetime] = {}
         self.request_times: Dict[str, deque] = {}
     
-    async def wait_if_needed(self, key: str = "default"):
+    async def wait_if_needed(self, key: str = "default", metric_key: Optional[str] = None):
         """
         요청 간격이 충분하지 않으면 대기
         
         Args:
             key: 요청 키 (세션별로 구분 가능)
+            metric_key: 대기 시간 지표의 key 레이블 (기본값: key, 세션 ID처럼 값이 계속 늘어나는 키는 묶음 이름을 지정)
         """
         now = datetime.now()
+        metric_key = metric_key or key
         
         if key not in self.last_request_time:
             self.last_request_time[key] = now
             self.request_times[key] = deque()
+            metrics.observe("rate_limit_wait", 0.0, key=metric_key)
             return
         
         last_time = self.last_request_time[key]
         elapsed = (now - last_time).total_seconds()
         
+        wait_time = 0.0
         if elapsed < self.min_interval:
             wait_time = self.min_interval - elapsed
             await asyncio.sleep(wait_time)
+        metrics.observe("rate_limit_wait", wait_time, key=metric_key)
         
         self.last_request_time[key] = datetime.now()
         
@@ -0,0 +1,254 @@
+"""
+검색 결과 재정렬 (로컬 CPU cross-encoder)
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from langchain.schema import Document
+from app.config import settings
+
+
+class CrossEncoderReranker:
+    """
+    질문-청크 쌍을 cross-encoder로 점수화하여 상위 결과만 남기는 재정렬기
+    
+    - 모델은 첫 호출 시 로드 (sentence-transformers 또는 ONNX Runtime)
+    - (질문 해시, 청크 ID)별 점수를 LRU 캐시에 저장하여 같은 질문 재검색 시 모델 호출 생략
+    - 최근 호출의 지연 시간 통계 제공
+    """
+    
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        backend: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_length: Optional[int] = None,
+        cache_size: Optional[int] = None
+    ):
+        """
+        Args:
+            model_name: cross-encoder 모델 이름 (기본값: settings.reranker_model)
+            backend: "torch" 또는 "onnx" (기본값: settings.reranker_backend)
+            batch_size: 배치 크기 (기본값: settings.reranker_batch_size)
+            max_length: 질문+청크 최대 토큰 길이 (기본값: settings.reranker_max_length)
+            cache_size: 점수 캐시 최대 항목 수 (기본값: settings.reranker_cache_size)
+        """
+        self.model_name = model_name or settings.reranker_model
+        self.backend = backend or settings.reranker_backend
+        self.batch_size = batch_size or settings.reranker_batch_size
+        self.max_length = max_length or settings.reranker_max_length
+        self.cache_size = cache_size if cache_size is not None else settings.reranker_cache_size
+        
+        self._model = None
+        self._tokenizer = None
+        self._load_lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # 지연 시간 통계 (최근 200회, asyncio.to_thread 워커들이 동시에 갱신하므로 _stats_lock으로 보호)
+        self._stats_lock = threading.Lock()
+        self._latencies_ms = deque(maxlen=200)
+        self._model_latencies_ms = deque(maxlen=200)
+        self.stats = {
+            "calls": 0,
+            "candidates": 0,
+            "cache_hits": 0,
+            "model_pairs": 0
+        }
+    
+    def _load_model(self):
+        """모델 로드 (최초 1회)"""
+        if self._model is not None:
+            return
+        
+        with self._load_lock:
+            if self._model is not None:
+                return
+            
+            if self.backend == "onnx":
+                self._load_onnx_model()
+                return
+            
+            try:
+                from sentence_transformers import CrossEncoder
+            except ImportError:
+                raise Exception("검색 결과 재정렬을 위해 sentence-transformers가 필요합니다. pip install sentence-transformers")
+            
+            self._model = CrossEncoder(self.model_name, max_length=self.max_length, device="cpu")
+    
+    def _load_onnx_model(self):
+        """ONNX Runtime 모델 로드 (reranker_quantize이면 int8 동적 양자화 모델 사용)"""
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+            from transformers import AutoTokenizer
+        except ImportError:
+            raise Exception("ONNX 재정렬 모델을 위해 optimum과 onnxruntime이 필요합니다. pip install optimum[onnxruntime]")
+        
+        export_dir = Path(settings.reranker_onnx_directory) / self.model_name.replace("/", "__")
+        
+        if not (export_dir / "model.onnx").exists():
+            model = ORTModelForSequenceClassification.from_pretrained(self.model_name, export=True)
+            model.save_pretrained(export_dir)
+            AutoTokenizer.from_pretrained(self.model_name).save_pretrained(export_dir)
+        
+        file_name = "model.onnx"
+        if settings.reranker_quantize:
+            file_name = "model_quantized.onnx"
+            if not (export_dir / file_name).exists():
+                from optimum.onnxruntime import ORTQuantizer
+                from optimum.onnxruntime.configuration import AutoQuantizationConfig
+                
+                quantizer = ORTQuantizer.from_pretrained(export_dir)
+                quantizer.quantize(
+                    save_dir=export_dir,
+                    quantization_config=AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+                )
+        
+        self._tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        self._model = ORTModelForSequenceClassification.from_pretrained(export_dir, file_name=file_name)
+    
+    def _predict(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """질문-청크 쌍 배치 점수 계산"""
+        self._load_model()
+        
+        if self.backend != "onnx":
+            scores = self._model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+            return [float(score) for score in scores]
+        
+        scores = []
+        for start in range(0, len(pairs), self.batch_size):
+            batch = pairs[start:start + self.batch_size]
+            inputs = self._tokenizer(
+                [query for query, _ in batch],
+                [text for _, text in batch],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np"
+            )
+            logits = self._model(**inputs).logits
+            scores.extend(float(row[0]) if len(row) == 1 else float(row[-1]) for row in logits)
+        return scores
+    
+    @staticmethod
+    def _chunk_key(document: Document) -> str:
+        """캐시 키용 청크 ID (없으면 내용 해시)"""
+        chunk_id = document.metadata.get("chunk_id")
+        if chunk_id:
+            return str(chunk_id)
+        return hashlib.sha1(document.page_content.encode("utf-8")).hexdigest()
+    
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[float]:
+        with self._cache_lock:
+            score = self._cache.get(key)
+            if score is not None:
+                self._cache.move_to_end(key)
+            return score
+    
+    def _cache_put(self, key: Tuple[str, str], score: float):
+        if not self.cache_size:
+            return
+        with self._cache_lock:
+            self._cache[key] = score
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def rerank(self, query: str, documents: List[Document], top_n: Optional[int] = None) -> List[Document]:
+        """
+        검색 결과 재정렬
+        
+        Args:
+            query: 검색 쿼리
+            documents: 후보 문서 (search_documents 결과)
+            top_n: 반환할 문서 수 (None이면 전체)
+            
+        Returns:
+            점수 내림차순 문서 리스트 (metadata에 rerank_score 포함)
+        """
+        if not documents:
+            return []
+        
+        started = time.perf_counter()
+        query_hash = hashlib.sha1(query.encode("utf-8")).hexdigest()
+        
+        scores: Dict[int, float] = {}
+        missing: List[int] = []
+        for index, document in enumerate(documents):
+            score = self._cache_get((query_hash, self._chunk_key(document)))
+            if score is None:
+                missing.append(index)
+            else:
+                scores[index] = score
+        
+        if missing:
+            model_started = time.perf_counter()
+            predicted = self._predict([(query, documents[index].page_content) for index in missing])
+            with self._stats_lock:
+                self._model_latencies_ms.append((time.perf_counter() - model_started) * 1000)
+            for index, score in zip(missing, predicted):
+                scores[index] = score
+                self._cache_put((query_hash, self._chunk_key(documents[index])), score)
+        
+        ranked = sorted(range(len(documents)), key=lambda index: scores[index], reverse=True)
+        if top_n is not None:
+            ranked = ranked[:top_n]
+        
+        results = [
+            Document(
+                page_content=documents[index].page_content,
+                metadata={**documents[index].metadata, "rerank_score": scores[index]}
+            )
+            for index in ranked
+        ]
+        
+        with self._stats_lock:
+            self.stats["calls"] += 1
+            self.stats["candidates"] += len(documents)
+            self.stats["cache_hits"] += len(documents) - len(missing)
+            self.stats["model_pairs"] += len(missing)
+            self._latencies_ms.append((time.perf_counter() - started) * 1000)
+        return results
+    
+    def latency_summary(self) -> Dict:
+        """
+        최근 재정렬 지연 시간 요약
+        
+        Returns:
+            호출 통계와 전체/모델 지연 시간 p50, p95 (ms)
+        """
+        def percentiles(values) -> Dict[str, float]:
+            if not values:
+                return {"p50": 0.0, "p95": 0.0}
+            ordered = sorted(values)
+            return {
+                "p50": round(ordered[len(ordered) // 2], 2),
+                "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2)
+            }
+        
+        with self._stats_lock:
+            stats = dict(self.stats)
+            latencies_ms = list(self._latencies_ms)
+            model_latencies_ms = list(self._model_latencies_ms)
+        
+        candidates = stats["candidates"]
+        return {
+            **stats,
+            "cache_hit_rate": round(stats["cache_hits"] / candidates, 3) if candidates else 0.0,
+            "total_ms": percentiles(latencies_ms),
+            "model_ms": percentiles(model_latencies_ms)
+        }
+
+
+_reranker: Optional[CrossEncoderReranker] = None
+
+
+def get_reranker() -> CrossEncoderReranker:
+    """전역 재정렬기 (모델은 첫 재정렬 시 로드)"""
+    global _reranker
+    if _reranker is None:
+        _reranker = CrossEncoderReranker()
+    return _reranker
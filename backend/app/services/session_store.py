@@ -0,0 +1,245 @@
+"""
+세션별 대화 메모리 저장소 (LRU + 유휴 TTL 제거, 메모리 상한, SQLite 내보내기)
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+from app.config import settings
+from app.services.conversation_memory import SummarizingMemory
+
+
+class SessionStore:
+    """
+    세션 ID → SummarizingMemory 저장소
+    
+    - 최근 사용 순서(LRU)를 유지하고 session_max_sessions개를 넘으면 가장 오래 쓰지 않은 세션부터 제거
+    - session_idle_ttl_seconds 동안 쓰지 않은 세션 제거
+    - 보관 중인 대화 텍스트 합계가 session_max_memory_mb를 넘으면 LRU 순서로 제거
+    - session_spill_enabled이면 제거된 세션을 SQLite(database_url)에 저장했다가 다시 요청될 때 복원
+    """
+    
+    def __init__(
+        self,
+        factory: Callable[[], SummarizingMemory],
+        max_sessions: Optional[int] = None,
+        idle_ttl_seconds: Optional[float] = None,
+        max_memory_bytes: Optional[int] = None,
+        spill_url: Optional[str] = None
+    ):
+        """
+        Args:
+            factory: 새 세션 메모리 생성 함수
+            max_sessions: 메모리에 유지할 최대 세션 수 (기본값: settings.session_max_sessions)
+            idle_ttl_seconds: 유휴 세션 제거 시간 (기본값: settings.session_idle_ttl_seconds)
+            max_memory_bytes: 대화 텍스트 합계 상한 (기본값: settings.session_max_memory_mb)
+            spill_url: 제거된 세션을 저장할 DB URL (기본값: session_spill_enabled이면 settings.database_url)
+        """
+        self.factory = factory
+        self.max_sessions = max_sessions if max_sessions is not None else settings.session_max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds if idle_ttl_seconds is not None else settings.session_idle_ttl_seconds
+        self.max_memory_bytes = (
+            max_memory_bytes if max_memory_bytes is not None else settings.session_max_memory_mb * 1024 * 1024
+        )
+        if spill_url is None and settings.session_spill_enabled:
+            spill_url = settings.database_url
+        self.spill_url = spill_url
+        
+        self._sessions: "OrderedDict[str, SummarizingMemory]" = OrderedDict()
+        self._last_access: Dict[str, float] = {}
+        # 세션별 대화 크기 (접근/대화 추가 시 갱신, 메모리 상한 계산 시 전체 세션을 다시 세지 않도록)
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._engine = None
+        self._table = None
+        
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "created": 0,
+            "restored": 0,
+            "evicted_lru": 0,
+            "evicted_ttl": 0,
+            "evicted_memory": 0,
+            "spilled": 0,
+            "spill_errors": 0
+        }
+    
+    def _get_table(self):
+        """내보내기용 SQLite 테이블 (최초 1회 생성)"""
+        if self._table is not None:
+            return self._table
+        
+        try:
+            from sqlalchemy import Column, Float, MetaData, String, Table, Text, create_engine
+        except ImportError:
+            raise Exception("세션 내보내기를 위해 sqlalchemy가 필요합니다. pip install sqlalchemy")
+        
+        self._engine = create_engine(self.spill_url)
+        metadata = MetaData()
+        table = Table(
+            "conversation_sessions",
+            metadata,
+            Column("session_id", String(128), primary_key=True),
+            Column("data", Text, nullable=False),
+            Column("updated_at", Float, nullable=False)
+        )
+        metadata.create_all(self._engine)
+        self._table = table
+        return table
+    
+    def _spill(self, session_id: str, memory: SummarizingMemory):
+        """제거된 세션을 DB에 저장"""
+        if not self.spill_url:
+            return
+        table = self._get_table()
+        data = json.dumps(memory.to_dict(), ensure_ascii=False)
+        with self._engine.begin() as connection:
+            connection.execute(table.delete().where(table.c.session_id == session_id))
+            connection.execute(table.insert().values(session_id=session_id, data=data, updated_at=time.time()))
+        self.stats["spilled"] += 1
+    
+    def _restore(self, session_id: str) -> Optional[SummarizingMemory]:
+        """DB에 저장된 세션 복원 (복원 후 DB에서는 삭제)"""
+        if not self.spill_url:
+            return None
+        table = self._get_table()
+        with self._engine.begin() as connection:
+            row = connection.execute(
+                table.select().where(table.c.session_id == session_id)
+            ).first()
+            if row is None:
+                return None
+            connection.execute(table.delete().where(table.c.session_id == session_id))
+        
+        template = self.factory()
+        memory = SummarizingMemory.from_dict(json.loads(row.data), summarizer=template.summarizer)
+        self.stats["restored"] += 1
+        return memory
+    
+    def _evict(self, session_id: str, reason: str):
+        memory = self._sessions.pop(session_id)
+        self._last_access.pop(session_id, None)
+        self._sizes.pop(session_id, None)
+        self.stats[f"evicted_{reason}"] += 1
+        try:
+            self._spill(session_id, memory)
+        except Exception:
+            # 내보내기 실패는 대화 응답을 막지 않음 (해당 세션 히스토리만 유실)
+            self.stats["spill_errors"] += 1
+    
+    def _enforce_limits(self):
+        """유휴 TTL, 최대 세션 수, 메모리 상한 순서로 제거 (가장 최근 세션은 항상 유지)"""
+        now = time.monotonic()
+        for session_id in list(self._sessions):
+            if len(self._sessions) <= 1:
+                break
+            if now - self._last_access[session_id] <= self.idle_ttl_seconds:
+                break  # LRU 순서이므로 이후 세션은 모두 TTL 이내
+            self._evict(session_id, "ttl")
+        
+        while len(self._sessions) > self.max_sessions:
+            self._evict(next(iter(self._sessions)), "lru")
+        
+        total = sum(self._sizes.values())
+        while len(self._sessions) > 1 and total > self.max_memory_bytes:
+            session_id = next(iter(self._sessions))
+            total -= self._sizes.get(session_id, 0)
+            self._evict(session_id, "memory")
+    
+    def get(self, session_id: str) -> SummarizingMemory:
+        """
+        세션 메모리 가져오기 (없으면 DB에서 복원하거나 새로 생성)
+        
+        Args:
+            session_id: 세션 ID
+            
+        Returns:
+            세션 메모리
+        """
+        with self._lock:
+            memory = self._sessions.get(session_id)
+            if memory is not None:
+                self.stats["hits"] += 1
+                self._sessions.move_to_end(session_id)
+            else:
+                self.stats["misses"] += 1
+                try:
+                    memory = self._restore(session_id)
+                except Exception:
+                    # 복원 실패 시 새 세션으로 시작
+                    self.stats["spill_errors"] += 1
+                    memory = None
+                if memory is None:
+                    memory = self.factory()
+                    self.stats["created"] += 1
+                self._sessions[session_id] = memory
+            
+            self._last_access[session_id] = time.monotonic()
+            self._sizes[session_id] = memory.size_bytes()
+            self._enforce_limits()
+            return memory
+    
+    def record_write(self, session_id: str):
+        """
+        세션에 대화를 추가한 뒤 호출: 크기를 다시 재고 상한 적용
+        
+        get()에서 잰 크기에는 이번 턴의 메시지가 없으므로, 쓰기 후에 다시 재지 않으면 상한이 한 턴씩 늦게 적용됩니다.
+        
+        Args:
+            session_id: 세션 ID (이미 제거된 세션이면 무시)
+        """
+        with self._lock:
+            memory = self._sessions.get(session_id)
+            if memory is None:
+                return
+            self._sessions.move_to_end(session_id)
+            self._last_access[session_id] = time.monotonic()
+            self._sizes[session_id] = memory.size_bytes()
+            self._enforce_limits()
+    
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+    
+    def pop(self, session_id: str) -> Optional[SummarizingMemory]:
+        """세션 삭제 (DB에 저장된 세션도 삭제)"""
+        with self._lock:
+            memory = self._sessions.pop(session_id, None)
+            self._last_access.pop(session_id, None)
+            self._sizes.pop(session_id, None)
+        if self.spill_url:
+            table = self._get_table()
+            with self._engine.begin() as connection:
+                connection.execute(table.delete().where(table.c.session_id == session_id))
+        return memory
+    
+    def total_bytes(self) -> int:
+        """메모리에 보관 중인 대화 텍스트 합계 (세션별 마지막 접근/대화 추가 시점 기준)"""
+        with self._lock:
+            return sum(self._sizes.values())
+    
+    def metrics(self) -> Dict:
+        """
+        세션 저장소 지표
+        
+        Returns:
+            활성 세션 수, 보관 중인 대화 크기, 요약 진행 중 세션 수, 적중/생성/복원/제거 횟수
+        """
+        with self._lock:
+            # 세션 크기는 접근할 때만 갱신되므로 지표 조회 시 전체를 다시 계산
+            self._sizes = {session_id: memory.size_bytes() for session_id, memory in self._sessions.items()}
+            self._enforce_limits()
+            return {
+                **self.stats,
+                "live_sessions": len(self._sessions),
+                "memory_bytes": self.total_bytes(),
+                "summarizing_sessions": sum(1 for memory in self._sessions.values() if memory.is_summarizing),
+                "max_sessions": self.max_sessions,
+                "max_memory_bytes": self.max_memory_bytes
+            }
@@ -0,0 +1,341 @@
+"""
+수집한 URL 출처 카탈로그와 최신성 재크롤링 스케줄러
+"""
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+from app.config import settings
+
+
+# 출처별로 보관할 최근 확인 기록 수
+HISTORY_LIMIT = 20
+
+
+class SourceCatalog:
+    """
+    RAG에 넣은 URL별 수집 상태 (DB에 저장, 프로세스 간 공유)
+    
+    - 마지막 확인 시각, ETag/Last-Modified, 내용 해시, 최근 변경 기록
+    - 적응형 재확인 주기: 바뀐 페이지는 주기를 줄이고, 그대로인 페이지는 늘림
+      (settings.freshness_min_interval_hours ~ settings.freshness_max_interval_hours)
+    """
+    
+    def __init__(self, database_url: Optional[str] = None):
+        """
+        Args:
+            database_url: DB URL (기본값: settings.database_url)
+        """
+        try:
+            from sqlalchemy import Column, Float, Index, Integer, MetaData, String, Table, Text, create_engine, event
+        except ImportError:
+            raise Exception("출처 카탈로그를 위해 sqlalchemy가 필요합니다. pip install sqlalchemy")
+        
+        self.database_url = database_url or settings.database_url
+        self.engine = create_engine(self.database_url)
+        if self.engine.dialect.name == "sqlite":
+            @event.listens_for(self.engine, "connect")
+            def _set_sqlite_pragma(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA busy_timeout=5000")
+                cursor.close()
+        
+        metadata = MetaData()
+        self.sources = Table(
+            "source_catalog",
+            metadata,
+            Column("url", String(2048), primary_key=True),
+            Column("doc_id", String(64)),
+            Column("etag", String(512)),
+            Column("last_modified", String(128)),
+            Column("content_hash", String(64)),
+            Column("interval_seconds", Float, nullable=False),
+            Column("last_fetched_at", Float),
+            Column("last_changed_at", Float),
+            Column("next_fetch_at", Float, nullable=False),
+            Column("fetch_count", Integer, nullable=False, default=0),
+            Column("change_count", Integer, nullable=False, default=0),
+            Column("error_count", Integer, nullable=False, default=0),
+            Column("last_error", Text),
+            Column("history", Text, default="[]"),  # [{"at", "changed", "not_modified", "error"}]
+            Index("ix_source_catalog_next_fetch", "next_fetch_at")
+        )
+        metadata.create_all(self.engine)
+    
+    @staticmethod
+    def _row_to_dict(row) -> Dict:
+        source = dict(row._mapping)
+        source["history"] = json.loads(source["history"] or "[]")
+        return source
+    
+    def get(self, url: str) -> Optional[Dict]:
+        """출처 상태 조회"""
+        with self.engine.connect() as connection:
+            row = connection.execute(self.sources.select().where(self.sources.c.url == url)).first()
+        return self._row_to_dict(row) if row else None
+    
+    def list(self, limit: int = 100) -> List[Dict]:
+        """출처 목록 (다음 확인 예정 순)"""
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                self.sources.select().order_by(self.sources.c.next_fetch_at).limit(limit)
+            ).all()
+        return [self._row_to_dict(row) for row in rows]
+    
+    def due(self, limit: Optional[int] = None, now: Optional[float] = None) -> List[Dict]:
+        """다시 확인할 때가 된 출처 (오래 기다린 순)"""
+        now = now or time.time()
+        table = self.sources
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                table.select()
+                .where(table.c.next_fetch_at <= now)
+                .order_by(table.c.next_fetch_at)
+                .limit(limit or settings.freshness_batch_size)
+            ).all()
+        return [self._row_to_dict(row) for row in rows]
+    
+    def _next_interval(self, interval: float, changed: bool) -> float:
+        minimum = settings.freshness_min_interval_hours * 3600
+        maximum = settings.freshness_max_interval_hours * 3600
+        interval = interval / 2 if changed else interval * 1.5
+        return max(minimum, min(maximum, interval))
+    
+    def record_fetch(
+        self,
+        url: str,
+        changed: bool,
+        content_hash: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        doc_id: Optional[str] = None,
+        not_modified: bool = False
+    ) -> Dict:
+        """
+        확인 결과 기록 후 다음 확인 시각 계산 (처음 보는 URL이면 카탈로그에 추가)
+        
+        Args:
+            url: 출처 URL
+            changed: 내용이 바뀌었는지 여부 (처음 수집은 True)
+            content_hash: 정리된 텍스트 해시
+            etag: 응답 ETag (조건부 요청용)
+            last_modified: 응답 Last-Modified (조건부 요청용)
+            doc_id: RAG 문서 ID
+            not_modified: 서버가 304로 응답했는지 여부
+            
+        Returns:
+            갱신된 출처 상태
+        """
+        from sqlalchemy.exc import IntegrityError
+        
+        now = time.time()
+        event = {"at": now, "changed": changed, "not_modified": not_modified}
+        
+        for _ in range(2):
+            try:
+                self._write_fetch(url, changed, event, now, content_hash, etag, last_modified, doc_id)
+                break
+            except IntegrityError:
+                # 다른 작업자가 먼저 추가한 경우 갱신으로 다시 처리
+                continue
+        return self.get(url)
+    
+    def _write_fetch(
+        self,
+        url: str,
+        changed: bool,
+        event: Dict,
+        now: float,
+        content_hash: Optional[str],
+        etag: Optional[str],
+        last_modified: Optional[str],
+        doc_id: Optional[str]
+    ):
+        table = self.sources
+        with self.engine.begin() as connection:
+            row = connection.execute(table.select().where(table.c.url == url)).first()
+            if row is None:
+                interval = settings.freshness_initial_interval_hours * 3600
+                connection.execute(table.insert().values(
+                    url=url,
+                    doc_id=doc_id,
+                    etag=etag,
+                    last_modified=last_modified,
+                    content_hash=content_hash,
+                    interval_seconds=interval,
+                    last_fetched_at=now,
+                    last_changed_at=now,
+                    next_fetch_at=now + interval,
+                    fetch_count=1,
+                    change_count=0,
+                    error_count=0,
+                    history=json.dumps([event])
+                ))
+                return
+            
+            interval = self._next_interval(row.interval_seconds, changed)
+            history = (json.loads(row.history or "[]") + [event])[-HISTORY_LIMIT:]
+            values = {
+                "interval_seconds": interval,
+                "last_fetched_at": now,
+                "next_fetch_at": now + interval,
+                "fetch_count": row.fetch_count + 1,
+                "error_count": 0,
+                "last_error": None,
+                "history": json.dumps(history)
+            }
+            if changed:
+                values["last_changed_at"] = now
+                values["change_count"] = row.change_count + 1
+            # 304 응답에는 검증자가 빠져 있을 수 있으므로 값이 있을 때만 갱신
+            for key, value in (("content_hash", content_hash), ("etag", etag),
+                               ("last_modified", last_modified), ("doc_id", doc_id)):
+                if value:
+                    values[key] = value
+            connection.execute(table.update().where(table.c.url == url).values(**values))
+    
+    def record_error(self, url: str, error: str) -> Optional[Dict]:
+        """확인 실패 기록 (실패가 이어질수록 다음 확인을 늦춤)"""
+        now = time.time()
+        table = self.sources
+        with self.engine.begin() as connection:
+            row = connection.execute(table.select().where(table.c.url == url)).first()
+            if row is None:
+                return None
+            retry = min(
+                settings.freshness_max_interval_hours * 3600,
+                settings.freshness_min_interval_hours * 3600 * (2 ** row.error_count)
+            )
+            history = (json.loads(row.history or "[]") + [{"at": now, "error": error[:200]}])[-HISTORY_LIMIT:]
+            connection.execute(table.update().where(table.c.url == url).values(
+                error_count=row.error_count + 1,
+                last_error=error,
+                next_fetch_at=now + retry,
+                history=json.dumps(history)
+            ))
+        return self.get(url)
+    
+    def remove(self, url: str):
+        """출처를 카탈로그에서 제거 (더 이상 재확인하지 않음)"""
+        with self.engine.begin() as connection:
+            connection.execute(self.sources.delete().where(self.sources.c.url == url))
+    
+    def remove_document(self, doc_id: str) -> int:
+        """
+        RAG 문서에 해당하는 출처 제거 (문서를 삭제하면 최신성 확인으로 다시 수집되지 않도록)
+        
+        Args:
+            doc_id: RAG 문서 ID
+            
+        Returns:
+            제거된 출처 수
+        """
+        with self.engine.begin() as connection:
+            return connection.execute(self.sources.delete().where(self.sources.c.doc_id == doc_id)).rowcount
+
+
+class FreshnessScheduler:
+    """
+    확인할 때가 된 출처를 주기적으로 찾아 작업 큐에 재확인 작업으로 등록하는 백그라운드 스레드
+    
+    여러 프로세스에서 실행돼도 작업 멱등 키(URL + 예정 시각)로 같은 확인이 한 번만 등록됩니다.
+    """
+    
+    def __init__(self, catalog: SourceCatalog, enqueue, check_interval: Optional[float] = None):
+        """
+        Args:
+            catalog: 출처 카탈로그
+            enqueue: (url, 예정 시각) → 재확인 작업 등록 함수
+            check_interval: 확인할 출처를 찾는 주기 초 (기본값: settings.freshness_check_interval)
+        """
+        self.catalog = catalog
+        self.enqueue = enqueue
+        self.check_interval = check_interval or settings.freshness_check_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"ticks": 0, "enqueued": 0, "errors": 0}
+    
+    def start(self):
+        """스케줄러 시작 (이미 시작했으면 무시)"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="freshness-scheduler", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """스케줄러 종료"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._stop.clear()
+    
+    def tick(self) -> int:
+        """확인할 때가 된 출처를 작업으로 등록 (등록한 수 반환)"""
+        self.stats["ticks"] += 1
+        count = 0
+        for source in self.catalog.due():
+            self.enqueue(source["url"], source["next_fetch_at"])
+            count += 1
+        self.stats["enqueued"] += count
+        return count
+    
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception:
+                # DB 잠금 등 일시적인 오류는 다음 주기에 다시 시도
+                self.stats["errors"] += 1
+            self._stop.wait(self.check_interval)
+
+
+_source_catalog: Optional[SourceCatalog] = None
+_source_catalog_lock = threading.Lock()
+
+
+def get_source_catalog() -> SourceCatalog:
+    """전역 출처 카탈로그"""
+    global _source_catalog
+    with _source_catalog_lock:
+        if _source_catalog is None:
+            _source_catalog = SourceCatalog()
+        return _source_catalog
+
+
+def track_crawled_document(
+    url: str,
+    content_hash: str,
+    doc_id: str,
+    changed: bool,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None
+) -> Optional[Dict]:
+    """
+    크롤링해 RAG에 저장한 URL을 출처 카탈로그에 기록 (최신성 스케줄러가 주기적으로 다시 확인)
+    
+    수집 경로(작업 큐, 수집 파이프라인, Streamlit 단일 URL)가 모두 이 함수로 등록합니다.
+    
+    Args:
+        url: 출처 URL
+        content_hash: 정리된 텍스트의 sha256 해시
+        doc_id: RAG 문서 ID
+        changed: 저장으로 청크가 추가/삭제되었는지 여부 (처음 수집이면 무시)
+        etag: 응답 ETag (없으면 다음 확인은 조건부 요청 없이 내용 해시로 비교)
+        last_modified: 응답 Last-Modified
+        
+    Returns:
+        갱신된 출처 상태 (최신성 확인이 꺼져 있으면 None)
+    """
+    if not settings.freshness_enabled:
+        return None
+    catalog = get_source_catalog()
+    return catalog.record_fetch(
+        url,
+        changed=changed or catalog.get(url) is None,
+        content_hash=content_hash,
+        etag=etag,
+        last_modified=last_modified,
+        doc_id=doc_id
+    )
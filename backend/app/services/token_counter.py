@@ -0,0 +1,58 @@
+"""
+토큰 수 추정
+"""
+import math
+import re
+
+
+# 한글 음절/자모, CJK 문자는 대략 글자당 1토큰
+_WIDE_CHAR_PATTERN = re.compile(r"[\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3\u4e00-\u9fff\u3040-\u30ff]")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Claude/Titan 토크나이저 기준 토큰 수를 근사 계산
+    (정확한 토크나이저 없이 청크 크기와 프롬프트 예산을 맞추기 위한 용도)
+    
+    한글/CJK 문자는 글자당 1토큰, 그 외 문자는 약 4자당 1토큰으로 계산합니다.
+    
+    Args:
+        text: 텍스트
+        
+    Returns:
+        추정 토큰 수
+    """
+    if not text:
+        return 0
+    
+    wide_chars = len(_WIDE_CHAR_PATTERN.findall(text))
+    other_chars = len(_WHITESPACE_PATTERN.sub(" ", text)) - wide_chars
+    return wide_chars + math.ceil(max(other_chars, 0) / 4)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    추정 토큰 수가 max_tokens를 넘지 않도록 텍스트 뒷부분을 자름
+    
+    Args:
+        text: 텍스트
+        max_tokens: 최대 토큰 수
+        
+    Returns:
+        잘린 텍스트 (이미 짧으면 그대로)
+    """
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    
+    # 토큰 수는 글자 수에 대해 단조 증가하므로 이분 탐색으로 최대 길이를 찾음
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
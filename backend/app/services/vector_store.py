@@ -0,0 +1,77 @@
+"""
+벡터 저장소 인터페이스와 백엔드 선택 (Chroma / 양자화 로컬 인덱스)
+"""
+from typing import Dict, List, Optional, Protocol
+from app.config import settings
+
+
+# 지원하는 벡터 저장소 백엔드
+VECTOR_BACKENDS = ["chroma", "quantized"]
+
+
+class VectorCollection(Protocol):
+    """
+    RAGService/CollectionRouter가 사용하는 컬렉션 연산 (chromadb Collection과 같은 시그니처)
+    
+    - get/query 결과 형식도 Chroma와 같음 (query는 질의별 리스트의 리스트, distances는 제곱 L2 거리)
+    - where 필터: {"키": 값}, {"키": {"$eq"|"$ne"|"$in"|"$nin"|"$gt"|"$gte"|"$lt"|"$lte": 값}}, {"$and"|"$or": [...]}
+    """
+    
+    name: str
+    metadata: Optional[Dict]
+    
+    def count(self) -> int: ...
+    
+    def add(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict]): ...
+    
+    def upsert(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict]): ...
+    
+    def update(self, ids: List[str], metadatas: Optional[List[Dict]] = None): ...
+    
+    def get(self, ids: Optional[List[str]] = None, where: Optional[Dict] = None, include: Optional[List[str]] = None) -> Dict: ...
+    
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 10,
+        where: Optional[Dict] = None,
+        include: Optional[List[str]] = None
+    ) -> Dict: ...
+    
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict] = None): ...
+
+
+class VectorClient(Protocol):
+    """컬렉션(파티션) 목록/생성 연산 (chromadb Client와 같은 시그니처)"""
+    
+    max_batch_size: int
+    
+    def list_collections(self) -> List[VectorCollection]: ...
+    
+    def get_collection(self, name: str) -> VectorCollection: ...
+    
+    def get_or_create_collection(self, name: str, metadata: Optional[Dict] = None) -> VectorCollection: ...
+    
+    def delete_collection(self, name: str): ...
+
+
+def create_vector_client(backend: Optional[str] = None) -> VectorClient:
+    """
+    설정에 맞는 벡터 저장소 클라이언트 생성
+    
+    Args:
+        backend: "chroma" 또는 "quantized" (기본값: settings.vector_backend)
+        
+    Returns:
+        VectorClient
+    """
+    backend = backend or settings.vector_backend
+    if backend == "chroma":
+        import chromadb
+        
+        return chromadb.PersistentClient(path=settings.chroma_persist_directory)
+    if backend == "quantized":
+        from app.services.quantized_store import get_quantized_client
+        
+        return get_quantized_client()
+    raise Exception(f"지원하지 않는 벡터 저장소입니다: {backend} (사용 가능: {', '.join(VECTOR_BACKENDS)})")
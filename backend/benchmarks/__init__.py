@@ -0,0 +1,2 @@
+# Benchmarks package
+# backend 디렉토리에서 `python -m benchmarks.<모듈명>` 형태로 실행
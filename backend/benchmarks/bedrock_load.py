@@ -0,0 +1,118 @@
+"""
+질문 생성 스트리밍 부하 테스트 (가짜 Bedrock 서버 사용, AWS 자격 증명 불필요)
+
+프로세스 안에서 FakeBedrockServer를 띄우고 BEDROCK_ENDPOINT_URL을 그 주소로 바꾼 뒤,
+QuestionService.stream()을 동시에 여러 개 실행해 처리량, 첫 토큰 지연, 재시도/실패 수를 측정합니다.
+서버의 지연/토큰 속도/제한 주입은 시드로 고정되므로 같은 옵션이면 같은 결과를 재현합니다.
+
+사용법:
+    cd backend
+    python -m benchmarks.bedrock_load --requests 40 --concurrency 8 --throttle-rate 0.2
+    python -m benchmarks.bedrock_load --max-concurrency 4 --concurrency 8 --retry-delay-scale 0.01
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.config import settings
+from benchmarks.fake_bedrock import FakeBedrockServer
+
+
+async def run_one(question_service, index: int) -> Dict:
+    from app.services.conversation_memory import SummarizingMemory
+    
+    started = time.perf_counter()
+    first_token = None
+    result = {"retries": 0, "tokens": 0, "error": None}
+    async for event in question_service.stream(f"백엔드 면접 질문 {index}개 만들어줘", SummarizingMemory()):
+        if event["type"] == "text":
+            if first_token is None:
+                first_token = time.perf_counter() - started
+            result["tokens"] += 1
+        elif event["type"] == "retry":
+            result["retries"] += 1
+        elif event["type"] == "error":
+            result["error"] = event["message"]
+    result["ttft"] = first_token
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+async def run_load(question_service, requests: int, concurrency: int) -> List[Dict]:
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def limited(index: int) -> Dict:
+        async with semaphore:
+            return await run_one(question_service, index)
+    
+    return await asyncio.gather(*(limited(index) for index in range(requests)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 Bedrock 서버로 질문 생성 스트리밍 부하 테스트")
+    parser.add_argument("--requests", type=int, default=40, help="전체 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--latency", type=float, default=0.3, help="서버 첫 토큰 지연 (초)")
+    parser.add_argument("--tokens-per-second", type=float, default=100.0, help="서버 초당 출력 토큰 수")
+    parser.add_argument("--output-tokens", type=int, default=100, help="응답 토큰 수")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="서버 ThrottlingException 확률")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="서버 동시 요청 한도 (0이면 제한 없음)")
+    parser.add_argument("--client-max-attempts", type=int, default=1, help="botocore 자체 재시도 포함 시도 횟수")
+    parser.add_argument("--retry-delay-scale", type=float, default=0.01, help="서비스 재시도 대기 시간 배율")
+    parser.add_argument("--rate-limit-interval", type=float, default=0.0, help="전역 요청 간격 제한 (초, 앱 기본값 4.0)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    server = FakeBedrockServer(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+        embed_latency=0.005,
+        throttle_rate=args.throttle_rate,
+        max_concurrency=args.max_concurrency,
+        seed=args.seed
+    ).start()
+    
+    settings.bedrock_endpoint_url = server.url
+    settings.bedrock_client_max_attempts = args.client_max_attempts
+    settings.bedrock_retry_delay_scale = args.retry_delay_scale
+    settings.embedding_provider = "bedrock"
+    settings.chroma_persist_directory = tempfile.mkdtemp(prefix="bedrock_load_chroma_")
+    settings.quantized_index_directory = tempfile.mkdtemp(prefix="bedrock_load_index_")
+    
+    from app.services.question_service import QuestionService
+    from app.services.rag_service import RAGService
+    from app.services.rate_limiter import rate_limiter
+    
+    rate_limiter.min_interval = args.rate_limit_interval
+    question_service = QuestionService(RAGService())
+    
+    try:
+        started = time.perf_counter()
+        results = asyncio.run(run_load(question_service, args.requests, args.concurrency))
+        elapsed = time.perf_counter() - started
+        stats = server.stats()
+    finally:
+        server.stop()
+    
+    succeeded = [result for result in results if result["error"] is None]
+    ttfts = [result["ttft"] for result in succeeded if result["ttft"] is not None]
+    seconds = [result["seconds"] for result in succeeded]
+    tokens = sum(result["tokens"] for result in succeeded)
+    
+    print(f"requests: {args.requests}, concurrency: {args.concurrency}, elapsed: {elapsed:.2f}s")
+    print(f"succeeded: {len(succeeded)}, failed: {len(results) - len(succeeded)}, "
+          f"service retries: {sum(result['retries'] for result in results)}")
+    print(f"throughput: {len(succeeded) / elapsed:.2f} req/s, {tokens / elapsed:.1f} streamed chunks/s")
+    if ttfts:
+        print(f"ttft p50/p95: {np.percentile(ttfts, 50) * 1000:.0f} / {np.percentile(ttfts, 95) * 1000:.0f} ms")
+        print(f"total p50/p95: {np.percentile(seconds, 50) * 1000:.0f} / {np.percentile(seconds, 95) * 1000:.0f} ms")
+    print(f"server: {stats}")
+
+
+if __name__ == "__main__":
+    main()
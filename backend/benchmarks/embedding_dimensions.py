@@ -0,0 +1,161 @@
+"""
+Titan v2 임베딩 차원 비교 및 나란히 저장하는 컬렉션으로 이전
+
+저장된 청크를 더 작은 차원(256/512)으로 다시 임베딩해, 기존(1024차원) 벡터로 검색한 상위 k개를
+정답으로 recall@k, 벡터당 저장 바이트, 전수 검색 지연 시간을 비교합니다.
+--write를 주면 다시 임베딩한 벡터를 차원별 컬렉션({접두사}_d512 등)에 저장하므로,
+비교 후 EMBEDDING_DIMENSIONS만 바꿔 새 컬렉션으로 전환할 수 있습니다 (기존 컬렉션은 그대로 유지).
+
+Bedrock 호출이 필요합니다 (청크 수 × 비교할 차원 수 + 질의 수 × (비교할 차원 수 + 1)).
+
+사용법:
+    cd backend
+    python -m benchmarks.embedding_dimensions --dimensions 256 512 --limit 2000 --queries 100 --k 10
+    python -m benchmarks.embedding_dimensions --dimensions 512 --queries-file questions.txt --write
+"""
+import argparse
+import random
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.config import settings
+from app.services.collection_router import CollectionRouter
+from app.services.embeddings import (
+    DEFAULT_DIMENSIONS,
+    DEFAULT_NORMALIZE,
+    collection_prefix,
+    create_bedrock_embeddings
+)
+
+
+def load_chunks(router: CollectionRouter, limit: int) -> Dict[str, List]:
+    """기존 컬렉션의 청크 (ID, 본문, 메타데이터, 임베딩)"""
+    chunks = {"ids": [], "documents": [], "metadatas": [], "embeddings": []}
+    for name in router.select_partitions():
+        collection = router.get_collection(name)
+        result = collection.get(include=["documents", "metadatas", "embeddings"], limit=limit - len(chunks["ids"]))
+        for key in chunks:
+            chunks[key].extend(result[key] or [])
+        if len(chunks["ids"]) >= limit:
+            break
+    if not chunks["ids"]:
+        raise SystemExit(f"청크가 없습니다 (접두사: {router.prefix})")
+    return chunks
+
+
+def sample_queries(documents: List[str], count: int, seed: int) -> List[str]:
+    """질의 파일이 없을 때: 임의 청크의 첫 문장을 질의로 사용"""
+    rng = random.Random(seed)
+    queries = []
+    for document in rng.sample(documents, min(count, len(documents))):
+        line = next((line for line in document.splitlines() if len(line.strip()) > 10), document)
+        queries.append(line.strip()[:200])
+    return queries
+
+
+def top_k(vectors: np.ndarray, query: np.ndarray, k: int) -> List[int]:
+    """전수 탐색 (제곱 L2 거리, Chroma 기본 거리와 같음)"""
+    distances = ((vectors - query) ** 2).sum(axis=1)
+    return np.argsort(distances)[:k].tolist()
+
+
+def embed_all(embeddings, texts: List[str]) -> np.ndarray:
+    vectors = []
+    for index, text in enumerate(texts, 1):
+        vectors.extend(embeddings.embed_documents([text]))
+        if index % 100 == 0:
+            print(f"  embedded {index}/{len(texts)}")
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def write_side_by_side(rag_service, chunks: Dict[str, List], vectors: np.ndarray, prefix: str):
+    """다시 임베딩한 벡터를 새 접두사의 컬렉션에 저장 (청크 ID/본문/메타데이터는 그대로)"""
+    router = CollectionRouter(rag_service.client, prefix=prefix)
+    grouped: Dict[str, List[int]] = {}
+    for index, metadata in enumerate(chunks["metadatas"]):
+        collection = router.get_collection_for(metadata)
+        grouped.setdefault(collection.name, []).append(index)
+    batch_size = rag_service._write_batch_size()
+    for name, indexes in grouped.items():
+        collection = router.get_collection(name)
+        for start in range(0, len(indexes), batch_size):
+            batch = indexes[start:start + batch_size]
+            collection.upsert(
+                ids=[chunks["ids"][i] for i in batch],
+                embeddings=vectors[batch].tolist(),
+                documents=[chunks["documents"][i] for i in batch],
+                metadatas=[chunks["metadatas"][i] for i in batch]
+            )
+    return sorted(grouped)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Titan v2 임베딩 차원별 recall/저장 공간 비교")
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[256, 512], help="비교할 출력 차원")
+    parser.add_argument("--no-normalize", action="store_true", help="정규화하지 않은 벡터로 비교")
+    parser.add_argument("--limit", type=int, default=2000, help="비교에 사용할 최대 청크 수")
+    parser.add_argument("--queries", type=int, default=100, help="질의 수 (질의 파일이 없을 때)")
+    parser.add_argument("--queries-file", default=None, help="한 줄에 질문 하나씩 적은 파일")
+    parser.add_argument("--k", type=int, default=10, help="recall@k의 k")
+    parser.add_argument("--write", action="store_true", help="다시 임베딩한 벡터를 차원별 컬렉션에 저장")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    from app.services.rag_service import RAGService
+    
+    rag_service = RAGService()
+    normalize = not args.no_normalize
+    source_prefix = collection_prefix(DEFAULT_DIMENSIONS, DEFAULT_NORMALIZE, provider="bedrock")
+    chunks = load_chunks(CollectionRouter(rag_service.client, prefix=source_prefix), args.limit)
+    baseline_vectors = np.asarray(chunks["embeddings"], dtype=np.float32)
+    
+    if args.queries_file:
+        with open(args.queries_file, encoding="utf-8") as file:
+            queries = [line.strip() for line in file if line.strip()]
+    else:
+        queries = sample_queries(chunks["documents"], args.queries, args.seed)
+    k = min(args.k, len(baseline_vectors))
+    print(f"model: {settings.embedding_model}, chunks: {len(baseline_vectors)} (prefix {source_prefix}), "
+          f"queries: {len(queries)}, k={k}")
+    
+    baseline_embeddings = create_bedrock_embeddings(
+        rag_service.bedrock_runtime, dimensions=DEFAULT_DIMENSIONS, normalize=DEFAULT_NORMALIZE
+    )
+    truth = [set(top_k(baseline_vectors, np.asarray(baseline_embeddings.embed_query(query), dtype=np.float32), k))
+             for query in queries]
+    
+    rows = []
+    for dimensions in args.dimensions:
+        print(f"re-embedding {len(chunks['ids'])} chunks at {dimensions} dims")
+        embeddings = create_bedrock_embeddings(rag_service.bedrock_runtime, dimensions=dimensions, normalize=normalize)
+        vectors = embed_all(embeddings, chunks["documents"])
+        
+        hits = 0
+        search_seconds = 0.0
+        for query, expected in zip(queries, truth):
+            query_vector = np.asarray(embeddings.embed_query(query), dtype=np.float32)
+            started = time.perf_counter()
+            found = top_k(vectors, query_vector, k)
+            search_seconds += time.perf_counter() - started
+            hits += len(expected & set(found))
+        rows.append((dimensions, hits / (k * len(queries)), search_seconds / len(queries) * 1000))
+        
+        if args.write:
+            prefix = collection_prefix(dimensions, normalize, provider="bedrock")
+            partitions = write_side_by_side(rag_service, chunks, vectors, prefix)
+            print(f"  wrote {len(chunks['ids'])} chunks to {len(partitions)} collections (prefix {prefix})")
+    
+    print()
+    print(f"{'dims':>6} {'recall':>7} {'search ms':>10} {'bytes/vec':>10} {'vs 1024':>8}")
+    print(f"{DEFAULT_DIMENSIONS:>6} {1.0:>7.3f} {'-':>10} {DEFAULT_DIMENSIONS * 4:>10} {1.0:>7.1f}x")
+    for dimensions, recall, search_ms in rows:
+        print(f"{dimensions:>6} {recall:>7.3f} {search_ms:>10.2f} {dimensions * 4:>10} "
+              f"{DEFAULT_DIMENSIONS / dimensions:>7.1f}x")
+    print()
+    print("recall: 1024차원 벡터로 찾은 상위 k개 중 같은 질의로 찾은 비율 (정답 기준은 기존 저장 벡터)")
+
+
+if __name__ == "__main__":
+    main()
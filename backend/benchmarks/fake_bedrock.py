@@ -0,0 +1,358 @@
+"""
+로컬 가짜 bedrock-runtime 서버 (부하 테스트 / 오프라인 벤치마크용)
+
+boto3가 보내는 요청을 그대로 받아 응답하므로 BEDROCK_ENDPOINT_URL만 바꾸면 앱 코드를 수정하지 않고 사용할 수 있습니다.
+- POST /model/{modelId}/invoke: Claude Messages 응답 또는 Titan 임베딩 (dimensions/normalize 지원)
+- POST /model/{modelId}/invoke-with-response-stream: Claude 스트리밍 이벤트 (AWS 이벤트 스트림 형식)
+- 응답 지연, 초당 출력 토큰 수, ThrottlingException 주입(확률 / 동시 요청 수 초과) 설정 가능
+- GET /stats: 요청/제한/토큰 통계, POST /reset: 통계 초기화
+
+같은 시드와 같은 요청이면 같은 응답과 같은 제한 순서를 재현합니다.
+임베딩은 단어별 고정 벡터의 합이므로 단어가 겹치는 텍스트끼리 가깝게 검색됩니다.
+
+사용법:
+    cd backend
+    python -m benchmarks.fake_bedrock --port 8900 --latency 0.3 --tokens-per-second 50 --throttle-rate 0.1
+    BEDROCK_ENDPOINT_URL=http://localhost:8900 streamlit run app.py
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import unquote
+
+import numpy as np
+
+
+_PATH_PATTERN = re.compile(r"^/model/(?P<model>[^/]+)/(?P<operation>invoke|invoke-with-response-stream)$")
+
+_WORDS = [
+    "서비스", "아키텍처", "트래픽", "데이터", "배포", "장애", "캐시", "검색", "모니터링", "플랫폼",
+    "설계", "경험", "프로젝트", "성능", "협업", "테스트", "질문", "개선", "운영", "확장"
+]
+
+
+def _event_message(payload: bytes, headers: Dict[str, str]) -> bytes:
+    """AWS 이벤트 스트림 메시지 인코딩 (prelude + 헤더 + 페이로드 + CRC32)"""
+    header_bytes = b""
+    for name, value in headers.items():
+        name_bytes = name.encode("utf-8")
+        value_bytes = value.encode("utf-8")
+        # 헤더 값 유형 7: 문자열
+        header_bytes += struct.pack(">B", len(name_bytes)) + name_bytes + b"\x07" + struct.pack(">H", len(value_bytes)) + value_bytes
+    total_length = 12 + len(header_bytes) + len(payload) + 4
+    prelude = struct.pack(">II", total_length, len(header_bytes))
+    prelude += struct.pack(">I", zlib.crc32(prelude) & 0xFFFFFFFF)
+    message = prelude + header_bytes + payload
+    return message + struct.pack(">I", zlib.crc32(message) & 0xFFFFFFFF)
+
+
+def _chunk_event(chunk: Dict) -> bytes:
+    """스트리밍 응답 청크 이벤트 ({"bytes": base64(JSON)})"""
+    payload = json.dumps({"bytes": base64.b64encode(json.dumps(chunk).encode("utf-8")).decode("ascii")})
+    return _event_message(payload.encode("utf-8"), {
+        ":event-type": "chunk",
+        ":content-type": "application/json",
+        ":message-type": "event"
+    })
+
+
+def _word_vector(word: str, dimensions: int) -> np.ndarray:
+    seed = int.from_bytes(hashlib.md5(word.encode("utf-8")).digest()[:8], "big")
+    return np.random.default_rng(seed).standard_normal(dimensions).astype(np.float32)
+
+
+class FakeBedrockServer:
+    """스레드에서 실행되는 가짜 bedrock-runtime HTTP 서버"""
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.2,
+        tokens_per_second: float = 50.0,
+        output_tokens: int = 200,
+        embed_latency: float = 0.02,
+        throttle_rate: float = 0.0,
+        max_concurrency: int = 0,
+        seed: int = 0
+    ):
+        """
+        Args:
+            host: 바인딩 주소
+            port: 포트 (0이면 빈 포트 자동 선택)
+            latency: 첫 토큰(또는 응답)까지 지연 초
+            tokens_per_second: 초당 출력 토큰 수 (0이면 지연 없음)
+            output_tokens: 응답 토큰 수 (요청 max_tokens가 더 작으면 그 값)
+            embed_latency: 임베딩 요청 지연 초
+            throttle_rate: ThrottlingException을 반환할 확률 (0~1, 시드로 재현 가능)
+            max_concurrency: 동시에 처리할 최대 요청 수, 넘으면 ThrottlingException (0이면 제한 없음)
+            seed: 제한 주입 / 응답 생성 시드
+        """
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.embed_latency = embed_latency
+        self.throttle_rate = throttle_rate
+        self.max_concurrency = max_concurrency
+        self.seed = seed
+        
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._in_flight = 0
+        self.reset_stats()
+        
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, format, *args):
+                pass
+            
+            def do_GET(self):
+                if self.path == "/stats":
+                    server._send_json(self, 200, server.stats())
+                else:
+                    server._send_json(self, 404, {"message": "Not found"})
+            
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if self.path == "/reset":
+                    server.reset_stats()
+                    server._send_json(self, 200, {"ok": True})
+                    return
+                match = _PATH_PATTERN.match(self.path)
+                if not match:
+                    server._send_json(self, 404, {"message": f"Unknown path: {self.path}"}, "ResourceNotFoundException")
+                    return
+                server._handle(self, unquote(match.group("model")), match.group("operation"), body)
+        
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "FakeBedrockServer":
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-bedrock", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """서버 종료"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    # ------------------------------------------------------------------
+    # 통계
+    # ------------------------------------------------------------------
+    
+    def reset_stats(self):
+        with self._lock:
+            self._rng = random.Random(self.seed)
+            self._stats = {
+                "requests": {"invoke": 0, "invoke-with-response-stream": 0, "embed": 0},
+                "throttled": 0,
+                "succeeded": 0,
+                "output_tokens": 0,
+                "max_in_flight": 0
+            }
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return json.loads(json.dumps(self._stats))
+    
+    # ------------------------------------------------------------------
+    # 요청 처리
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _send_json(handler: BaseHTTPRequestHandler, status: int, payload: Dict, error_type: Optional[str] = None):
+        data = json.dumps(payload).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        if error_type:
+            handler.send_header("x-amzn-ErrorType", error_type)
+        handler.end_headers()
+        handler.wfile.write(data)
+    
+    def _admit(self, operation: str) -> bool:
+        """요청 수락 여부 (동시 요청 수 초과 또는 확률적 제한이면 False)"""
+        with self._lock:
+            self._stats["requests"][operation] += 1
+            throttled = (
+                (self.max_concurrency and self._in_flight >= self.max_concurrency)
+                or (self.throttle_rate and self._rng.random() < self.throttle_rate)
+            )
+            if throttled:
+                self._stats["throttled"] += 1
+                return False
+            self._in_flight += 1
+            self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._in_flight)
+            return True
+    
+    def _release(self, output_tokens: int = 0):
+        with self._lock:
+            self._in_flight -= 1
+            self._stats["succeeded"] += 1
+            self._stats["output_tokens"] += output_tokens
+    
+    def _handle(self, handler: BaseHTTPRequestHandler, model_id: str, operation: str, body: bytes):
+        request = json.loads(body or b"{}")
+        is_embedding = "embed" in model_id
+        if not self._admit("embed" if is_embedding else operation):
+            self._send_json(
+                handler, 429,
+                {"message": "Too many requests, please wait before trying again."},
+                "ThrottlingException"
+            )
+            return
+        
+        output_tokens = 0
+        try:
+            if is_embedding:
+                time.sleep(self.embed_latency)
+                self._send_json(handler, 200, self._embedding(request))
+            elif operation == "invoke":
+                words = self._answer_words(request)
+                output_tokens = len(words)
+                time.sleep(self.latency + (output_tokens / self.tokens_per_second if self.tokens_per_second else 0))
+                self._send_json(handler, 200, self._message(model_id, request, words))
+            else:
+                output_tokens = self._stream(handler, model_id, request)
+        finally:
+            self._release(output_tokens)
+    
+    def _embedding(self, request: Dict) -> Dict:
+        """Titan 임베딩 (단어 벡터 합, dimensions/normalize 반영)"""
+        text = request.get("inputText", "")
+        dimensions = int(request.get("dimensions", 1024))
+        words = text.split() or [""]
+        vector = np.zeros(dimensions, dtype=np.float32)
+        for word in words:
+            vector += _word_vector(word, dimensions)
+        if request.get("normalize", True):
+            vector /= max(float(np.linalg.norm(vector)), 1e-12)
+        return {"embedding": vector.tolist(), "inputTextTokenCount": len(words)}
+    
+    def _answer_words(self, request: Dict) -> List[str]:
+        """요청 본문으로 정해지는 응답 단어 (같은 요청이면 같은 응답)"""
+        count = min(self.output_tokens, int(request.get("max_tokens", self.output_tokens)))
+        seed = int.from_bytes(hashlib.md5(json.dumps(request, sort_keys=True).encode("utf-8")).digest()[:8], "big")
+        rng = random.Random(seed ^ self.seed)
+        return [rng.choice(_WORDS) for _ in range(count)]
+    
+    @staticmethod
+    def _input_tokens(request: Dict) -> int:
+        return max(1, len(json.dumps(request.get("messages", []), ensure_ascii=False)) // 4)
+    
+    def _message(self, model_id: str, request: Dict, words: List[str]) -> Dict:
+        return {
+            "id": "msg_fake",
+            "type": "message",
+            "role": "assistant",
+            "model": model_id,
+            "content": [{"type": "text", "text": " ".join(words)}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": self._input_tokens(request), "output_tokens": len(words)}
+        }
+    
+    def _stream(self, handler: BaseHTTPRequestHandler, model_id: str, request: Dict) -> int:
+        """Claude Messages 스트리밍 이벤트를 토큰 속도에 맞춰 전송 (chunked 전송)"""
+        words = self._answer_words(request)
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/vnd.amazon.eventstream")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+        
+        def send(chunk: Dict):
+            data = _chunk_event(chunk)
+            handler.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+            handler.wfile.flush()
+        
+        started = time.perf_counter()
+        time.sleep(self.latency)
+        send({
+            "type": "message_start",
+            "message": {
+                "id": "msg_fake", "type": "message", "role": "assistant", "model": model_id, "content": [],
+                "usage": {"input_tokens": self._input_tokens(request), "output_tokens": 1}
+            }
+        })
+        send({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+        interval = 1 / self.tokens_per_second if self.tokens_per_second else 0
+        for index, word in enumerate(words):
+            if interval:
+                # 누적 오차 없이 목표 속도에 맞춤
+                delay = started + self.latency + (index + 1) * interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            send({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": word + " "}})
+        send({"type": "content_block_stop", "index": 0})
+        send({"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": len(words)}})
+        send({
+            "type": "message_stop",
+            "amazon-bedrock-invocationMetrics": {
+                "inputTokenCount": self._input_tokens(request),
+                "outputTokenCount": len(words),
+                "invocationLatency": int((time.perf_counter() - started) * 1000),
+                "firstByteLatency": int(self.latency * 1000)
+            }
+        })
+        handler.wfile.write(b"0\r\n\r\n")
+        handler.wfile.flush()
+        return len(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 가짜 bedrock-runtime 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.2, help="첫 토큰까지 지연 (초)")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="초당 출력 토큰 수 (0이면 지연 없음)")
+    parser.add_argument("--output-tokens", type=int, default=200, help="응답 토큰 수")
+    parser.add_argument("--embed-latency", type=float, default=0.02, help="임베딩 요청 지연 (초)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="ThrottlingException 확률 (0~1)")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="동시 요청 한도 (넘으면 ThrottlingException, 0이면 제한 없음)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    server = FakeBedrockServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+        embed_latency=args.embed_latency,
+        throttle_rate=args.throttle_rate,
+        max_concurrency=args.max_concurrency,
+        seed=args.seed
+    )
+    print(f"fake bedrock-runtime listening on {server.url} (BEDROCK_ENDPOINT_URL={server.url})")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+대량 수집 처리량 비교: 문서별 순차 처리 vs IngestPipeline
+
+네트워크/Bedrock 없이 비교하기 위해 내려받기와 임베딩은 지정한 지연 시간만큼 대기하는 가짜 서비스로 대체하고,
+HTML 정리/청크 분할/Chroma 저장은 실제 코드를 사용합니다 (모드별 임시 디렉터리에 저장).
+
+사용법:
+    cd backend
+    python -m benchmarks.ingest_pipeline --urls 40 --fetch-latency 0.2 --embed-latency 0.02
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from typing import Dict, List
+
+from app.config import settings
+from app.services.crawler_service import CrawlerService
+from app.services.ingest_pipeline import IngestPipeline
+
+
+def build_page(index: int, sections: int = 20) -> bytes:
+    """헤딩/문단이 섞인 테스트용 HTML"""
+    rng = random.Random(index)
+    words = ["서비스", "아키텍처", "트래픽", "데이터", "배포", "장애", "캐시", "검색", "모니터링", "플랫폼"]
+    body = []
+    for section in range(sections):
+        body.append(f"<h2>섹션 {section} 문서 {index}</h2>")
+        for _ in range(4):
+            sentence = " ".join(rng.choice(words) for _ in range(30))
+            body.append(f"<p>{sentence}을 개선했습니다.</p>")
+    html = f"<html><body><nav>메뉴</nav><main>{''.join(body)}</main><footer>푸터</footer></body></html>"
+    return html.encode("utf-8")
+
+
+class FakeCrawler(CrawlerService):
+    """지연 후 미리 만든 HTML을 반환하는 크롤러"""
+    
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+    
+    def fetch_page(self, url: str, max_length: int = 50000) -> Dict:
+        time.sleep(self.latency)
+        return {"url": url, "html": build_page(int(url.rsplit("/", 1)[-1])), "text": None}
+
+
+class FakeEmbeddings:
+    """텍스트마다 지연 후 고정 차원 벡터를 반환하는 임베딩"""
+    
+    def __init__(self, latency: float, dimensions: int = 256):
+        self.latency = latency
+        self.dimensions = dimensions
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = []
+        for text in texts:
+            time.sleep(self.latency)
+            rng = random.Random(hash(text))
+            vectors.append([rng.random() for _ in range(self.dimensions)])
+        return vectors
+
+
+def create_rag_service(embed_latency: float, mode: str):
+    """
+    비교 모드별 새 RAGService (빈 임시 저장소)
+    
+    같은 저장소를 쓰면 뒤에 실행한 모드는 이미 저장된 청크를 건너뛰어 임베딩/저장 없이 끝나므로
+    모드마다 새 디렉터리를 사용합니다.
+    """
+    from app.services.rag_service import RAGService
+    
+    directory = tempfile.mkdtemp(prefix=f"ingest_pipeline_bench_{mode}_")
+    settings.chroma_persist_directory = f"{directory}/chroma"
+    settings.quantized_index_directory = f"{directory}/index"
+    rag_service = RAGService()
+    rag_service.embeddings = FakeEmbeddings(embed_latency)
+    return rag_service
+
+
+def run_sequential(rag_service, crawler: FakeCrawler, urls: List[str]) -> float:
+    """기존 방식: URL마다 crawl_url → add_document를 차례로 실행"""
+    started = time.perf_counter()
+    for url in urls:
+        content = crawler.crawl_url(url)
+        asyncio.run(rag_service.add_document(content, {"source": "crawler", "url": url}))
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대량 수집 파이프라인 처리량 비교")
+    parser.add_argument("--urls", type=int, default=40, help="수집할 URL 수")
+    parser.add_argument("--fetch-latency", type=float, default=0.2, help="페이지 내려받기 지연 (초)")
+    parser.add_argument("--embed-latency", type=float, default=0.02, help="청크당 임베딩 지연 (초)")
+    parser.add_argument("--clean-workers", type=int, default=settings.pipeline_clean_workers, help="정리/분할 프로세스 수")
+    args = parser.parse_args()
+    
+    crawler = FakeCrawler(args.fetch_latency)
+    urls = [f"https://example.com/post/{index}" for index in range(args.urls)]
+    
+    sequential_seconds = run_sequential(create_rag_service(args.embed_latency, "sequential"), crawler, urls)
+    
+    pipeline = IngestPipeline(
+        create_rag_service(args.embed_latency, "pipeline"),
+        crawler,
+        clean_workers=args.clean_workers,
+        embed_workers=4,
+        embed_min_interval=0
+    )
+    result = pipeline.run(urls)
+    failed = [document for document in result["documents"] if document["status"] != "succeeded"]
+    if failed:
+        raise SystemExit(f"파이프라인 실패: {failed[:3]}")
+    
+    print(f"{'mode':>12} {'seconds':>9} {'docs/s':>8}")
+    print(f"{'sequential':>12} {sequential_seconds:>9.2f} {args.urls / sequential_seconds:>8.1f}")
+    print(f"{'pipeline':>12} {result['elapsed']:>9.2f} {args.urls / result['elapsed']:>8.1f}")
+    print(f"speedup: {sequential_seconds / result['elapsed']:.1f}x")
+    print()
+    print(f"{'stage':>8} {'processed':>10} {'failed':>7} {'busy (s)':>9}")
+    for stage, stats in result["stats"].items():
+        print(f"{stage:>8} {stats['processed']:>10} {stats['failed']:>7} {stats['busy_seconds']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
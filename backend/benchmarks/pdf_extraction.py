@@ -0,0 +1,136 @@
+"""
+PDF 추출 백엔드 품질/속도 비교 도구
+
+샘플 PDF 디렉토리의 각 파일을 백엔드별로 추출하여
+소요 시간과 pdfplumber 결과 대비 유사도를 비교합니다.
+
+사용법:
+    cd backend
+    python -m benchmarks.pdf_extraction ./sample_pdfs --repeat 3 --json result.json
+"""
+import argparse
+import json
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from app.services.pdf_service import PDFService, get_extraction_backend, is_garbled_text
+
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def token_similarity(reference: str, candidate: str) -> float:
+    """
+    토큰 집합 기준 유사도 (Jaccard)
+    줄바꿈/공백 배치 차이는 무시하고 추출된 단어가 같은지만 비교
+    
+    Args:
+        reference: 기준 텍스트
+        candidate: 비교할 텍스트
+        
+    Returns:
+        0.0 ~ 1.0 사이 유사도
+    """
+    reference_tokens = set(_TOKEN_PATTERN.findall(reference.lower()))
+    candidate_tokens = set(_TOKEN_PATTERN.findall(candidate.lower()))
+    if not reference_tokens and not candidate_tokens:
+        return 1.0
+    return len(reference_tokens & candidate_tokens) / len(reference_tokens | candidate_tokens)
+
+
+def measure(func, repeat: int):
+    """함수를 repeat번 실행하여 (중앙값 소요 시간, 마지막 결과) 반환"""
+    durations = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations), result
+
+
+def compare_file(path: Path, repeat: int) -> Dict:
+    """
+    PDF 하나에 대해 백엔드별 추출 결과 비교
+    
+    Args:
+        path: PDF 파일 경로
+        repeat: 반복 측정 횟수
+        
+    Returns:
+        파일별 비교 결과
+    """
+    file_content = path.read_bytes()
+    
+    candidates = {
+        "pdfplumber": get_extraction_backend("pdfplumber").extract_pages,
+        "pypdf2": get_extraction_backend("pypdf2").extract_pages,
+    }
+    hybrid_service = PDFService(backend="pypdf2", fallback_backend="pdfplumber")
+    candidates["pypdf2+fallback"] = hybrid_service.extract_pages
+    
+    results = {}
+    for name, extract in candidates.items():
+        seconds, pages = measure(lambda: extract(file_content), repeat)
+        results[name] = {"seconds": seconds, "pages": pages}
+    
+    reference_text = "\n".join(results["pdfplumber"]["pages"])
+    
+    report = {"file": path.name, "pages": len(results["pdfplumber"]["pages"]), "backends": {}}
+    for name, result in results.items():
+        text = "\n".join(result["pages"])
+        report["backends"][name] = {
+            "seconds": round(result["seconds"], 4),
+            "characters": len(text),
+            "garbled_pages": sum(1 for page in result["pages"] if is_garbled_text(page)),
+            "similarity_to_pdfplumber": round(token_similarity(reference_text, text), 4),
+        }
+    report["backends"]["pypdf2+fallback"]["fallback_used"] = hybrid_service.last_extraction_stats.get("fallback_used", 0)
+    return report
+
+
+def print_table(reports: List[Dict]):
+    """비교 결과를 표 형태로 출력"""
+    header = f"{'file':<32} {'backend':<16} {'seconds':>9} {'chars':>8} {'garbled':>8} {'similarity':>10}"
+    print(header)
+    print("-" * len(header))
+    for report in reports:
+        for name, row in report["backends"].items():
+            print(
+                f"{report['file'][:32]:<32} {name:<16} {row['seconds']:>9.4f} "
+                f"{row['characters']:>8} {row['garbled_pages']:>8} {row['similarity_to_pdfplumber']:>10.4f}"
+            )
+    
+    # 백엔드별 합계
+    print("-" * len(header))
+    backends = reports[0]["backends"].keys() if reports else []
+    for name in backends:
+        total_seconds = sum(report["backends"][name]["seconds"] for report in reports)
+        mean_similarity = statistics.mean(report["backends"][name]["similarity_to_pdfplumber"] for report in reports)
+        print(f"{'TOTAL':<32} {name:<16} {total_seconds:>9.4f} {'':>8} {'':>8} {mean_similarity:>10.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 추출 백엔드 품질/속도 비교")
+    parser.add_argument("corpus", type=Path, help="샘플 PDF가 들어있는 디렉토리")
+    parser.add_argument("--repeat", type=int, default=3, help="파일별 반복 측정 횟수")
+    parser.add_argument("--json", type=Path, help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+    
+    pdf_files = sorted(args.corpus.glob("**/*.pdf"))
+    if not pdf_files:
+        raise SystemExit(f"PDF 파일이 없습니다: {args.corpus}")
+    
+    reports = [compare_file(path, args.repeat) for path in pdf_files]
+    print_table(reports)
+    
+    if args.json:
+        args.json.write_text(json.dumps(reports, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""
+수집/검색/생성 전 구간 벤치마크 (커밋 간 비교용 JSON 출력)
+
+- crawl: 저장해 둔 HTML 페이지를 로컬 HTTP 서버로 제공하고 CrawlerService.crawl_url로 내려받기 + 정리
+- pdf: 샘플 PDF를 PDFService.extract_text로 추출 (캐시 사용 안 함)
+- rag: 문서 수를 늘려 가며 RAGService.add_document 처리 시간과 search_documents 지연 시간 측정
+- generation: QuestionService.stream / RAGService.stream_generate_with_rag의 첫 토큰 지연과 초당 토큰 수
+
+Bedrock 호출(임베딩, 생성)은 benchmarks.fake_bedrock 서버로 보내므로 AWS 자격 증명 없이 실행되고,
+벡터 DB/캐시는 임시 디렉터리를 사용합니다. 결과 JSON에는 git 커밋과 실행 환경이 함께 기록되며,
+--compare로 이전 결과와 지표별 변화를 비교할 수 있습니다.
+
+사용법:
+    cd backend
+    python -m benchmarks.suite --json results/$(git rev-parse --short HEAD).json
+    python -m benchmarks.suite --pages-dir ./saved_pages --pdf-dir ./sample_pdfs --corpus-sizes 20 100 500
+    python -m benchmarks.suite --only rag generation --compare results/old.json
+"""
+import argparse
+import asyncio
+import functools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.config import settings
+from benchmarks.fake_bedrock import FakeBedrockServer
+from benchmarks.ingest_pipeline import build_page
+
+
+SECTIONS = ["crawl", "pdf", "rag", "generation"]
+
+_RESUME_WORDS = [
+    "python", "java", "kubernetes", "redis", "kafka", "spring", "react", "aws", "docker", "postgresql",
+    "designed", "implemented", "migrated", "reduced", "latency", "throughput", "service", "pipeline", "team", "api"
+]
+
+
+def percentile_ms(values: List[float], q: float) -> float:
+    return round(float(np.percentile(values, q)) * 1000, 3) if values else 0.0
+
+
+def git_info() -> Dict:
+    """현재 커밋과 작업 트리 변경 여부"""
+    def run(*args) -> str:
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, timeout=30).stdout.strip()
+        except Exception:
+            return ""
+    
+    return {"commit": run("rev-parse", "HEAD") or None, "dirty": bool(run("status", "--porcelain", "--untracked-files=no"))}
+
+
+# ----------------------------------------------------------------------
+# 합성 데이터
+# ----------------------------------------------------------------------
+
+def synthetic_pdf(pages: int, lines_per_page: int = 45, seed: int = 0) -> bytes:
+    """섹션 제목과 경력 문장으로 채운 텍스트 PDF (Helvetica, 외부 라이브러리 없이 생성)"""
+    rng = random.Random(seed)
+    headings = ["EDUCATION", "EXPERIENCE", "PROJECTS", "SKILLS"]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # 페이지 목록 (페이지 객체 번호가 정해진 뒤 채움)
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    kids = []
+    for page in range(pages):
+        lines = []
+        for line in range(lines_per_page):
+            if line % 12 == 0:
+                lines.append(headings[(page * 4 + line // 12) % len(headings)])
+            else:
+                lines.append(" ".join(rng.choice(_RESUME_WORDS) for _ in range(12)))
+        text = " T* ".join(f"({line}) Tj" for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 50 750 Td {text} ET".encode("latin-1")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode("latin-1") + stream + b"\nendstream")
+        content_number = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_number} 0 R >>".encode("latin-1")
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>".encode("latin-1")
+    
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode("latin-1")
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(output)
+
+
+def serve_directory(directory: Path) -> ThreadingHTTPServer:
+    """저장한 페이지를 제공하는 로컬 HTTP 서버 (백그라운드 스레드)"""
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=str(directory)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ----------------------------------------------------------------------
+# 구간별 측정
+# ----------------------------------------------------------------------
+
+def bench_crawl(pages_dir: Optional[Path], pages: int, repeat: int) -> Dict:
+    from app.services.crawler_service import CrawlerService
+    
+    if pages_dir is None:
+        pages_dir = Path(tempfile.mkdtemp(prefix="suite_pages_"))
+        for index in range(pages):
+            (pages_dir / f"page_{index}.html").write_bytes(build_page(index))
+    files = sorted(pages_dir.glob("**/*.html"))
+    if not files:
+        raise SystemExit(f"HTML 파일이 없습니다: {pages_dir}")
+    
+    server = serve_directory(pages_dir)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    crawler = CrawlerService()
+    durations = []
+    characters = 0
+    try:
+        for _ in range(repeat):
+            for path in files:
+                url = f"{base_url}/{path.relative_to(pages_dir).as_posix()}"
+                started = time.perf_counter()
+                text = crawler.crawl_url(url)
+                durations.append(time.perf_counter() - started)
+                characters += len(text)
+    finally:
+        server.shutdown()
+        server.server_close()
+    
+    return {
+        "pages": len(files),
+        "html_bytes": sum(path.stat().st_size for path in files),
+        "p50_ms": percentile_ms(durations, 50),
+        "p95_ms": percentile_ms(durations, 95),
+        "pages_per_second": round(len(durations) / sum(durations), 2),
+        "characters_per_page": round(characters / len(durations))
+    }
+
+
+def bench_pdf(pdf_dir: Optional[Path], repeat: int) -> Dict:
+    from app.services.pdf_service import PDFService
+    
+    if pdf_dir is not None:
+        samples = [(path.name, path.read_bytes()) for path in sorted(pdf_dir.glob("**/*.pdf"))]
+        if not samples:
+            raise SystemExit(f"PDF 파일이 없습니다: {pdf_dir}")
+    else:
+        samples = [(f"synthetic_{pages}p.pdf", synthetic_pdf(pages, seed=pages)) for pages in (1, 3, 10)]
+    
+    service = PDFService(use_cache=False)
+    files = {}
+    for name, content in samples:
+        durations = []
+        text = ""
+        for _ in range(repeat):
+            started = time.perf_counter()
+            text = asyncio.run(service.extract_text(content, name))
+            durations.append(time.perf_counter() - started)
+        files[name] = {
+            "bytes": len(content),
+            "median_ms": round(statistics.median(durations) * 1000, 3),
+            "characters": len(text)
+        }
+    return {
+        "files": files,
+        "total_median_ms": round(sum(row["median_ms"] for row in files.values()), 3)
+    }
+
+
+def bench_rag(corpus_sizes: List[int], queries: int) -> Dict:
+    from app.services.crawler_service import clean_html
+    from app.services.rag_service import RAGService
+    
+    rag_service = RAGService()
+    rng = random.Random(0)
+    words = ["서비스", "아키텍처", "트래픽", "데이터", "배포", "장애", "캐시", "검색", "모니터링", "플랫폼"]
+    questions = [" ".join(rng.choice(words) for _ in range(4)) for _ in range(queries)]
+    
+    results = {}
+    added = 0
+    total_chunks = 0
+    for size in sorted(corpus_sizes):
+        durations = []
+        for index in range(added, size):
+            text = clean_html(build_page(index))
+            started = time.perf_counter()
+            asyncio.run(rag_service.add_document(text, {"source": "crawler", "url": f"https://example.com/post/{index}"}))
+            durations.append(time.perf_counter() - started)
+            total_chunks += len(rag_service.split_document(text))
+        added = size
+        
+        latencies = []
+        for question in questions:
+            started = time.perf_counter()
+            asyncio.run(rag_service.search_documents(question, k=5))
+            latencies.append(time.perf_counter() - started)
+        
+        results[str(size)] = {
+            "documents": size,
+            "chunks": total_chunks,
+            "add_median_ms": round(statistics.median(durations) * 1000, 3) if durations else 0.0,
+            "search_p50_ms": percentile_ms(latencies, 50),
+            "search_p95_ms": percentile_ms(latencies, 95)
+        }
+    return results
+
+
+async def _measure_stream(stream, text_of) -> Dict:
+    started = time.perf_counter()
+    first = last = None
+    chunks = 0
+    async for item in stream:
+        text = text_of(item)
+        if not text:
+            continue
+        now = time.perf_counter()
+        first = first or now
+        last = now
+        chunks += 1
+    return {"ttft": (first - started) if first else None, "chunks": chunks, "first": first, "last": last}
+
+
+def bench_generation(runs: int, server: FakeBedrockServer) -> Dict:
+    from app.services.conversation_memory import SummarizingMemory
+    from app.services.question_service import QuestionService
+    from app.services.rag_service import RAGService
+    
+    rag_service = RAGService()
+    question_service = QuestionService(rag_service)
+    generators = {
+        "question_service": lambda index: _measure_stream(
+            question_service.stream(f"백엔드 면접 질문 {index}", SummarizingMemory()),
+            lambda event: event.get("text") if event["type"] == "text" else None
+        ),
+        "rag_stream": lambda index: _measure_stream(
+            rag_service.stream_generate_with_rag(f"캐시 설계 경험 {index}", session_id=f"suite-{index}"),
+            lambda text: text
+        )
+    }
+    
+    results = {}
+    for name, run in generators.items():
+        ttfts = []
+        rates = []
+        for index in range(runs):
+            measured = asyncio.run(run(index))
+            if measured["ttft"] is None:
+                continue
+            ttfts.append(measured["ttft"])
+            if measured["chunks"] > 1 and measured["last"] > measured["first"]:
+                rates.append((measured["chunks"] - 1) / (measured["last"] - measured["first"]))
+        results[name] = {
+            "runs": runs,
+            "completed": len(ttfts),
+            "ttft_p50_ms": percentile_ms(ttfts, 50),
+            "ttft_p95_ms": percentile_ms(ttfts, 95),
+            # 서버 첫 토큰 지연을 뺀 앱 쪽 지연 (검색, 프롬프트 조립, 클라이언트 처리)
+            "ttft_overhead_p50_ms": round(percentile_ms(ttfts, 50) - server.latency * 1000, 3),
+            "tokens_per_second": round(statistics.median(rates), 2) if rates else 0.0
+        }
+    results["server_tokens_per_second"] = server.tokens_per_second
+    return results
+
+
+# ----------------------------------------------------------------------
+# 비교 / 출력
+# ----------------------------------------------------------------------
+
+def flatten(results: Dict, prefix: str = "") -> Dict[str, float]:
+    """중첩 결과를 "구간.항목" 키의 숫자 지표로 변환"""
+    metrics = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            metrics.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[name] = value
+    return metrics
+
+
+def print_comparison(previous: Dict, current: Dict):
+    old_metrics = flatten(previous.get("results", {}))
+    new_metrics = flatten(current["results"])
+    old_commit = (previous.get("meta", {}).get("git", {}).get("commit") or "?")[:10]
+    new_commit = (current["meta"]["git"]["commit"] or "?")[:10]
+    print(f"\n{'metric':<48} {old_commit:>12} {new_commit:>12} {'change':>8}")
+    for name in sorted(set(old_metrics) & set(new_metrics)):
+        old, new = old_metrics[name], new_metrics[name]
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "-"
+        print(f"{name:<48} {old:>12.3f} {new:>12.3f} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집/검색/생성 전 구간 벤치마크")
+    parser.add_argument("--only", nargs="+", choices=SECTIONS, default=SECTIONS, help="실행할 구간")
+    parser.add_argument("--pages-dir", type=Path, help="저장한 HTML 페이지 디렉터리 (없으면 합성 페이지)")
+    parser.add_argument("--pages", type=int, default=20, help="합성 페이지 수")
+    parser.add_argument("--pdf-dir", type=Path, help="샘플 PDF 디렉터리 (없으면 합성 PDF)")
+    parser.add_argument("--corpus-sizes", type=int, nargs="+", default=[10, 50, 200], help="검색을 측정할 문서 수")
+    parser.add_argument("--queries", type=int, default=20, help="문서 수별 검색 질의 수")
+    parser.add_argument("--generation-runs", type=int, default=5, help="생성기별 실행 횟수")
+    parser.add_argument("--latency", type=float, default=0.2, help="가짜 Bedrock 첫 토큰 지연 (초)")
+    parser.add_argument("--tokens-per-second", type=float, default=100.0, help="가짜 Bedrock 초당 출력 토큰 수")
+    parser.add_argument("--embed-latency", type=float, default=0.0, help="가짜 Bedrock 임베딩 지연 (초)")
+    parser.add_argument("--repeat", type=int, default=3, help="crawl/pdf 반복 측정 횟수")
+    parser.add_argument("--json", type=Path, help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--compare", type=Path, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+    
+    server = FakeBedrockServer(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=100,
+        embed_latency=args.embed_latency
+    ).start()
+    settings.bedrock_endpoint_url = server.url
+    settings.embedding_provider = "bedrock"
+    settings.chroma_persist_directory = tempfile.mkdtemp(prefix="suite_chroma_")
+    settings.quantized_index_directory = tempfile.mkdtemp(prefix="suite_index_")
+    settings.pdf_cache_directory = tempfile.mkdtemp(prefix="suite_pdf_cache_")
+    
+    from app.services.rate_limiter import rate_limiter
+    
+    rate_limiter.min_interval = 0
+    
+    results = {}
+    try:
+        if "crawl" in args.only:
+            results["crawl"] = bench_crawl(args.pages_dir, args.pages, args.repeat)
+        if "pdf" in args.only:
+            results["pdf"] = bench_pdf(args.pdf_dir, args.repeat)
+        if "rag" in args.only:
+            results["rag"] = bench_rag(args.corpus_sizes, args.queries)
+        if "generation" in args.only:
+            results["generation"] = bench_generation(args.generation_runs, server)
+    finally:
+        server.stop()
+    
+    report = {
+        "meta": {
+            "git": git_info(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "settings": {
+                "vector_backend": settings.vector_backend,
+                "embedding_dimensions": settings.embedding_dimensions,
+                "chunk_max_tokens": settings.chunk_max_tokens,
+                "pdf_extraction_backend": settings.pdf_extraction_backend
+            },
+            "args": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()}
+        },
+        "results": results
+    }
+    
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    if args.compare:
+        print_comparison(json.loads(args.compare.read_text(encoding="utf-8")), report)
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
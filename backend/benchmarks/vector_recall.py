@@ -0,0 +1,175 @@
+"""
+벡터 저장소 백엔드 비교: Chroma(HNSW, float32) vs 양자화 로컬 인덱스(int8 / 이진 + float32 재계산)
+
+전수 탐색(제곱 L2) 결과를 정답으로 recall@k, 질의 지연 시간, 벡터당 메모리 상주 바이트와 메타데이터 바이트를 비교합니다.
+기본은 군집이 있는 정규화 합성 벡터를 사용하고, --chroma-path를 주면 기존 Chroma DB의 실제 임베딩을 사용합니다.
+
+사용법:
+    cd backend
+    python -m benchmarks.vector_recall --vectors 20000 --dimensions 1024 --queries 200 --k 10
+    python -m benchmarks.vector_recall --chroma-path ./chroma_db
+"""
+import argparse
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.services.quantized_store import QuantizedVectorClient
+
+# Chroma 기본 HNSW 설정 (hnsw:M) - 그래프 링크 메모리 추정용
+CHROMA_HNSW_M = 16
+
+
+def synthetic_corpus(count: int, dimensions: int, clusters: int, seed: int) -> np.ndarray:
+    """군집 중심 주변에 흩어진 정규화 벡터 (문서 임베딩처럼 주제별로 몰려 있는 분포)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimensions)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=count)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((count, dimensions)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def load_chroma_embeddings(path: str, limit: int) -> np.ndarray:
+    """기존 Chroma DB의 모든 컬렉션에서 임베딩 읽기"""
+    import chromadb
+    
+    client = chromadb.PersistentClient(path=path)
+    vectors: List[List[float]] = []
+    for collection in client.list_collections():
+        vectors.extend(collection.get(include=["embeddings"])["embeddings"] or [])
+        if len(vectors) >= limit:
+            break
+    if not vectors:
+        raise SystemExit(f"임베딩이 없습니다: {path}")
+    return np.asarray(vectors[:limit], dtype=np.float32)
+
+
+def make_queries(corpus: np.ndarray, count: int, seed: int) -> np.ndarray:
+    """코퍼스 벡터에 잡음을 더한 질의 (질문과 관련 청크가 가깝지만 같지는 않은 상황)"""
+    rng = np.random.default_rng(seed + 1)
+    picked = corpus[rng.integers(0, len(corpus), size=count)]
+    noise = rng.standard_normal(picked.shape).astype(np.float32) * (np.linalg.norm(picked, axis=1, keepdims=True) / np.sqrt(corpus.shape[1]))
+    return picked + 0.5 * noise
+
+
+def exact_neighbors(corpus: np.ndarray, queries: np.ndarray, k: int) -> List[set]:
+    """전수 탐색 정답"""
+    norms = (corpus * corpus).sum(axis=1)
+    truth = []
+    for query in queries:
+        distances = norms - 2 * corpus @ query
+        truth.append(set(np.argpartition(distances, k - 1)[:k].tolist()))
+    return truth
+
+
+def chunk_metadata(index: int) -> Dict:
+    """실제 청크와 비슷한 크기의 메타데이터 (문서 키/출처/기업 플래그 등 15개 안팎)"""
+    doc = index // 20
+    metadata = {
+        "doc_id": f"crawler-{doc:08x}",
+        "source": "crawler",
+        "url": f"https://example.com/careers/{doc}",
+        "title": f"채용 공고 {doc}",
+        "chunk_index": index % 20,
+        "total_chunks": 20,
+        "content_hash": f"{doc * 2654435761 % 2 ** 64:016x}",
+        "crawled_at": "2026-01-01T00:00:00",
+        "partition": "crawler",
+        "has_company": True
+    }
+    for company in ("samsung", "lg", "sk", "hyundai", "naver"):
+        metadata[f"company_{company}"] = doc % 5 == len(company) % 5
+    return metadata
+
+
+def evaluate(collection, corpus: np.ndarray, queries: np.ndarray, truth: List[set], k: int, batch_size: int) -> Dict:
+    ids = [str(index) for index in range(len(corpus))]
+    started = time.perf_counter()
+    for start in range(0, len(corpus), batch_size):
+        collection.add(
+            ids=ids[start:start + batch_size],
+            embeddings=corpus[start:start + batch_size].tolist(),
+            documents=[""] * len(ids[start:start + batch_size]),
+            metadatas=[chunk_metadata(index) for index in range(start, min(start + batch_size, len(corpus)))]
+        )
+    build_seconds = time.perf_counter() - started
+    
+    hits = 0
+    latencies = []
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        result = collection.query(query_embeddings=[query.tolist()], n_results=k, include=["distances"])
+        latencies.append(time.perf_counter() - started)
+        hits += len(expected & {int(found) for found in result["ids"][0]})
+    return {
+        "recall": hits / (k * len(queries)),
+        "build_seconds": build_seconds,
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p95_ms": float(np.percentile(latencies, 95) * 1000)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벡터 저장소 recall/메모리/지연 시간 비교")
+    parser.add_argument("--vectors", type=int, default=20000, help="코퍼스 벡터 수")
+    parser.add_argument("--dimensions", type=int, default=1024, help="합성 벡터 차원 (Titan v2 기본 1024)")
+    parser.add_argument("--clusters", type=int, default=200, help="합성 벡터 군집 수")
+    parser.add_argument("--queries", type=int, default=200, help="질의 수")
+    parser.add_argument("--k", type=int, default=10, help="recall@k의 k")
+    parser.add_argument("--rescore-factor", type=int, default=8, help="양자화 인덱스 재계산 후보 배수")
+    parser.add_argument("--chroma-path", default=None, help="실제 임베딩을 읽을 Chroma DB 경로")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    if args.chroma_path:
+        corpus = load_chroma_embeddings(args.chroma_path, args.vectors)
+    else:
+        corpus = synthetic_corpus(args.vectors, args.dimensions, args.clusters, args.seed)
+    queries = make_queries(corpus, args.queries, args.seed)
+    truth = exact_neighbors(corpus, queries, args.k)
+    dimensions = corpus.shape[1]
+    print(f"corpus: {len(corpus)} x {dimensions}, queries: {len(queries)}, k={args.k}")
+    print()
+    
+    import chromadb
+    
+    rows = []
+    chroma = chromadb.PersistentClient(path=tempfile.mkdtemp(prefix="vector_recall_chroma_"))
+    collection = chroma.get_or_create_collection("bench")
+    result = evaluate(collection, corpus, queries, truth, args.k, 5000)
+    # float32 벡터 + 레벨 0 HNSW 링크 (2M개 int32)
+    result["bytes_per_vector"] = dimensions * 4 + 2 * CHROMA_HNSW_M * 4
+    result["metadata_per_vector"] = None  # Chroma SQLite (검색 경로에서 따로 측정하지 않음)
+    rows.append(("chroma-hnsw", result))
+    
+    for quantization in ("int8", "binary"):
+        client = QuantizedVectorClient(
+            path=tempfile.mkdtemp(prefix=f"vector_recall_{quantization}_"),
+            quantization=quantization,
+            rescore_factor=args.rescore_factor
+        )
+        collection = client.get_or_create_collection("bench")
+        result = evaluate(collection, corpus, queries, truth, args.k, 5000)
+        usage = collection.memory_bytes()
+        result["bytes_per_vector"] = usage["resident"] / max(1, collection.count())
+        result["metadata_per_vector"] = usage["metadata"] / max(1, collection.count())
+        rows.append((f"quantized-{quantization}", result))
+    
+    print(f"{'backend':>18} {'recall':>7} {'p50 ms':>8} {'p95 ms':>8} {'build s':>8} {'bytes/vec':>10} {'vs chroma':>9} {'meta/vec':>9}")
+    baseline = rows[0][1]["bytes_per_vector"]
+    for name, result in rows:
+        print(
+            f"{name:>18} {result['recall']:>7.3f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+            f"{result['build_seconds']:>8.1f} {result['bytes_per_vector']:>10.0f} "
+            f"{baseline / result['bytes_per_vector']:>8.1f}x "
+            + (f"{result['metadata_per_vector']:>9.0f}" if result["metadata_per_vector"] is not None else f"{'-':>9}")
+        )
+    print()
+    print("bytes/vec: 검색 시 메모리에 상주하는 크기 (양자화 인덱스의 float32 원본은 디스크에서 후보만 읽음)")
+    print("meta/vec: SQLite에 둔 청크 ID/메타데이터 크기 (where 필터와 결과 조회 때만 디스크에서 읽으며 메모리에 상주하지 않음)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+공용 테스트 설정 (임시 저장소 디렉터리, 가짜 Bedrock 서버)
+"""
+import pytest
+from app.config import settings
+
+
+@pytest.fixture
+def temp_stores(tmp_path, monkeypatch):
+    """벡터 저장소/캐시/DB를 테스트별 임시 디렉터리로 변경"""
+    monkeypatch.setattr(settings, "chroma_persist_directory", str(tmp_path / "chroma"))
+    monkeypatch.setattr(settings, "quantized_index_directory", str(tmp_path / "index"))
+    monkeypatch.setattr(settings, "pdf_cache_directory", str(tmp_path / "pdf_cache"))
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{tmp_path / 'test.db'}")
+    return tmp_path
+
+
+@pytest.fixture
+def fake_bedrock(temp_stores, monkeypatch):
+    """로컬 가짜 bedrock-runtime 서버 (AWS 자격 증명 없이 임베딩/생성 호출)"""
+    from benchmarks.fake_bedrock import FakeBedrockServer
+    
+    server = FakeBedrockServer(latency=0.01, tokens_per_second=2000, output_tokens=20).start()
+    monkeypatch.setattr(settings, "bedrock_endpoint_url", server.url)
+    monkeypatch.setattr(settings, "embedding_provider", "bedrock")
+    yield server
+    server.stop()
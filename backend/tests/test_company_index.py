@@ -0,0 +1,68 @@
+"""
+회사 별칭 매칭 테스트 (AhoCorasickMatcher 단어 경계, 모호한 한글 별칭)
+
+실행:
+    cd backend
+    python -m pytest tests
+"""
+import pytest
+from app.services.company_index import AhoCorasickMatcher, company_index
+
+
+@pytest.mark.parametrize("text", [
+    "메타데이터 설계",
+    "현대적인 아키텍처",
+    "토스트 메시지",
+    "라인 단위 로그",
+    "파이프라인 구성",
+    "당근 주스",
+    "기아 문제",
+    "gsap 애니메이션"
+])
+def test_common_words_are_not_companies(text):
+    assert company_index.match(text) == []
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("카카오 백엔드 면접 질문", ["kakao"]),
+    ("카카오에서 일하고 싶어요", ["kakao"]),
+    ("네이버의 검색 서비스", ["naver"]),
+    ("카카오톡 메시지 서버", ["kakao"]),
+    ("토스 백엔드 면접 질문 5개", ["toss"]),
+    ("토스뱅크 채용", ["toss"]),
+    ("라인플러스 개발 문화", ["line"]),
+    ("현대자동차 소프트웨어", ["hyundai"]),
+    ("메타의 기술 블로그", ["meta"]),
+    ("당근마켓과 쿠팡 비교", ["daangn", "coupang"]),
+    ("LG전자 임베디드", ["lg"]),
+    ("Google and Netflix", ["google", "netflix"])
+])
+def test_company_mentions(text, expected):
+    assert company_index.match(text) == expected
+
+
+def test_primary_company_ignores_common_word_repeats():
+    text = "메타데이터 저장소. 메타데이터 인덱스. 메타데이터 캐시."
+    assert company_index.primary_company(text) is None
+
+
+def test_primary_company_from_metadata_alias():
+    assert company_index.primary_company("", {"company": "라인"}) == "line"
+    assert company_index.primary_company("", {"company": "kakao"}) == "kakao"
+
+
+def test_primary_company_from_url():
+    assert company_index.primary_company("", {"url": "https://tech.kakao.com/posts/1"}) == "kakao"
+
+
+def test_matcher_reports_overlapping_patterns():
+    matcher = AhoCorasickMatcher({"he": "a", "she": "b", "hers": "c"})
+    assert sorted(matcher.find("ushers")) == []
+    assert sorted(matcher.find("she hers")) == [(0, "she", "b"), (4, "hers", "c")]
+
+
+def test_matcher_hangul_particles():
+    matcher = AhoCorasickMatcher({"카카오": "kakao"})
+    assert matcher.find("카카오는") == [(0, "카카오", "kakao")]
+    assert matcher.find("카카오프렌즈") == []
+    assert matcher.find("주카카오") == []
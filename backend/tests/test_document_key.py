@@ -0,0 +1,55 @@
+"""
+문서 출처 키 테스트 (크롤링 문서는 URL, 업로드 문서는 내용으로 구분)
+"""
+from app.services.rag_service import RAGService
+
+
+def test_crawled_document_keeps_key_when_content_changes():
+    metadata = {"source": "crawler", "url": "https://example.com/post/1"}
+    assert RAGService.document_key("첫 버전", metadata) == RAGService.document_key("수정된 버전", metadata)
+
+
+def test_pdfs_with_same_filename_are_different_documents():
+    first = RAGService.document_key("홍길동 이력서", {"source": "pdf", "filename": "resume.pdf"})
+    second = RAGService.document_key("김철수 이력서", {"source": "pdf", "filename": "resume.pdf"})
+    assert first != second
+    
+    # 같은 파일을 다시 올리면 같은 문서
+    assert first == RAGService.document_key("홍길동 이력서", {"source": "pdf", "filename": "resume.pdf"})
+
+
+def test_url_outside_crawler_source_does_not_merge_documents():
+    first = RAGService.document_key("메모 A", {"source": "manual", "url": "https://example.com"})
+    second = RAGService.document_key("메모 B", {"source": "manual", "url": "https://example.com"})
+    assert first != second
+
+
+def _page(version: str) -> str:
+    return "\n\n".join(
+        f"## {version} 섹션 {index}\n\n" + f"{version} 카카오 서버 트래픽 개선 내용 {index}. " * 60
+        for index in range(3)
+    )
+
+
+def _stored_chunks(rag_service, doc_id: str) -> int:
+    return sum(len(ids) for ids in rag_service._find_document_chunks(doc_id, "crawler").values())
+
+
+def test_readding_a_crawled_url_replaces_the_previous_version(fake_bedrock):
+    import asyncio
+    from app.services.rag_service import RAGService
+    
+    rag_service = RAGService()
+    metadata = {"source": "crawler", "url": "https://example.com/post/1"}
+    first = asyncio.run(rag_service.add_document(_page("v1"), metadata))
+    first_count = _stored_chunks(rag_service, first)
+    second = asyncio.run(rag_service.add_document(_page("v2"), metadata))
+    
+    assert second == first
+    assert _stored_chunks(rag_service, second) == first_count
+    texts = [
+        text
+        for name in rag_service._find_document_chunks(first, "crawler")
+        for text in rag_service.router.get_collection(name).get(where={"doc_id": first})["documents"]
+    ]
+    assert texts and all("v1" not in text for text in texts)
@@ -0,0 +1,24 @@
+"""
+면접 기록 저장소 테스트 (커서 페이지가 세션/메시지를 빠뜨리지 않는지)
+"""
+from app.services import history_store as history_module
+from app.services.history_store import HistoryStore
+
+
+def test_session_pages_keep_sessions_with_the_same_last_time(temp_stores, monkeypatch):
+    history_store = HistoryStore(database_url=f"sqlite:///{temp_stores / 'history.db'}")
+    # 한 배치로 저장된 여러 세션은 마지막 대화 시각이 같을 수 있음
+    monkeypatch.setattr(history_module.time, "time", lambda: 1700000000.0)
+    for index in range(5):
+        history_store.append("alice", f"s{index}", "user", f"질문 {index}")
+    history_store.flush()
+    
+    seen = []
+    cursor = None
+    while True:
+        sessions, cursor = history_store.list_sessions("alice", limit=2, before=cursor)
+        seen.extend(session["session_id"] for session in sessions)
+        if cursor is None:
+            break
+    assert seen == ["s4", "s3", "s2", "s1", "s0"]
+    history_store.close()
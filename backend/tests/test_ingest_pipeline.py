@@ -0,0 +1,49 @@
+"""
+수집 파이프라인 테스트 (다시 수집한 URL의 이전 청크 정리)
+"""
+from app.services.ingest_pipeline import IngestPipeline
+
+
+class VersionedCrawler:
+    """version을 바꾸면 같은 URL이 다른 본문을 반환하는 크롤러"""
+    
+    def __init__(self):
+        self.version = "v1"
+    
+    def fetch_page(self, url, max_length=50000, etag=None, last_modified=None):
+        text = "\n\n".join(
+            f"## {self.version} 섹션 {index}\n\n" + f"{self.version} 서버 트래픽 개선 내용 {index}. " * 60
+            for index in range(3)
+        )
+        return {"url": url, "html": None, "text": text, "etag": None, "last_modified": None, "not_modified": False}
+
+
+def _stored_chunks(rag_service, doc_id):
+    return {
+        chunk_id
+        for name, ids in rag_service._find_document_chunks(doc_id, "crawler").items()
+        for chunk_id in ids
+    }
+
+
+def test_rerun_on_changed_page_replaces_chunks(fake_bedrock):
+    from app.services.rag_service import RAGService
+    
+    rag_service = RAGService()
+    crawler = VersionedCrawler()
+    url = "https://example.com/post/1"
+    
+    first = IngestPipeline(rag_service, crawler, clean_workers=0, embed_min_interval=0).run([url])["documents"][0]
+    assert first["status"] == "succeeded"
+    assert len(_stored_chunks(rag_service, first["doc_id"])) == first["chunks"]
+    
+    crawler.version = "v2"
+    second = IngestPipeline(rag_service, crawler, clean_workers=0, embed_min_interval=0).run([url])["documents"][0]
+    assert second["status"] == "succeeded"
+    assert second["doc_id"] == first["doc_id"]
+    assert second["removed"] == first["chunks"]
+    assert len(_stored_chunks(rag_service, second["doc_id"])) == second["chunks"]
+    
+    # 바뀌지 않은 페이지를 다시 수집하면 아무것도 지우지 않음
+    third = IngestPipeline(rag_service, crawler, clean_workers=0, embed_min_interval=0).run([url])["documents"][0]
+    assert (third["skipped"], third["removed"]) == (third["chunks"], 0)
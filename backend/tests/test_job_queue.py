@@ -0,0 +1,84 @@
+"""
+작업 큐 테스트 (lease 연장, 크롤링 결과 크기)
+"""
+import threading
+import time
+from app.services import ingest_jobs
+from app.services.job_queue import JobQueue
+
+
+def _wait_done(queue, job_id, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"작업이 끝나지 않음: {queue.get(job_id)}")
+
+
+def test_long_job_is_not_reclaimed_while_running(temp_stores):
+    """진행률 보고 없이 lease보다 오래 걸리는 작업도 다른 작업자(프로세스)가 다시 실행하지 않음"""
+    database_url = f"sqlite:///{temp_stores / 'jobs.db'}"
+    runs = []
+    runs_lock = threading.Lock()
+    
+    def slow_embed(payload, report):
+        with runs_lock:
+            runs.append(payload["doc"])
+        time.sleep(1.2)
+        return {"doc": payload["doc"]}
+    
+    queues = []
+    for _ in range(2):
+        queue = JobQueue(database_url=database_url, workers=1, poll_interval=0.05, lease_seconds=0.3)
+        queue.register("embed", slow_embed)
+        queues.append(queue)
+    
+    job_id = queues[0].enqueue("embed", {"doc": "large"})
+    for queue in queues:
+        queue.start()
+    try:
+        job = _wait_done(queues[0], job_id)
+    finally:
+        for queue in queues:
+            queue.stop()
+    
+    assert job["status"] == "succeeded"
+    assert job["attempts"] == 1
+    assert runs == ["large"]
+
+
+def test_crawl_result_keeps_only_preview(monkeypatch):
+    class FakeCrawler:
+        def fetch_page(self, url):
+            return {"text": "본문 " * 5000, "html": None, "etag": None, "last_modified": None}
+    
+    monkeypatch.setitem(ingest_jobs._services, "crawler", FakeCrawler())
+    result = ingest_jobs.crawl_job({"url": "https://example.com/a", "auto_rag": False}, lambda progress, message="": None)
+    
+    assert "content" not in result
+    assert result["length"] == len("본문 " * 5000)
+    assert len(result["preview"]) == ingest_jobs.CRAWL_PREVIEW_CHARS
+
+
+def test_crawl_without_auto_rag_keeps_full_content(temp_stores, monkeypatch):
+    class FakeCrawler:
+        def fetch_page(self, url):
+            return {"text": "전체 본문 " * 1000, "html": None, "etag": None, "last_modified": None}
+    
+    queue = JobQueue(database_url=f"sqlite:///{temp_stores / 'jobs.db'}", workers=1, poll_interval=0.05)
+    queue.register("crawl", ingest_jobs.crawl_job)
+    monkeypatch.setattr(ingest_jobs, "_ingest_queue", queue)
+    monkeypatch.setitem(ingest_jobs._services, "crawler", FakeCrawler())
+    
+    job_id = queue.enqueue("crawl", {"url": "https://example.com/a", "auto_rag": False})
+    queue.start()
+    try:
+        job = _wait_done(queue, job_id)
+    finally:
+        queue.stop()
+    
+    assert job["status"] == "succeeded"
+    assert job["result"]["embed_job_id"] is None
+    assert ingest_jobs.get_crawl_content(job_id) == {"url": "https://example.com/a", "content": "전체 본문 " * 1000}
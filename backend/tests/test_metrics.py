@@ -0,0 +1,79 @@
+"""
+단계별 지표 테스트 (레이블별 히스토그램, 요청 ID)
+"""
+import asyncio
+import pytest
+from app.config import settings
+from app.services.metrics import MetricsRegistry, current_request_id, metrics, trace_request
+from app.services.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def clean_metrics(monkeypatch):
+    monkeypatch.setattr(settings, "metrics_enabled", True)
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+
+def test_rate_limit_wait_is_split_by_key(clean_metrics):
+    limiter = RateLimiter(min_interval=0.0)
+    
+    async def run():
+        for _ in range(3):
+            await limiter.wait_if_needed(key="bedrock_embed")
+        await limiter.wait_if_needed(key="session-1234", metric_key="rag_session")
+    
+    asyncio.run(run())
+    stages = clean_metrics.snapshot()["stages"]
+    assert stages['rate_limit_wait{key="bedrock_embed"}']["count"] == 3
+    assert stages['rate_limit_wait{key="rag_session"}']["count"] == 1
+    assert all("session-1234" not in name for name in stages)
+    
+    text = clean_metrics.render_prometheus()
+    assert 'interview_stage_duration_seconds_count{key="bedrock_embed",stage="rate_limit_wait"} 3' in text
+
+
+def test_spans_carry_request_id_per_stream(clean_metrics):
+    @trace_request
+    async def stream(name):
+        with metrics.span("prompt_assembly"):
+            pass
+        yield name
+        # 다음 단계에서 다른 스레드로 넘긴 작업도 같은 요청 ID
+        await asyncio.to_thread(metrics.observe, "bedrock_ttft", 0.01)
+        yield name
+    
+    def consume_like_streamlit(events):
+        # Streamlit처럼 단계마다 새 이벤트 루프/태스크로 진행
+        items = []
+        while True:
+            loop = asyncio.new_event_loop()
+            try:
+                items.append(loop.run_until_complete(events.__anext__()))
+            except StopAsyncIteration:
+                return items
+            finally:
+                loop.close()
+    
+    async def concurrent():
+        async def collect(name):
+            return [item async for item in stream(name)]
+        return await asyncio.gather(collect("a"), collect("b"))
+    
+    assert consume_like_streamlit(stream("s")) == ["s", "s"]
+    assert asyncio.run(concurrent()) == [["a", "a"], ["b", "b"]]
+    assert current_request_id.get() is None
+    
+    by_request = {}
+    for span in clean_metrics.snapshot()["recent"]:
+        by_request.setdefault(span["request_id"], []).append(span["stage"])
+    assert None not in by_request
+    assert len(by_request) == 3
+    assert all(sorted(stages) == ["bedrock_ttft", "prompt_assembly"] for stages in by_request.values())
+
+
+def test_registry_without_labels_keeps_stage_names():
+    registry = MetricsRegistry()
+    registry.observe("vector_query", 0.02)
+    assert list(registry.snapshot()["stages"]) == ["vector_query"]
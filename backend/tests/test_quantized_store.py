@@ -0,0 +1,86 @@
+"""
+양자화 인덱스 테스트 (여러 클라이언트/프로세스가 같은 디렉터리를 쓸 때 손상되지 않는지)
+"""
+import numpy as np
+from app.services.quantized_store import QuantizedVectorClient, get_quantized_client
+
+
+def _vectors(seed: int, count: int, dimensions: int = 16):
+    return np.random.default_rng(seed).standard_normal((count, dimensions)).astype(np.float32).tolist()
+
+
+def test_clients_sharing_a_directory_do_not_overwrite_each_other(tmp_path):
+    # 서로 다른 프로세스처럼 메모리 상태를 따로 가진 두 클라이언트 (둘 다 쓰기 전에 컬렉션을 열어 둠)
+    path = str(tmp_path / "index")
+    client_a = QuantizedVectorClient(path=path)
+    client_b = QuantizedVectorClient(path=path)
+    collection_a = client_a.get_or_create_collection("docs")
+    collection_b = client_b.get_or_create_collection("docs")
+    
+    vectors_a = _vectors(1, 3)
+    vectors_b = _vectors(2, 3)
+    collection_a.add(ids=["a0", "a1", "a2"], embeddings=vectors_a, documents=["A0", "A1", "A2"], metadatas=[{"doc_id": "A"}] * 3)
+    collection_b.add(ids=["b0", "b1", "b2"], embeddings=vectors_b, documents=["B0", "B1", "B2"], metadatas=[{"doc_id": "B"}] * 3)
+    
+    for collection in (collection_a, collection_b, QuantizedVectorClient(path=path).get_collection("docs")):
+        assert collection.count() == 6
+        assert sorted(collection.get()["ids"]) == ["a0", "a1", "a2", "b0", "b1", "b2"]
+        result = collection.query(query_embeddings=[vectors_a[1]], n_results=1)
+        assert result["ids"] == [["a1"]]
+        assert result["documents"] == [["A1"]]
+    
+    # 한쪽의 삭제도 다른 쪽에 반영
+    collection_b.delete(where={"doc_id": "A"})
+    assert sorted(collection_a.get()["ids"]) == ["b0", "b1", "b2"]
+    assert collection_a.query(query_embeddings=[vectors_b[2]], n_results=1)["ids"] == [["b2"]]
+
+
+def test_collections_created_by_another_client_are_visible(tmp_path):
+    path = str(tmp_path / "index")
+    client_a = QuantizedVectorClient(path=path)
+    client_b = QuantizedVectorClient(path=path)
+    client_a.get_or_create_collection("new_partition", {"source": "crawler"})
+    
+    assert [collection.name for collection in client_b.list_collections()] == ["new_partition"]
+    assert client_b.get_collection("new_partition").metadata == {"source": "crawler"}
+
+
+def test_one_client_per_directory_in_process(tmp_path):
+    path = tmp_path / "index"
+    assert get_quantized_client(str(path)) is get_quantized_client(str(path / ".." / "index"))
+    assert get_quantized_client(str(path)) is not get_quantized_client(str(tmp_path / "other"))
+
+
+def test_where_filters_run_in_sqlite_and_survive_compaction(tmp_path):
+    client = QuantizedVectorClient(path=str(tmp_path / "index"))
+    collection = client.get_or_create_collection("docs")
+    metadatas = [
+        {"doc_id": f"d{index % 4}", "chunk_index": index, "company_samsung": index % 2 == 0}
+        for index in range(2000)
+    ]
+    metadatas[5].pop("company_samsung")
+    collection.add(
+        ids=[f"c{index}" for index in range(2000)],
+        embeddings=_vectors(3, 2000),
+        documents=[f"text {index}" for index in range(2000)],
+        metadatas=metadatas
+    )
+    
+    assert len(collection.get(where={"doc_id": "d1"})["ids"]) == 500
+    assert len(collection.get(where={"company_samsung": True})["ids"]) == 1000
+    assert "c5" in collection.get(where={"company_samsung": {"$ne": True}})["ids"]
+    assert "c5" in collection.get(where={"company_samsung": {"$nin": [True]}})["ids"]
+    assert collection.get(where={"$and": [{"doc_id": {"$in": ["d0", "d1"]}}, {"chunk_index": {"$lt": 4}}]})["ids"] == ["c0", "c1"]
+    assert len(collection.get(where={"$or": [{"doc_id": "d2"}, {"chunk_index": {"$gte": 1998}}]})["ids"]) == 501
+    
+    # 절반 넘게 삭제하면 압축되어 행 번호가 바뀌어도 ID/메타데이터가 같은 벡터를 가리킴
+    collection.delete(where={"doc_id": {"$ne": "d3"}})
+    assert collection.count() == 500
+    vectors = _vectors(3, 2000)
+    result = collection.query(query_embeddings=[vectors[1999]], n_results=1, where={"chunk_index": {"$gt": 1000}})
+    assert result["ids"] == [["c1999"]]
+    assert result["metadatas"][0][0]["chunk_index"] == 1999
+    
+    usage = QuantizedVectorClient(path=str(tmp_path / "index")).get_collection("docs").memory_bytes()
+    assert usage["resident"] == 500 * (16 + 9)
+    assert usage["metadata"] > 0
@@ -0,0 +1,26 @@
+"""
+RAG 생성 토큰 사용량 테스트 (동시 요청끼리 사용량이 섞이지 않는지)
+"""
+import asyncio
+
+
+def test_usage_is_returned_per_request(fake_bedrock):
+    from app.services.rag_service import RAGService
+    
+    rag_service = RAGService()
+    
+    async def stream(usage):
+        async for _ in rag_service.stream_generate_with_rag("캐시 설계 질문", usage_result=usage):
+            pass
+    
+    async def run():
+        first, second, generated = {}, {}, {}
+        await asyncio.gather(stream(first), stream(second))
+        await rag_service.generate_with_rag("캐시 설계 질문", usage_result=generated)
+        return first, second, generated
+    
+    first, second, generated = asyncio.run(run())
+    for usage in (first, second, generated):
+        assert usage["output_tokens"] == 20
+        assert usage["input_tokens"] > 0
+    assert not hasattr(rag_service, "last_usage")
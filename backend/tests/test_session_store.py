@@ -0,0 +1,25 @@
+"""
+세션 메모리 저장소 테스트 (상한 설정과 메모리 상한 적용 시점)
+"""
+from app.services.conversation_memory import SummarizingMemory
+from app.services.session_store import SessionStore
+
+
+def test_zero_limits_are_kept():
+    store = SessionStore(SummarizingMemory, max_sessions=0, idle_ttl_seconds=0, max_memory_bytes=0)
+    assert (store.max_sessions, store.idle_ttl_seconds, store.max_memory_bytes) == (0, 0, 0)
+
+
+def test_memory_cap_counts_the_turn_just_written():
+    store = SessionStore(SummarizingMemory, max_sessions=10, idle_ttl_seconds=3600, max_memory_bytes=1000)
+    first = store.get("first")
+    first.add_user_message("가" * 200)
+    store.record_write("first")
+    
+    second = store.get("second")
+    second.add_user_message("나" * 200)
+    # 두 세션 합계 1200바이트: 쓰기 직후 가장 오래 쓰지 않은 세션 제거 (다음 get까지 기다리지 않음)
+    store.record_write("second")
+    assert "first" not in store
+    assert store.total_bytes() == 600
+    assert store.stats["evicted_memory"] == 1
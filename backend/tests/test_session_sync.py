@@ -0,0 +1,43 @@
+"""
+워커 간 세션 메모리 동기화 테스트 (세션이 여러 워커를 오가도 모든 대화가 메모리에 반영되는지)
+"""
+from app.services import history_store as history_module
+from app.services.conversation_memory import SummarizingMemory
+from app.services.history_store import HistoryStore
+
+
+def _answer(history_store, memory, user_id, session_id, question, answer):
+    """워커 하나가 질문에 답하고 메모리/기록에 저장하는 과정 (main.stream_questions와 같은 순서)"""
+    memory.add_user_message(question)
+    memory.add_ai_message(answer)
+    history_store.append(user_id, session_id, "user", question)
+    assert history_store.append(user_id, session_id, "assistant", answer).wait(5)
+
+
+def test_memory_follows_session_across_workers(temp_stores, monkeypatch):
+    from app.main import _memory_key, _sync_memory_from_history
+    
+    history_store = HistoryStore(database_url=f"sqlite:///{temp_stores / 'history.db'}")
+    monkeypatch.setattr(history_module, "_history_store", history_store)
+    worker_a, worker_b = SummarizingMemory(), SummarizingMemory()
+    
+    _sync_memory_from_history(worker_a, "alice", "s1")
+    _answer(history_store, worker_a, "alice", "s1", "카카오 질문 3개", "1번 ... 2번 ... 3번 ...")
+    
+    _sync_memory_from_history(worker_b, "alice", "s1")
+    assert [message["content"] for message in worker_b.history()] == ["카카오 질문 3개", "1번 ... 2번 ... 3번 ..."]
+    _answer(history_store, worker_b, "alice", "s1", "1번 답변 예시", "예시 답변")
+    
+    # 워커 A는 이미 메모리가 있어도 B가 답한 대화를 이어 붙임
+    _sync_memory_from_history(worker_a, "alice", "s1")
+    assert [message["content"] for message in worker_a.history()] == [
+        "카카오 질문 3개", "1번 ... 2번 ... 3번 ...", "1번 답변 예시", "예시 답변"
+    ]
+    assert worker_a.message_count == 4
+    
+    # 다른 사용자의 같은 세션 ID는 기록도 메모리 키도 다름
+    other = SummarizingMemory()
+    _sync_memory_from_history(other, "bob", "s1")
+    assert other.history() == []
+    assert _memory_key("alice", "s1") != _memory_key("bob", "s1")
+    history_store.close()
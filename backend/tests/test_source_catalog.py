@@ -0,0 +1,44 @@
+"""
+출처 카탈로그 테스트 (수집 경로별 등록, 문서 삭제 시 제거)
+"""
+import asyncio
+from app.config import settings
+from app.services import ingest_jobs, source_catalog
+
+
+class FakeCrawler:
+    def fetch_page(self, url, max_length=50000, etag=None, last_modified=None):
+        return {
+            "url": url,
+            "html": None,
+            "text": f"# {url}\n\n" + "카카오 백엔드 서버 트래픽을 개선했습니다. " * 40,
+            "etag": f'"{url[-1]}"',
+            "last_modified": None,
+            "not_modified": False
+        }
+
+
+def test_pipeline_ingest_is_tracked_and_delete_untracks(fake_bedrock, monkeypatch):
+    from app.services.rag_service import RAGService
+    
+    monkeypatch.setattr(settings, "freshness_enabled", True)
+    monkeypatch.setattr(settings, "pipeline_clean_workers", 0)
+    monkeypatch.setattr(source_catalog, "_source_catalog", None)
+    rag_service = RAGService()
+    monkeypatch.setitem(ingest_jobs._services, "rag", rag_service)
+    monkeypatch.setitem(ingest_jobs._services, "crawler", FakeCrawler())
+    
+    urls = ["https://example.com/post/1", "https://example.com/post/2"]
+    result = ingest_jobs.pipeline_job({"urls": urls}, lambda progress, message="": None)
+    assert [document["status"] for document in result["documents"]] == ["succeeded", "succeeded"]
+    
+    catalog = source_catalog.get_source_catalog()
+    tracked = catalog.get(urls[0])
+    assert tracked["doc_id"] == result["documents"][0]["doc_id"]
+    assert tracked["etag"] == '"1"'
+    
+    # 삭제한 문서는 최신성 확인 대상에서 빠짐 (다시 수집되지 않음)
+    asyncio.run(rag_service.delete_document(tracked["doc_id"]))
+    assert catalog.get(urls[0]) is None
+    assert catalog.get(urls[1]) is not None
+    assert ingest_jobs.refresh_job({"url": urls[0]}, lambda progress, message="": None)["status"] == "untracked"